@@ -14,6 +14,7 @@ from lead_qualification_agent.callbacks import (
     create_after_model_callback,
     create_before_model_callback,
 )
+from utils.llm_cache import LlmResponseCache
 
 # Get logger
 logger: logging.Logger = logging.getLogger(name=f"adk_log.{__name__}")
@@ -24,6 +25,9 @@ after_model_callback: Callable[..., Any] = create_after_model_callback(
     logger=logger, next_step_message="Workflows proceed to Action Recommender Agent."
 )
 
+# Identical lead texts get the cached score instead of another model call
+llm_cache = LlmResponseCache(max_entries=1024, ttl_seconds=24 * 60 * 60)
+
 # Create scorer agent
 lead_scorer_agent = LlmAgent(
     name="LeadScorerAgent",
@@ -43,6 +47,6 @@ lead_scorer_agent = LlmAgent(
     """,
     description="Scores qualified leads on a scale of 1-10.",
     output_key="lead_score",
-    before_model_callback=before_model_callback,
-    after_model_callback=after_model_callback,
+    before_model_callback=[before_model_callback, llm_cache.before_model_callback],
+    after_model_callback=[llm_cache.after_model_callback, after_model_callback],
 )
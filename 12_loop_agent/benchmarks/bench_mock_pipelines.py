@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Sequential, Parallel and Loop agent pipelines.
+
+Runs the lead qualification (10), system monitor (11) and LinkedIn post (12)
+pipelines with every model replaced by a scripted MockLlm, so no API key or
+network is needed. The scripts call the pipelines' real tools (get_cpu_info,
+get_memory_info, get_disk_info, count_characters and exit_loop, after two
+review rounds), so with the default zero model latency the time per run is
+the framework and tool overhead.
+
+With --error-rate or --fail-first (the first calls of each pipeline's first
+agent), model calls fail with 503 errors and each run goes through the
+ResilientRunner of multi_agent_config_system. It only retries runs that
+haven't produced an event yet, and each pipeline's before_agent_callback
+records the initial state in an event before any model call, so the injected
+errors show how many runs fail rather than being retried. The example agents
+write their logs, health report and post files as usual.
+
+Usage:
+    python benchmarks/bench_mock_pipelines.py [--runs 5] [--latency 0.0]
+        [--distribution lognormal] [--spread 0.5] [--error-rate 0.05]
+        [--fail-first 1]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+# Add the repository root, the example directories and the project with the
+# resilient runner to the path
+repo_dir: Path = Path(__file__).parent.parent.parent
+for directory in ("", "10_sequential_agent", "11_parallel_agent", "12_loop_agent"):
+    sys.path.append(str(repo_dir / directory))
+sys.path.append(str(repo_dir / "multi_agent_config_system"))
+
+from lead_qualification_agent import root_agent as lead_agent  # noqa: E402
+from lead_qualification_agent.subagents.scorer import agent as scorer  # noqa: E402
+from linkedin_post_agent import root_agent as linkedin_agent  # noqa: E402
+from resilience import ResilientRunner  # noqa: E402
+from system_monitor_agent import root_agent as monitor_agent  # noqa: E402
+
+from utils.mock_llm import MockLlm, MockResponse, install_mock_llm  # noqa: E402
+
+APP_NAME: str = "Mock Pipelines"
+USER_ID: str = "bench_user"
+
+# Scripted answers of each pipeline's LLM agents
+SCRIPTS: dict[str, dict[str, list[MockResponse]]] = {
+    "sequential (lead qualification)": {
+        "LeadValidatorAgent": [MockResponse(text="valid")],
+        "LeadScorerAgent": [
+            MockResponse(text="8: Decision maker with clear budget and immediate need")
+        ],
+        "ActionRecommenderAgent": [
+            MockResponse(text="Schedule a product demo with the decision maker.")
+        ],
+    },
+    "parallel (system monitor)": {
+        **{
+            agent_name: [
+                MockResponse(function_call=tool),
+                MockResponse(after_tool=tool, text=f"{agent_name}: $tool_result"),
+            ]
+            for agent_name, tool in (
+                ("CpuInfoAgent", "get_cpu_info"),
+                ("MemoryInfoAgent", "get_memory_info"),
+                ("DiskInfoAgent", "get_disk_info"),
+            )
+        },
+        "SynthesizerAgent": [MockResponse(text="System health report: all good.")],
+    },
+    "loop (LinkedIn post)": {
+        "InitialPostGenerator": [
+            MockResponse(text="Excited to share what ADK can do.")
+        ],
+        "PostReviewer": [
+            MockResponse(function_call="count_characters", args={"post": "$user_text"}),
+            MockResponse(
+                after_tool="count_characters",
+                text="Add a clearer call to action.",
+                times=2,
+            ),
+            MockResponse(after_tool="count_characters", function_call="exit_loop"),
+        ],
+        "PostRefinerAgent": [MockResponse(text="Refined post about ADK.")],
+    },
+}
+
+PIPELINES: dict[str, BaseAgent] = {
+    "sequential (lead qualification)": lead_agent,
+    "parallel (system monitor)": monitor_agent,
+    "loop (LinkedIn post)": linkedin_agent,
+}
+
+# Posts are padded to a length count_characters accepts
+OUTPUT_TOKENS: dict[str, int] = {"InitialPostGenerator": 200, "PostRefinerAgent": 200}
+
+
+def install_models(
+    pipeline: str, args: argparse.Namespace, run: int
+) -> dict[str, MockLlm]:
+    """Give each LLM agent of a pipeline a fresh scripted model."""
+    models: dict[str, MockLlm] = {
+        agent_name: MockLlm(
+            responses=responses,
+            latency=args.latency,
+            latency_distribution=args.distribution,
+            latency_spread=args.spread,
+            error_rate=args.error_rate,
+            fail_first=args.fail_first if i == 0 else 0,
+            output_tokens=OUTPUT_TOKENS.get(agent_name),
+            seed=args.seed + run * 100 + i,
+        )
+        for i, (agent_name, responses) in enumerate(SCRIPTS[pipeline].items())
+    }
+    install_mock_llm(PIPELINES[pipeline], by_agent=models)
+    return models
+
+
+async def run_pipeline(pipeline: str, args: argparse.Namespace) -> dict[str, Any]:
+    """Run a pipeline args.runs times and measure each run."""
+    session_service = InMemorySessionService()
+    runner = Runner(
+        app_name=APP_NAME, agent=PIPELINES[pipeline], session_service=session_service
+    )
+    resilient_runner = ResilientRunner(runner, base_delay=0.01, max_delay=0.1)
+    run_agent: Callable[..., Any] = (
+        resilient_runner.run_async
+        if args.error_rate or args.fail_first
+        else runner.run_async
+    )
+
+    seconds: list[float] = []
+    calls: int = 0
+    failed: int = 0
+    for run in range(args.runs):
+        models = install_models(pipeline, args, run)
+        # The scorer caches its answers; start every run cold
+        scorer.llm_cache.clear()
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+        message = types.Content(
+            role="user",
+            parts=[types.Part(text="Jane Doe, CTO at Acme, budget approved, Q3")],
+        )
+        start: float = time.perf_counter()
+        try:
+            async for _ in run_agent(
+                user_id=USER_ID, session_id=session.id, new_message=message
+            ):
+                pass
+        except Exception:
+            failed += 1
+        seconds.append(time.perf_counter() - start)
+        calls += sum(model.call_count for model in models.values())
+
+    return {
+        "mean_ms": statistics.mean(seconds) * 1000,
+        "max_ms": max(seconds) * 1000,
+        "calls": calls / args.runs,
+        "failed": failed,
+        "retries": resilient_runner.metrics.retries,
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    """Run every pipeline."""
+    print(
+        f"Runs: {args.runs}, model latency: {args.latency * 1000:.1f} ms "
+        f"({args.distribution}), error rate: {args.error_rate:.0%}, "
+        f"failing first calls: {args.fail_first}"
+    )
+    print(
+        f"{'pipeline':<34} {'mean ms':>9} {'max ms':>9} {'calls/run':>10} "
+        f"{'failed':>7} {'retries':>8}"
+    )
+    for pipeline in PIPELINES:
+        result = await run_pipeline(pipeline, args)
+        print(
+            f"{pipeline:<34} {result['mean_ms']:>9.1f} {result['max_ms']:>9.1f} "
+            f"{result['calls']:>10.1f} {result['failed']:>7} {result['retries']:>8}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock model pipeline benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per pipeline")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Model latency in seconds"
+    )
+    parser.add_argument(
+        "--distribution",
+        default="fixed",
+        choices=["fixed", "uniform", "normal", "lognormal", "exponential"],
+        help="Model latency distribution",
+    )
+    parser.add_argument(
+        "--spread", type=float, default=0.0, help="Latency spread (see MockLlm)"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of calls failing with 503"
+    )
+    parser.add_argument(
+        "--fail-first",
+        type=int,
+        default=0,
+        help="Failing first calls of each pipeline's first agent, per run",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,13 @@ import asyncio
 import uuid
 
 from dotenv import load_dotenv
-from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.sessions.session import Session
 from google.genai import types
 
 # from root_agent.agent import question_answer_agent
 from question_answer_agent.agent import root_agent
+from utils.runner_pool import runner_pool
 
 # Load environment variables from .env file
 load_dotenv()
@@ -55,7 +55,8 @@ async def create_session() -> str:
 async def run_agent(session_id: str, input_text: str) -> None:
     """Run the agent with the given input text."""
 
-    runner = Runner(
+    # Reuse one runner for every turn instead of creating one per question
+    runner = runner_pool.get(
         app_name=APP_NAME,
         agent=root_agent,
         session_service=memory_session_service,
@@ -63,7 +64,8 @@ async def run_agent(session_id: str, input_text: str) -> None:
 
     new_message = types.Content(role="user", parts=[types.Part(text=input_text)])
 
-    for event in runner.run(
+    # run_async keeps the model call on this event loop instead of blocking it
+    async for event in runner.run_async(
         user_id=USER_ID,
         session_id=session_id,
         new_message=new_message,
@@ -119,6 +121,9 @@ async def main() -> None:
         # Log session state
         await log_session_state(session_id=session_id)
 
+    # Close the pooled runners
+    await runner_pool.close()
+
 
 # Run the async main function
 if __name__ == "__main__":
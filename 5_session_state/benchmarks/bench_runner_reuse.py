@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark for runner reuse in the session state example.
+
+Runs the same conversation three ways against a mock model, so only the
+per-turn framework overhead is measured:
+
+- new runner + run: a Runner per question driven by the synchronous
+  runner.run generator (the old run_agent)
+- new runner + run_async: a Runner per question on the async path
+- pooled runner + run_async: one Runner from the runner pool for every turn
+
+Reports the mean time per turn and the longest stall of the event loop while
+the turns ran. The model waits --latency seconds per call, which the
+synchronous path spends blocking the loop; since it never yields, its stall
+spans all of its turns.
+
+Usage:
+    python benchmarks/bench_runner_reuse.py [--turns 200] [--latency 0.01]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+# Add the repository root to the path for the shared utils package
+sys.path.append(str(object=Path(__file__).parent.parent.parent))
+
+from utils.mock_llm import MockLlm  # noqa: E402
+from utils.runner_pool import RunnerPool  # noqa: E402
+
+APP_NAME: str = "John Bot"
+USER_ID: str = "john_doe"
+
+TurnFunction = Callable[[InMemorySessionService, Agent, str, str], Awaitable[None]]
+
+
+async def turn_new_runner_sync(
+    session_service: InMemorySessionService, agent: Agent, session_id: str, text: str
+) -> None:
+    """Create a runner and drive the synchronous run generator."""
+    runner = Runner(app_name=APP_NAME, agent=agent, session_service=session_service)
+    message = types.Content(role="user", parts=[types.Part(text=text)])
+    for _ in runner.run(user_id=USER_ID, session_id=session_id, new_message=message):
+        pass
+
+
+async def turn_new_runner_async(
+    session_service: InMemorySessionService, agent: Agent, session_id: str, text: str
+) -> None:
+    """Create a runner and drive run_async."""
+    runner = Runner(app_name=APP_NAME, agent=agent, session_service=session_service)
+    message = types.Content(role="user", parts=[types.Part(text=text)])
+    async for _ in runner.run_async(
+        user_id=USER_ID, session_id=session_id, new_message=message
+    ):
+        pass
+
+
+def pooled_turn(pool: RunnerPool) -> TurnFunction:
+    """Create a turn function that takes its runner from `pool`."""
+
+    async def turn_pooled_runner_async(
+        session_service: InMemorySessionService,
+        agent: Agent,
+        session_id: str,
+        text: str,
+    ) -> None:
+        runner = pool.get(APP_NAME, agent, session_service)
+        message = types.Content(role="user", parts=[types.Part(text=text)])
+        async for _ in runner.run_async(
+            user_id=USER_ID, session_id=session_id, new_message=message
+        ):
+            pass
+
+    return turn_pooled_runner_async
+
+
+async def measure(
+    turn: TurnFunction, turns: int, latency: float
+) -> tuple[float, float]:
+    """Run `turns` turns in one session.
+
+    Returns:
+        Mean milliseconds per turn and the longest event loop stall in milliseconds
+    """
+    session_service = InMemorySessionService()
+    agent = Agent(
+        name="question_answer_agent",
+        model=MockLlm(latency=latency),
+        description="Question answer agent",
+        instruction="Answer the user's questions.",
+    )
+    session = await session_service.create_session(
+        app_name=APP_NAME, user_id=USER_ID, state={"user_name": "John Doe"}
+    )
+
+    # A ticker that wakes every millisecond measures how long the loop stalls
+    tick: float = 0.001
+    stall: list[float] = [0.0]
+    running: bool = True
+
+    async def ticker() -> None:
+        last: float = time.perf_counter()
+        while running:
+            await asyncio.sleep(tick)
+            now: float = time.perf_counter()
+            stall[0] = max(stall[0], now - last - tick)
+            last = now
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start: float = time.perf_counter()
+    for i in range(turns):
+        await turn(session_service, agent, session.id, f"question {i}")
+    elapsed: float = time.perf_counter() - start
+    running = False
+    await ticker_task
+    return elapsed / turns * 1000, stall[0] * 1000
+
+
+async def run_benchmark(turns: int, latency: float) -> None:
+    """Measure each way of running a turn."""
+    pool = RunnerPool()
+    cases: list[tuple[str, TurnFunction]] = [
+        ("new runner + run", turn_new_runner_sync),
+        ("new runner + run_async", turn_new_runner_async),
+        ("pooled runner + run_async", pooled_turn(pool)),
+    ]
+    print(f"Turns: {turns}, model latency: {latency * 1000:.1f} ms")
+    print(f"{'mode':<28} {'ms/turn':>9} {'overhead ms':>12} {'max loop stall ms':>18}")
+    for name, turn in cases:
+        per_turn, stall = await measure(turn, turns, latency)
+        overhead: float = per_turn - latency * 1000
+        print(f"{name:<28} {per_turn:>9.3f} {overhead:>12.3f} {stall:>18.1f}")
+    print(f"Pooled runners created: {pool.created}, reused: {pool.reused}")
+    await pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Runner reuse benchmark")
+    parser.add_argument("--turns", type=int, default=200, help="Turns per mode")
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="Mock model latency in seconds"
+    )
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(turns=args.turns, latency=args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the runner pool.
+This script tests that runners are created once per app and agent and reused across turns.
+"""
+
+import asyncio
+
+from google.adk.agents import Agent
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from utils.mock_llm import MockLlm
+from utils.runner_pool import RunnerPool
+
+APP_NAME: str = "John Bot"
+USER_ID: str = "john_doe"
+
+
+def _create_agent(name: str) -> Agent:
+    """Create an agent that echoes the user through MockLlm."""
+    return Agent(
+        name=name,
+        model=MockLlm(),
+        description="Echoes the user",
+        instruction="Repeat what the user says.",
+    )
+
+
+def test_runner_is_reused_across_turns() -> None:
+    """Every turn of every session gets the same runner and keeps its state."""
+
+    async def run() -> None:
+        pool = RunnerPool()
+        session_service = InMemorySessionService()
+        agent = _create_agent("echo_agent")
+        sessions = [
+            await session_service.create_session(
+                app_name=APP_NAME, user_id=USER_ID, state={"user_name": "John Doe"}
+            )
+            for _ in range(2)
+        ]
+
+        runners = set()
+        for turn in range(3):
+            for session in sessions:
+                runner = pool.get(APP_NAME, agent, session_service)
+                runners.add(id(runner))
+                message = types.Content(
+                    role="user", parts=[types.Part(text=f"turn {turn}")]
+                )
+                responses = [
+                    event.content.parts[0].text
+                    async for event in runner.run_async(
+                        user_id=USER_ID, session_id=session.id, new_message=message
+                    )
+                    if event.is_final_response()
+                ]
+                assert responses == [f"echo: turn {turn}"]
+
+        assert len(runners) == 1
+        assert (pool.created, pool.reused) == (1, 5)
+
+        session = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=sessions[0].id
+        )
+        assert len(session.events) == 6
+        assert session.state["user_name"] == "John Doe"
+
+        await pool.close()
+        assert len(pool) == 0
+
+    asyncio.run(run())
+
+
+def test_runners_are_separate_per_app_and_agent() -> None:
+    """Different apps, agents and session services get their own runners."""
+    pool = RunnerPool()
+    session_service = InMemorySessionService()
+    agent = _create_agent("echo_agent")
+    other_agent = _create_agent("other_agent")
+
+    runner = pool.get(APP_NAME, agent, session_service)
+    assert pool.get(APP_NAME, agent, session_service) is runner
+    assert pool.get("Other Bot", agent, session_service) is not runner
+    assert pool.get(APP_NAME, other_agent, session_service) is not runner
+    assert pool.get(APP_NAME, agent, InMemorySessionService()) is not runner
+    assert len(pool) == 4
+
+
+if __name__ == "__main__":
+    test_runner_is_reused_across_turns()
+    test_runners_are_separate_per_app_and_agent()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark for session I/O under concurrent sessions.
+
+Runs 1, 16 and 64 concurrent sessions that each do a number of turns (one
+get_session and two append_event calls, like a Runner turn) through the
+synchronous DatabaseSessionService and through AsyncDatabaseSessionService.
+For each run it reports turns per second and the worst event loop stall, which
+shows how long the loop was blocked by session I/O.
+
+Without --db-url a temporary SQLite database stands in for PostgreSQL; pass a
+postgresql:// URL to benchmark a real server with the pool settings below.
+
+Usage:
+    python benchmarks/bench_session_concurrency.py [--db-url postgresql://...]
+        [--turns 20] [--pool-size 5] [--max-overflow 10]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService, DatabaseSessionService
+
+# Add the repository root to the path for the shared utils package
+sys.path.append(str(object=Path(__file__).parent.parent.parent))
+
+from utils.async_session_service import AsyncDatabaseSessionService  # noqa: E402
+
+APP_NAME: str = "Persistent Agent"
+CONCURRENCY: tuple[int, ...] = (1, 16, 64)
+
+
+async def measure_stall(stop: asyncio.Event, interval: float = 0.001) -> float:
+    """Return the longest delay of a periodic wake-up until stop is set."""
+    worst: float = 0.0
+    while not stop.is_set():
+        start: float = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run_sessions(
+    session_service: BaseSessionService, sessions: int, turns: int
+) -> tuple[float, float]:
+    """Run `turns` turns in each of `sessions` concurrent sessions.
+
+    Returns:
+        Turns per second and the worst event loop stall in milliseconds
+    """
+    created = [
+        await session_service.create_session(
+            app_name=APP_NAME, user_id=f"user_{i}", state={"reminders": []}
+        )
+        for i in range(sessions)
+    ]
+
+    async def converse(session_id: str, user_id: str) -> None:
+        for turn in range(turns):
+            session = await session_service.get_session(
+                app_name=APP_NAME, user_id=user_id, session_id=session_id
+            )
+            for author in ("user", "persistent_agent"):
+                await session_service.append_event(
+                    session=session,
+                    event=Event(
+                        invocation_id=Event.new_id(),
+                        author=author,
+                        actions=EventActions(
+                            state_delta={"reminders": [f"reminder {turn}"]}
+                        ),
+                    ),
+                )
+
+    stop = asyncio.Event()
+    stall = asyncio.create_task(measure_stall(stop))
+    start: float = time.perf_counter()
+    await asyncio.gather(*(converse(s.id, s.user_id) for s in created))
+    elapsed: float = time.perf_counter() - start
+    stop.set()
+    return sessions * turns / elapsed, await stall * 1000
+
+
+async def run_benchmark(
+    db_url: str, turns: int, pool_size: int, max_overflow: int
+) -> None:
+    """Benchmark both session services at every concurrency level."""
+    engine_options: dict = {}
+    if db_url.startswith("postgresql"):
+        engine_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_pre_ping": True,
+        }
+
+    print(f"Database: {db_url.split('@')[-1]}, turns per session: {turns}")
+    print(f"{'driver':<8} {'sessions':>8} {'turns/s':>10} {'max stall ms':>13}")
+    for sessions in CONCURRENCY:
+        services: dict[str, BaseSessionService] = {
+            "sync": DatabaseSessionService(db_url=db_url, **engine_options),
+            "async": AsyncDatabaseSessionService(db_url=db_url, **engine_options),
+        }
+        for driver, session_service in services.items():
+            rate, stall_ms = await run_sessions(session_service, sessions, turns)
+            print(f"{driver:<8} {sessions:>8} {rate:>10,.0f} {stall_ms:>13.1f}")
+            if isinstance(session_service, AsyncDatabaseSessionService):
+                await session_service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent session I/O benchmark")
+    parser.add_argument("--db-url", help="Database URL (default: temporary SQLite)")
+    parser.add_argument("--turns", type=int, default=20, help="Turns per session")
+    parser.add_argument("--pool-size", type=int, default=5, help="PostgreSQL pool")
+    parser.add_argument("--max-overflow", type=int, default=10, help="Pool overflow")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_url: str = args.db_url or f"sqlite:///{directory}/sessions.db"
+        asyncio.run(
+            run_benchmark(
+                db_url=db_url,
+                turns=args.turns,
+                pool_size=args.pool_size,
+                max_overflow=args.max_overflow,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
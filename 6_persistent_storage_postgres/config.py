@@ -22,6 +22,10 @@ APP_NAME: str = config.get("Application", "AppName", fallback="Persistent Agent"
 DB_TYPE: str = config.get("Database", "DB_TYPE", fallback="sqlite")
 
 DB_URL: str
+# Keyword arguments for the SQLAlchemy engine (connection pool settings)
+DB_ENGINE_OPTIONS: dict = {}
+# Whether sessions are stored through an async driver (asyncpg)
+DB_ASYNC: bool = False
 
 if DB_TYPE.lower() == "postgresql":
     # It's good practice to get credentials from environment variables in production.
@@ -44,6 +48,56 @@ if DB_TYPE.lower() == "postgresql":
 
     # The ADK's DatabaseSessionService uses peewee, which uses psycopg2 for postgresql:// URLs
     DB_URL = f"postgresql://{pg_user}:{pg_password}@{pg_host}:{pg_port}/{pg_dbname}"
+
+    # Connection pool settings, passed to the SQLAlchemy engine
+    pg_pool_size = int(
+        os.environ.get(
+            "PG_POOL_SIZE", config.get("Database", "PG_POOL_SIZE", fallback="5")
+        )
+    )
+    pg_max_overflow = int(
+        os.environ.get(
+            "PG_MAX_OVERFLOW", config.get("Database", "PG_MAX_OVERFLOW", fallback="10")
+        )
+    )
+    pg_pool_pre_ping = os.environ.get(
+        "PG_POOL_PRE_PING", config.get("Database", "PG_POOL_PRE_PING", fallback="true")
+    ).lower() in ("1", "true", "yes", "on")
+    pg_pool_recycle = int(
+        os.environ.get(
+            "PG_POOL_RECYCLE",
+            config.get("Database", "PG_POOL_RECYCLE", fallback="1800"),
+        )
+    )
+    pg_pool_timeout = float(
+        os.environ.get(
+            "PG_POOL_TIMEOUT", config.get("Database", "PG_POOL_TIMEOUT", fallback="30")
+        )
+    )
+    pg_statement_timeout_ms = int(
+        os.environ.get(
+            "PG_STATEMENT_TIMEOUT_MS",
+            config.get("Database", "PG_STATEMENT_TIMEOUT_MS", fallback="30000"),
+        )
+    )
+    DB_ASYNC = os.environ.get(
+        "PG_ASYNC_DRIVER", config.get("Database", "PG_ASYNC_DRIVER", fallback="false")
+    ).lower() in ("1", "true", "yes", "on")
+
+    DB_ENGINE_OPTIONS = {
+        "pool_size": pg_pool_size,
+        "max_overflow": pg_max_overflow,
+        "pool_pre_ping": pg_pool_pre_ping,
+        "pool_recycle": pg_pool_recycle,
+        "pool_timeout": pg_pool_timeout,
+    }
+    if pg_statement_timeout_ms > 0:
+        # asyncpg takes server settings, psycopg2 takes libpq options
+        DB_ENGINE_OPTIONS["connect_args"] = (
+            {"server_settings": {"statement_timeout": str(pg_statement_timeout_ms)}}
+            if DB_ASYNC
+            else {"options": f"-c statement_timeout={pg_statement_timeout_ms}"}
+        )
 else:
     # Fallback to SQLite
     DB_NAME: str = config.get("Database", "DatabaseName", fallback="my_agent_data.db")
@@ -52,3 +106,36 @@ else:
 # --- User Configuration ---
 USER_ID: str = config.get("Database", "UserID", fallback="john_doe")
 USER_NAME: str = config.get("Database", "UserName", fallback="John Doe")
+
+# --- Session Cache Configuration ---
+SESSION_CACHE_SIZE: int = config.getint("SessionCache", "MaxSessions", fallback=256)
+SESSION_CACHE_TTL: float = config.getfloat("SessionCache", "TTLSeconds", fallback=300)
+
+# --- Write-Behind Configuration ---
+WRITE_BEHIND: bool = config.getboolean("WriteBehind", "Enabled", fallback=False)
+WRITE_BEHIND_BATCH_SIZE: int = config.getint("WriteBehind", "BatchSize", fallback=64)
+WRITE_BEHIND_FLUSH_INTERVAL: float = config.getfloat(
+    "WriteBehind", "FlushInterval", fallback=0.0
+)
+WRITE_BEHIND_MAX_PENDING: int = config.getint(
+    "WriteBehind", "MaxPending", fallback=1024
+)
+
+# --- Session Archive Configuration ---
+ARCHIVE: bool = config.getboolean("Archive", "Enabled", fallback=False)
+ARCHIVE_MAX_IDLE_DAYS: float = config.getfloat("Archive", "MaxIdleDays", fallback=30)
+ARCHIVE_INTERVAL: float = config.getfloat("Archive", "IntervalSeconds", fallback=3600)
+ARCHIVE_BATCH_SIZE: int = config.getint("Archive", "BatchSize", fallback=100)
+
+# --- Streaming Configuration ---
+STREAMING: bool = config.getboolean("Streaming", "Enabled", fallback=True)
+STREAMING_FLUSH_INTERVAL: float = config.getfloat(
+    "Streaming", "FlushInterval", fallback=0.05
+)
+STREAMING_MAX_CHARS: int = config.getint("Streaming", "MaxChars", fallback=256)
+
+# --- Server Configuration ---
+SERVER_HOST: str = config.get("Server", "Host", fallback="127.0.0.1")
+SERVER_PORT: int = config.getint("Server", "Port", fallback=8000)
+SERVER_MAX_CONCURRENCY: int = config.getint("Server", "MaxConcurrency", fallback=16)
+SERVER_MAX_WAITING: int = config.getint("Server", "MaxWaiting", fallback=256)
@@ -1,42 +1,102 @@
+import argparse
 import asyncio
 import uuid
 
 import config  # Configuration
 from dotenv import load_dotenv
+from google.adk.events import Event, EventActions
 from google.adk.runners import Runner
-from google.adk.sessions import DatabaseSessionService
-from google.adk.sessions.base_session_service import ListSessionsResponse
+from google.adk.sessions import BaseSessionService, DatabaseSessionService
 from google.adk.sessions.session import Session
-from persistent_agent.agent import persistent_agent
-from utility import call_agent_async
+from persistent_agent.agent import (
+    REMINDER_COUNT_KEY,
+    persistent_agent,
+    use_reminder_store,
+)
+from utility import StateTracker, call_agent_async
+from utils.async_session_service import AsyncDatabaseSessionService
+from utils.reminder_store import ReminderStore
+from utils.session_archive import ArchivingSessionService
+from utils.session_batching import BatchingDatabaseSessionService
+from utils.session_cache import CachedSessionService
+from utils.session_queries import ensure_session_indexes, get_latest_session
+from utils.streaming import BufferedSink, StreamingRenderer
 
 # Load environment variables from .env file
 load_dotenv()
 
 
 # ===== Initialize Persistent Session Service =====
-session_service = DatabaseSessionService(db_url=config.DB_URL)
+database_service: BaseSessionService
+if config.DB_ASYNC:
+    # The asyncpg driver keeps session I/O off the event loop
+    database_service = AsyncDatabaseSessionService(
+        db_url=config.DB_URL, **config.DB_ENGINE_OPTIONS
+    )
+elif config.WRITE_BEHIND:
+    # Write-behind mode commits the events of many turns in one transaction
+    database_service = BatchingDatabaseSessionService(
+        db_url=config.DB_URL,
+        batch_size=config.WRITE_BEHIND_BATCH_SIZE,
+        flush_interval=config.WRITE_BEHIND_FLUSH_INTERVAL,
+        max_pending=config.WRITE_BEHIND_MAX_PENDING,
+        **config.DB_ENGINE_OPTIONS,
+    )
+else:
+    database_service = DatabaseSessionService(
+        db_url=config.DB_URL, **config.DB_ENGINE_OPTIONS
+    )
+
+# Idle sessions move to a compressed archive table and come back on first read
+if config.ARCHIVE:
+    database_service = ArchivingSessionService(
+        inner=database_service,
+        max_idle_seconds=config.ARCHIVE_MAX_IDLE_DAYS * 24 * 3600,
+        interval_seconds=config.ARCHIVE_INTERVAL,
+        batch_size=config.ARCHIVE_BATCH_SIZE,
+    )
+
+# Hot sessions are served from memory, writes go through to the database
+session_service = CachedSessionService(
+    inner=database_service,
+    max_sessions=config.SESSION_CACHE_SIZE,
+    ttl_seconds=config.SESSION_CACHE_TTL,
+)
+
+# ===== Initialize Reminder Store =====
+# Reminders are rows of their own table, next to the sessions
+reminder_store = ReminderStore(db_url=config.DB_URL)
+use_reminder_store(reminder_store)
 
 
 # ===== Define Initial State =====
 initial_state: dict = {
     "user_name": config.USER_NAME,
-    "reminders": [],
 }
 
 
 # Main entrypoint
 async def main_async() -> None:
     # ===== Session Management =====
-    # Get existing sessions for the user
-    existing_sessions: ListSessionsResponse = await session_service.list_sessions(
+    # Make sure the most recent session can be looked up through the index
+    await ensure_session_indexes(session_service)
+    if isinstance(database_service, ArchivingSessionService):
+        database_service.start()
+
+    # Get the user's most recently updated session
+    latest_session: Session | None = await get_latest_session(
+        session_service,
         app_name=config.APP_NAME,
         user_id=config.USER_ID,
     )
-    # Check existing sessions
-    if existing_sessions and len(existing_sessions.sessions) > 0:
-        # Most recent session
-        SESSION_ID: str = existing_sessions.sessions[0].id
+    if latest_session is None and isinstance(database_service, ArchivingSessionService):
+        # The latest session may have been archived; reading it restores it
+        latest_session = await database_service.get_latest_archived_session(
+            app_name=config.APP_NAME, user_id=config.USER_ID
+        )
+    # Check existing session
+    if latest_session:
+        SESSION_ID: str = latest_session.id
         print(f"Continuing existing session: {SESSION_ID}")
     else:
         # Create new session with initial state
@@ -49,6 +109,40 @@ async def main_async() -> None:
         SESSION_ID: str = new_session.id
         print(f"Created new session: {SESSION_ID}")
 
+    # ===== State Tracking =====
+    # Fetch the session state once; the tracker follows it from the agent events
+    session: Session | None = await session_service.get_session(
+        app_name=config.APP_NAME,
+        user_id=config.USER_ID,
+        session_id=SESSION_ID,
+    )
+
+    # Move a reminder list kept in the state by earlier versions to the table
+    legacy_reminders: list | None = session.state.get("reminders") if session else None
+    state_delta: dict = {}
+    if session and legacy_reminders:
+        imported: int = reminder_store.import_reminders(
+            app_name=config.APP_NAME, user_id=config.USER_ID, texts=legacy_reminders
+        )
+        state_delta["reminders"] = []
+        print(f"Moved {imported} reminders to the reminders table")
+
+    # The count is shared by the user's sessions; seed it from the table
+    reminder_count: int = reminder_store.count(config.APP_NAME, config.USER_ID)
+    if session and session.state.get(REMINDER_COUNT_KEY) != reminder_count:
+        state_delta[REMINDER_COUNT_KEY] = reminder_count
+    if session and state_delta:
+        await session_service.append_event(
+            session=session,
+            event=Event(
+                invocation_id=Event.new_id(),
+                author="user",
+                actions=EventActions(state_delta=state_delta),
+            ),
+        )
+
+    state_tracker = StateTracker(state=session.state if session else initial_state)
+
     # ===== Agent Runner Setup =====
     runner = Runner(
         app_name=config.APP_NAME,
@@ -56,29 +150,102 @@ async def main_async() -> None:
         session_service=session_service,
     )
 
+    # Show responses as they stream in, and time them
+    renderer: StreamingRenderer | None = (
+        StreamingRenderer(
+            sink=BufferedSink(
+                flush_interval=config.STREAMING_FLUSH_INTERVAL,
+                max_chars=config.STREAMING_MAX_CHARS,
+            )
+        )
+        if config.STREAMING
+        else None
+    )
+
     # ===== Interactive Conversation Loop =====
     print(f"\nWelcome to {config.APP_NAME} Chat!")
     print("Your reminders will be remembered across conversations.")
     print("Type 'exit' or 'quit' to end the conversation.\n")
 
     # Start conversation
-    while True:
-        user_input: str = input("You: ")
-        if user_input.lower() in ["exit", "quit"]:
-            print(
-                "Ending conversation. Your remainders has been saved to the database."
+    try:
+        while True:
+            user_input: str = input("You: ")
+            if user_input.lower() in ["exit", "quit"]:
+                print(
+                    "Ending conversation. Your remainders has been saved to the database."
+                )
+                break
+
+            # process the user query
+            await call_agent_async(
+                runner=runner,
+                user_id=config.USER_ID,
+                session_id=SESSION_ID,
+                query=user_input,
+                state_tracker=state_tracker,
+                renderer=renderer,
             )
-            break
+    finally:
+        if renderer:
+            print(f"Response latency: {renderer.summary()}")
+        print(f"Session cache: {session_service.stats()}")
+        if isinstance(database_service, ArchivingSessionService):
+            print(f"Session archive: {database_service.stats()}")
 
-        # process the user query
-        await call_agent_async(
-            runner=runner,
-            user_id=config.USER_ID,
-            session_id=SESSION_ID,
-            query=user_input,
-        )
+        # Flush events still queued for the database before exiting
+        await session_service.close()
+        reminder_store.close()
+
+
+# Server entrypoint
+async def serve_async(host: str, port: int) -> None:
+    from utils.agent_server import AgentServer, serve
+
+    await ensure_session_indexes(session_service)
+    if isinstance(database_service, ArchivingSessionService):
+        database_service.start()
+
+    # One runner serves the sessions of every user
+    runner = Runner(
+        app_name=config.APP_NAME,
+        agent=persistent_agent,
+        session_service=session_service,
+    )
+    server = AgentServer(
+        runner,
+        session_service,
+        app_name=config.APP_NAME,
+        max_concurrency=config.SERVER_MAX_CONCURRENCY,
+        max_waiting=config.SERVER_MAX_WAITING,
+        initial_state=initial_state,
+    )
+    print(f"Serving {config.APP_NAME} on http://{host}:{port}")
+    try:
+        await serve(server, host, port)
+    finally:
+        print(f"\nServer metrics: {server.metrics.as_dict()}")
+        print(f"Session cache: {session_service.stats()}")
+
+        # Flush events still queued for the database before exiting
+        await session_service.close()
+        reminder_store.close()
 
 
 # Run the async main function
 if __name__ == "__main__":
-    asyncio.run(main=main_async())
+    parser = argparse.ArgumentParser(description=config.APP_NAME)
+    parser.add_argument(
+        "--serve", action="store_true", help="Serve sessions over HTTP and WebSocket"
+    )
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    args = parser.parse_args()
+
+    if args.serve:
+        try:
+            asyncio.run(main=serve_async(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        asyncio.run(main=main_async())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark for coalesced session event appends.
+
+Runs many concurrent sessions that each append a series of state-changing
+events, once through DatabaseSessionService (one transaction per event) and
+once through BatchingDatabaseSessionService (one transaction per batch), and
+reports events per second for both. Every run uses a fresh SQLite database.
+
+Usage:
+    python benchmarks/bench_batch_commits.py [--sessions 16] [--events 50]
+        [--batch-size 64] [--flush-interval 0.0]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService
+
+# Add the repository root to the path for the shared utils package
+sys.path.append(str(object=Path(__file__).parent.parent.parent))
+
+from utils.session_batching import BatchingDatabaseSessionService  # noqa: E402
+
+APP_NAME: str = "Persistent Agent"
+
+
+async def run_sessions(session_service, sessions: int, events: int) -> float:
+    """Append `events` events to each of `sessions` concurrent sessions.
+
+    Returns:
+        Events per second, including the final flush
+    """
+    created = [
+        await session_service.create_session(
+            app_name=APP_NAME, user_id=f"user_{i}", state={"reminders": []}
+        )
+        for i in range(sessions)
+    ]
+
+    async def converse(session) -> None:
+        for turn in range(events):
+            await session_service.append_event(
+                session=session,
+                event=Event(
+                    invocation_id=Event.new_id(),
+                    author="persistent_agent",
+                    actions=EventActions(
+                        state_delta={"reminders": [f"reminder {turn}"]}
+                    ),
+                ),
+            )
+            # Give the other sessions a turn, as a live runner would
+            await asyncio.sleep(0)
+
+    start: float = time.perf_counter()
+    await asyncio.gather(*(converse(session) for session in created))
+    if isinstance(session_service, BatchingDatabaseSessionService):
+        await session_service.close()
+    elapsed: float = time.perf_counter() - start
+    return sessions * events / elapsed
+
+
+async def run_benchmark(
+    sessions: int, events: int, batch_size: int, flush_interval: float
+) -> None:
+    """Compare per-event commits with coalesced commits."""
+    print(f"Sessions: {sessions}, events per session: {events}")
+    with tempfile.TemporaryDirectory() as directory:
+        direct = DatabaseSessionService(db_url=f"sqlite:///{directory}/direct.db")
+        direct_rate: float = await run_sessions(direct, sessions, events)
+        print(f"{'per-event commits':<20} {direct_rate:>10,.0f} events/s")
+
+        batching = BatchingDatabaseSessionService(
+            db_url=f"sqlite:///{directory}/batching.db",
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+        )
+        batching_rate: float = await run_sessions(batching, sessions, events)
+        print(
+            f"{'coalesced commits':<20} {batching_rate:>10,.0f} events/s "
+            f"({batching.batches} transactions, {batching_rate / direct_rate:.1f}x)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Coalesced append benchmark")
+    parser.add_argument("--sessions", type=int, default=16, help="Concurrent sessions")
+    parser.add_argument("--events", type=int, default=50, help="Events per session")
+    parser.add_argument("--batch-size", type=int, default=64, help="Events per commit")
+    parser.add_argument(
+        "--flush-interval", type=float, default=0.0, help="Extra wait per batch"
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        run_benchmark(
+            sessions=args.sessions,
+            events=args.events,
+            batch_size=args.batch_size,
+            flush_interval=args.flush_interval,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
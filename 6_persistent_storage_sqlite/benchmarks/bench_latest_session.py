@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark for finding a user's most recent session at startup.
+
+Stores a growing number of sessions for one user and times the old startup
+lookup (list_sessions, then take the newest) against get_latest_session,
+which reads a single row through the (app_name, user_id, update_time) index.
+
+Usage:
+    python benchmarks/bench_latest_session.py [--counts 100 1000 10000 50000]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions.database_session_service import StorageSession
+from sqlalchemy import insert
+
+# Add the repository root to the path for the shared utils package
+sys.path.append(str(object=Path(__file__).parent.parent.parent))
+
+from utils.session_queries import (  # noqa: E402
+    ensure_session_indexes,
+    get_latest_session,
+)
+
+APP_NAME: str = "Persistent Agent"
+USER_ID: str = "john_doe"
+
+
+def add_sessions(database: DatabaseSessionService, count: int) -> None:
+    """Insert `count` sessions for the user in one transaction."""
+    with database.db_engine.begin() as connection:
+        connection.execute(
+            insert(StorageSession),
+            [
+                {
+                    "app_name": APP_NAME,
+                    "user_id": USER_ID,
+                    "id": str(uuid.uuid4()),
+                    "state": {"user_name": "John Doe", "reminders": []},
+                }
+                for _ in range(count)
+            ],
+        )
+
+
+async def time_lookups(database: DatabaseSessionService, repeat: int = 5) -> tuple:
+    """Return the best time in ms of the list scan and of the indexed lookup."""
+    list_ms: list[float] = []
+    latest_ms: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        response = await database.list_sessions(app_name=APP_NAME, user_id=USER_ID)
+        max(response.sessions, key=lambda session: session.last_update_time)
+        list_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await get_latest_session(database, APP_NAME, USER_ID)
+        latest_ms.append((time.perf_counter() - start) * 1000)
+    return min(list_ms), min(latest_ms)
+
+
+async def run_benchmark(counts: list[int]) -> None:
+    """Time both lookups as the user's session count grows."""
+    with tempfile.TemporaryDirectory() as directory:
+        database = DatabaseSessionService(db_url=f"sqlite:///{directory}/sessions.db")
+        await ensure_session_indexes(database)
+
+        print(f"{'sessions':>9} {'list_sessions ms':>17} {'latest ms':>10}")
+        stored: int = 0
+        for count in sorted(counts):
+            add_sessions(database, count - stored)
+            stored = count
+            list_ms, latest_ms = await time_lookups(database)
+            print(f"{count:>9,} {list_ms:>17.2f} {latest_ms:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latest-session lookup benchmark")
+    parser.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000, 50000],
+        help="Session counts to measure at",
+    )
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(counts=args.counts))
+
+
+if __name__ == "__main__":
+    main()
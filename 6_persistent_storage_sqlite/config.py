@@ -22,3 +22,53 @@ DB_NAME: str = config.get("Database", "DatabaseName", fallback="my_agent_data.db
 DB_URL: str = f"sqlite:///./{DB_NAME}"
 USER_ID: str = config.get("Database", "UserID", fallback="john_doe")
 USER_NAME: str = config.get("Database", "UserName", fallback="John Doe")
+
+# --- Session Cache Configuration ---
+SESSION_CACHE_SIZE: int = config.getint("SessionCache", "MaxSessions", fallback=256)
+SESSION_CACHE_TTL: float = config.getfloat("SessionCache", "TTLSeconds", fallback=300)
+
+# --- Write-Behind Configuration ---
+WRITE_BEHIND: bool = config.getboolean("WriteBehind", "Enabled", fallback=False)
+WRITE_BEHIND_BATCH_SIZE: int = config.getint("WriteBehind", "BatchSize", fallback=64)
+WRITE_BEHIND_FLUSH_INTERVAL: float = config.getfloat(
+    "WriteBehind", "FlushInterval", fallback=0.0
+)
+WRITE_BEHIND_MAX_PENDING: int = config.getint(
+    "WriteBehind", "MaxPending", fallback=1024
+)
+
+# --- Session Archive Configuration ---
+ARCHIVE: bool = config.getboolean("Archive", "Enabled", fallback=False)
+ARCHIVE_MAX_IDLE_DAYS: float = config.getfloat("Archive", "MaxIdleDays", fallback=30)
+ARCHIVE_INTERVAL: float = config.getfloat("Archive", "IntervalSeconds", fallback=3600)
+ARCHIVE_BATCH_SIZE: int = config.getint("Archive", "BatchSize", fallback=100)
+
+# --- Streaming Configuration ---
+STREAMING: bool = config.getboolean("Streaming", "Enabled", fallback=True)
+STREAMING_FLUSH_INTERVAL: float = config.getfloat(
+    "Streaming", "FlushInterval", fallback=0.05
+)
+STREAMING_MAX_CHARS: int = config.getint("Streaming", "MaxChars", fallback=256)
+
+# --- Server Configuration ---
+SERVER_HOST: str = config.get("Server", "Host", fallback="127.0.0.1")
+SERVER_PORT: int = config.getint("Server", "Port", fallback=8000)
+SERVER_MAX_CONCURRENCY: int = config.getint("Server", "MaxConcurrency", fallback=16)
+SERVER_MAX_WAITING: int = config.getint("Server", "MaxWaiting", fallback=256)
+
+# --- SQLite Performance Profile ---
+SQLITE_PERFORMANCE_PROFILE: bool = config.getboolean(
+    "SQLite", "PerformanceProfile", fallback=False
+)
+# Pragmas run on every connection, empty when the profile is off
+SQLITE_PRAGMAS: dict = (
+    {
+        "journal_mode": config.get("SQLite", "JournalMode", fallback="WAL"),
+        "synchronous": config.get("SQLite", "Synchronous", fallback="NORMAL"),
+        "mmap_size": config.getint("SQLite", "MmapSize", fallback=268435456),
+        "cache_size": config.getint("SQLite", "CacheSize", fallback=-65536),
+        "busy_timeout": config.getint("SQLite", "BusyTimeout", fallback=5000),
+    }
+    if SQLITE_PERFORMANCE_PROFILE
+    else {}
+)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the normalized reminder store.
+This script tests reminder IDs and indexes, single-row edits and paginated listings against a temporary SQLite database.
+"""
+
+from pathlib import Path
+
+from sqlalchemy import event, insert, select
+
+from utils.reminder_store import ReminderStore, StorageReminder
+
+APP_NAME: str = "Persistent Agent"
+USER_ID: str = "john_doe"
+
+
+def test_edits_keep_ids_and_order(tmp_path: Path) -> None:
+    """Updates and deletes touch one reminder and keep the others in order."""
+    store = ReminderStore(db_url=f"sqlite:///{tmp_path / 'r.db'}")
+    added = [store.add(APP_NAME, USER_ID, f"reminder {i}") for i in range(1, 5)]
+    store.add(APP_NAME, "jane_doe", "someone else's reminder")
+    assert [reminder.index for reminder in added] == [1, 2, 3, 4]
+
+    assert store.update(APP_NAME, USER_ID, added[1].id, "buy milk")
+    assert store.delete(APP_NAME, USER_ID, added[0].id)
+    assert not store.delete(APP_NAME, "jane_doe", added[2].id)
+    assert not store.update(APP_NAME, USER_ID, added[0].id, "already deleted")
+
+    # The remaining reminders move up one index but keep their IDs
+    page = store.list_page(APP_NAME, USER_ID)
+    assert [(r.id, r.index, r.text) for r in page.reminders] == [
+        (added[1].id, 1, "buy milk"),
+        (added[2].id, 2, "reminder 3"),
+        (added[3].id, 3, "reminder 4"),
+    ]
+    assert store.add(APP_NAME, USER_ID, "reminder 5").index == 4
+    assert store.count(APP_NAME, USER_ID) == 4
+    # A count kept by the caller, e.g. in user state, is used as is
+    assert store.add(APP_NAME, USER_ID, "reminder 6", count=4).index == 5
+    store.close()
+
+
+def test_add_retries_when_its_position_was_taken(tmp_path: Path) -> None:
+    """An add whose position a concurrent add took first moves past it."""
+    store = ReminderStore(db_url=f"sqlite:///{tmp_path / 'r.db'}")
+    first = store.add(APP_NAME, USER_ID, "reminder 1", count=0)
+    raced: list[bool] = []
+
+    @event.listens_for(store.database_session_factory, "before_flush")
+    def concurrent_add(session, flush_context, instances) -> None:
+        # Another writer commits position 2 after the add read its last position
+        if not raced:
+            raced.append(True)
+            with store.db_engine.begin() as connection:
+                connection.execute(
+                    insert(StorageReminder).values(
+                        id="concurrent",
+                        app_name=APP_NAME,
+                        user_id=USER_ID,
+                        position=2,
+                        text="concurrent reminder",
+                    )
+                )
+
+    added = store.add(APP_NAME, USER_ID, "reminder 2", count=1)
+    with store.database_session_factory() as db:
+        rows = db.execute(
+            select(StorageReminder.id, StorageReminder.position).order_by(
+                StorageReminder.position
+            )
+        ).all()
+    assert rows == [(first.id, 1), ("concurrent", 2), (added.id, 3)]
+    store.close()
+
+
+def test_pages_cover_every_reminder_once(tmp_path: Path) -> None:
+    """Paging with next_page_token lists each reminder once, in order."""
+    store = ReminderStore(db_url=f"sqlite:///{tmp_path / 'r.db'}")
+    store.import_reminders(APP_NAME, USER_ID, [f"reminder {i}" for i in range(1, 8)])
+
+    pages = [store.list_page(APP_NAME, USER_ID, page_size=3)]
+    while pages[-1].next_page_token:
+        pages.append(
+            store.list_page(
+                APP_NAME, USER_ID, page_size=3, page_token=pages[-1].next_page_token
+            )
+        )
+
+    assert [len(page.reminders) for page in pages] == [3, 3, 1]
+    listed = [reminder for page in pages for reminder in page.reminders]
+    assert [reminder.index for reminder in listed] == list(range(1, 8))
+    assert [reminder.text for reminder in listed] == [
+        f"reminder {i}" for i in range(1, 8)
+    ]
+    store.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_edits_keep_ids_and_order,
+        test_add_retries_when_its_position_was_taken,
+        test_pages_cover_every_reminder_once,
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
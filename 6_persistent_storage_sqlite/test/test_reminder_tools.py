@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the reminder tools of the persistent agent.
+This script tests that each user's tool calls only read and write their own reminders, as in server mode.
+"""
+
+import asyncio
+from pathlib import Path
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools.tool_context import ToolContext
+
+from persistent_agent.agent import (
+    REMINDER_COUNT_KEY,
+    add_reminder,
+    delete_reminder,
+    persistent_agent,
+    update_reminder,
+    use_reminder_store,
+    view_reminders,
+)
+from utils.reminder_store import ReminderStore
+
+APP_NAME: str = "Persistent Agent"
+
+
+def test_users_only_see_their_own_reminders(tmp_path: Path) -> None:
+    """Tool calls in two users' sessions act on separate reminder lists."""
+
+    async def run() -> None:
+        store = ReminderStore(db_url=f"sqlite:///{tmp_path / 'r.db'}")
+        use_reminder_store(store)
+        session_service = InMemorySessionService()
+
+        contexts: dict[str, ToolContext] = {}
+        for user_id in ("john_doe", "jane_doe"):
+            session = await session_service.create_session(
+                app_name=APP_NAME, user_id=user_id
+            )
+            contexts[user_id] = ToolContext(
+                InvocationContext(
+                    session_service=session_service,
+                    invocation_id=f"e-{user_id}",
+                    agent=persistent_agent,
+                    session=session,
+                )
+            )
+        john, jane = contexts["john_doe"], contexts["jane_doe"]
+
+        add_reminder("buy milk", john)
+        added = add_reminder("call mom", john)
+        add_reminder("water the plants", jane)
+
+        assert [r["text"] for r in view_reminders(john)["reminders"]] == [
+            "buy milk",
+            "call mom",
+        ]
+        assert [r["text"] for r in view_reminders(jane)["reminders"]] == [
+            "water the plants"
+        ]
+        assert john.state[REMINDER_COUNT_KEY] == 2
+        assert jane.state[REMINDER_COUNT_KEY] == 1
+
+        # Reminder IDs of another user are not found
+        assert update_reminder(added["id"], "hacked", jane)["status"] == "error"
+        assert delete_reminder(added["id"], jane)["status"] == "error"
+        assert store.list_page(APP_NAME, "john_doe").reminders[1].text == "call mom"
+        store.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_users_only_see_their_own_reminders(Path(directory))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for the idle session archive.
+This script tests archival and transparent restores against a temporary SQLite database.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions.database_session_service import StorageEvent, StorageSession
+from sqlalchemy import func, select, update
+
+from utils.session_archive import ARCHIVE_CODEC, ArchivingSessionService
+from utils.session_cache import CachedSessionService
+
+APP_NAME: str = "Persistent Agent"
+USER_ID: str = "john_doe"
+
+
+def _state_event(state_delta: dict) -> Event:
+    """Build an event that only carries a state delta."""
+    return Event(
+        invocation_id=Event.new_id(),
+        author="user",
+        actions=EventActions(state_delta=state_delta),
+    )
+
+
+def _make_idle(database: DatabaseSessionService, session_id: str) -> None:
+    """Move a session's update time two days into the past."""
+    with database.database_session_factory() as db:
+        db.execute(
+            update(StorageSession)
+            .where(StorageSession.id == session_id)
+            .values(update_time=datetime.now() - timedelta(days=2))
+        )
+        db.commit()
+
+
+def test_idle_sessions_are_archived_and_restored(tmp_path: Path) -> None:
+    """Only idle sessions are archived, and get_session restores them intact."""
+
+    async def run() -> None:
+        database = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'a.db'}")
+        archive = ArchivingSessionService(inner=database, max_idle_seconds=24 * 3600)
+        idle = await archive.create_session(
+            app_name=APP_NAME, user_id=USER_ID, state={"user_name": "John Doe"}
+        )
+        active = await archive.create_session(app_name=APP_NAME, user_id=USER_ID)
+        for turn in range(3):
+            await archive.append_event(
+                session=idle, event=_state_event({"reminder_count": turn})
+            )
+        _make_idle(database, idle.id)
+        before = await database.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=idle.id
+        )
+
+        report = await archive.archive_idle_sessions()
+        assert (report.sessions, report.events) == (1, 3)
+        assert report.reclaimed_bytes > 0
+        with database.database_session_factory() as db:
+            assert db.scalar(select(func.count()).select_from(StorageEvent)) == 0
+            assert db.scalars(select(StorageSession.id)).all() == [active.id]
+        latest = await archive.get_latest_archived_session(APP_NAME, USER_ID)
+        assert latest.id == idle.id
+
+        restored = await archive.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=idle.id
+        )
+        assert (
+            restored.state
+            == before.state
+            == {
+                "user_name": "John Doe",
+                "reminder_count": 2,
+            }
+        )
+        assert [e.id for e in restored.events] == [e.id for e in before.events]
+        assert restored.last_update_time > before.last_update_time
+        assert archive.stats()["rehydrated"] == 1
+        assert (await archive.archive_idle_sessions()).sessions == 0
+
+    asyncio.run(run())
+
+
+def test_append_to_cached_copy_restores_session(tmp_path: Path) -> None:
+    """A cached session keeps working after the archive job moved it."""
+
+    async def run() -> None:
+        database = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'a.db'}")
+        archive = ArchivingSessionService(inner=database, max_idle_seconds=24 * 3600)
+        session_service = CachedSessionService(inner=archive, ttl_seconds=None)
+        created = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+        _make_idle(database, created.id)
+        session_service.clear()
+        session = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=created.id
+        )
+        assert (await archive.archive_idle_sessions()).sessions == 1
+
+        await session_service.append_event(
+            session=session, event=_state_event({"user_name": "Jane"})
+        )
+        stored = await database.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=created.id
+        )
+        assert stored.state == {"user_name": "Jane"}
+        assert len(stored.events) == 1
+        await session_service.close()
+
+    asyncio.run(run())
+
+
+def test_failed_or_updated_sessions_are_skipped(tmp_path: Path) -> None:
+    """A session that fails to archive or was just updated doesn't stop the run."""
+
+    async def run() -> None:
+        database = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'a.db'}")
+        archive = ArchivingSessionService(
+            inner=database, max_idle_seconds=24 * 3600, batch_size=2
+        )
+        sessions = [
+            await archive.create_session(app_name=APP_NAME, user_id=USER_ID)
+            for _ in range(4)
+        ]
+        for session in sessions:
+            _make_idle(database, session.id)
+        broken, updated = sessions[0].id, sessions[1].id
+
+        archive_session = archive._archive_session
+
+        def flaky_archive_session(db, key, cutoff):
+            if key[2] == broken:
+                raise ValueError("corrupt event")
+            if key[2] == updated:
+                # A new event arrives after the session was found idle
+                db.execute(
+                    update(StorageSession)
+                    .where(StorageSession.id == updated)
+                    .values(update_time=func.now())
+                )
+                db.commit()
+            return archive_session(db, key, cutoff)
+
+        archive._archive_session = flaky_archive_session
+        assert (await archive.archive_idle_sessions()).sessions == 0
+        # The broken session no longer heads the batch
+        assert (await archive.archive_idle_sessions()).sessions == 2
+        assert archive.stats()["archived_sessions"] == 2
+        assert archive.stats()["codec"] == ARCHIVE_CODEC
+        with database.database_session_factory() as db:
+            assert set(db.scalars(select(StorageSession.id))) == {broken, updated}
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_idle_sessions_are_archived_and_restored,
+        test_append_to_cached_copy_restores_session,
+        test_failed_or_updated_sessions_are_skipped,
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
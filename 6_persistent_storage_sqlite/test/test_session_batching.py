@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Test script for the batching session service.
+This script tests coalesced appends against a temporary SQLite database without requiring API keys.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions.database_session_service import StorageSession
+from sqlalchemy import event
+
+from utils.session_batching import BatchingDatabaseSessionService
+
+APP_NAME: str = "Persistent Agent"
+USER_ID: str = "john_doe"
+
+
+def _state_event(state_delta: dict) -> Event:
+    """Build an event that only carries a state delta."""
+    return Event(
+        invocation_id=Event.new_id(),
+        author="user",
+        actions=EventActions(state_delta=state_delta),
+    )
+
+
+def test_concurrent_appends_are_coalesced(tmp_path: Path) -> None:
+    """Appends from many sessions are committed in a few transactions."""
+
+    async def run() -> None:
+        db_url: str = f"sqlite:///{tmp_path / 'batching.db'}"
+        session_service = BatchingDatabaseSessionService(
+            db_url=db_url, batch_size=4, flush_interval=0.5
+        )
+        sessions = [
+            await session_service.create_session(
+                app_name=APP_NAME, user_id=USER_ID, state={"count": 0}
+            )
+            for _ in range(4)
+        ]
+
+        async def converse(session) -> None:
+            for turn in range(1, 6):
+                await session_service.append_event(
+                    session=session, event=_state_event({"count": turn})
+                )
+
+        await asyncio.gather(*(converse(session) for session in sessions))
+        assert all(len(session.events) == 5 for session in sessions)
+        await session_service.close()
+
+        # Each append waits for its commit, so every turn of all four
+        # sessions is one transaction
+        assert session_service.events_written == 20
+        assert session_service.batches == 5
+
+        # Read the data back through a plain service
+        database = DatabaseSessionService(db_url=db_url)
+        for session in sessions:
+            stored = await database.get_session(
+                app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+            )
+            assert stored.state == {"count": 5}
+            assert [e.id for e in stored.events] == [e.id for e in session.events]
+
+    asyncio.run(run())
+
+
+def test_reads_flush_pending_events(tmp_path: Path) -> None:
+    """A session with queued events is flushed before it's read."""
+
+    async def run() -> None:
+        session_service = BatchingDatabaseSessionService(
+            db_url=f"sqlite:///{tmp_path / 'batching.db'}",
+            flush_interval=60,
+            max_pending=4,
+        )
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+        append = asyncio.create_task(
+            session_service.append_event(
+                session=session, event=_state_event({"user:user_name": "Jane Doe"})
+            )
+        )
+        await asyncio.sleep(0)
+
+        stored = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+        )
+        assert stored.state == {"user:user_name": "Jane Doe"}
+        assert len(stored.events) == 1
+        await append
+        assert session.state == {"user:user_name": "Jane Doe"}
+        await session_service.close()
+
+    asyncio.run(run())
+
+
+def test_missing_session_fails_only_its_appends(tmp_path: Path) -> None:
+    """An event of a deleted session fails alone; the rest of its batch commits."""
+
+    async def run() -> None:
+        session_service = BatchingDatabaseSessionService(
+            db_url=f"sqlite:///{tmp_path / 'batching.db'}",
+            batch_size=2,
+            flush_interval=0.05,
+        )
+        kept = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+        deleted = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+        await session_service.delete_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=deleted.id
+        )
+
+        results = await asyncio.gather(
+            session_service.append_event(
+                session=kept, event=_state_event({"count": 1})
+            ),
+            session_service.append_event(
+                session=deleted, event=_state_event({"count": 1})
+            ),
+            return_exceptions=True,
+        )
+        assert not isinstance(results[0], Exception)
+        assert isinstance(results[1], ValueError)
+        assert kept.state == {"count": 1} and deleted.events == []
+        assert session_service.batches == 1
+        assert (session_service.events_written, session_service.rejected_events) == (
+            1,
+            1,
+        )
+        assert session_service.failed_batches == 0
+        await session_service.close()
+
+    asyncio.run(run())
+
+
+def test_stale_session_is_rejected(tmp_path: Path) -> None:
+    """An append to a session updated elsewhere since it was read fails."""
+
+    async def run() -> None:
+        db_url: str = f"sqlite:///{tmp_path / 'batching.db'}"
+        session_service = BatchingDatabaseSessionService(
+            db_url=db_url, batch_size=1, flush_interval=0
+        )
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+
+        # SQLite keeps whole seconds, so move every update a second further
+        clock: list[datetime] = [datetime.now()]
+
+        def tick(mapper, connection, target) -> None:
+            clock[0] += timedelta(seconds=1)
+            target.update_time = clock[0]
+
+        event.listen(StorageSession, "before_update", tick)
+        try:
+            # Appends of one session queued together don't make each other stale
+            await asyncio.gather(
+                *(
+                    session_service.append_event(
+                        session=session, event=_state_event({"count": count})
+                    )
+                    for count in (1, 2, 3)
+                )
+            )
+        finally:
+            event.remove(StorageSession, "before_update", tick)
+        assert session_service.batches == 3
+        assert session.last_update_time == clock[0].timestamp()
+
+        # A copy read before another update is stale
+        stale = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+        )
+        stale.last_update_time -= 10
+        try:
+            await session_service.append_event(
+                session=stale, event=_state_event({"count": 4})
+            )
+        except ValueError as e:
+            assert "stale session" in str(e)
+        else:
+            raise AssertionError("Appending to a stale session didn't fail")
+        assert stale.state == {"count": 3}
+        await session_service.close()
+
+    asyncio.run(run())
+
+
+def test_queued_events_survive_a_stopped_writer(tmp_path: Path) -> None:
+    """Events queued for a writer that stopped are committed by the next one."""
+
+    async def run() -> None:
+        session_service = BatchingDatabaseSessionService(
+            db_url=f"sqlite:///{tmp_path / 'batching.db'}", flush_interval=0
+        )
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+        appends = [
+            asyncio.create_task(
+                session_service.append_event(
+                    session=session, event=_state_event({"count": count})
+                )
+            )
+            for count in (1, 2)
+        ]
+        # Both events are queued; stop the writer before it takes them
+        await asyncio.sleep(0)
+        session_service._writer.cancel()
+        await asyncio.sleep(0)
+        assert session_service._writer.done()
+        assert session_service._queue.qsize() == 2
+
+        await session_service.flush()
+        await asyncio.gather(*appends)
+        assert session_service.events_written == 2
+        stored = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+        )
+        assert stored.state == {"count": 2}
+        await session_service.close()
+
+    asyncio.run(run())
+
+
+def test_writer_only_sees_a_copy_of_the_event(tmp_path: Path) -> None:
+    """Changes to an event after it's queued don't reach the database."""
+
+    async def run() -> None:
+        session_service = BatchingDatabaseSessionService(
+            db_url=f"sqlite:///{tmp_path / 'batching.db'}", flush_interval=0.05
+        )
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+        event = _state_event({"reminders": ["call mom"]})
+        append = asyncio.create_task(
+            session_service.append_event(session=session, event=event)
+        )
+        await asyncio.sleep(0)
+        event.actions.state_delta["reminders"].append("buy milk")
+        await append
+
+        stored = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+        )
+        assert stored.state == {"reminders": ["call mom"]}
+        await session_service.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_concurrent_appends_are_coalesced,
+        test_reads_flush_pending_events,
+        test_missing_session_fails_only_its_appends,
+        test_stale_session_is_rejected,
+        test_queued_events_survive_a_stopped_writer,
+        test_writer_only_sees_a_copy_of_the_event,
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test script for the write-through session cache.
+This script tests the cache against a temporary SQLite database without requiring API keys.
+"""
+
+import asyncio
+from pathlib import Path
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+from utils.session_cache import CachedSessionService
+
+APP_NAME: str = "Persistent Agent"
+USER_ID: str = "john_doe"
+
+
+def _state_event(state_delta: dict) -> Event:
+    """Build an event that only carries a state delta."""
+    return Event(
+        invocation_id=Event.new_id(),
+        author="user",
+        actions=EventActions(state_delta=state_delta),
+    )
+
+
+def test_repeat_reads_are_served_from_cache(tmp_path: Path) -> None:
+    """Appends write through and later reads don't go to the database."""
+
+    async def run() -> None:
+        database = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'cache.db'}")
+        session_service = CachedSessionService(inner=database, ttl_seconds=None)
+        created = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID, state={"reminders": []}
+        )
+
+        for turn in range(3):
+            session = await session_service.get_session(
+                app_name=APP_NAME, user_id=USER_ID, session_id=created.id
+            )
+            await session_service.append_event(
+                session=session,
+                event=_state_event({"reminders": [f"reminder {turn}"]}),
+            )
+
+        cached = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=created.id
+        )
+        stored = await database.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=created.id
+        )
+        assert cached.state == stored.state == {"reminders": ["reminder 2"]}
+        assert [e.id for e in cached.events] == [e.id for e in stored.events]
+        assert session_service.stats()["hits"] == 4
+        assert session_service.stats()["misses"] == 0
+
+        # Filtered reads are served from a private copy of the cached session
+        recent = await session_service.get_session(
+            app_name=APP_NAME,
+            user_id=USER_ID,
+            session_id=created.id,
+            config=GetSessionConfig(num_recent_events=1),
+        )
+        assert [e.id for e in recent.events] == [stored.events[-1].id]
+        recent.state["reminders"].append("local change")
+        again = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=created.id
+        )
+        assert again.state == {"reminders": ["reminder 2"]}
+        recent.events.clear()
+        assert len(again.events) == len(stored.events)
+
+    asyncio.run(run())
+
+
+def test_stale_writer_and_shared_state_invalidate(tmp_path: Path) -> None:
+    """A writer with an older version or a user: change drops cached copies."""
+
+    async def run() -> None:
+        database = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'cache.db'}")
+        session_service = CachedSessionService(inner=database, ttl_seconds=None)
+        first = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+        second = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+
+        # A session object with a different version than the cached copy
+        writer = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=first.id
+        )
+        writer.last_update_time += 1
+        await session_service.append_event(
+            session=writer, event=_state_event({"user:user_name": "Jane Doe"})
+        )
+        assert session_service.stats()["invalidations"] == 2
+        assert session_service.stats()["size"] == 0
+
+        # Both sessions are reloaded and see the new user state
+        for session_id in (first.id, second.id):
+            session = await session_service.get_session(
+                app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+            )
+            assert session.state["user:user_name"] == "Jane Doe"
+        assert session_service.stats()["misses"] == 2
+
+    asyncio.run(run())
+
+
+def test_session_lists_are_cached(tmp_path: Path) -> None:
+    """Listed sessions follow creates, appends and deletes without a query."""
+
+    async def run() -> None:
+        database = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'cache.db'}")
+        session_service = CachedSessionService(inner=database, ttl_seconds=None)
+        first = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+        await session_service.list_sessions(app_name=APP_NAME, user_id=USER_ID)
+
+        queries: list[str] = []
+
+        async def list_sessions(**kwargs):
+            queries.append(kwargs["user_id"])
+            return await DatabaseSessionService.list_sessions(database, **kwargs)
+
+        database.list_sessions = list_sessions
+        second = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+        await session_service.append_event(
+            session=second, event=_state_event({"reminders": ["call mom"]})
+        )
+        await session_service.delete_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=first.id
+        )
+
+        listed = await session_service.list_sessions(app_name=APP_NAME, user_id=USER_ID)
+        stored = await DatabaseSessionService.list_sessions(
+            database, app_name=APP_NAME, user_id=USER_ID
+        )
+        assert queries == []
+        assert [(s.id, s.last_update_time) for s in listed.sessions] == [
+            (s.id, s.last_update_time) for s in stored.sessions
+        ]
+
+    asyncio.run(run())
+
+
+def test_ttl_and_capacity_bound_the_cache(tmp_path: Path) -> None:
+    """Expired entries are reloaded and the least recently used are evicted."""
+
+    async def run() -> None:
+        database = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'cache.db'}")
+        session_service = CachedSessionService(
+            inner=database, max_sessions=2, ttl_seconds=0.01
+        )
+        sessions = [
+            await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+            for _ in range(3)
+        ]
+        assert session_service.stats()["size"] == 2
+        assert session_service.stats()["evictions"] == 1
+
+        await asyncio.sleep(0.02)
+        await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=sessions[-1].id
+        )
+        assert session_service.stats()["misses"] == 1
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_repeat_reads_are_served_from_cache,
+        test_stale_writer_and_shared_state_invalidate,
+        test_session_lists_are_cached,
+        test_ttl_and_capacity_bound_the_cache,
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the indexed session queries.
+This script tests the latest-session lookup and paginated listings against a temporary SQLite database.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions.database_session_service import StorageSession
+from sqlalchemy import update
+
+from utils.session_cache import CachedSessionService
+from utils.session_queries import (
+    ensure_session_indexes,
+    get_latest_session,
+    list_sessions_page,
+)
+
+APP_NAME: str = "Persistent Agent"
+USER_ID: str = "john_doe"
+
+
+def test_latest_session_is_most_recently_updated(tmp_path: Path) -> None:
+    """The latest session is found by update time, not creation order."""
+
+    async def run() -> None:
+        database = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'q.db'}")
+        await ensure_session_indexes(database)
+        assert await get_latest_session(database, APP_NAME, USER_ID) is None
+
+        sessions = [
+            await database.create_session(app_name=APP_NAME, user_id=USER_ID)
+            for _ in range(3)
+        ]
+        await database.create_session(app_name=APP_NAME, user_id="jane_doe")
+
+        # Make the first session the most recently updated one
+        with database.database_session_factory() as db:
+            db.execute(
+                update(StorageSession)
+                .where(StorageSession.id == sessions[0].id)
+                .values(update_time=datetime.now() + timedelta(minutes=5))
+            )
+            db.commit()
+
+        latest = await get_latest_session(database, APP_NAME, USER_ID)
+        assert latest.id == sessions[0].id
+
+    asyncio.run(run())
+
+
+def test_pages_cover_every_session_once(tmp_path: Path) -> None:
+    """Keyset pages list all sessions, newest first, without repeats."""
+
+    async def run() -> None:
+        session_service = CachedSessionService(
+            inner=DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'q.db'}")
+        )
+        await ensure_session_indexes(session_service)
+        created = {
+            (
+                await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+            ).id
+            for _ in range(7)
+        }
+
+        pages: list = []
+        page_token = None
+        while True:
+            page = await list_sessions_page(
+                session_service, APP_NAME, USER_ID, page_size=3, page_token=page_token
+            )
+            pages.append(page)
+            page_token = page.next_page_token
+            if page_token is None:
+                break
+
+        assert [len(page.sessions) for page in pages] == [3, 3, 1]
+        listed = [session for page in pages for session in page.sessions]
+        assert {session.id for session in listed} == created
+        update_times = [session.last_update_time for session in listed]
+        assert update_times == sorted(update_times, reverse=True)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_latest_session_is_most_recently_updated,
+        test_pages_cover_every_session_once,
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite performance profile.
+This script tests that the profile's pragmas are set on every pooled connection of a temporary SQLite database.
+"""
+
+from pathlib import Path
+
+import pytest
+from google.adk.sessions import DatabaseSessionService
+from sqlalchemy import text
+
+from utils.sqlite_pragmas import PERFORMANCE_PRAGMAS, apply_sqlite_pragmas
+
+
+def test_profile_applies_to_every_connection(tmp_path: Path) -> None:
+    """Connections opened before and after the pragmas are applied all use them."""
+    database = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'p.db'}")
+    apply_sqlite_pragmas(database.db_engine, PERFORMANCE_PRAGMAS)
+
+    with database.db_engine.connect() as first, database.db_engine.connect() as second:
+        for connection in (first, second):
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            # synchronous=NORMAL is reported as 1
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert connection.execute(text("PRAGMA cache_size")).scalar() == -65536
+
+    with pytest.raises(ValueError):
+        apply_sqlite_pragmas(database.db_engine, {"journal_mode": "WAL; DROP"})
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_profile_applies_to_every_connection(Path(directory))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for streamed agent responses.
+This script tests incremental rendering and response timing with a mock model.
+"""
+
+import asyncio
+import contextlib
+import io
+
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from utility import call_agent_async
+from utils.mock_llm import MockLlm
+from utils.streaming import BufferedSink, StreamingRenderer, TurnTiming
+
+APP_NAME: str = "Persistent Agent"
+USER_ID: str = "john_doe"
+
+
+def test_buffered_sink_batches_writes() -> None:
+    """Text is written once the buffer is full or when flushed."""
+    stream = io.StringIO()
+    sink = BufferedSink(stream=stream, flush_interval=60.0, max_chars=10)
+    sink.write("abc")
+    sink.write("def")
+    assert stream.getvalue() == ""
+    sink.write("ghij")
+    assert stream.getvalue() == "abcdefghij"
+    sink.write("k")
+    sink.flush()
+    assert stream.getvalue() == "abcdefghijk"
+
+
+def test_buffered_sink_flushes_after_interval_without_writes() -> None:
+    """Buffered text is written once flush_interval passes, even with no more writes."""
+
+    async def run() -> None:
+        stream = io.StringIO()
+        sink = BufferedSink(stream=stream, flush_interval=0.05, max_chars=256)
+        sink.flush()
+        sink.write("abc")
+        assert stream.getvalue() == ""
+        await asyncio.sleep(0.1)
+        assert stream.getvalue() == "abc"
+        assert sink._timer is None
+
+    asyncio.run(run())
+
+
+def test_streamed_response_is_rendered_once_and_timed() -> None:
+    """Partial events are shown as they arrive and each turn is timed."""
+
+    async def run() -> None:
+        session_service = InMemorySessionService()
+        agent = Agent(
+            name="echo_agent",
+            model=MockLlm(latency=0.02, token_latency=0.01),
+            description="Echoes the user",
+            instruction="Repeat what the user says.",
+        )
+        runner = Runner(app_name=APP_NAME, agent=agent, session_service=session_service)
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID, state={"user_name": "John Doe"}
+        )
+
+        stream = io.StringIO()
+        renderer = StreamingRenderer(sink=BufferedSink(stream=stream))
+        for query in ("hello there", "again"):
+            response = await call_agent_async(
+                runner=runner,
+                user_id=USER_ID,
+                session_id=session.id,
+                query=query,
+                renderer=renderer,
+            )
+            assert response == f"echo: {query}"
+
+        output = stream.getvalue()
+        assert output.count("echo: hello there") == 1
+        assert output.count("AGENT RESPONSE") == 2
+
+        assert len(renderer.timings) == 2
+        for timing in renderer.timings:
+            assert 0.02 <= timing.time_to_first_token < timing.time_to_final
+        assert renderer.summary()["turns"] == 2
+
+    asyncio.run(run())
+
+
+def test_turn_without_final_response_shows_no_final_time() -> None:
+    """A turn that ends before its final response doesn't report 0 ms."""
+    renderer = StreamingRenderer(sink=BufferedSink(stream=io.StringIO()))
+    renderer.timings.append(TurnTiming(time_to_first_token=0.25))
+    with contextlib.redirect_stdout(io.StringIO()) as stdout:
+        renderer.end_turn()
+    output: str = stdout.getvalue()
+    assert "First token after 250 ms, final response after n/a" in output
+    assert renderer.summary()["median_time_to_final_ms"] is None
+
+
+if __name__ == "__main__":
+    test_buffered_sink_batches_writes()
+    test_buffered_sink_flushes_after_interval_without_writes()
+    test_streamed_response_is_rendered_once_and_timed()
+    test_turn_without_final_response_shows_no_final_time()
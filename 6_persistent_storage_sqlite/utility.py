@@ -1,3 +1,9 @@
+import copy
+from typing import Any
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
+from google.adk.sessions import State
 from google.genai import types
 
 
@@ -28,37 +34,65 @@ class Colors:
     BG_WHITE = "\033[47m"
 
 
+class StateTracker:
+    """Keeps a local copy of the session state up to date during a conversation.
+
+    The tracker is seeded once with the session state and then applies the
+    state_delta of every event streamed from runner.run_async, so the state
+    can be displayed before and after each turn without fetching the session.
+    """
+
+    def __init__(self, state: dict[str, Any]) -> None:
+        """Initialize the tracker with the current session state.
+
+        Args:
+            state: The session state to start from
+        """
+        self.state: dict[str, Any] = copy.deepcopy(state)
+
+    def apply(self, event: Event) -> None:
+        """Apply the state delta of an event to the local state."""
+        if event.partial or not event.actions or not event.actions.state_delta:
+            return
+        for key, value in event.actions.state_delta.items():
+            if key.startswith(State.TEMP_PREFIX):
+                continue
+            self.state[key] = copy.deepcopy(value)
+
+
 async def display_state(
     session_service, app_name, user_id, session_id, label="Current State"
 ) -> None:
-    """Display the current state of the session in a formatted way."""
+    """Fetch the session and display its current state."""
     try:
         session = await session_service.get_session(
             app_name=app_name,
             user_id=user_id,
             session_id=session_id,
         )
+        print_state(state=session.state, label=label)
 
-        # Format the output with clear sections
-        print(f"\n{'-' * 10} {label} {'-' * 10}")  # Processing state
+    except Exception as e:
+        print(f"Error displaying session state: {e}")
 
-        # Handle user name
-        user_name = session.state.get("user_name", "Unknown")
-        print(f"👤 User: {user_name}")
 
-        # Handle reminders
-        reminders = session.state.get("reminders", [])
-        if reminders:
-            print("📋Reminders:")
-            for idx, reminder in enumerate(reminders, start=1):
-                print(f"  {idx}. {reminder}")
-        else:
-            print("📋 No reminders found.")
+def print_state(state, label="Current State") -> None:
+    """Display the state of the session in a formatted way."""
+    # Format the output with clear sections
+    print(f"\n{'-' * 10} {label} {'-' * 10}")  # Processing state
 
-        print("-" * (22 + len(label)))
+    # Handle user name
+    user_name = state.get("user_name", "Unknown")
+    print(f"👤 User: {user_name}")
 
-    except Exception as e:
-        print(f"Error displaying session state: {e}")
+    # Handle reminders, which are stored in their own table
+    reminder_count = state.get("user:reminder_count", 0)
+    if reminder_count:
+        print(f"📋 Reminders: {reminder_count}")
+    else:
+        print("📋 No reminders found.")
+
+    print("-" * (22 + len(label)))
 
 
 async def process_agent_response(event):
@@ -140,8 +174,18 @@ async def process_agent_response(event):
     return final_response
 
 
-async def call_agent_async(runner, user_id, session_id, query):
-    """Call the agent synchronously with the user's query."""
+async def call_agent_async(
+    runner, user_id, session_id, query, state_tracker=None, renderer=None
+):
+    """Call the agent asynchronously with the user's query.
+
+    The state shown before and after the run comes from the state tracker,
+    which is updated from the streamed events instead of fetching the session.
+    Without a tracker, one is seeded from a single session fetch.
+
+    With a StreamingRenderer, the response is streamed and shown as it is
+    generated, and the renderer records the turn's time to first token.
+    """
     content = types.Content(role="user", parts=[types.Part(text=query)])
     print(
         f"\n{Colors.BG_GREEN}{Colors.BLACK}{Colors.BOLD}--- Running Query: {query} ---{Colors.RESET}"
@@ -149,14 +193,23 @@ async def call_agent_async(runner, user_id, session_id, query):
 
     final_response_text = None
 
+    if state_tracker is None:
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name,
+            user_id=user_id,
+            session_id=session_id,
+        )
+        state_tracker = StateTracker(state=session.state if session else {})
+
     # Display state before processing the query
-    await display_state(
-        session_service=runner.session_service,
-        app_name=runner.app_name,
-        user_id=user_id,
-        session_id=session_id,
-        label="State Before Processing",
+    print_state(state=state_tracker.state, label="State Before Processing")
+
+    # Stream partial responses when there is a renderer to show them
+    run_config = RunConfig(
+        streaming_mode=StreamingMode.SSE if renderer else StreamingMode.NONE
     )
+    if renderer:
+        renderer.start_turn()
 
     # Process event and get final response
     try:
@@ -164,20 +217,22 @@ async def call_agent_async(runner, user_id, session_id, query):
             user_id=user_id,
             session_id=session_id,
             new_message=content,
+            run_config=run_config,
         ):
-            response = await process_agent_response(event=event)
+            state_tracker.apply(event=event)
+            if renderer:
+                response = renderer.render(event=event)
+            else:
+                response = await process_agent_response(event=event)
             if response:
                 final_response_text = response
     except Exception as e:
         print(f"Error running agent: {e}")
 
+    if renderer:
+        renderer.end_turn()
+
     # Display state after processing the query
-    await display_state(
-        session_service=runner.session_service,
-        app_name=runner.app_name,
-        user_id=user_id,
-        session_id=session_id,
-        label="State After Processing",
-    )
+    print_state(state=state_tracker.state, label="State After Processing")
 
     return final_response_text
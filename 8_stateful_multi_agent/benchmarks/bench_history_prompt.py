@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the compacted interaction history.
+
+Simulates a long session (one user query and one agent response per turn) and
+compares the size and render time of an instruction that injects the full
+interaction history with one that injects the compacted history kept in the
+session state.
+
+Usage:
+    python benchmarks/bench_history_prompt.py [--turns 1000] [--window 10]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events import Event, EventActions
+from google.adk.sessions import Session
+
+# Add the example directory to the path
+sys.path.append(str(object=Path(__file__).parent.parent))
+
+from customer_service_agent.history import (  # noqa: E402
+    HISTORY_STATE_KEY,
+    LAST_INTERACTION_KEY,
+    HistoryCompactor,
+    get_interaction_history,
+    history_instruction,
+)
+
+# Turns at which the prompt size is reported
+REPORT_AT: tuple[int, ...] = (1, 10, 100, 250, 500, 1000)
+
+# Same history-bearing sections as the customer service instruction
+TEMPLATE: str = """
+<user_info>
+Name: {user_name}
+</user_info>
+
+<purchase_info>
+Purchased Courses: {purchased_courses}
+</purchase_info>
+
+<interaction_history>
+{interaction_history}
+</interaction_history>
+"""
+
+
+def _append_history(
+    session: Session, compactor: HistoryCompactor, author: str, entry: dict
+) -> None:
+    """Append a history event the same way append_interaction does."""
+    compacted: dict = compactor.fold(session.state.get(HISTORY_STATE_KEY), entry)
+    session.events.append(
+        Event(
+            invocation_id=Event.new_id(),
+            author=author,
+            actions=EventActions(
+                state_delta={LAST_INTERACTION_KEY: entry, HISTORY_STATE_KEY: compacted}
+            ),
+        )
+    )
+    session.state[LAST_INTERACTION_KEY] = entry
+    session.state[HISTORY_STATE_KEY] = compacted
+
+
+async def run_benchmark(turns: int, window: int) -> None:
+    """Render the instruction every turn and print the size at REPORT_AT turns."""
+    session = Session(
+        app_name="Customer Service",
+        user_id="john_doe",
+        id="benchmark",
+        state={"user_name": "John Doe", "purchased_courses": []},
+    )
+    context = ReadonlyContext(invocation_context=SimpleNamespace(session=session))
+    compactor = HistoryCompactor(window_size=window)
+    compacted_instruction = history_instruction(template=TEMPLATE, compactor=compactor)
+
+    print(f"Turns: {turns}, window size: {window}")
+    print(
+        f"{'turn':>6} {'full chars':>12} {'compacted':>10} {'full ms':>9} {'cmp ms':>8}"
+    )
+    for turn in range(1, turns + 1):
+        _append_history(
+            session,
+            compactor,
+            author="user",
+            entry={
+                "action": "user_query",
+                "query": f"What's the price of the course? (turn {turn})",
+                "timestamp": "2025-01-01 12:00:00",
+            },
+        )
+        _append_history(
+            session,
+            compactor,
+            author="sales_agent",
+            entry={
+                "action": "agent_response",
+                "agent_name": "sales_agent",
+                "response": "The AI Marketing Platform course costs $149.",
+                "timestamp": "2025-01-01 12:00:05",
+            },
+        )
+
+        # The compacted instruction is rendered every turn, as in a live session
+        start: float = time.perf_counter()
+        compacted: str = await compacted_instruction(context)
+        compacted_ms: float = (time.perf_counter() - start) * 1000
+
+        if turn in REPORT_AT or turn == turns:
+            start = time.perf_counter()
+            full: str = TEMPLATE.replace(
+                "{interaction_history}", str(get_interaction_history(session))
+            )
+            full_ms: float = (time.perf_counter() - start) * 1000
+            print(
+                f"{turn:>6} {len(full):>12,} {len(compacted):>10,} "
+                f"{full_ms:>9.3f} {compacted_ms:>8.3f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compacted history benchmark")
+    parser.add_argument("--turns", type=int, default=1000, help="Session length")
+    parser.add_argument("--window", type=int, default=10, help="Verbatim entries")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(turns=args.turns, window=args.window))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Interaction History
+
+Append-only interaction history shared by the customer service agents.
+
+The history is the repository's shared utils/interaction_history.py: every
+entry is its own event, and instructions render a compacted view of it. The
+module is loaded by its file path, since this example's utils.py shadows the
+utils package.
+"""
+
+from shared_utils import load_shared_module
+
+_interaction_history = load_shared_module("interaction_history")
+
+HISTORY_STATE_KEY = _interaction_history.HISTORY_STATE_KEY
+LAST_INTERACTION_KEY = _interaction_history.LAST_INTERACTION_KEY
+HistoryCompactor = _interaction_history.HistoryCompactor
+append_interaction = _interaction_history.append_interaction
+count_actions = _interaction_history.count_actions
+default_compactor = _interaction_history.default_compactor
+get_interaction_history = _interaction_history.get_interaction_history
+history_instruction = _interaction_history.history_instruction
+record_interaction = _interaction_history.record_interaction
+summarize_actions = _interaction_history.summarize_actions
@@ -4,6 +4,7 @@ from typing import Any
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 
+from ...history import history_instruction, record_interaction
 from ..sales_agent.course_info import COURSE_ID, COURSE_NAME
 
 
@@ -42,18 +43,15 @@ def refund_course(tool_context: ToolContext) -> dict[str, Any]:
     # Refund and update purchased courses in state - COMPLETELY REPLACE the list
     tool_context.state["purchased_courses"] = []
 
-    # Add refund action to interaction history
-    current_interaction_history: Any = tool_context.state.get(
-        key="interaction_history", default=[]
-    )
-    current_interaction_history.append(
-        {
+    # Record the refund in the interaction history
+    record_interaction(
+        state=tool_context.state,
+        entry={
             "action": "refund_course",
             "id": COURSE_ID,
             "timestamp": current_time,
-        }
+        },
     )
-    tool_context.state["interaction_history"] = current_interaction_history
 
     # Return success message
     return {
@@ -69,7 +67,8 @@ order_agent = Agent(
     name="order_agent",
     model="gemini-2.0-flash",
     description="Order agent for viewing purchase history and processing refunds",
-    instruction="""
+    instruction=history_instruction(
+        template="""
     You are the order agent for the AI Developer Accelerator community.
     Your role is to help users view their purchase history, course access, and process refunds.
 
@@ -125,6 +124,7 @@ order_agent = Agent(
     - Mention our 30-day money-back guarantee if relevant
     - Direct course questions to course support
     - Direct purchase inquiries to sales
-    """,
+    """
+    ),
     tools=[refund_course, get_current_time],
 )
@@ -4,6 +4,7 @@ from datetime import datetime
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 
+from ...history import history_instruction, record_interaction
 from .course_info import COURSE_ID, COURSE_NAME
 
 
@@ -46,18 +47,15 @@ def purchase_course(tool_context: ToolContext) -> dict[str, Any]:
     # Update state
     tool_context.state["purchased_courses"] = new_purchased_course
 
-    # Get and update current interaction history
-    current_interaction_history: Any = tool_context.state.get(
-        key="interaction_history", default=[]
-    )
-    current_interaction_history.append(
-        {
+    # Record the purchase in the interaction history
+    record_interaction(
+        state=tool_context.state,
+        entry={
             "action": "purchase_course",
             "id": COURSE_ID,
             "timestamp": current_time,
-        }
+        },
     )
-    tool_context.state["interaction_history"] = current_interaction_history
 
     return {
         "status": "success",
@@ -72,7 +70,8 @@ sales_agent = Agent(
     name="sales_agent",
     model="gemini-2.0-flash",
     description="Sales agent for the AI Marketing Platform course",
-    instruction="""
+    instruction=history_instruction(
+        template="""
     You are a sales agent for the AI Developer Accelerator community, specifically handling sales
     for the AI Marketing Platform course.
 
@@ -121,6 +120,7 @@ sales_agent = Agent(
     4. After any interaction:
        - The state will automatically track the interaction
        - Be ready to hand off to course support after purchase
-    """,
+    """
+    ),
     tools=[purchase_course],
 )
@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 
 from dotenv import load_dotenv
@@ -6,7 +7,13 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 
 from customer_service_agent.agent import customer_service_agent
-from utils import add_user_query_interaction_history, call_agent_async
+from server_mode import serve_runner
+from utils import (
+    StateTracker,
+    StreamingRenderer,
+    add_user_query_interaction_history,
+    call_agent_async,
+)
 
 
 # Load environment variables from .env file
@@ -16,11 +23,18 @@ load_dotenv()
 APP_NAME: str = "Customer Service"
 USER_ID: str = "john_doe"
 
+# Show responses while they are generated, and time them
+STREAMING: bool = True
+
+# Server mode (main.py --serve): many concurrent sessions over HTTP and WebSocket
+SERVER_HOST: str = "127.0.0.1"
+SERVER_PORT: int = 8000
+SERVER_MAX_CONCURRENCY: int = 16
+
 # ===== Initialize State =====
 initial_state: dict = {
     "user_name": "John Doe",
     "purchased_courses": [],
-    "interaction_history": [],
 }
 
 # ===== Initialize In-Memory Session Service =====
@@ -40,6 +54,9 @@ async def main_async():
     session_id = new_session.id
     print(f"\nSession created: Session ID: {session_id}")
 
+    # Track the session state locally from the agent events
+    state_tracker = StateTracker(session=new_session)
+
     # ===== Agent Runner Setup =====
     # Create a runner
     runner = Runner(
@@ -48,6 +65,9 @@ async def main_async():
         session_service=session_service,
     )
 
+    # Responses are rendered as they stream in
+    renderer = StreamingRenderer() if STREAMING else None
+
     # ===== Interactive Conversation Loop =====
     print("\nWelcome to the Customer Service Agent Chat!")
     print("Type 'exit' or 'quit' to end the conversation.")
@@ -61,17 +81,23 @@ async def main_async():
         # Update interaction history with the user's query
         await add_user_query_interaction_history(
             session_service=session_service,
-            app_name=APP_NAME,
-            user_id=USER_ID,
-            session_id=session_id,
+            session=state_tracker.session,
             query=user_input,
         )
 
         # Process the user query through the agent
         await call_agent_async(
-            runner=runner, user_id=USER_ID, session_id=session_id, query=user_input
+            runner=runner,
+            user_id=USER_ID,
+            session_id=session_id,
+            query=user_input,
+            state_tracker=state_tracker,
+            renderer=renderer,
         )
 
+    if renderer:
+        print(f"Response latency: {renderer.summary()}")
+
     # ===== State Examination =====
     # Show final session state
     final_session = await session_service.get_session(
@@ -85,10 +111,43 @@ async def main_async():
         print("No final session state available.")
 
 
+async def serve_async(host: str, port: int) -> None:
+    """Serve many concurrent sessions over HTTP and WebSocket."""
+    # One runner serves the sessions of every user
+    runner = Runner(
+        app_name=APP_NAME,
+        agent=customer_service_agent,
+        session_service=session_service,
+    )
+    await serve_runner(
+        runner,
+        session_service,
+        app_name=APP_NAME,
+        initial_state=initial_state,
+        host=host,
+        port=port,
+        max_concurrency=SERVER_MAX_CONCURRENCY,
+    )
+
+
 # ===== Main Entrypoint =====
 def main() -> None:
-    # Run the main async function
-    asyncio.run(main_async())
+    parser = argparse.ArgumentParser(description="Customer service agent")
+    parser.add_argument(
+        "--serve", action="store_true", help="Serve sessions over HTTP and WebSocket"
+    )
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    args = parser.parse_args()
+
+    if args.serve:
+        try:
+            asyncio.run(serve_async(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        # Run the main async function
+        asyncio.run(main_async())
 
 
 if __name__ == "__main__":
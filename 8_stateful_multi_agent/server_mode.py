@@ -0,0 +1,57 @@
+"""
+Server mode of the stateful multi-agent example.
+Serves many concurrent sessions with the shared utils/agent_server.py, which is
+loaded by its file path: this example's utils.py shadows the utils package.
+"""
+
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService
+
+from shared_utils import SHARED_UTILS_DIR, load_shared_module
+
+# The shared server module, next to this example in the repository
+AGENT_SERVER_PATH: Path = SHARED_UTILS_DIR / "agent_server.py"
+
+
+def load_agent_server() -> ModuleType:
+    """Load the shared utils/agent_server.py module from its file."""
+    return load_shared_module("agent_server")
+
+
+async def serve_runner(
+    runner: Runner,
+    session_service: BaseSessionService,
+    app_name: str,
+    initial_state: dict[str, Any],
+    host: str,
+    port: int,
+    max_concurrency: int = 16,
+) -> None:
+    """Serve a runner's sessions over HTTP and WebSocket until stopped.
+
+    Args:
+        runner: The runner every session's turns go through
+        session_service: The session service the runner uses
+        app_name: App name the sessions are created under
+        initial_state: State of new sessions
+        host: Host to listen on
+        port: Port to listen on
+        max_concurrency: Most turns that run at once
+    """
+    agent_server: ModuleType = load_agent_server()
+    server = agent_server.AgentServer(
+        runner,
+        session_service,
+        app_name=app_name,
+        max_concurrency=max_concurrency,
+        initial_state=initial_state,
+    )
+    print(f"Serving {app_name} on http://{host}:{port}")
+    try:
+        await agent_server.serve(server, host, port)
+    finally:
+        print(f"\nServer metrics: {server.metrics.as_dict()}")
@@ -0,0 +1,36 @@
+"""
+Shared utils modules for the stateful multi-agent example.
+This example's utils.py shadows the repository's utils package, so its
+modules are loaded by their file path instead of imported.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+# The shared utils package, next to this example in the repository
+SHARED_UTILS_DIR: Path = Path(__file__).resolve().parent.parent / "utils"
+
+
+def load_shared_module(name: str) -> ModuleType:
+    """Load a module of the shared utils package from its file.
+
+    The module is loaded once per process, so every part of the example uses
+    the same classes.
+
+    Args:
+        name: Name of the module in the utils package, e.g. "agent_server"
+
+    Returns:
+        The module
+    """
+    path: Path = SHARED_UTILS_DIR / f"{name}.py"
+    loaded: ModuleType | None = sys.modules.get(name)
+    if loaded is not None and Path(loaded.__file__) == path:
+        return loaded
+    spec = importlib.util.spec_from_file_location(name, path)
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
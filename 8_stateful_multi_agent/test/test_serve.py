@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test script for the server mode.
+This script tests serving sessions with the shared agent server and a mock model.
+"""
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from server_mode import AGENT_SERVER_PATH, load_agent_server
+from utils.mock_llm import MockLlm
+
+APP_NAME: str = "Customer Service"
+
+
+def test_agent_server_is_loaded_by_path() -> None:
+    """The shared agent server is loaded from its file and serves sessions."""
+    agent_server = load_agent_server()
+    assert Path(agent_server.__file__) == AGENT_SERVER_PATH
+
+    session_service = InMemorySessionService()
+    agent = Agent(
+        name="echo_agent",
+        model=MockLlm(),
+        description="Echoes the user",
+        instruction="Repeat what the user says.",
+    )
+    runner = Runner(app_name=APP_NAME, agent=agent, session_service=session_service)
+    server = agent_server.AgentServer(
+        runner,
+        session_service,
+        app_name=APP_NAME,
+        initial_state={"user_name": "John Doe", "purchased_courses": []},
+    )
+    client = TestClient(agent_server.create_app(server))
+    session_id = client.post("/sessions", json={"user_id": "u1"}).json()["session_id"]
+    response = client.post(
+        f"/sessions/{session_id}/turns", json={"user_id": "u1", "text": "hello"}
+    )
+    assert response.status_code == 200
+    assert response.json()["response"] == "echo: hello"
+
+
+if __name__ == "__main__":
+    test_agent_server_is_loaded_by_path()
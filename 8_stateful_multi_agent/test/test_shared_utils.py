@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Test script for loading the shared utils modules.
+This script tests that the example uses the shared interaction history despite its own utils.py.
+"""
+
+from pathlib import Path
+
+from customer_service_agent import history
+from shared_utils import SHARED_UTILS_DIR, load_shared_module
+
+
+def test_history_is_the_shared_module() -> None:
+    """The agents' history is loaded once from utils/interaction_history.py."""
+    shared = load_shared_module("interaction_history")
+    assert Path(shared.__file__) == SHARED_UTILS_DIR / "interaction_history.py"
+    assert load_shared_module("interaction_history") is shared
+    assert history.HistoryCompactor is shared.HistoryCompactor
+    assert history.default_compactor is shared.default_compactor
+
+
+if __name__ == "__main__":
+    test_history_is_the_shared_module()
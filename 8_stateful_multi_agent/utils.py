@@ -1,7 +1,20 @@
-from datetime import datetime
+import copy
 
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.sessions import State
 from google.genai import types
 
+from customer_service_agent.history import (
+    HISTORY_STATE_KEY,
+    LAST_INTERACTION_KEY,
+    append_interaction,
+    get_interaction_history,
+)
+from shared_utils import load_shared_module
+
+# Streamed responses are rendered by the shared utils/streaming.py
+StreamingRenderer = load_shared_module("streaming").StreamingRenderer
+
 
 # ANSI color codes for terminal output
 class Colors:
@@ -32,94 +45,71 @@ class Colors:
 
 async def update_interaction_history(
     session_service,
-    app_name,
-    user_id,
-    session_id,
+    session,
     entry,
+    author="user",
 ):
-    """Add an entry to the interaction history in state.
+    """Append an entry to the interaction history of the session.
+
+    The entry is appended as a single event, so the existing history is
+    never copied or rewritten.
 
     Args:
         session_service: The session service instance
-        app_name: The application name
-        user_id: The user ID
-        session_id: The session ID
+        session: The session to append to, e.g. the StateTracker's session,
+            which the append keeps up to date
         entry: A dictionary containing the interaction data
             - requires 'action' key (e.g., 'user_query', 'agent_response')
             - other keys are flexible depending on the action type
+        author: Author recorded on the history event
+
+    Returns:
+        The appended history event, or None if it couldn't be appended
     """
 
     try:
-        # Get current session
-        session = await session_service.get_session(
-            app_name=app_name,
-            user_id=user_id,
-            session_id=session_id,
-        )
-
-        # Get current interaction history
-        interaction_history = session.state.get("interaction_history", [])
-
-        # Check timestamp
-        if "timestamp" not in entry:
-            entry["timestamp"] = datetime.now().strftime(format="%Y-%m-%d %H:%M:%S")
-
-        # Add entry to interaction history
-        interaction_history.append(entry)
-
-        # Create updated state
-        updated_state = session.state.copy()
-        updated_state["interaction_history"] = interaction_history
-
-        # Create new session with updated state
-        await session_service.create_session(
-            app_name=app_name,
-            user_id=user_id,
-            session_id=session_id,
-            state=updated_state,
+        return await append_interaction(
+            session_service=session_service,
+            session=session,
+            entry=entry,
+            author=author,
         )
 
     except Exception as e:
         print(f"Error updating interaction history: {e}")
+        return None
 
 
 async def add_agent_response_interaction_history(
     session_service,
-    app_name,
-    user_id,
-    session_id,
+    session,
     agent_name,
     response,
 ):
-    """Add the agent's response to the interaction history in the session state."""
+    """Add the agent's response to the interaction history of the session."""
 
-    await update_interaction_history(
+    return await update_interaction_history(
         session_service=session_service,
-        app_name=app_name,
-        user_id=user_id,
-        session_id=session_id,
+        session=session,
         entry={
             "action": "agent_response",
             "agent_name": agent_name,
             "response": response,
         },
+        author=agent_name,
     )
 
 
 async def add_user_query_interaction_history(
     session_service,
-    app_name,
-    user_id,
-    session_id,
+    session,
     query,
 ):
-    """Add the user's query to the interaction history in the session state."""
+    """Add the user's query to the interaction history of the session."""
 
-    await update_interaction_history(
+    return await update_interaction_history(
         session_service=session_service,
-        app_name=app_name,
-        user_id=user_id,
-        session_id=session_id,
+        session=session,
         entry={
             "action": "user_query",
             "query": query,
@@ -127,80 +117,121 @@ async def add_user_query_interaction_history(
     )
 
 
+class StateTracker:
+    """Keeps a local copy of the session up to date during a conversation.
+
+    The tracker is seeded once with the session and then applies the
+    state_delta of every event streamed from runner.run_async, so the state
+    can be displayed before and after each turn without fetching the session.
+    Interaction history events are appended to the tracker's session
+    directly, which updates it the same way.
+    """
+
+    def __init__(self, session):
+        """Initialize the tracker with the current session.
+
+        Args:
+            session: The session to start from
+        """
+        self.session = session.model_copy(deep=True)
+
+    def apply(self, event):
+        """Apply the state delta of an event to the local session."""
+        if event.partial:
+            return
+        self.session.last_update_time = event.timestamp
+        if not event.actions or not event.actions.state_delta:
+            return
+        for key, value in event.actions.state_delta.items():
+            if key.startswith(State.TEMP_PREFIX):
+                continue
+            self.session.state[key] = copy.deepcopy(value)
+        # Keep state-changing events, which carry the interaction history
+        self.session.events.append(event)
+
+
 async def display_state(
     session_service, app_name, user_id, session_id, label="Current State"
 ):
-    """Display the current session state in a formatted way."""
+    """Fetch the session and display its current state."""
     try:
         # Get the most up-to-date session
         session = await session_service.get_session(
             app_name=app_name, user_id=user_id, session_id=session_id
         )
+        print_state(session=session, label=label)
+    except Exception as e:
+        print(f"Error displaying state: {e}")
 
-        # Format the output with clear sections
-        print(f"\n{'-' * 10} {label} {'-' * 10}")
-
-        # Handle the user name
-        user_name = session.state.get("user_name", "Unknown")
-        print(f"👤 User: {user_name}")
-
-        # Handle purchased courses
-        purchased_courses = session.state.get("purchased_courses", [])
-        if purchased_courses and any(purchased_courses):
-            print("📚 Courses:")
-            for course in purchased_courses:
-                if isinstance(course, dict):
-                    course_id = course.get("id", "Unknown")
-                    purchase_date = course.get("purchase_date", "Unknown date")
-                    print(f"  - {course_id} (purchased on {purchase_date})")
-                elif course:  # Handle string format for backward compatibility
-                    print(f"  - {course}")
-        else:
-            print("📚 Courses: None")
-
-        # Handle interaction history in a more readable way
-        if (
-            "interaction_history" in session.state
-            and session.state["interaction_history"]
-        ):
-            print("📝 Interaction History:")
-            for i, entry in enumerate(session.state["interaction_history"], 1):
-                if entry.get("action") == "user_query":
-                    timestamp = entry.get("timestamp", "Unknown time")
-                    query = entry.get("query", "Unknown query")
-                    print(f'  {i}. User query at {timestamp}: "{query}"')
-                elif entry.get("action") == "agent_response":
-                    timestamp = entry.get("timestamp", "Unknown time")
-                    agent_name = entry.get("agent_name", "Unknown agent")
-                    response_text = entry.get("response", "No response")
-                    # Truncate long responses for display
-                    if len(response_text) > 50:
-                        response_text = response_text[:50] + "..."
-                    print(
-                        f'  {i}. {agent_name} response at {timestamp}: "{response_text}"'
-                    )
-                else:
-                    # Generic fallback for other entry types
-                    action = entry.get("action", "unknown")
-                    timestamp = entry.get("timestamp", "Unknown time")
-                    print(f"  {i}. {action} at {timestamp}")
-        else:
-            print("📝 Interaction History: None")
 
-        # Show any additional state keys that might exist
-        other_keys = [
-            k
-            for k in session.state.keys()
-            if k not in ["user_name", "purchased_courses", "interaction_history"]
+def print_state(session, label="Current State"):
+    """Display the session state in a formatted way."""
+    state = session.state
+
+    # Format the output with clear sections
+    print(f"\n{'-' * 10} {label} {'-' * 10}")
+
+    # Handle the user name
+    user_name = state.get("user_name", "Unknown")
+    print(f"👤 User: {user_name}")
+
+    # Handle purchased courses
+    purchased_courses = state.get("purchased_courses", [])
+    if purchased_courses and any(purchased_courses):
+        print("📚 Courses:")
+        for course in purchased_courses:
+            if isinstance(course, dict):
+                course_id = course.get("id", "Unknown")
+                purchase_date = course.get("purchase_date", "Unknown date")
+                print(f"  - {course_id} (purchased on {purchase_date})")
+            elif course:  # Handle string format for backward compatibility
+                print(f"  - {course}")
+    else:
+        print("📚 Courses: None")
+
+    # Handle interaction history in a more readable way
+    interaction_history = get_interaction_history(session)
+    if interaction_history:
+        print("📝 Interaction History:")
+        for i, entry in enumerate(interaction_history, 1):
+            if entry.get("action") == "user_query":
+                timestamp = entry.get("timestamp", "Unknown time")
+                query = entry.get("query", "Unknown query")
+                print(f'  {i}. User query at {timestamp}: "{query}"')
+            elif entry.get("action") == "agent_response":
+                timestamp = entry.get("timestamp", "Unknown time")
+                agent_name = entry.get("agent_name", "Unknown agent")
+                response_text = entry.get("response", "No response")
+                # Truncate long responses for display
+                if len(response_text) > 50:
+                    response_text = response_text[:50] + "..."
+                print(f'  {i}. {agent_name} response at {timestamp}: "{response_text}"')
+            else:
+                # Generic fallback for other entry types
+                action = entry.get("action", "unknown")
+                timestamp = entry.get("timestamp", "Unknown time")
+                print(f"  {i}. {action} at {timestamp}")
+    else:
+        print("📝 Interaction History: None")
+
+    # Show any additional state keys that might exist
+    other_keys = [
+        k
+        for k in state.keys()
+        if k
+        not in [
+            "user_name",
+            "purchased_courses",
+            LAST_INTERACTION_KEY,
+            HISTORY_STATE_KEY,
         ]
-        if other_keys:
-            print("🔑 Additional State:")
-            for key in other_keys:
-                print(f"  {key}: {session.state[key]}")
+    ]
+    if other_keys:
+        print("🔑 Additional State:")
+        for key in other_keys:
+            print(f"  {key}: {state[key]}")
 
-        print("-" * (22 + len(label)))
-    except Exception as e:
-        print(f"Error displaying state: {e}")
+    print("-" * (22 + len(label)))
 
 
 async def process_agent_response(event):
@@ -240,8 +271,18 @@ async def process_agent_response(event):
     return final_response
 
 
-async def call_agent_async(runner, user_id, session_id, query):
-    """Call the agent asynchronously with the user's query."""
+async def call_agent_async(
+    runner, user_id, session_id, query, state_tracker=None, renderer=None
+):
+    """Call the agent asynchronously with the user's query.
+
+    The state shown before and after the run comes from the state tracker,
+    which is updated from the streamed events instead of fetching the session.
+    Without a tracker, one is seeded from a single session fetch.
+
+    With a StreamingRenderer, the response is streamed and shown as it is
+    generated, and the renderer records the turn's time to first token.
+    """
 
     content = types.Content(role="user", parts=[types.Part(text=query)])
     print(
@@ -250,48 +291,58 @@ async def call_agent_async(runner, user_id, session_id, query):
     final_response_text = None
     agent_name = None
 
+    if state_tracker is None:
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+        state_tracker = StateTracker(session=session)
+
     # Display state before processing the query
-    await display_state(
-        session_service=runner.session_service,
-        app_name=runner.app_name,
-        user_id=user_id,
-        session_id=session_id,
-        label="State Before Processing",
+    print_state(session=state_tracker.session, label="State Before Processing")
+
+    # Stream partial responses when there is a renderer to show them
+    run_config = RunConfig(
+        streaming_mode=StreamingMode.SSE if renderer else StreamingMode.NONE
     )
+    if renderer:
+        renderer.start_turn()
 
     try:
         async for event in runner.run_async(
-            user_id=user_id, session_id=session_id, new_message=content
+            user_id=user_id,
+            session_id=session_id,
+            new_message=content,
+            run_config=run_config,
         ):
+            state_tracker.apply(event=event)
+
             # Capture the agent name from the event if available
             if event.author:
                 agent_name = event.author
 
-            response = await process_agent_response(event)
+            if renderer:
+                response = renderer.render(event=event)
+            else:
+                response = await process_agent_response(event)
             if response:
                 final_response_text = response
     except Exception as e:
         print(f"{Colors.BG_RED}{Colors.WHITE}ERROR during agent run: {e}{Colors.RESET}")
 
+    if renderer:
+        renderer.end_turn()
+
     # Add the agent response to interaction history if we got a final response
     if final_response_text and agent_name:
         await add_agent_response_interaction_history(
             session_service=runner.session_service,
-            app_name=runner.app_name,
-            user_id=user_id,
-            session_id=session_id,
+            session=state_tracker.session,
             agent_name=agent_name,
             response=final_response_text,
         )
 
     # Display state after processing the message
-    await display_state(
-        session_service=runner.session_service,
-        app_name=runner.app_name,
-        user_id=user_id,
-        session_id=session_id,
-        label="State AFTER processing",
-    )
+    print_state(session=state_tracker.session, label="State AFTER processing")
 
     # # Add debug state call
     # await debug_state(
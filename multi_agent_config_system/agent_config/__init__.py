@@ -1,6 +1,25 @@
 """Agent configuration management package."""
 
 from .agent_factory import AgentFactory
+from .bundle import (
+    AgentBundle,
+    build_bundle,
+    hash_sources,
+    load_bundle,
+    save_bundle,
+)
 from .config_manager import AgentConfigManager
+from .config_watcher import ConfigWatcher
+from .instruction_provider import SessionInstructionProvider
 
-__all__: list[str] = ["AgentConfigManager", "AgentFactory"]
+__all__: list[str] = [
+    "AgentBundle",
+    "AgentConfigManager",
+    "AgentFactory",
+    "ConfigWatcher",
+    "SessionInstructionProvider",
+    "build_bundle",
+    "hash_sources",
+    "load_bundle",
+    "save_bundle",
+]
@@ -1,64 +1,278 @@
-from typing import Dict, Any, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Set, Union
 from google.adk.agents import Agent
 
 from .config_manager import AgentConfigManager
+from .instruction_provider import SessionInstructionProvider
+
+@dataclass
+class _AgentSpec:
+    """An agent's loaded configuration, rendered instruction and tools."""
+
+    agent_id: str
+    config: Dict[str, Any]
+    instruction: Union[str, SessionInstructionProvider]
+    tools: List[Any]
+
+    @property
+    def sub_agent_ids(self) -> List[str]:
+        return self.config.get("sub_agents", [])
 
 class AgentFactory:
     """Factory for creating agent instances from configurations."""
     
-    def __init__(self, config_manager: AgentConfigManager):
+    def __init__(
+        self,
+        config_manager: AgentConfigManager,
+        per_session_instructions: bool = False,
+        max_workers: Optional[int] = None,
+        llm_cache: Optional[Any] = None,
+        state_formatters: Optional[Dict[str, Callable[[Any], str]]] = None,
+    ):
         """Initialize the agent factory.
         
         Args:
             config_manager: The configuration manager to use
+            per_session_instructions: Render the state variables into each
+                request's instruction from its session's state, instead of
+                into the agent once, so one agent tree serves every session
+            max_workers: Threads that load and render the agents of a tree,
+                or None for the thread pool's default
+            llm_cache: Response cache (utils.llm_cache.LlmResponseCache) for
+                the agents whose configuration sets cache: true, leaving the
+                instruction blocks listed in cache_ignore_blocks out of the key
+            state_formatters: Functions rendering the values of some session
+                variables into per-session instructions, by variable name
         """
         self.config_manager = config_manager
+        self.per_session_instructions = per_session_instructions
         self.agent_cache = {}  # Cache for created agents
+        self.rebuild_callbacks: List[Callable[[str, Agent], None]] = []
+        self.max_workers = max_workers
+        self.llm_cache = llm_cache
+        self.state_formatters = dict(state_formatters or {})
+
+        # Seconds spent loading, rendering and creating each agent
+        self.build_times: Dict[str, float] = {}
+
+        # What each cached agent was built from, to know what a file change affects
+        self._agent_templates: Dict[str, str] = {}
+        self._sub_agent_ids: Dict[str, List[str]] = {}
+        self._state_variables: Dict[str, Optional[Dict[str, Any]]] = {}
         
     def create_agent(self, agent_id: str, state_variables: Optional[Dict[str, Any]] = None) -> Agent:
         """Create an agent instance from configuration.
         
         Args:
             agent_id: Identifier for the agent
-            state_variables: Variables from the session state to include in rendering
+            state_variables: Variables from the session state to include in rendering.
+                With per-session instructions these are the names of the
+                session variables and their values for sessions that lack them.
             
         Returns:
             Configured Agent instance
+
+        Raises:
+            ValueError: If the sub_agents references form a cycle
         """
         # Check if we've already created this agent
         if agent_id in self.agent_cache:
             return self.agent_cache[agent_id]
             
+        # Load and render every agent in the tree, one level at a time
+        specs = self._prepare_tree(agent_id, state_variables)
+        self._check_cycles(agent_id, specs)
+
+        # Create the agents bottom-up from the prepared nodes
+        return self._assemble(agent_id, specs, state_variables)
+
+    def _prepare_tree(
+        self, root_id: str, state_variables: Optional[Dict[str, Any]]
+    ) -> Dict[str, _AgentSpec]:
+        """Load and render the agents of a tree, concurrently per level.
+
+        Each agent is prepared once, however many parents reference it.
+        Cached agents without a parent are reused as they are, so their
+        sub-agents aren't prepared again.
+
+        Args:
+            root_id: Identifier of the root agent
+            state_variables: Variables from the session state to include in rendering
+
+        Returns:
+            The prepared agents by agent ID
+        """
+        specs: Dict[str, _AgentSpec] = {}
+        seen: Set[str] = {root_id}
+        level = [root_id]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while level:
+                to_prepare = [
+                    agent_id
+                    for agent_id in level
+                    if agent_id not in self.agent_cache
+                    or self.agent_cache[agent_id].parent_agent is not None
+                ]
+                for spec in executor.map(
+                    lambda agent_id: self._prepare(agent_id, state_variables),
+                    to_prepare,
+                ):
+                    specs[spec.agent_id] = spec
+
+                next_level = []
+                for agent_id in to_prepare:
+                    for sub_agent_id in specs[agent_id].sub_agent_ids:
+                        if sub_agent_id not in seen:
+                            seen.add(sub_agent_id)
+                            next_level.append(sub_agent_id)
+                level = next_level
+        return specs
+
+    def _prepare(self, agent_id: str, state_variables: Optional[Dict[str, Any]]) -> _AgentSpec:
+        """Load an agent's configuration, instruction and tools."""
+        start = time.perf_counter()
+
         # Load the agent configuration
         config = self.config_manager.load_agent_config(agent_id)
         
         # Get the rendered instruction
-        instruction = self.config_manager.get_agent_instruction(agent_id, state_variables)
-        
-        # Create sub-agents if needed
-        sub_agents = []
-        if "sub_agents" in config:
-            for sub_agent_id in config["sub_agents"]:
-                sub_agent = self.create_agent(sub_agent_id, state_variables)
-                sub_agents.append(sub_agent)
+        if self.per_session_instructions:
+            instruction = SessionInstructionProvider(
+                self.config_manager.get_static_instruction(agent_id, state_variables or {}),
+                defaults=state_variables,
+                formatters=self.state_formatters,
+            )
+        else:
+            instruction = self.config_manager.get_agent_instruction(agent_id, state_variables)
         
         # Create tools if needed
         tools = self._load_tools(config.get("tools", []))
         
+        self.build_times[agent_id] = time.perf_counter() - start
+        return _AgentSpec(agent_id, config, instruction, tools)
+
+    def _check_cycles(self, root_id: str, specs: Dict[str, _AgentSpec]) -> None:
+        """Raise ValueError if the prepared agents reference each other in a cycle."""
+        done: Set[str] = set()
+        path: List[str] = []
+
+        def visit(agent_id: str) -> None:
+            if agent_id in path:
+                cycle = path[path.index(agent_id):] + [agent_id]
+                raise ValueError(f"Cycle in sub_agents: {' -> '.join(cycle)}")
+            if agent_id in done or agent_id not in specs:
+                return
+            path.append(agent_id)
+            for sub_agent_id in specs[agent_id].sub_agent_ids:
+                visit(sub_agent_id)
+            path.pop()
+            done.add(agent_id)
+
+        visit(root_id)
+
+    def _assemble(
+        self,
+        agent_id: str,
+        specs: Dict[str, _AgentSpec],
+        state_variables: Optional[Dict[str, Any]],
+    ) -> Agent:
+        """Create an agent and its sub-agents from prepared agents.
+
+        An agent referenced by several parents gets one instance per parent,
+        since ADK agents can only have one parent. The first one is cached.
+        """
+        if agent_id not in specs:
+            cached = self.agent_cache.get(agent_id)
+            if cached is not None and cached.parent_agent is None:
+                return cached
+            # A cached agent that got a parent in this tree is needed again
+            specs[agent_id] = self._prepare(agent_id, state_variables)
+
+        start = time.perf_counter()
+        spec = specs[agent_id]
+
+        # Create sub-agents if needed
+        sub_agents = [
+            self._assemble(sub_agent_id, specs, state_variables)
+            for sub_agent_id in spec.sub_agent_ids
+        ]
+
         # Create the agent
         agent = Agent(
-            name=config["name"],
-            model=config["model"],
-            description=config["description"],
-            instruction=instruction,
+            name=spec.config["name"],
+            model=spec.config["model"],
+            description=spec.config["description"],
+            instruction=spec.instruction,
             sub_agents=sub_agents,
-            tools=tools
+            tools=spec.tools
         )
+        if self.llm_cache is not None and spec.config.get("cache", False):
+            self.llm_cache.enable_for(
+                agent, ignore_blocks=spec.config.get("cache_ignore_blocks", [])
+            )
+        self.build_times[agent_id] += time.perf_counter() - start
         
         # Cache the agent
-        self.agent_cache[agent_id] = agent
+        self.agent_cache.setdefault(agent_id, agent)
+        self._agent_templates[agent_id] = spec.config["instruction_template"]
+        self._sub_agent_ids[agent_id] = list(spec.sub_agent_ids)
+        self._state_variables[agent_id] = state_variables
         
         return agent
+
+    def rebuild_changed(self, changed_paths: Set[Path]) -> Dict[str, Agent]:
+        """Rebuild the cached agents affected by changed files.
+
+        An agent is affected when its configuration, its template or a
+        template it includes changed. ADK agents can only have one parent,
+        so the trees of all of an affected agent's ancestors are rebuilt too.
+        Each rebuilt root agent is passed to the rebuild callbacks.
+
+        Args:
+            changed_paths: Configuration and template files that changed
+
+        Returns:
+            The rebuilt root agents by agent ID
+        """
+        changed = {Path(path).resolve() for path in changed_paths}
+        parents: Dict[str, Set[str]] = {}
+        for agent_id, sub_agent_ids in self._sub_agent_ids.items():
+            for sub_agent_id in sub_agent_ids:
+                parents.setdefault(sub_agent_id, set()).add(agent_id)
+
+        # New agent configs change no cached agent until they're referenced
+        affected_roots: Set[str] = set()
+        for agent_id, template_path in self._agent_templates.items():
+            files = set(self.config_manager.get_config_paths(agent_id))
+            files |= self.config_manager.get_template_paths(template_path)
+            if {path.resolve() for path in files} & changed:
+                ancestors = [agent_id]
+                while ancestors:
+                    ancestor_id = ancestors.pop()
+                    if ancestor_id in parents:
+                        ancestors.extend(parents[ancestor_id])
+                    else:
+                        affected_roots.add(ancestor_id)
+
+        rebuilt: Dict[str, Agent] = {}
+        for root_id in affected_roots:
+            state_variables = self._state_variables[root_id]
+            self._forget(root_id)
+            rebuilt[root_id] = self.create_agent(root_id, state_variables)
+            for callback in self.rebuild_callbacks:
+                callback(root_id, rebuilt[root_id])
+        return rebuilt
+
+    def _forget(self, agent_id: str) -> None:
+        """Drop an agent and its sub-agents from the cache."""
+        for sub_agent_id in self._sub_agent_ids.pop(agent_id, []):
+            self._forget(sub_agent_id)
+        self.agent_cache.pop(agent_id, None)
+        self._agent_templates.pop(agent_id, None)
+        self._state_variables.pop(agent_id, None)
     
     def _load_tools(self, tool_ids: List[str]) -> List[Any]:
         """Load tools by their identifiers.
@@ -0,0 +1,200 @@
+import hashlib
+import pickle
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from google.adk.utils.variant_utils import get_google_llm_variant
+
+from .config_manager import AgentConfigManager
+
+# Bump when the bundle contents change shape, so old bundles are rebuilt
+BUNDLE_FORMAT_VERSION = 3
+
+# Magic bytes, format version, SHA-256 of the payload and SHA-256 of the sources
+_HEADER = struct.Struct(">8sI32s32s")
+_MAGIC = b"AGBUNDLE"
+
+
+@dataclass
+class AgentBundle:
+    """Agent configurations and static instructions compiled ahead of time."""
+
+    environment: str
+    session_variables: List[str]
+    configs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    static_instructions: Dict[str, str] = field(default_factory=dict)
+    tool_api_variant: str = ""
+    tool_declarations: Dict[str, Any] = field(default_factory=dict)
+    content_hash: str = ""
+    source_hash: str = ""
+
+
+def hash_sources(
+    config_dir: Union[str, Path],
+    template_dir: Union[str, Path],
+    app_config_files: Iterable[Union[str, Path]] = (),
+) -> str:
+    """Hash the files a bundle is compiled from.
+
+    Files are hashed by content and by their path relative to their
+    directory, so the hash doesn't change when the project is moved or
+    checked out again. The modules of the registered tools are hashed by
+    module name, since the bundle holds function declarations built from
+    their signatures and docstrings.
+
+    Args:
+        config_dir: Directory containing agent configuration files
+        template_dir: Directory containing instruction templates
+        app_config_files: App config files the bundle depends on
+
+    Returns:
+        The SHA-256 of the sources, as a hex string
+    """
+    from tools.registry import get_tool_source_files
+
+    config_dir, template_dir = Path(config_dir), Path(template_dir)
+    sources = [
+        *(
+            (f"agents/{path.relative_to(config_dir).as_posix()}", path)
+            for path in sorted(config_dir.glob("*.yaml"))
+        ),
+        *(
+            (f"templates/{path.relative_to(template_dir).as_posix()}", path)
+            for path in sorted(template_dir.rglob("*.j2"))
+        ),
+        *((f"app/{Path(path).name}", Path(path)) for path in app_config_files),
+        *(
+            (f"tools/{module_path}", path)
+            for module_path, path in get_tool_source_files().items()
+        ),
+    ]
+
+    digest = hashlib.sha256()
+    for name, path in sources:
+        try:
+            content = path.read_bytes() if path else b""
+        except OSError:
+            # A tool module that can't be read only contributes its name
+            content = b""
+        digest.update(f"{name}\0{len(content)}\0".encode())
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def build_bundle(
+    config_manager: AgentConfigManager,
+    session_variables: Iterable[str],
+    app_config_files: Iterable[Union[str, Path]] = (),
+) -> AgentBundle:
+    """Compile every agent configuration into a bundle.
+
+    Each configuration is merged with its environment override, and its
+    instruction is rendered the way per-session instructions need it. The
+    function declarations of the agents' tools are included too, so tool
+    modules are only imported when a tool is invoked.
+
+    Args:
+        config_manager: The configuration manager to compile from
+        session_variables: Names of the variables that come from the session state
+        app_config_files: App config files the bundle depends on, hashed
+            with the agent configs and templates so load_bundle can tell
+            when the bundle is stale
+
+    Returns:
+        The compiled bundle
+    """
+    from tools.registry import get_tool_declaration
+
+    bundle = AgentBundle(
+        environment=config_manager.environment,
+        session_variables=sorted(session_variables),
+        tool_api_variant=get_google_llm_variant(),
+        source_hash=hash_sources(
+            config_manager.config_dir, config_manager.template_dir, app_config_files
+        ),
+    )
+    for agent_id in config_manager.list_agent_ids():
+        config = config_manager.load_agent_config(agent_id)
+        bundle.configs[agent_id] = config
+        bundle.static_instructions[agent_id] = config_manager.get_static_instruction(
+            agent_id, bundle.session_variables
+        )
+        for tool_id in config.get("tools", []):
+            bundle.tool_declarations[tool_id] = get_tool_declaration(tool_id)
+    return bundle
+
+
+def save_bundle(bundle: AgentBundle, path: Union[str, Path]) -> str:
+    """Write a bundle to a file.
+
+    Args:
+        bundle: The bundle to write
+        path: Path of the bundle file
+
+    Returns:
+        The content hash of the written bundle
+    """
+    payload = pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL)
+    digest = hashlib.sha256(payload).digest()
+    bundle.content_hash = digest.hex()
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC,
+                BUNDLE_FORMAT_VERSION,
+                digest,
+                bytes.fromhex(bundle.source_hash or "00" * 32),
+            )
+        )
+        f.write(payload)
+    return bundle.content_hash
+
+
+def load_bundle(
+    path: Union[str, Path], source_hash: Optional[str] = None
+) -> AgentBundle:
+    """Read a bundle written by save_bundle.
+
+    Args:
+        path: Path of the bundle file
+        source_hash: hash_sources() of the current sources, to reject a
+            bundle built from other sources, or None to skip the check
+
+    Returns:
+        The bundle
+
+    Raises:
+        ValueError: If the file is not a bundle, was built by another format
+            version, is corrupted or is stale
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Not an agent bundle: {path}")
+    magic, version, digest, source_digest = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError(f"Not an agent bundle: {path}")
+    if version != BUNDLE_FORMAT_VERSION:
+        raise ValueError(
+            f"Agent bundle {path} has format version {version}, "
+            f"expected {BUNDLE_FORMAT_VERSION}; rebuild it"
+        )
+    payload = memoryview(data)[_HEADER.size :]
+    if hashlib.sha256(payload).digest() != digest:
+        raise ValueError(f"Agent bundle {path} is corrupted; rebuild it")
+    # Checked before unpickling, so a stale bundle costs no more than its hash
+    if source_hash is not None and source_digest.hex() != source_hash:
+        raise ValueError(
+            f"Agent bundle {path} is stale, agent configs, templates, tool "
+            "modules or the app config changed since it was built; rebuild it"
+        )
+
+    bundle = pickle.loads(payload)
+    bundle.content_hash = digest.hex()
+    return bundle
@@ -1,15 +1,60 @@
+import copy
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import jinja2
 import yaml
+from jinja2 import meta
+
+from .instruction_provider import session_placeholder
+
+if TYPE_CHECKING:
+    from .bundle import AgentBundle
+
+# Guards the metrics below, since agents may be built from several threads
+_stats_lock = threading.Lock()
+
+
+@dataclass
+class TemplateStats:
+    """Template compilation and rendering metrics."""
+
+    compiles: int = 0
+    renders: int = 0
+    render_seconds: float = 0.0
+
+    @property
+    def average_render_ms(self) -> float:
+        """Average time to render an instruction, in milliseconds."""
+        return self.render_seconds * 1000 / self.renders if self.renders else 0.0
+
+
+class _CountingEnvironment(jinja2.Environment):
+    """Jinja2 environment that counts template compilations."""
+
+    stats: TemplateStats
+
+    def compile(self, *args: Any, **kwargs: Any) -> Any:
+        """Compile a template source, counting the compilation."""
+        with _stats_lock:
+            self.stats.compiles += 1
+        return super().compile(*args, **kwargs)
 
 
 class AgentConfigManager:
     """Manages agent configurations and instructions."""
 
     def __init__(
-        self, config_dir: str, template_dir: str, environment: str = "production"
+        self,
+        config_dir: str,
+        template_dir: str,
+        environment: str = "production",
+        bytecode_cache_dir: Optional[str] = None,
+        bundle: Optional["AgentBundle"] = None,
     ):
         """Initialize the config manager.
 
@@ -17,31 +62,157 @@ class AgentConfigManager:
             config_dir: Directory containing agent configuration files
             template_dir: Directory containing instruction templates
             environment: Current environment (development, staging, production)
+            bytecode_cache_dir: Directory to keep compiled templates in across
+                processes, or None to compile them in every process
+            bundle: Precompiled agent bundle to serve configurations and
+                static instructions from instead of the YAML and templates
+
+        Raises:
+            ValueError: If the bundle was built for another environment
         """
+        if bundle is not None and bundle.environment != environment:
+            raise ValueError(
+                f"Agent bundle was built for {bundle.environment}, not {environment}"
+            )
+
         self.config_dir = config_dir
         self.template_dir = template_dir
         self.environment = environment
+        self.bytecode_cache_dir = bytecode_cache_dir
+        self.bundle = bundle
+        self.template_stats = TemplateStats()
         self.jinja_env = self._setup_jinja_environment()
 
+        # Parsed YAML files keyed by path, valid while their mtime and size match
+        self._yaml_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        self.parse_counts: Counter[Path] = Counter()
+
         # Load app config for variable injection
         try:
             from config.app_config_loader import load_app_config
 
-            self.app_config = load_app_config(environment)
+            self._load_app_config = load_app_config
+            load_app_config(environment)
         except ImportError:
-            self.app_config = None
+            self._load_app_config = None
+
+    @property
+    def app_config(self) -> Any:
+        """The shared app config for this environment, or None if unavailable."""
+        if self._load_app_config is None:
+            return None
+        return self._load_app_config(self.environment)
 
     def _setup_jinja_environment(self) -> jinja2.Environment:
         """Set up the Jinja2 environment with template loader."""
-        return jinja2.Environment(
+        bytecode_cache = None
+        if self.bytecode_cache_dir:
+            # Entries are keyed by template source checksum, so edits invalidate them
+            Path(self.bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(self.bytecode_cache_dir)
+
+        env = _CountingEnvironment(
             loader=jinja2.FileSystemLoader(self.template_dir),
+            bytecode_cache=bytecode_cache,
             trim_blocks=True,
             lstrip_blocks=True,
         )
+        env.stats = self.template_stats
+        return env
+
+    def prewarm_templates(self) -> int:
+        """Load every template so later renders skip compilation.
+
+        With a bytecode cache, templates compiled in an earlier process are
+        loaded from the cache and the others are compiled and added to it.
+
+        Returns:
+            Number of templates loaded
+        """
+        names = self.jinja_env.list_templates(extensions=["j2"])
+        for name in names:
+            self.jinja_env.get_template(name)
+        return len(names)
+
+    def _load_yaml(self, path: Path) -> Any:
+        """Parse a YAML file, reusing the parsed result until the file changes.
+
+        Args:
+            path: Path to the YAML file
+
+        Returns:
+            A private copy of the parsed YAML content
+        """
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._yaml_cache.get(path)
+        if cached is None or cached[0] != version:
+            with open(path, "r") as f:
+                cached = (version, yaml.safe_load(f))
+            self._yaml_cache[path] = cached
+            with _stats_lock:
+                self.parse_counts[path] += 1
+
+        # Callers update the returned dictionaries, so never hand out the cache
+        return copy.deepcopy(cached[1])
+
+    def get_config_paths(self, agent_id: str) -> List[Path]:
+        """Get the configuration files an agent is loaded from.
+
+        Args:
+            agent_id: Identifier for the agent
+
+        Returns:
+            The base configuration file and its environment override, whether
+            or not the override exists
+        """
+        return [
+            Path(self.config_dir) / f"{agent_id}.yaml",
+            Path(self.config_dir) / f"{agent_id}.{self.environment}.yaml",
+        ]
+
+    def list_agent_ids(self) -> List[str]:
+        """List the agents that have a configuration file.
+
+        Returns:
+            Sorted agent identifiers, without environment overrides
+        """
+        return sorted(
+            path.stem
+            for path in Path(self.config_dir).glob("*.yaml")
+            if "." not in path.stem
+        )
+
+    def get_template_paths(self, template_path: str) -> Set[Path]:
+        """Get a template file and the files of all templates it includes.
+
+        Args:
+            template_path: Path to the template file (relative to template_dir)
+
+        Returns:
+            Paths of the template and everything it includes, recursively
+        """
+        paths: Set[Path] = set()
+        pending: List[str] = [template_path]
+        seen: Set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            source, filename, _ = self.jinja_env.loader.get_source(self.jinja_env, name)
+            paths.add(Path(filename))
+            referenced = meta.find_referenced_templates(self.jinja_env.parse(source))
+            pending.extend(ref for ref in referenced if ref is not None)
+        return paths
 
     def load_agent_config(self, agent_id: str) -> Dict[str, Any]:
         """Load agent configuration from YAML file.
 
+        Each file is parsed once and served from the cache until its mtime
+        or size changes. With a bundle, the configuration comes from the
+        bundle instead.
+
         Args:
             agent_id: Identifier for the agent
 
@@ -51,20 +222,25 @@ class AgentConfigManager:
         Raises:
             FileNotFoundError: If agent configuration file doesn't exist
         """
+        if self.bundle is not None:
+            if agent_id not in self.bundle.configs:
+                raise FileNotFoundError(
+                    f"Agent configuration not in bundle: {agent_id}"
+                )
+            return copy.deepcopy(self.bundle.configs[agent_id])
+
         config_path = Path(self.config_dir) / f"{agent_id}.yaml"
 
         if not config_path.exists():
             raise FileNotFoundError(f"Agent configuration not found: {config_path}")
 
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
+        config = self._load_yaml(config_path)
 
         # Add environment-specific overrides if they exist
         env_config_path = Path(self.config_dir) / f"{agent_id}.{self.environment}.yaml"
         if env_config_path.exists():
-            with open(env_config_path, "r") as f:
-                env_config = yaml.safe_load(f)
-                config.update(env_config)
+            env_config = self._load_yaml(env_config_path)
+            config.update(env_config)
 
         return config
 
@@ -78,12 +254,17 @@ class AgentConfigManager:
         Returns:
             Rendered instruction string
         """
+        start = time.perf_counter()
         template = self.jinja_env.get_template(template_path)
 
         # Add environment as a variable
         context = {"environment": self.environment, **variables}
 
-        return template.render(**context)
+        instruction = template.render(**context)
+        with _stats_lock:
+            self.template_stats.renders += 1
+            self.template_stats.render_seconds += time.perf_counter() - start
+        return instruction
 
     def get_agent_instruction(
         self, agent_id: str, state_variables: Optional[Dict[str, Any]] = None
@@ -98,7 +279,55 @@ class AgentConfigManager:
             Fully rendered instruction string
         """
         config = self.load_agent_config(agent_id)
+        variables = self._get_static_variables(config)
+
+        # Add state variables (these take precedence)
+        if state_variables:
+            variables.update(state_variables)
+
+        return self.render_instruction(config["instruction_template"], variables)
+
+    def get_static_instruction(
+        self, agent_id: str, session_variables: Iterable[str]
+    ) -> str:
+        """Render the session-independent part of an agent's instruction.
+
+        Session variables are rendered as placeholders for a
+        SessionInstructionProvider to fill in per request, so templates may
+        only output them, not branch or loop on them.
+
+        Args:
+            agent_id: Identifier for the agent
+            session_variables: Names of the variables that come from the session state
+
+        Returns:
+            Rendered instruction string with session variable placeholders
+        """
+        session_variables = sorted(session_variables)
+        if (
+            self.bundle is not None
+            and self.bundle.session_variables == session_variables
+            and agent_id in self.bundle.static_instructions
+        ):
+            return self.bundle.static_instructions[agent_id]
+
+        config = self.load_agent_config(agent_id)
+        variables = self._get_static_variables(config)
+        variables.update(
+            {name: session_placeholder(name) for name in session_variables}
+        )
+
+        return self.render_instruction(config["instruction_template"], variables)
 
+    def _get_static_variables(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the template variables from an agent config and the app config.
+
+        Args:
+            config: The agent configuration
+
+        Returns:
+            Dictionary of template variables
+        """
         # Start with template variables from config
         variables = config.get("variables", {})
 
@@ -121,8 +350,4 @@ class AgentConfigManager:
                     }
                 )
 
-        # Add state variables (these take precedence)
-        if state_variables:
-            variables.update(state_variables)
-
-        return self.render_instruction(config["instruction_template"], variables)
+        return variables
@@ -0,0 +1,92 @@
+import asyncio
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+
+class ConfigWatcher:
+    """Watches agent configuration and template files for changes.
+
+    The watcher polls the modification time and size of every YAML file in
+    the config directory and every template in the template directory, so it
+    needs no platform file-notification support.
+    """
+
+    def __init__(
+        self,
+        config_dir: str,
+        template_dir: str,
+        on_change: Callable[[Set[Path]], None],
+        interval: float = 1.0,
+    ):
+        """Initialize the config watcher.
+
+        Args:
+            config_dir: Directory containing agent configuration files
+            template_dir: Directory containing instruction templates
+            on_change: Called with the paths that were changed, added or removed
+            interval: Seconds between polls
+        """
+        self.config_dir = Path(config_dir)
+        self.template_dir = Path(template_dir)
+        self.on_change = on_change
+        self.interval = interval
+        self._versions = self._scan()
+        self._task: Optional[asyncio.Task] = None
+
+    def _watched_files(self) -> Iterable[Path]:
+        """List the configuration and template files."""
+        yield from self.config_dir.glob("*.yaml")
+        yield from self.template_dir.rglob("*.j2")
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        """Get the modification time and size of every watched file."""
+        versions: Dict[Path, Tuple[int, int]] = {}
+        for path in self._watched_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            versions[path.resolve()] = (stat.st_mtime_ns, stat.st_size)
+        return versions
+
+    def check(self) -> Set[Path]:
+        """Poll the files once and report changes to on_change.
+
+        Returns:
+            The paths that were changed, added or removed since the last poll
+        """
+        versions = self._scan()
+        changed = {
+            path
+            for path in versions.keys() | self._versions.keys()
+            if versions.get(path) != self._versions.get(path)
+        }
+        self._versions = versions
+        if changed:
+            self.on_change(changed)
+        return changed
+
+    async def _watch(self) -> None:
+        """Poll the files every interval."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.check()
+            except Exception as e:
+                # Keep watching, e.g. after a YAML file was saved half-written
+                print(f"\n⚠️  Failed to reload agent configuration: {e}")
+
+    def start(self) -> None:
+        """Start polling on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
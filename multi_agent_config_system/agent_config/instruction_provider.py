@@ -0,0 +1,73 @@
+import re
+from typing import Any, Callable, Dict, Optional
+
+from google.adk.agents.readonly_context import ReadonlyContext
+
+# Matches {name} and optional {name?} state placeholders
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)(\??)\}")
+
+
+def session_placeholder(name: str) -> str:
+    """Get the placeholder a session variable renders as in a static instruction.
+
+    Args:
+        name: Name of the session state variable
+
+    Returns:
+        The placeholder, filled in from the session state on each request
+    """
+    return f"{{{name}}}"
+
+
+class SessionInstructionProvider:
+    """ADK instruction provider that fills session state into a static instruction.
+
+    The static instruction is rendered once per agent with every session
+    variable left as a placeholder. On each request the placeholders are
+    replaced with values from the session state, so one agent can serve any
+    number of sessions.
+    """
+
+    def __init__(
+        self,
+        static_instruction: str,
+        defaults: Optional[Dict[str, Any]] = None,
+        formatters: Optional[Dict[str, Callable[[Any], str]]] = None,
+    ):
+        """Initialize the instruction provider.
+
+        Args:
+            static_instruction: Instruction with session variable placeholders
+            defaults: Values for variables that are missing from the session state
+            formatters: Functions rendering the values of some variables, by
+                variable name; other values are rendered with str()
+        """
+        self.static_instruction = static_instruction
+        self.defaults = dict(defaults or {})
+        self.formatters = dict(formatters or {})
+
+    def render(self, state: Dict[str, Any]) -> str:
+        """Fill the placeholders in the static instruction.
+
+        Args:
+            state: Session state to take the values from
+
+        Returns:
+            The instruction for the session. Placeholders for unknown variables
+            are left as they are, optional ones are left empty.
+        """
+
+        def replace(match: re.Match) -> str:
+            name, optional = match.groups()
+            format_value = self.formatters.get(name, str)
+            if name in state:
+                return format_value(state[name])
+            if name in self.defaults:
+                return format_value(self.defaults[name])
+            return "" if optional else match.group(0)
+
+        return _PLACEHOLDER.sub(replace, self.static_instruction)
+
+    def __call__(self, context: ReadonlyContext) -> str:
+        """Render the instruction for the session of the current request."""
+        return self.render(context.state)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the compiled agent bundle.
+
+Generates a tree of agents (one root, its sub-agents and theirs, 50 agents
+by default), each with a YAML config and a template that includes the
+shared templates, and compares two ways to start up:
+
+- Sources: parse every YAML file and compile and render every template.
+- Bundle: load the bundle written by build_bundle.
+
+For each it reports the median time in ms to load all configurations and
+static instructions, and to build the whole agent tree with per-session
+instructions (which adds creating the ADK agents).
+
+Usage:
+    python benchmarks/bench_agent_bundle.py [--children 7] [--grandchildren 6]
+        [--repeat 20]
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+# Add the project directory to the path for the agent_config package
+project_dir: Path = Path(__file__).parent.parent
+sys.path.append(str(object=project_dir))
+
+from agent_config import (  # noqa: E402
+    AgentBundle,
+    AgentConfigManager,
+    AgentFactory,
+    build_bundle,
+    hash_sources,
+    load_bundle,
+    save_bundle,
+)
+from config.app_config_loader import load_app_config  # noqa: E402
+
+SESSION_STATE: dict = {
+    "user_name": "John Doe",
+    "purchased_courses": [],
+    "interaction_history": [],
+}
+
+TEMPLATE: str = """You are {{ agent_title }} for the AI Developer Accelerator community.
+
+{% include 'shared/user_context.j2' %}
+
+**Course Details:**
+- **Name:** {{ course_name }}
+- **Price:** ${{ course_price }}
+- **Duration:** {{ course_duration }}
+- **Refunds:** {{ refund_policy_days }}-day money-back guarantee
+
+{% for topic in topics %}
+{{ loop.index }}. **{{ topic | title }}**
+   - Answer questions about {{ topic }} clearly and with examples
+   - Direct complex {{ topic }} issues to support
+{% endfor %}
+
+{% include 'shared/professional_tone.j2' %}
+"""
+
+
+def write_agent(
+    config_dir: Path, template_dir: Path, agent_id: str, sub_agent_ids: list[str]
+) -> None:
+    """Write the config and template of one generated agent."""
+    (template_dir / agent_id).mkdir()
+    (template_dir / agent_id / "main.j2").write_text(TEMPLATE)
+    sub_agents = "".join(f"  - {sub_agent_id}\n" for sub_agent_id in sub_agent_ids)
+    sub_agents = sub_agents or "  []\n"
+    (config_dir / f"{agent_id}.yaml").write_text(
+        f'name: "{agent_id}"\n'
+        'model: "gemini-2.0-flash"\n'
+        f'description: "Generated agent {agent_id}"\n'
+        f'instruction_template: "{agent_id}/main.j2"\n'
+        "variables:\n"
+        f'  agent_title: "the {agent_id.replace("_", " ")}"\n'
+        "  topics: [billing, content, access, community, tooling, deployment]\n"
+        "  course_price: 149\n"
+        '  course_duration: "6 weeks"\n'
+        "  refund_policy_days: 30\n"
+        f"sub_agents:\n{sub_agents}"
+        "tools: []\n"
+    )
+
+
+def generate_tree(directory: Path, children: int, grandchildren: int) -> int:
+    """Generate a root agent with `children` sub-agents of `grandchildren` each.
+
+    Returns:
+        The number of agents
+    """
+    config_dir: Path = directory / "agents"
+    template_dir: Path = directory / "templates"
+    config_dir.mkdir()
+    shutil.copytree(project_dir / "templates" / "shared", template_dir / "shared")
+
+    child_ids = [f"agent_{i}" for i in range(children)]
+    write_agent(config_dir, template_dir, "root_agent", child_ids)
+    for child_id in child_ids:
+        grandchild_ids = [f"{child_id}_{j}" for j in range(grandchildren)]
+        write_agent(config_dir, template_dir, child_id, grandchild_ids)
+        for grandchild_id in grandchild_ids:
+            write_agent(config_dir, template_dir, grandchild_id, [])
+    return 1 + children + children * grandchildren
+
+
+def median_ms(run: Callable[[], object], repeat: int) -> float:
+    """Return the median duration of `repeat` runs in ms."""
+    durations: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        run()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def run_benchmark(children: int, grandchildren: int, repeat: int) -> None:
+    """Compare starting from the sources and from a bundle."""
+    environment: str = load_app_config().environment
+    with tempfile.TemporaryDirectory() as directory:
+        agent_count: int = generate_tree(Path(directory), children, grandchildren)
+        config_dir: str = f"{directory}/agents"
+        template_dir: str = f"{directory}/templates"
+        bundle_path: Path = Path(directory) / "agents.bundle"
+        save_bundle(
+            build_bundle(
+                AgentConfigManager(config_dir, template_dir, environment), SESSION_STATE
+            ),
+            bundle_path,
+        )
+
+        def config_manager(bundle: Optional[AgentBundle]) -> AgentConfigManager:
+            return AgentConfigManager(
+                config_dir, template_dir, environment, bundle=bundle
+            )
+
+        def load_all(bundle: Optional[AgentBundle]) -> None:
+            manager = config_manager(bundle)
+            for agent_id in manager.list_agent_ids():
+                manager.load_agent_config(agent_id)
+                manager.get_static_instruction(agent_id, SESSION_STATE)
+
+        def build_tree(bundle: Optional[AgentBundle]) -> None:
+            AgentFactory(
+                config_manager(bundle), per_session_instructions=True
+            ).create_agent("root_agent", state_variables=SESSION_STATE)
+
+        print(f"Agents: {agent_count}, bundle: {bundle_path.stat().st_size:,} bytes")
+        print(f"{'startup':<10} {'load configs ms':>16} {'build tree ms':>14}")
+        for name, load in (
+            ("sources", lambda: None),
+            (
+                "bundle",
+                lambda: load_bundle(
+                    bundle_path, hash_sources(config_dir, template_dir)
+                ),
+            ),
+        ):
+            load_ms = median_ms(lambda: load_all(load()), repeat)
+            build_ms = median_ms(lambda: build_tree(load()), repeat)
+            print(f"{name:<10} {load_ms:>16.2f} {build_ms:>14.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Agent bundle startup benchmark")
+    parser.add_argument("--children", type=int, default=7, help="Root sub-agents")
+    parser.add_argument(
+        "--grandchildren", type=int, default=6, help="Sub-agents of each sub-agent"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement")
+    args = parser.parse_args()
+    run_benchmark(
+        children=args.children, grandchildren=args.grandchildren, repeat=args.repeat
+    )
+
+
+if __name__ == "__main__":
+    main()
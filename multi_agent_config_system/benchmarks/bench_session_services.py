@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the session service backends.
+
+Creates each session.service_type backend through the session factory and
+runs the same workload on it: several threads, each with its own event loop
+running concurrent users. Every user creates a session and does a series of
+turns (one get_session and two append_event calls, like a Runner turn).
+Reports turns per second for each backend.
+
+The database backends use a temporary SQLite database unless --db-url is
+given.
+
+Usage:
+    python benchmarks/bench_session_services.py [--threads 4] [--users 16]
+        [--turns 20] [--db-url postgresql://...]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService
+
+# Add the project directory and the repository root to the path for the
+# sessions package and the shared utils package
+sys.path.append(str(object=Path(__file__).parent.parent))
+sys.path.append(str(object=Path(__file__).parent.parent.parent))
+
+from sessions import create_session_service  # noqa: E402
+
+APP_NAME: str = "Customer Service"
+
+
+async def converse(service: BaseSessionService, user_id: str, turns: int) -> None:
+    """Create a session for a user and do `turns` turns in it."""
+    session = await service.create_session(app_name=APP_NAME, user_id=user_id)
+    for turn in range(turns):
+        session = await service.get_session(
+            app_name=APP_NAME, user_id=user_id, session_id=session.id
+        )
+        for author in ("user", "customer_service_agent"):
+            await service.append_event(
+                session,
+                Event(
+                    invocation_id=Event.new_id(),
+                    author=author,
+                    actions=EventActions(state_delta={"turn": turn}),
+                ),
+            )
+
+
+def measure(
+    service: BaseSessionService, threads: int, users: int, turns: int
+) -> tuple[float, int]:
+    """Run the workload on `threads` threads of `users` concurrent users each.
+
+    Returns:
+        Completed turns per second and the number of failed users
+    """
+    failures: list[int] = [0] * threads
+
+    def run(thread: int) -> None:
+        async def run_users() -> None:
+            results = await asyncio.gather(
+                *(
+                    converse(service, f"user_{thread}_{user}", turns)
+                    for user in range(users)
+                ),
+                return_exceptions=True,
+            )
+            failures[thread] = sum(isinstance(r, Exception) for r in results)
+            if threads == 1 and hasattr(service, "close"):
+                # Release pooled connections on the loop that opened them
+                await service.close()
+
+        asyncio.run(run_users())
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    start: float = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed: float = time.perf_counter() - start
+    failed: int = sum(failures)
+    return (threads * users - failed) * turns / elapsed, failed
+
+
+def run_benchmark(threads: int, users: int, turns: int, db_url: Optional[str]) -> None:
+    """Run the workload on every backend."""
+    print(f"Threads: {threads}, users per thread: {users}, turns per user: {turns}")
+    print(f"{'backend':<32} {'turns/s':>10} {'failed users':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        backends: list[tuple[str, str, dict[str, Any]]] = [
+            ("InMemorySessionService", "InMemorySessionService", {}),
+            (
+                "DatabaseSessionService",
+                "DatabaseSessionService",
+                {"db_url": db_url or f"sqlite:///{directory}/sync.db"},
+            ),
+            (
+                "DatabaseSessionService (async)",
+                "DatabaseSessionService",
+                {
+                    "db_url": db_url or f"sqlite:///{directory}/async.db",
+                    "async_driver": True,
+                },
+            ),
+        ]
+        for name, service_type, settings in backends:
+            service = create_session_service(service_type, settings)
+            if settings.get("async_driver"):
+                # Async engines are bound to one event loop, so use a single thread
+                rate, failed = measure(service, 1, threads * users, turns)
+            else:
+                rate, failed = measure(service, threads, users, turns)
+            print(f"{name:<32} {rate:>10,.0f} {failed:>13}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Session service backend benchmark")
+    parser.add_argument("--threads", type=int, default=4, help="Threads")
+    parser.add_argument("--users", type=int, default=16, help="Users per thread")
+    parser.add_argument("--turns", type=int, default=20, help="Turns per user")
+    parser.add_argument("--db-url", help="Database URL (default: temporary SQLite)")
+    args = parser.parse_args()
+    run_benchmark(
+        threads=args.threads,
+        users=args.users,
+        turns=args.turns,
+        db_url=args.db_url,
+    )
+
+
+if __name__ == "__main__":
+    main()
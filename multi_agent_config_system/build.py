@@ -0,0 +1,59 @@
+"""
+Build the agent bundle.
+
+Compiles every agent configuration, merged with its environment override,
+and every agent's static instruction into the bundle file set by
+paths.agent_bundle in app_config.yaml. main.py loads the bundle at startup
+instead of parsing the YAML files and rendering the templates.
+
+Rebuild the bundle after changing agent configs, templates or the app config.
+
+Usage:
+    python build.py [--environment production] [--output build/agents.bundle]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from agent_config import AgentConfigManager, build_bundle, save_bundle
+from config.app_config_loader import app_config_provider, load_app_config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the agent bundle")
+    parser.add_argument(
+        "--environment", help="Environment to build for (default: from app config)"
+    )
+    parser.add_argument("--output", help="Bundle file (default: from app config)")
+    args = parser.parse_args()
+
+    app_config = load_app_config(args.environment)
+    script_dir = Path(__file__).parent
+    output = Path(
+        args.output or script_dir / (app_config.agent_bundle or "build/agents.bundle")
+    )
+
+    start = time.perf_counter()
+    config_manager = AgentConfigManager(
+        config_dir=str(script_dir / app_config.agents_config_dir),
+        template_dir=str(script_dir / app_config.templates_dir),
+        environment=app_config.environment,
+    )
+    # Sessions start with the same state as in main.py
+    session_variables = ["user_name", *app_config.initial_state]
+    bundle = build_bundle(
+        config_manager,
+        session_variables,
+        app_config_provider.config_files(app_config.environment),
+    )
+    content_hash = save_bundle(bundle, output)
+
+    print(
+        f"Built {output} for {bundle.environment}: {len(bundle.configs)} agents, "
+        f"sha256 {content_hash[:12]}, {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Application configuration package."""
@@ -1,11 +1,40 @@
 """Application configuration loader."""
 
+import copy
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only copy of a config value, with dicts as mapping proxies
+    and lists as tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of a frozen config value.
+
+    Args:
+        value: A value read from an AppConfig, e.g. app_config.initial_state
+
+    Returns:
+        The value with mapping proxies as dicts and tuples as lists
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return copy.deepcopy(value)
 
 
 class AppConfig(BaseModel):
@@ -25,6 +54,9 @@ class AppConfig(BaseModel):
     initial_state: Dict[str, Any] = Field(
         default_factory=dict, description="Initial session state"
     )
+    session_settings: Dict[str, Any] = Field(
+        default_factory=dict, description="Session service settings"
+    )
 
     # Environment settings
     environment: str = Field(..., description="Current environment")
@@ -32,12 +64,52 @@ class AppConfig(BaseModel):
     # Paths
     agents_config_dir: str = Field(..., description="Agents configuration directory")
     templates_dir: str = Field(..., description="Templates directory")
+    template_cache_dir: Optional[str] = Field(
+        None, description="Compiled templates cache directory"
+    )
+    agent_bundle: Optional[str] = Field(None, description="Compiled agent bundle file")
 
     # Course settings
     courses: Dict[str, Any] = Field(
         default_factory=dict, description="Course configuration"
     )
 
+    # Tool settings
+    tools: Dict[str, Any] = Field(default_factory=dict, description="Tool settings")
+
+    # Model call retry and circuit breaker settings
+    resilience: Dict[str, Any] = Field(
+        default_factory=dict, description="Model call resilience settings"
+    )
+
+    # Model response cache settings
+    llm_cache: Dict[str, Any] = Field(
+        default_factory=dict, description="Model response cache settings"
+    )
+
+    # Server mode settings
+    server: Dict[str, Any] = Field(default_factory=dict, description="Server settings")
+
+    # Hot reload settings
+    hot_reload: Dict[str, Any] = Field(
+        default_factory=dict, description="Agent config hot reload settings"
+    )
+
+    @field_validator(
+        "initial_state",
+        "session_settings",
+        "courses",
+        "tools",
+        "resilience",
+        "llm_cache",
+        "server",
+        "hot_reload",
+    )
+    @classmethod
+    def _freeze_section(cls, value: Dict[str, Any]) -> Mapping[str, Any]:
+        """Make a config section read-only, nested values included."""
+        return _freeze(value)
+
     class Config:
         """Pydantic configuration."""
 
@@ -45,6 +117,8 @@ class AppConfig(BaseModel):
         extra = "allow"
         # Use enum values instead of enum objects
         use_enum_values = True
+        # One instance is shared across the process, so it can't be changed
+        frozen = True
 
 
 class AppConfigLoader:
@@ -103,12 +177,35 @@ class AppConfigLoader:
             default_user_name=self._config_data["user"]["default_user_name"],
             session_service_type=self._config_data["session"]["service_type"],
             initial_state=self._config_data["session"]["initial_state"],
+            session_settings=self._config_data["session"],
             environment=environment,
             agents_config_dir=self._config_data["paths"]["agents_config_dir"],
             templates_dir=self._config_data["paths"]["templates_dir"],
+            template_cache_dir=self._config_data["paths"].get("template_cache_dir"),
+            agent_bundle=self._config_data["paths"].get("agent_bundle"),
             courses=self._config_data["courses"],
+            tools=self._config_data.get("tools", {}),
+            hot_reload=self._config_data.get("hot_reload", {}),
+            resilience=self._config_data.get("resilience", {}),
+            server=self._config_data.get("server", {}),
+            llm_cache=self._config_data.get("llm_cache", {}),
         )
 
+    def config_files(self, environment: str) -> List[Path]:
+        """List the files a configuration for an environment is loaded from.
+
+        Args:
+            environment: Environment of the configuration
+
+        Returns:
+            The config file, followed by the environment override if it exists
+        """
+        env_config_path = self.config_file_path.with_suffix(f".{environment}.yaml")
+        return [
+            self.config_file_path,
+            *([env_config_path] if env_config_path.exists() else []),
+        ]
+
     def _merge_configs(
         self, base_config: Dict[str, Any], env_config: Dict[str, Any]
     ) -> None:
@@ -125,8 +222,101 @@ class AppConfigLoader:
                 base_config[key] = value
 
 
+class AppConfigProvider:
+    """Loads application configuration once and shares it across the process.
+
+    Configurations are memoized per environment until reload() is called. The
+    returned AppConfig is frozen, nested sections included; use thaw() for a
+    copy that can be changed, such as a session's initial state.
+    """
+
+    def __init__(self, config_file_path: Optional[Union[str, Path]] = None):
+        """Initialize the config provider.
+
+        Args:
+            config_file_path: Path to the config file. If None, uses default location.
+        """
+        self._loader = AppConfigLoader(config_file_path)
+        self._configs: Dict[Optional[str], AppConfig] = {}
+        self._callbacks: List[Callable[[AppConfig], None]] = []
+        self._lock = threading.RLock()
+        self.loads = 0
+
+    def get(self, environment: Optional[str] = None) -> AppConfig:
+        """Get the configuration for an environment, loading it on first use.
+
+        Args:
+            environment: Environment to get config for. If None, uses the
+                default, which is resolved on first use.
+
+        Returns:
+            The shared AppConfig instance.
+        """
+        with self._lock:
+            if environment not in self._configs:
+                self._store(environment, self._load(environment))
+            return self._configs[environment]
+
+    def reload(self) -> None:
+        """Reload every loaded configuration from file.
+
+        The change callbacks are called with each configuration that changed.
+        """
+        with self._lock:
+            old_configs = self._configs
+            self._configs = {}
+            changed: List[AppConfig] = []
+            # The default environment first, in case the file changed it
+            for environment in sorted(old_configs, key=lambda key: key is not None):
+                if environment in self._configs:
+                    continue
+                config = self._load(environment)
+                self._store(environment, config)
+                if config != old_configs[environment]:
+                    changed.append(config)
+            callbacks = list(self._callbacks)
+
+        for config in changed:
+            for callback in callbacks:
+                callback(config)
+
+    def config_files(self, environment: str) -> List[Path]:
+        """List the files a configuration for an environment is loaded from.
+
+        Args:
+            environment: Environment of the configuration
+
+        Returns:
+            The config file, followed by the environment override if it exists
+        """
+        return self._loader.config_files(environment)
+
+    def add_callback(self, callback: Callable[[AppConfig], None]) -> None:
+        """Register a function to call with configurations changed by reload().
+
+        Args:
+            callback: Called with the new AppConfig
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def _load(self, environment: Optional[str]) -> AppConfig:
+        """Load a configuration from file."""
+        self.loads += 1
+        return self._loader.load_config(environment)
+
+    def _store(self, environment: Optional[str], config: AppConfig) -> None:
+        """Memoize a configuration under the requested and resolved environment."""
+        self._configs[environment] = config
+        self._configs.setdefault(config.environment, config)
+
+
+# Process-wide configuration provider
+app_config_provider = AppConfigProvider()
+
+
 def load_app_config(environment: Optional[str] = None) -> AppConfig:
-    """Convenience function to load application configuration.
+    """Convenience function to get the shared application configuration.
 
     Args:
         environment: Environment to load config for.
@@ -134,5 +324,4 @@ def load_app_config(environment: Optional[str] = None) -> AppConfig:
     Returns:
         AppConfig instance with loaded configuration.
     """
-    loader = AppConfigLoader()
-    return loader.load_config(environment)
+    return app_config_provider.get(environment)
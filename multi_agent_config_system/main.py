@@ -1,14 +1,24 @@
+import argparse
 import asyncio
-import time
 from pathlib import Path
 
 from agent_config.agent_factory import AgentFactory
+from agent_config.bundle import hash_sources, load_bundle
 from agent_config.config_manager import AgentConfigManager
-from config.app_config_loader import load_app_config
+from agent_config.config_watcher import ConfigWatcher
+from config.app_config_loader import app_config_provider, load_app_config, thaw
+from resilience import CircuitOpenError, ResilientRunner, classify_error
+from tools.registry import add_declarations, prewarm_tools
 from dotenv import load_dotenv
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
 from google.genai import types
+from sessions.session_factory import create_session_service
+from utils.interaction_history import (
+    HISTORY_STATE_KEY,
+    append_interaction,
+    default_compactor,
+)
 
 # Load environment variables
 load_dotenv()
@@ -21,23 +31,89 @@ APP_NAME = app_config.app_name
 USER_ID = app_config.default_user_id
 
 # Initialize state from config
-initial_state= {"user_name": app_config.default_user_name, **app_config.initial_state}
+initial_state= {"user_name": app_config.default_user_name, **thaw(app_config.initial_state)}
 
-# Initialize session service
-session_service = InMemorySessionService()
+# Initialize the session service set by session.service_type
+session_service = create_session_service(
+    app_config.session_service_type, app_config.session_settings
+)
 
 # Get the directory where this script is located
 script_dir = Path(__file__).parent
 
+# Load the agent bundle written by build.py, unless hot reload needs the sources
+# or the sources changed since it was built
+agent_bundle = None
+if app_config.agent_bundle and not app_config.hot_reload.get("enabled", False):
+    bundle_path = script_dir / app_config.agent_bundle
+    if bundle_path.exists():
+        try:
+            agent_bundle = load_bundle(
+                bundle_path,
+                hash_sources(
+                    script_dir / app_config.agents_config_dir,
+                    script_dir / app_config.templates_dir,
+                    app_config_provider.config_files(app_config.environment),
+                ),
+            )
+            if agent_bundle.environment != app_config.environment:
+                raise ValueError(f"it was built for {agent_bundle.environment}")
+        except ValueError as e:
+            print(f"⚠️  Ignoring agent bundle, run build.py to rebuild it: {e}")
+            agent_bundle = None
+
 # Initialize configuration system with paths from config
 config_manager = AgentConfigManager(
     config_dir=str(script_dir / app_config.agents_config_dir),
     template_dir=str(script_dir / app_config.templates_dir),
     environment=app_config.environment,
+    bytecode_cache_dir=(
+        str(script_dir / app_config.template_cache_dir)
+        if app_config.template_cache_dir
+        else None
+    ),
+    bundle=agent_bundle,
+)
+
+# Compile all templates up front, or load them from the bytecode cache
+if agent_bundle is None:
+    config_manager.prewarm_templates()
+else:
+    add_declarations(agent_bundle.tool_declarations, agent_bundle.tool_api_variant)
+
+# Import latency-critical tools now instead of on their first call
+prewarm_tools(app_config.tools.get("prewarm", []))
+
+# Cache model responses for the agents whose config sets cache: true
+llm_cache = None
+if app_config.llm_cache.get("enabled", False):
+    from utils.llm_cache import LlmResponseCache
+
+    db_path = app_config.llm_cache.get("db_path")
+    llm_cache = LlmResponseCache(
+        max_entries=app_config.llm_cache.get("max_entries", 1024),
+        ttl_seconds=app_config.llm_cache.get("ttl_seconds", 3600),
+        db_path=script_dir / db_path if db_path else None,
+    )
+
+# Initialize agent factory; instructions read the state of each request's
+# session, so the agent tree stays valid as the state changes
+agent_factory = AgentFactory(
+    config_manager,
+    per_session_instructions=True,
+    llm_cache=llm_cache,
+    state_formatters={HISTORY_STATE_KEY: default_compactor.render},
 )
 
-# Initialize agent factory
-agent_factory = AgentFactory(config_manager)
+# Watch agent configs and templates when hot reload is enabled
+config_watcher = None
+if app_config.hot_reload.get("enabled", False):
+    config_watcher = ConfigWatcher(
+        config_dir=str(script_dir / app_config.agents_config_dir),
+        template_dir=str(script_dir / app_config.templates_dir),
+        on_change=agent_factory.rebuild_changed,
+        interval=app_config.hot_reload.get("interval_seconds", 1.0),
+    )
 
 
 async def main_async() -> None:
@@ -64,6 +140,31 @@ async def main_async() -> None:
         session_service=session_service,
     )
 
+    def report_retry(attempt: int, delay: float, error: BaseException) -> None:
+        """Tell the user a request is being retried."""
+        max_attempts = resilient_runner.max_attempts
+        print(f"\n⚠️  Service temporarily unavailable (attempt {attempt}/{max_attempts})")
+        print(f"💡 Retrying in {delay:.1f} seconds...")
+
+    # Retry overloaded models without blocking the event loop
+    resilient_runner = ResilientRunner(
+        runner, on_retry=report_retry, **app_config.resilience
+    )
+
+    def use_rebuilt_agent(agent_id, agent) -> None:
+        """Switch the runner to a rebuilt root agent."""
+        if agent_id == "customer_service":
+            runner.agent = agent
+            print("\n🔄 Agent configuration reloaded")
+
+    agent_factory.rebuild_callbacks.append(use_rebuilt_agent)
+
+    stats = config_manager.template_stats
+    print(
+        f"Instructions rendered: {stats.renders} in {stats.render_seconds * 1000:.1f} ms "
+        f"({stats.compiles} templates compiled)"
+    )
+
     # Interactive conversation loop
     print("\nWelcome to the Customer Service Agent Chat!")
     print("Type 'exit' or 'quit' to end the conversation.")
@@ -74,87 +175,128 @@ async def main_async() -> None:
             print("Ending conversation. Goodbye!")
             break
 
-        # Update interaction history
+        # Pick up config and template edits made while waiting for input
+        if config_watcher:
+            try:
+                config_watcher.check()
+            except Exception as e:
+                print(f"\n⚠️  Failed to reload agent configuration: {e}")
+
+        # Append the user query to the interaction history as its own event;
+        # only the state is needed, so skip loading the event log
         session = await session_service.get_session(
-            app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+            app_name=APP_NAME,
+            user_id=USER_ID,
+            session_id=session_id,
+            config=GetSessionConfig(num_recent_events=1),
         )
-
-        if session and hasattr(session, "state"):
-            # Add user query to interaction history
-            interaction_history = session.state.get("interaction_history", [])
-            interaction_history.append(
-                {
-                    "action": "user_query",
-                    "query": user_input,
-                    "timestamp": "2023-06-30 12:00:00",  # In a real app, use actual timestamp
-                }
-            )
-
-            # Create updated state
-            updated_state = session.state.copy()
-            updated_state["interaction_history"] = interaction_history
-
-            # Update session state by creating a new session with the same ID
-            await session_service.create_session(
-                app_name=APP_NAME,
-                user_id=USER_ID,
-                session_id=session_id,
-                state=updated_state,
+        if session:
+            await append_interaction(
+                session_service,
+                session,
+                {"action": "user_query", "query": user_input},
             )
 
         # Process the user query
         new_message = types.Content(role="user", parts=[types.Part(text=user_input)])
 
-        # Retry mechanism for API overload errors
-        max_retries = 3
-        retry_delay = 2  # seconds
+        try:
+            final_response_text = None
+            async for event in resilient_runner.run_async(
+                user_id=USER_ID, session_id=session_id, new_message=new_message
+            ):
+                if event.is_final_response():
+                    if event.content and event.content.parts:
+                        # Handle both text and function call parts
+                        text_parts = [
+                            part.text for part in event.content.parts
+                            if hasattr(part, 'text') and part.text
+                        ]
+                        if text_parts:
+                            final_response_text = "\n".join(text_parts)
+                            print(f"\nAgent: {final_response_text}")
+                        else:
+                            print("\nAgent: [Processing your request...]")
 
-        for attempt in range(max_retries):
-            try:
-                final_response_text = None
-                async for event in runner.run_async(
-                    user_id=USER_ID, session_id=session_id, new_message=new_message
-                ):
-                    if event.is_final_response():
-                        if event.content and event.content.parts:
-                            # Handle both text and function call parts
-                            text_parts = [
-                                part.text for part in event.content.parts
-                                if hasattr(part, 'text') and part.text
-                            ]
-                            if text_parts:
-                                final_response_text = "\n".join(text_parts)
-                                print(f"\nAgent: {final_response_text}")
-                            else:
-                                print("\nAgent: [Processing your request...]")
-                break  # Success, exit retry loop
-
-            except Exception as e:
-                error_type = type(e).__name__
-                is_retryable = ("503" in str(e) or "overloaded" in str(e).lower()
-                               or "UNAVAILABLE" in str(e))
-
-                if is_retryable and attempt < max_retries - 1:
-                    print(f"\n⚠️  Service temporarily unavailable (attempt {attempt + 1}/{max_retries})")
-                    print(f"💡 Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                    continue
-                else:
-                    # Final attempt failed or non-retryable error
-                    if "503" in str(e) or "overloaded" in str(e).lower():
-                        print(f"\n❌ Service temporarily unavailable after {max_retries} attempts")
-                        print("💡 The AI service is currently overloaded. Please try again later.")
-                    elif "UNAVAILABLE" in str(e):
-                        print(f"\n❌ Service unavailable: {e}")
-                        print("💡 Please check your internet connection and try again.")
-                    else:
-                        print(f"\n❌ An error occurred ({error_type}): {e}")
-                        print("💡 Please try rephrasing your request or try again later.")
-                    break
+        except CircuitOpenError as e:
+            print(f"\n❌ Service temporarily unavailable: {e}")
+            print("💡 The AI service is currently overloaded. Please try again later.")
+        except Exception as e:
+            error_type = type(e).__name__
+            if classify_error(e).retryable:
+                print(f"\n❌ Service temporarily unavailable ({error_type}): {e}")
+                print("💡 The AI service is currently overloaded. Please try again later.")
+            else:
+                print(f"\n❌ An error occurred ({error_type}): {e}")
+                print("💡 Please try rephrasing your request or try again later.")
 
         # In a real app, you would also update the interaction history with the agent's response
 
+    print(f"\nModel call metrics: {resilient_runner.metrics.as_dict()}")
+    if llm_cache:
+        print(f"Response cache: {llm_cache.stats()}")
+
+    # Release pooled database connections
+    if hasattr(session_service, "close"):
+        await session_service.close()
+
+
+async def serve_async(host: str, port: int) -> None:
+    """Serve many concurrent sessions over HTTP and WebSocket."""
+    from utils.agent_server import AgentServer, serve
+
+    # One agent tree and runner serve every session
+    runner = Runner(
+        app_name=APP_NAME,
+        agent=agent_factory.create_agent("customer_service", state_variables=initial_state),
+        session_service=session_service,
+    )
+    resilient_runner = ResilientRunner(runner, **app_config.resilience)
+
+    def use_rebuilt_agent(agent_id, agent) -> None:
+        """Switch the runner to a rebuilt root agent."""
+        if agent_id == "customer_service":
+            runner.agent = agent
+
+    agent_factory.rebuild_callbacks.append(use_rebuilt_agent)
+    if config_watcher:
+        config_watcher.start()
+
+    server = AgentServer(
+        resilient_runner,
+        session_service,
+        app_name=APP_NAME,
+        max_concurrency=app_config.server.get("max_concurrency", 16),
+        max_waiting=app_config.server.get("max_waiting"),
+        initial_state=initial_state,
+    )
+    print(f"Serving {APP_NAME} on http://{host}:{port}")
+    try:
+        await serve(server, host, port)
+    finally:
+        if config_watcher:
+            await config_watcher.stop()
+        print(f"\nServer metrics: {server.metrics.as_dict()}")
+        print(f"Model call metrics: {resilient_runner.metrics.as_dict()}")
+        if llm_cache:
+            print(f"Response cache: {llm_cache.stats()}")
+        if hasattr(session_service, "close"):
+            await session_service.close()
+
 
 if __name__ == "__main__":
-    asyncio.run(main_async())
+    parser = argparse.ArgumentParser(description="Customer service agent")
+    parser.add_argument(
+        "--serve", action="store_true", help="Serve sessions over HTTP and WebSocket"
+    )
+    parser.add_argument("--host", default=app_config.server.get("host", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=app_config.server.get("port", 8000))
+    args = parser.parse_args()
+
+    if args.serve:
+        try:
+            asyncio.run(serve_async(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        asyncio.run(main_async())
@@ -0,0 +1,19 @@
+"""Resilience package for agent configuration system."""
+
+from .resilient_runner import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ErrorKind,
+    ResilientRunner,
+    RetryBudget,
+    classify_error,
+)
+
+__all__: list[str] = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "ErrorKind",
+    "ResilientRunner",
+    "RetryBudget",
+    "classify_error",
+]
@@ -0,0 +1,388 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional
+
+import httpx
+from google.adk.agents.run_config import RunConfig
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import errors, types
+
+# HTTP status codes of model errors that are worth retrying
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class ErrorKind(str, Enum):
+    """What went wrong with a model call."""
+
+    OVERLOADED = "overloaded"  # 5xx and request timeouts from the model API
+    RATE_LIMITED = "rate_limited"  # 429 RESOURCE_EXHAUSTED
+    NETWORK = "network"  # connection failures and client-side timeouts
+    CLIENT = "client"  # other 4xx, e.g. invalid requests or credentials
+    OTHER = "other"  # everything else, e.g. bugs in tools
+
+    @property
+    def retryable(self) -> bool:
+        """Whether a later attempt may succeed."""
+        return self in (ErrorKind.OVERLOADED, ErrorKind.RATE_LIMITED, ErrorKind.NETWORK)
+
+
+def classify_error(error: BaseException) -> ErrorKind:
+    """Classify an error raised while running an agent.
+
+    Args:
+        error: The error
+
+    Returns:
+        The kind of error
+    """
+    if isinstance(error, errors.APIError):
+        if error.code == 429:
+            return ErrorKind.RATE_LIMITED
+        if error.code in RETRYABLE_STATUS_CODES:
+            return ErrorKind.OVERLOADED
+        if isinstance(error, errors.ClientError):
+            return ErrorKind.CLIENT
+        return ErrorKind.OTHER
+    if isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError)):
+        return ErrorKind.NETWORK
+    return ErrorKind.OTHER
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a model whose circuit breaker is open."""
+
+    def __init__(self, model: str, retry_after: float):
+        self.model = model
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuit breaker for {model} is open, retry in {retry_after:.1f}s"
+        )
+
+
+class CircuitBreaker:
+    """Stops calling a model after consecutive retryable failures.
+
+    After failure_threshold failures in a row the breaker opens and rejects
+    calls for reset_timeout seconds. Then it lets one trial call through: a
+    success closes the breaker, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before a trial call
+            clock: Monotonic clock, in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """State of the breaker: "closed", "open" or "half_open"."""
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a trial call through."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - self.clock())
+
+    def allow(self) -> bool:
+        """Check whether a call may go ahead, claiming the trial call if half open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a call that didn't fail for the model."""
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a retryable failure, opening the breaker at the threshold."""
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give up a trial call that ended without a result, e.g. when cancelled."""
+        self._trial_in_flight = False
+
+
+class RetryBudget:
+    """Caps retries at a fraction of requests, so retries can't multiply load.
+
+    Every request deposits ratio tokens and every retry withdraws one. The
+    budget starts full, so a quiet process can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.2, burst: float = 10.0):
+        """Initialize the retry budget.
+
+        Args:
+            ratio: Retries allowed per request
+            burst: Most retries allowed in a row, the budget's size
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+
+    def deposit(self) -> None:
+        """Add the tokens a request earns."""
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take a token for a retry, if the budget has one."""
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+@dataclass
+class ResilienceMetrics:
+    """Counts of requests, retries and rejections."""
+
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    retries_denied: int = 0
+    circuit_rejections: int = 0
+    backoff_seconds: float = 0.0
+    errors: Counter = field(default_factory=Counter)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the metrics as a flat dictionary, e.g. for logging or a metrics endpoint."""
+        metrics: Dict[str, Any] = {
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "retries_denied": self.retries_denied,
+            "circuit_rejections": self.circuit_rejections,
+            "backoff_seconds": round(self.backoff_seconds, 3),
+        }
+        for kind, count in self.errors.items():
+            metrics[f"errors.{kind.value}"] = count
+        return metrics
+
+
+class ResilientRunner:
+    """Runs agents with retries, backoff and a circuit breaker per model.
+
+    Retryable errors are retried after an exponential backoff with full
+    jitter, awaited with asyncio.sleep so other sessions keep running. A run
+    is only retried while it hasn't produced any event, so tool calls are
+    never repeated, and the user message is only appended to the session once.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        retry_budget_ratio: float = 0.2,
+        retry_budget_burst: float = 10.0,
+        on_retry: Optional[Callable[[int, float, BaseException], None]] = None,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        rng: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the resilient runner.
+
+        Args:
+            runner: The runner to call
+            max_attempts: Attempts per request, including the first one
+            base_delay: Backoff before the first retry, in seconds
+            max_delay: Longest backoff, in seconds
+            failure_threshold: Consecutive failures that open a model's breaker
+            reset_timeout: Seconds a breaker stays open before a trial call
+            retry_budget_ratio: Retries allowed per request
+            retry_budget_burst: Most retries allowed in a row
+            on_retry: Called with the attempt number, the backoff and the
+                error before each retry
+            sleep: Awaitable sleep, in seconds
+            rng: Random number in [0, 1) for the jitter
+            clock: Monotonic clock for the circuit breakers, in seconds
+        """
+        self.runner = runner
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_retry = on_retry
+        self.sleep = sleep
+        self.rng = rng
+        self.clock = clock
+        self.retry_budget = RetryBudget(retry_budget_ratio, retry_budget_burst)
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.metrics = ResilienceMetrics()
+
+    @property
+    def model(self) -> str:
+        """Name of the root agent's model, which keys the circuit breakers.
+
+        Workflow agents (Sequential, Parallel, Loop) have no model and share
+        the "default" breaker.
+        """
+        model = getattr(self.runner.agent, "model", None)
+        return getattr(model, "model", model) or "default"
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        """Get the circuit breaker of a model."""
+        if model not in self.breakers:
+            self.breakers[model] = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout, self.clock
+            )
+        return self.breakers[model]
+
+    def backoff(self, attempt: int) -> float:
+        """Get the delay before a retry, with full jitter.
+
+        Args:
+            attempt: Number of the attempt that failed, starting at 1
+
+        Returns:
+            The delay, in seconds
+        """
+        return self.rng() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+    async def _message_appended(
+        self, user_id: str, session_id: str, new_message: types.Content
+    ) -> bool:
+        """Check whether a failed attempt left the user message in the session.
+
+        The runner appends the message before running the agent, and a retried
+        attempt hasn't produced any event, so the message is the last event.
+        """
+        session = await self.runner.session_service.get_session(
+            app_name=self.runner.app_name,
+            user_id=user_id,
+            session_id=session_id,
+            config=GetSessionConfig(num_recent_events=1),
+        )
+        if session is None or not session.events:
+            return False
+        last_event = session.events[-1]
+        return last_event.author == "user" and last_event.content == new_message
+
+    async def run_async(
+        self,
+        *,
+        user_id: str,
+        session_id: str,
+        new_message: Optional[types.Content],
+        run_config: Optional[RunConfig] = None,
+    ) -> AsyncGenerator[Event, None]:
+        """Run the agent like Runner.run_async, retrying retryable errors.
+
+        Retries run the agent on the session as it is once the first attempt
+        appended the user message, instead of appending it again.
+
+        Args:
+            user_id: The user ID of the session
+            session_id: The session ID
+            new_message: The user message to append to the session, if any
+            run_config: The run config for the agent, ADK's default if None
+
+        Yields:
+            The events generated by the agent
+
+        Raises:
+            CircuitOpenError: If the model's circuit breaker is open
+        """
+        model = self.model
+        breaker = self.breaker(model)
+        self.metrics.requests += 1
+        self.retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if not breaker.allow():
+                self.metrics.circuit_rejections += 1
+                raise CircuitOpenError(model, breaker.retry_after())
+
+            produced_events = False
+            try:
+                async for event in self.runner.run_async(
+                    user_id=user_id,
+                    session_id=session_id,
+                    new_message=new_message,
+                    run_config=run_config or RunConfig(),
+                ):
+                    produced_events = True
+                    yield event
+            except Exception as e:
+                kind = classify_error(e)
+                self.metrics.errors[kind] += 1
+                if kind.retryable:
+                    breaker.record_failure()
+                else:
+                    # Not an availability problem, so it doesn't count against the model
+                    breaker.record_success()
+
+                if (
+                    not kind.retryable
+                    or produced_events
+                    or attempt >= self.max_attempts
+                ):
+                    self.metrics.failures += 1
+                    raise
+                if not self.retry_budget.withdraw():
+                    self.metrics.retries_denied += 1
+                    self.metrics.failures += 1
+                    raise
+
+                delay = self.backoff(attempt)
+                self.metrics.retries += 1
+                self.metrics.backoff_seconds += delay
+                if self.on_retry:
+                    self.on_retry(attempt, delay, e)
+                await self.sleep(delay)
+                if new_message and await self._message_appended(
+                    user_id, session_id, new_message
+                ):
+                    new_message = None
+                continue
+            except BaseException:
+                # Cancelled or closed by the consumer, which says nothing
+                # about the model, but a claimed trial call must be given back
+                breaker.release_trial()
+                raise
+
+            breaker.record_success()
+            self.metrics.successes += 1
+            return
@@ -0,0 +1,7 @@
+"""Session service package for agent configuration system."""
+
+from .session_factory import create_session_service
+
+__all__: list[str] = [
+    "create_session_service",
+]
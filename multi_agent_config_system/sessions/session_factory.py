@@ -0,0 +1,64 @@
+import os
+from typing import Any, Dict, List, Optional
+
+from google.adk.sessions import (
+    BaseSessionService,
+    DatabaseSessionService,
+    InMemorySessionService,
+)
+
+# Session service types for session.service_type in app_config.yaml
+SESSION_SERVICE_TYPES: List[str] = [
+    "InMemorySessionService",
+    "DatabaseSessionService",
+]
+
+
+def _database_url(session_config: Dict[str, Any]) -> str:
+    """Get the database URL, preferring the SESSION_DB_URL environment variable."""
+    db_url = os.getenv("SESSION_DB_URL") or session_config.get("db_url")
+    if not db_url:
+        raise ValueError(
+            "DatabaseSessionService needs session.db_url in app_config.yaml "
+            "or the SESSION_DB_URL environment variable"
+        )
+    return db_url
+
+
+def create_session_service(
+    service_type: str, session_config: Optional[Dict[str, Any]] = None
+) -> BaseSessionService:
+    """Create the session service named by session.service_type.
+
+    Args:
+        service_type: One of SESSION_SERVICE_TYPES
+        session_config: The session section of the app config, with the
+            database URL, driver and pool settings
+
+    Returns:
+        The session service
+
+    Raises:
+        ValueError: If the service type is unknown or the database URL is missing
+    """
+    session_config = session_config or {}
+
+    if service_type == "InMemorySessionService":
+        return InMemorySessionService()
+
+    if service_type == "DatabaseSessionService":
+        db_url = _database_url(session_config)
+        # SQLite connections aren't pooled the way server databases are
+        engine_options: Dict[str, Any] = (
+            {} if db_url.startswith("sqlite") else dict(session_config.get("pool", {}))
+        )
+        if session_config.get("async_driver", False):
+            from utils.async_session_service import AsyncDatabaseSessionService
+
+            return AsyncDatabaseSessionService(db_url=db_url, **engine_options)
+        return DatabaseSessionService(db_url=db_url, **engine_options)
+
+    raise ValueError(
+        f"Unknown session service type: {service_type}. "
+        f"Expected one of {', '.join(SESSION_SERVICE_TYPES)}"
+    )
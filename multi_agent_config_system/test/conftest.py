@@ -0,0 +1,20 @@
+"""
+Configuration file for pytest.
+This file is automatically loaded by pytest.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the path
+parent_dir: Path = Path(__file__).parent.parent
+sys.path.append(str(object=parent_dir))
+
+
+@pytest.fixture(autouse=True)
+def project_config_package(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Resolve `config` to this project's package, not another example's config.py."""
+    monkeypatch.syspath_prepend(str(parent_dir))
+    monkeypatch.delitem(sys.modules, "config", raising=False)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled agent bundle.
+This script tests building, loading and validating a bundle of the project's agents.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from agent_config import (
+    AgentConfigManager,
+    AgentFactory,
+    build_bundle,
+    hash_sources,
+    load_bundle,
+    save_bundle,
+)
+from tools import registry
+
+PROJECT_DIR: Path = Path(__file__).parent.parent
+CONFIG_DIR: str = str(PROJECT_DIR / "config" / "agents")
+TEMPLATE_DIR: str = str(PROJECT_DIR / "templates")
+INITIAL_STATE: dict = {
+    "user_name": "John Doe",
+    "purchased_courses": [],
+    "interaction_history": [],
+}
+
+
+def _build_tree(config_manager: AgentConfigManager) -> dict[str, str]:
+    """Build the customer service tree and return each agent's static instruction."""
+    root = AgentFactory(config_manager, per_session_instructions=True).create_agent(
+        "customer_service", state_variables=INITIAL_STATE
+    )
+    return {
+        agent.name: agent.instruction.static_instruction
+        for agent in [root, *root.sub_agents]
+    }
+
+
+def test_bundle_replaces_yaml_and_templates(tmp_path: Path) -> None:
+    """A tree built from the bundle matches one built from the sources."""
+    bundle_path: Path = tmp_path / "agents.bundle"
+    content_hash: str = save_bundle(
+        build_bundle(AgentConfigManager(CONFIG_DIR, TEMPLATE_DIR), INITIAL_STATE),
+        bundle_path,
+    )
+    bundle = load_bundle(bundle_path)
+    assert bundle.content_hash == content_hash
+    assert sorted(bundle.configs) == sorted(
+        path.stem for path in Path(CONFIG_DIR).glob("*.yaml")
+    )
+
+    bundled = AgentConfigManager(CONFIG_DIR, TEMPLATE_DIR, bundle=bundle)
+    assert _build_tree(bundled) == _build_tree(
+        AgentConfigManager(CONFIG_DIR, TEMPLATE_DIR)
+    )
+    assert not bundled.parse_counts
+    assert bundled.template_stats.compiles == 0
+
+    with pytest.raises(ValueError):
+        AgentConfigManager(
+            CONFIG_DIR, TEMPLATE_DIR, environment="development", bundle=bundle
+        )
+
+
+def test_invalid_bundles_are_rejected(tmp_path: Path) -> None:
+    """Corrupted bundles and bundles of another format version fail to load."""
+    bundle_path: Path = tmp_path / "agents.bundle"
+    save_bundle(
+        build_bundle(AgentConfigManager(CONFIG_DIR, TEMPLATE_DIR), INITIAL_STATE),
+        bundle_path,
+    )
+    data: bytes = bundle_path.read_bytes()
+
+    bundle_path.write_bytes(data[:-1] + bytes([data[-1] ^ 1]))
+    with pytest.raises(ValueError, match="corrupted"):
+        load_bundle(bundle_path)
+
+    # The format version follows the 8 magic bytes
+    bundle_path.write_bytes(data[:8] + (999).to_bytes(4, "big") + data[12:])
+    with pytest.raises(ValueError, match="format version 999"):
+        load_bundle(bundle_path)
+
+
+def test_stale_bundles_are_rejected(tmp_path: Path) -> None:
+    """A bundle fails to load once its agent configs or templates change."""
+    config_dir: Path = tmp_path / "agents"
+    template_dir: Path = tmp_path / "templates"
+    shutil.copytree(CONFIG_DIR, config_dir)
+    shutil.copytree(TEMPLATE_DIR, template_dir)
+    bundle_path: Path = tmp_path / "agents.bundle"
+    save_bundle(
+        build_bundle(
+            AgentConfigManager(str(config_dir), str(template_dir)), INITIAL_STATE
+        ),
+        bundle_path,
+    )
+    assert load_bundle(bundle_path, hash_sources(config_dir, template_dir))
+
+    template: Path = template_dir / "shared" / "professional_tone.j2"
+    template.write_text(template.read_text() + "\nBe brief.\n")
+    with pytest.raises(ValueError, match="stale"):
+        load_bundle(bundle_path, hash_sources(config_dir, template_dir))
+
+    # Sources checked out elsewhere hash the same
+    assert hash_sources(config_dir, template_dir) == hash_sources(
+        shutil.copytree(config_dir, tmp_path / "copy" / "agents"),
+        shutil.copytree(template_dir, tmp_path / "copy" / "templates"),
+    )
+
+
+def test_changed_tool_modules_make_bundles_stale(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Editing a tool's module invalidates the declarations in the bundle."""
+    module: Path = tmp_path / "bundled_greeting_tools.py"
+    module.write_text(
+        "def greet(name: str) -> str:\n"
+        '    """Greet someone."""\n'
+        '    return f"Hello {name}"\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry.register_lazy_tool("bundled_greet", "bundled_greeting_tools:greet")
+
+    bundle_path: Path = tmp_path / "agents.bundle"
+    save_bundle(
+        build_bundle(AgentConfigManager(CONFIG_DIR, TEMPLATE_DIR), INITIAL_STATE),
+        bundle_path,
+    )
+    assert load_bundle(bundle_path, hash_sources(CONFIG_DIR, TEMPLATE_DIR))
+
+    # A new parameter changes the tool's function declaration
+    module.write_text(module.read_text().replace("name: str", "name: str, title: str"))
+    with pytest.raises(ValueError, match="stale"):
+        load_bundle(bundle_path, hash_sources(CONFIG_DIR, TEMPLATE_DIR))
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_bundle_replaces_yaml_and_templates,
+        test_invalid_bundles_are_rejected,
+        test_stale_bundles_are_rejected,
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
+    with tempfile.TemporaryDirectory() as directory:
+        test_changed_tool_modules_make_bundles_stale(
+            Path(directory), pytest.MonkeyPatch()
+        )
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for building agent graphs.
+This script tests shared sub-agents, cycle detection and build times with temporary configs.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from agent_config import AgentConfigManager, AgentFactory
+
+
+def _write_agents(
+    tmp_path: Path, sub_agents: dict[str, list[str]]
+) -> AgentConfigManager:
+    """Write an agent config and template for each agent in a graph."""
+    config_dir: Path = tmp_path / "agents"
+    template_dir: Path = tmp_path / "templates"
+    config_dir.mkdir()
+    template_dir.mkdir()
+    for agent_id, sub_agent_ids in sub_agents.items():
+        (template_dir / f"{agent_id}.j2").write_text(f"You are {agent_id}.")
+        (config_dir / f"{agent_id}.yaml").write_text(
+            f'name: "{agent_id}"\n'
+            'model: "gemini-2.0-flash"\n'
+            f'description: "{agent_id}"\n'
+            f'instruction_template: "{agent_id}.j2"\n'
+            f"sub_agents: {sub_agent_ids}\n"
+            "tools: []\n"
+        )
+    return AgentConfigManager(str(config_dir), str(template_dir))
+
+
+def test_shared_sub_agent_is_prepared_once(tmp_path: Path) -> None:
+    """A sub-agent with two parents is rendered once and built for each parent."""
+    config_manager = _write_agents(
+        tmp_path,
+        {
+            "root": ["sales", "support"],
+            "sales": ["billing"],
+            "support": ["billing"],
+            "billing": [],
+        },
+    )
+    agent_factory = AgentFactory(config_manager, max_workers=4)
+    root = agent_factory.create_agent("root")
+
+    sales_billing = root.find_agent("sales").sub_agents[0]
+    support_billing = root.find_agent("support").sub_agents[0]
+    assert sales_billing.name == support_billing.name == "billing"
+    assert sales_billing is not support_billing
+    assert sales_billing.parent_agent.name == "sales"
+    assert support_billing.parent_agent.name == "support"
+    assert config_manager.template_stats.renders == 4
+    assert set(agent_factory.build_times) == {"root", "sales", "support", "billing"}
+
+    # Cached agents are reused as roots
+    assert agent_factory.create_agent("root") is root
+
+
+def test_cycle_is_reported(tmp_path: Path) -> None:
+    """Agents that reference each other raise ValueError naming the cycle."""
+    config_manager = _write_agents(tmp_path, {"root": ["a"], "a": ["b"], "b": ["a"]})
+    with pytest.raises(ValueError, match="a -> b -> a"):
+        AgentFactory(config_manager).create_agent("root")
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (test_shared_sub_agent_is_prepared_once, test_cycle_is_reported):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
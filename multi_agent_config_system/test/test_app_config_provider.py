@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the memoized app config provider.
+This script tests loading, freezing and reloading a temporary copy of the app config.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+# The tests import config once conftest has put this project first on sys.path
+CONFIG_DIR: Path = Path(__file__).parent.parent / "config"
+
+
+def test_config_is_loaded_once_and_frozen(tmp_path: Path) -> None:
+    """The default and the explicit environment share one frozen instance."""
+    from config.app_config_loader import AppConfig, AppConfigProvider
+
+    shutil.copy(CONFIG_DIR / "app_config.yaml", tmp_path / "app_config.yaml")
+    provider = AppConfigProvider(tmp_path / "app_config.yaml")
+
+    app_config: AppConfig = provider.get()
+    assert provider.get() is app_config
+    assert provider.get(app_config.environment) is app_config
+    assert provider.loads == 1
+    with pytest.raises(ValidationError):
+        app_config.app_name = "Changed"
+
+
+def test_nested_sections_are_read_only(tmp_path: Path) -> None:
+    """Nested config sections can't be changed; thaw() gives a mutable copy."""
+    from config.app_config_loader import AppConfig, AppConfigProvider, thaw
+
+    shutil.copy(CONFIG_DIR / "app_config.yaml", tmp_path / "app_config.yaml")
+    app_config: AppConfig = AppConfigProvider(tmp_path / "app_config.yaml").get()
+
+    with pytest.raises(TypeError):
+        app_config.courses["ai_marketing_platform"]["price"] = 0
+    with pytest.raises(TypeError):
+        app_config.session_settings["initial_state"]["purchased_courses"] = []
+    with pytest.raises(AttributeError):
+        app_config.initial_state["purchased_courses"].append("course")
+
+    initial_state: dict = thaw(app_config.initial_state)
+    initial_state["purchased_courses"].append("course")
+    assert initial_state["purchased_courses"] == ["course"]
+    assert app_config.initial_state["purchased_courses"] == ()
+
+
+def test_reload_calls_back_with_changed_config(tmp_path: Path) -> None:
+    """reload() re-reads the file and reports configurations that changed."""
+    from config.app_config_loader import AppConfig, AppConfigProvider
+
+    config_path: Path = tmp_path / "app_config.yaml"
+    shutil.copy(CONFIG_DIR / "app_config.yaml", config_path)
+    provider = AppConfigProvider(config_path)
+    reloaded: list[AppConfig] = []
+    provider.add_callback(reloaded.append)
+    old_config: AppConfig = provider.get()
+
+    provider.reload()
+    assert reloaded == []
+
+    config_path.write_text(
+        config_path.read_text().replace('name: "Customer Service"', 'name: "Support"')
+    )
+    provider.reload()
+    assert [config.app_name for config in reloaded] == ["Support"]
+    assert provider.get() is reloaded[0]
+    assert provider.get(old_config.environment) is reloaded[0]
+    assert old_config.app_name == "Customer Service"
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_config_is_loaded_once_and_frozen,
+        test_nested_sections_are_read_only,
+        test_reload_calls_back_with_changed_config,
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the agent config cache and hot reload.
+This script tests YAML caching and agent rebuilds against a temporary copy of the configs.
+"""
+
+import shutil
+from pathlib import Path
+
+from agent_config import AgentConfigManager, AgentFactory, ConfigWatcher
+
+PROJECT_DIR: Path = Path(__file__).parent.parent
+
+
+def _copy_configs(tmp_path: Path) -> tuple[Path, Path]:
+    """Copy the agent configs and templates into a temporary directory."""
+    config_dir: Path = tmp_path / "agents"
+    template_dir: Path = tmp_path / "templates"
+    shutil.copytree(PROJECT_DIR / "config" / "agents", config_dir)
+    shutil.copytree(PROJECT_DIR / "templates", template_dir)
+    return config_dir, template_dir
+
+
+def test_each_config_file_is_parsed_once(tmp_path: Path) -> None:
+    """Building the agent tree parses every agent config exactly once."""
+    config_dir, template_dir = _copy_configs(tmp_path)
+    config_manager = AgentConfigManager(str(config_dir), str(template_dir))
+    AgentFactory(config_manager).create_agent("customer_service")
+
+    assert len(config_manager.parse_counts) == len(list(config_dir.glob("*.yaml")))
+    assert set(config_manager.parse_counts.values()) == {1}
+
+
+def test_changed_files_rebuild_the_agent_tree(tmp_path: Path) -> None:
+    """Editing a sub-agent's config or template rebuilds the root agent."""
+    config_dir, template_dir = _copy_configs(tmp_path)
+    config_manager = AgentConfigManager(str(config_dir), str(template_dir))
+    agent_factory = AgentFactory(config_manager)
+    root = agent_factory.create_agent("customer_service")
+    rebuilt: list[tuple[str, object]] = []
+    agent_factory.rebuild_callbacks.append(
+        lambda agent_id, agent: rebuilt.append((agent_id, agent))
+    )
+    watcher = ConfigWatcher(
+        str(config_dir), str(template_dir), on_change=agent_factory.rebuild_changed
+    )
+    assert watcher.check() == set()
+
+    template: Path = template_dir / "policy_agent" / "main.j2"
+    template.write_text(template.read_text() + "\nAlways mention the refund window.\n")
+    assert watcher.check() == {template.resolve()}
+    assert [agent_id for agent_id, _ in rebuilt] == ["customer_service"]
+    new_root = rebuilt[0][1]
+    assert new_root is not root
+    policy_agent = new_root.find_agent("policy_agent")
+    assert "Always mention the refund window." in policy_agent.instruction
+
+    config: Path = config_dir / "sales_agent.yaml"
+    config.write_text(
+        config.read_text().replace(
+            'model: "gemini-2.0-flash"', 'model: "gemini-2.5-flash"'
+        )
+    )
+    watcher.check()
+    assert len(rebuilt) == 2
+    assert rebuilt[1][1].find_agent("sales_agent").model == "gemini-2.5-flash"
+    assert config_manager.parse_counts[config.resolve()] == 2
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_each_config_file_is_parsed_once,
+        test_changed_files_rebuild_the_agent_tree,
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
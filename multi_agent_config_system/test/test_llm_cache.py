@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Test script for the model response cache.
+This script tests cache hits and misses, failed model calls, the SQLite tier, expiry and per-agent opt-in.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import Agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import errors, types
+
+from agent_config import AgentConfigManager, AgentFactory
+from utils.llm_cache import (
+    LlmResponseCache,
+    cache_hit,
+    request_cache_key,
+    strip_tagged_blocks,
+)
+from utils.mock_llm import MockLlm
+
+APP_NAME: str = "Customer Service"
+USER_ID: str = "john_doe"
+
+
+class CountingMockLlm(MockLlm):
+    """MockLlm that counts its calls."""
+
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        async for response in super().generate_content_async(llm_request, stream):
+            yield response
+
+
+async def _ask(
+    cache: LlmResponseCache, model: CountingMockLlm, text: str, stream: bool = False
+) -> tuple[str, bool]:
+    """Ask a question in a new session; return the answer and whether it was cached."""
+    agent = cache.enable_for(
+        Agent(
+            name="customer_service_agent",
+            model=model,
+            description="Customer service agent",
+            instruction="Answer questions about the course.",
+        )
+    )
+    session_service = InMemorySessionService()
+    runner = Runner(app_name=APP_NAME, agent=agent, session_service=session_service)
+    session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE if stream else None)
+    async for event in runner.run_async(
+        user_id=USER_ID,
+        session_id=session.id,
+        new_message=types.Content(role="user", parts=[types.Part(text=text)]),
+        run_config=run_config,
+    ):
+        if event.is_final_response():
+            return event.content.parts[0].text, cache_hit(event)
+    raise AssertionError("no final response")
+
+
+def test_repeated_requests_are_served_from_cache() -> None:
+    """An identical request is answered from the cache without calling the model."""
+
+    async def run() -> None:
+        cache = LlmResponseCache(max_entries=8)
+        model = CountingMockLlm()
+
+        assert await _ask(cache, model, "what's the course price") == (
+            "echo: what's the course price",
+            False,
+        )
+        assert await _ask(cache, model, "what's the course price") == (
+            "echo: what's the course price",
+            True,
+        )
+        assert await _ask(cache, model, "what's the refund policy") == (
+            "echo: what's the refund policy",
+            False,
+        )
+        assert model.calls == 2
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 2, 2)
+        assert stats["hit_rate"] == 1 / 3
+
+    asyncio.run(run())
+
+
+def test_streamed_responses_are_stored_complete() -> None:
+    """Only the complete response of a streamed answer is cached."""
+
+    async def run() -> None:
+        cache = LlmResponseCache()
+        model = CountingMockLlm()
+        assert await _ask(cache, model, "hello there", stream=True) == (
+            "echo: hello there",
+            False,
+        )
+        assert cache.stores == 1
+        assert await _ask(cache, model, "hello there") == ("echo: hello there", True)
+        assert model.calls == 1
+
+    asyncio.run(run())
+
+
+def test_sqlite_tier_outlives_the_process_cache_and_expires(tmp_path: Path) -> None:
+    """Responses in the SQLite file are found by a new cache until they expire."""
+
+    async def run() -> None:
+        db_path = tmp_path / "llm_cache.db"
+        first = LlmResponseCache(db_path=db_path, ttl_seconds=0.3)
+        await _ask(first, CountingMockLlm(), "hello")
+        first.close()
+
+        second = LlmResponseCache(db_path=db_path, ttl_seconds=0.3)
+        model = CountingMockLlm()
+        assert await _ask(second, model, "hello") == ("echo: hello", True)
+        assert await _ask(second, model, "hello") == ("echo: hello", True)
+        assert (second.disk_hits, second.memory_hits) == (1, 1)
+
+        time.sleep(0.35)
+        assert await _ask(second, model, "hello") == ("echo: hello", False)
+        assert model.calls == 1
+        second.close()
+
+    asyncio.run(run())
+
+
+def test_cache_key_ignores_function_call_ids() -> None:
+    """Requests that differ only in ADK's function call IDs get the same key."""
+
+    def request(call_id: str) -> LlmRequest:
+        return LlmRequest(
+            model="gemini-2.0-flash",
+            config=types.GenerateContentConfig(system_instruction="Be brief."),
+            contents=[
+                types.Content(
+                    role="model",
+                    parts=[
+                        types.Part(
+                            function_call=types.FunctionCall(
+                                id=call_id, name="get_cpu_info", args={}
+                            )
+                        )
+                    ],
+                )
+            ],
+        )
+
+    assert request_cache_key(request("adk-1")) == request_cache_key(request("adk-2"))
+    other = request("adk-1")
+    other.config.system_instruction = "Be detailed."
+    assert request_cache_key(other) != request_cache_key(request("adk-1"))
+
+
+def test_ignored_blocks_are_left_out_of_the_key() -> None:
+    """Requests that differ only inside an ignored instruction block match."""
+
+    def request(history: str) -> LlmRequest:
+        return LlmRequest(
+            model="gemini-2.0-flash",
+            config=types.GenerateContentConfig(
+                system_instruction="Be brief.\n<interaction_history>\n"
+                f"{history}\n</interaction_history>"
+            ),
+        )
+
+    normalize = strip_tagged_blocks(["interaction_history"])
+    assert request_cache_key(request("[]"), normalize) == request_cache_key(
+        request("[{'action': 'user_query'}]"), normalize
+    )
+    assert request_cache_key(request("[]")) != request_cache_key(
+        request("[{'action': 'user_query'}]")
+    )
+
+
+def test_agent_cache_ignores_interaction_history() -> None:
+    """A repeated question hits the cache even though the history differs."""
+
+    async def run() -> None:
+        cache = LlmResponseCache()
+        model = CountingMockLlm()
+        agent = cache.enable_for(
+            Agent(
+                name="customer_service_agent",
+                model=model,
+                description="Customer service agent",
+                instruction="Answer questions about the course.\n"
+                "<interaction_history>{interaction_history}</interaction_history>",
+            ),
+            ignore_blocks=["interaction_history"],
+        )
+        session_service = InMemorySessionService()
+        runner = Runner(app_name=APP_NAME, agent=agent, session_service=session_service)
+        hits: list[bool] = []
+        for history in ([], [{"action": "user_query", "query": "hi"}]):
+            session = await session_service.create_session(
+                app_name=APP_NAME,
+                user_id=USER_ID,
+                state={"interaction_history": history},
+            )
+            async for event in runner.run_async(
+                user_id=USER_ID,
+                session_id=session.id,
+                new_message=types.Content(
+                    role="user", parts=[types.Part(text="what's the course price")]
+                ),
+            ):
+                if event.is_final_response():
+                    hits.append(cache_hit(event))
+        assert hits == [False, True]
+        assert model.calls == 1
+
+    asyncio.run(run())
+
+
+def test_failed_model_calls_leave_bounded_pending_keys() -> None:
+    """Keys of requests whose model call raised are dropped, not kept forever."""
+
+    async def run() -> None:
+        cache = LlmResponseCache(max_pending=2)
+        model = CountingMockLlm(fail_first=3)
+
+        for i in range(3):
+            with pytest.raises(errors.ServerError):
+                await _ask(cache, model, f"question {i}")
+        assert len(cache._pending) == 2
+        assert cache.stores == 0
+
+        assert await _ask(cache, model, "question 0") == ("echo: question 0", False)
+        assert await _ask(cache, model, "question 0") == ("echo: question 0", True)
+        assert cache.stores == 1
+        assert len(cache._pending) <= cache.max_pending
+
+    asyncio.run(run())
+
+
+def test_factory_enables_cache_for_agents_that_opt_in(tmp_path: Path) -> None:
+    """Only agents whose config sets cache: true get the cache callbacks."""
+    config_dir: Path = tmp_path / "agents"
+    template_dir: Path = tmp_path / "templates"
+    config_dir.mkdir()
+    template_dir.mkdir()
+    for agent_id, extra in (
+        (
+            "root",
+            "sub_agents: [helper]\ncache: true\n"
+            "cache_ignore_blocks: [interaction_history]\n",
+        ),
+        ("helper", ""),
+    ):
+        (template_dir / f"{agent_id}.j2").write_text(f"You are {agent_id}.")
+        (config_dir / f"{agent_id}.yaml").write_text(
+            f'name: "{agent_id}"\n'
+            'model: "gemini-2.0-flash"\n'
+            f'description: "{agent_id}"\n'
+            f'instruction_template: "{agent_id}.j2"\n'
+            "tools: []\n" + extra
+        )
+    cache = LlmResponseCache()
+    agent_factory = AgentFactory(
+        AgentConfigManager(str(config_dir), str(template_dir)), llm_cache=cache
+    )
+    root = agent_factory.create_agent("root")
+
+    assert root.canonical_before_model_callbacks == [cache.before_model_callback]
+    assert root.canonical_after_model_callbacks == [cache.after_model_callback]
+    assert root.sub_agents[0].canonical_before_model_callbacks == []
+    assert set(cache._normalizers) == {"root"}
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    test_repeated_requests_are_served_from_cache()
+    test_streamed_responses_are_stored_complete()
+    test_cache_key_ignores_function_call_ids()
+    test_ignored_blocks_are_left_out_of_the_key()
+    test_agent_cache_ignores_interaction_history()
+    test_failed_model_calls_leave_bounded_pending_keys()
+    with tempfile.TemporaryDirectory() as directory:
+        test_sqlite_tier_outlives_the_process_cache_and_expires(Path(directory))
+    with tempfile.TemporaryDirectory() as directory:
+        test_factory_enables_cache_for_agents_that_opt_in(Path(directory))
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Test script for the resilient runner.
+This script tests retries, error classification, circuit breakers and retry budgets.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.agents.run_config import RunConfig
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import errors, types
+
+from resilience import CircuitOpenError, ErrorKind, ResilientRunner, classify_error
+from utils.mock_llm import MockLlm
+
+MESSAGE = types.Content(role="user", parts=[types.Part(text="hi")])
+
+
+def _api_error(code: int) -> errors.APIError:
+    """Create the error the model API raises for a status code."""
+    error_class = errors.ServerError if code >= 500 else errors.ClientError
+    return error_class(code, {"error": {"code": code, "message": "", "status": ""}})
+
+
+class ScriptedRunner:
+    """Runner that raises the scripted errors, then yields one event per run."""
+
+    def __init__(self, *failures: BaseException):
+        self.agent = SimpleNamespace(model="gemini-2.0-flash")
+        self.app_name = "Scripted"
+        self.session_service = InMemorySessionService()
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def run_async(self, *, user_id, session_id, new_message, run_config):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        yield f"{session_id}: done"
+
+
+class HangingRunner(ScriptedRunner):
+    """Runner that hangs until cancelled while hang is set."""
+
+    def __init__(self, *failures: BaseException):
+        super().__init__(*failures)
+        self.hang = False
+        self.started = asyncio.Event()
+
+    async def run_async(self, *, user_id, session_id, new_message, run_config):
+        if self.hang:
+            self.calls += 1
+            self.started.set()
+            await asyncio.Event().wait()
+        async for event in super().run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=new_message,
+            run_config=run_config,
+        ):
+            yield event
+
+
+class FakeClock:
+    """Clock and sleep that only advance when slept on."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _resilient(runner: ScriptedRunner, clock: FakeClock, **settings) -> ResilientRunner:
+    return ResilientRunner(
+        runner, sleep=clock.sleep, clock=clock, rng=lambda: 1.0, **settings
+    )
+
+
+async def _run(resilient_runner: ResilientRunner, session_id: str = "s1") -> list:
+    return [
+        event
+        async for event in resilient_runner.run_async(
+            user_id="u", session_id=session_id, new_message=MESSAGE
+        )
+    ]
+
+
+def test_errors_are_classified_by_type() -> None:
+    """Errors are classified by their type and status code."""
+    assert classify_error(_api_error(503)) is ErrorKind.OVERLOADED
+    assert classify_error(_api_error(429)) is ErrorKind.RATE_LIMITED
+    assert classify_error(_api_error(400)) is ErrorKind.CLIENT
+    assert classify_error(ConnectionResetError()) is ErrorKind.NETWORK
+    # A message that mentions 503 isn't an overloaded model
+    assert classify_error(ValueError("order 503 not found")) is ErrorKind.OTHER
+
+
+def test_overloaded_model_is_retried_with_backoff() -> None:
+    """Retryable errors are retried after exponentially growing delays."""
+    clock = FakeClock()
+    runner = ScriptedRunner(_api_error(503), _api_error(503))
+    resilient_runner = _resilient(runner, clock, base_delay=1.0)
+
+    assert asyncio.run(_run(resilient_runner)) == ["s1: done"]
+    assert clock.sleeps == [1.0, 2.0]
+    assert resilient_runner.metrics.as_dict()["retries"] == 2
+    assert resilient_runner.metrics.as_dict()["errors.overloaded"] == 2
+
+
+def test_client_errors_are_not_retried() -> None:
+    """Errors that would fail again are raised at once."""
+    clock = FakeClock()
+    runner = ScriptedRunner(_api_error(400))
+    with pytest.raises(errors.ClientError):
+        asyncio.run(_run(_resilient(runner, clock)))
+    assert runner.calls == 1
+    assert clock.sleeps == []
+
+
+def test_circuit_breaker_opens_and_recovers() -> None:
+    """After enough failures the model is not called until the reset timeout."""
+    clock = FakeClock()
+    runner = ScriptedRunner(*[_api_error(503)] * 3)
+    resilient_runner = _resilient(
+        runner, clock, max_attempts=3, failure_threshold=2, reset_timeout=10.0
+    )
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(_run(resilient_runner))
+    assert runner.calls == 2
+    assert resilient_runner.breaker("gemini-2.0-flash").state == "open"
+
+    # The trial call after the timeout fails and opens the breaker again
+    clock.now += 10.0
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(_run(resilient_runner))
+    assert runner.calls == 3
+
+    clock.now += 10.0
+    assert asyncio.run(_run(resilient_runner)) == ["s1: done"]
+    assert resilient_runner.breaker("gemini-2.0-flash").state == "closed"
+    assert resilient_runner.metrics.circuit_rejections == 2
+
+
+def test_cancelled_trial_call_releases_the_breaker() -> None:
+    """A half-open trial call that is cancelled doesn't keep the breaker shut."""
+
+    async def run() -> None:
+        clock = FakeClock()
+        runner = HangingRunner(_api_error(503))
+        resilient_runner = _resilient(
+            runner, clock, max_attempts=1, failure_threshold=1, reset_timeout=10.0
+        )
+        with pytest.raises(errors.ServerError):
+            await _run(resilient_runner)
+        breaker = resilient_runner.breaker("gemini-2.0-flash")
+        assert breaker.state == "open"
+
+        clock.now += 10.0
+        runner.hang = True
+        task = asyncio.create_task(_run(resilient_runner))
+        await runner.started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert breaker.state == "half_open"
+
+        runner.hang = False
+        assert await _run(resilient_runner) == ["s1: done"]
+        assert breaker.state == "closed"
+
+    asyncio.run(run())
+
+
+def test_retry_budget_limits_retries() -> None:
+    """Retries stop when the retry budget is spent."""
+    clock = FakeClock()
+    runner = ScriptedRunner(*[_api_error(503)] * 3)
+    resilient_runner = _resilient(
+        runner, clock, max_attempts=5, retry_budget_ratio=0.0, retry_budget_burst=1
+    )
+    with pytest.raises(errors.ServerError):
+        asyncio.run(_run(resilient_runner))
+    assert runner.calls == 2
+    assert resilient_runner.metrics.retries_denied == 1
+
+
+def test_backoff_does_not_block_other_sessions() -> None:
+    """Other sessions finish while a request waits to be retried."""
+
+    async def run() -> list:
+        finished: list = []
+        slow = ResilientRunner(ScriptedRunner(_api_error(503)), base_delay=0.2)
+        fast = ResilientRunner(ScriptedRunner())
+
+        async def track(resilient_runner: ResilientRunner, session_id: str) -> None:
+            finished.extend(await _run(resilient_runner, session_id))
+
+        await asyncio.gather(track(slow, "slow"), track(fast, "fast"))
+        return finished
+
+    assert asyncio.run(run()) == ["fast: done", "slow: done"]
+
+
+def test_mock_model_503s_are_retried_in_a_workflow_agent() -> None:
+    """A mock model's injected 503s are retried through a real runner."""
+
+    async def run() -> None:
+        model = MockLlm(fail_first=2)
+        root_agent = SequentialAgent(
+            name="Pipeline", sub_agents=[Agent(name="Answerer", model=model)]
+        )
+        session_service = InMemorySessionService()
+        runner = Runner(
+            app_name="Pipeline", agent=root_agent, session_service=session_service
+        )
+        session = await session_service.create_session(app_name="Pipeline", user_id="u")
+        resilient_runner = ResilientRunner(runner, base_delay=0.0)
+
+        events = await _run(resilient_runner, session.id)
+        assert events[-1].content.parts[0].text == "echo: hi"
+        assert model.call_count == 3
+        assert resilient_runner.metrics.retries == 2
+        # Workflow agents have no model of their own
+        assert list(resilient_runner.breakers) == ["default"]
+
+    asyncio.run(run())
+
+
+def test_retries_append_the_user_message_once() -> None:
+    """A retried run reuses the user message the first attempt appended."""
+
+    async def run() -> None:
+        model = MockLlm(fail_first=2)
+        session_service = InMemorySessionService()
+        runner = Runner(
+            app_name="Answerer",
+            agent=Agent(name="Answerer", model=model),
+            session_service=session_service,
+        )
+        session = await session_service.create_session(app_name="Answerer", user_id="u")
+        resilient_runner = ResilientRunner(runner, base_delay=0.0)
+        run_config = RunConfig(max_llm_calls=10)
+
+        events = [
+            event
+            async for event in resilient_runner.run_async(
+                user_id="u",
+                session_id=session.id,
+                new_message=MESSAGE,
+                run_config=run_config,
+            )
+        ]
+        assert events[-1].content.parts[0].text == "echo: hi"
+        assert model.call_count == 3
+
+        session = await session_service.get_session(
+            app_name="Answerer", user_id="u", session_id=session.id
+        )
+        assert [event.author for event in session.events] == ["user", "Answerer"]
+        assert session.events[0].content == MESSAGE
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_errors_are_classified_by_type()
+    test_overloaded_model_is_retried_with_backoff()
+    test_client_errors_are_not_retried()
+    test_circuit_breaker_opens_and_recovers()
+    test_cancelled_trial_call_releases_the_breaker()
+    test_retry_budget_limits_retries()
+    test_backoff_does_not_block_other_sessions()
+    test_mock_model_503s_are_retried_in_a_workflow_agent()
+    test_retries_append_the_user_message_once()
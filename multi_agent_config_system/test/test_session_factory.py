@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test script for the session service factory.
+This script tests each configured session service type.
+"""
+
+from pathlib import Path
+
+import pytest
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
+
+from sessions import create_session_service
+
+
+def test_service_type_selects_the_backend(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """session.service_type picks the service, and database settings are applied."""
+    monkeypatch.delenv("SESSION_DB_URL", raising=False)
+    assert isinstance(
+        create_session_service("InMemorySessionService"), InMemorySessionService
+    )
+
+    with pytest.raises(ValueError, match="SESSION_DB_URL"):
+        create_session_service("DatabaseSessionService", {})
+    with pytest.raises(ValueError, match="Unknown session service type"):
+        create_session_service("RedisSessionService")
+
+    # The environment variable wins over db_url, and SQLite ignores the pool
+    monkeypatch.setenv("SESSION_DB_URL", f"sqlite:///{tmp_path / 'sessions.db'}")
+    database = create_session_service(
+        "DatabaseSessionService",
+        {"db_url": "sqlite:///unused.db", "pool": {"pool_size": 5, "max_overflow": 10}},
+    )
+    assert isinstance(database, DatabaseSessionService)
+    assert (tmp_path / "sessions.db").exists()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_service_type_selects_the_backend(Path(directory), pytest.MonkeyPatch())
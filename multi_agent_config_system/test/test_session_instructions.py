@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for per-session instruction rendering.
+This script tests that one agent tree renders each session's state into its instructions.
+"""
+
+import asyncio
+from pathlib import Path
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.sessions import InMemorySessionService
+
+from agent_config import AgentConfigManager, AgentFactory, SessionInstructionProvider
+from utils.interaction_history import HISTORY_STATE_KEY, default_compactor
+
+PROJECT_DIR: Path = Path(__file__).parent.parent
+INITIAL_STATE: dict = {
+    "user_name": "John Doe",
+    "purchased_courses": [],
+    "interaction_history": [],
+}
+
+
+def _config_manager() -> AgentConfigManager:
+    """Create a config manager for the project's agents and templates."""
+    return AgentConfigManager(
+        config_dir=str(PROJECT_DIR / "config" / "agents"),
+        template_dir=str(PROJECT_DIR / "templates"),
+    )
+
+
+def test_static_instruction_matches_full_rendering() -> None:
+    """Filling the static instruction gives the same text as rendering with the state."""
+    config_manager = _config_manager()
+    root = AgentFactory(config_manager, per_session_instructions=True).create_agent(
+        "customer_service", state_variables=INITIAL_STATE
+    )
+    state: dict = {
+        "user_name": "Jane Roe",
+        "purchased_courses": ["ai_marketing_platform"],
+        "interaction_history": [{"action": "user_query", "query": "refund"}],
+    }
+
+    # Sub-agent names match their config IDs
+    agents = [("customer_service", root)]
+    agents += [(sub_agent.name, sub_agent) for sub_agent in root.sub_agents]
+    for agent_id, agent in agents:
+        assert isinstance(agent.instruction, SessionInstructionProvider)
+        # State placeholders left by the full rendering are filled in by ADK
+        expected = SessionInstructionProvider(
+            config_manager.get_agent_instruction(agent_id, state)
+        ).render(state)
+        assert agent.instruction.render(state) == expected
+        assert "{user_name}" not in expected
+
+
+def test_one_agent_tree_serves_every_session() -> None:
+    """ADK asks the provider for each session's instruction."""
+
+    async def run() -> None:
+        root = AgentFactory(
+            _config_manager(), per_session_instructions=True
+        ).create_agent("customer_service", state_variables=INITIAL_STATE)
+        order_agent = root.find_agent("order_agent")
+        session_service = InMemorySessionService()
+        instructions: list[str] = []
+        for user_name, purchased_courses in [
+            ("Jane", ["ai_marketing_platform"]),
+            ("Joe", None),
+        ]:
+            state: dict = {"user_name": user_name}
+            if purchased_courses is not None:
+                state["purchased_courses"] = purchased_courses
+            session = await session_service.create_session(
+                app_name="Customer Service", user_id=user_name, state=state
+            )
+            context = ReadonlyContext(
+                InvocationContext(
+                    session_service=session_service,
+                    invocation_id="test",
+                    agent=order_agent,
+                    session=session,
+                )
+            )
+            (
+                instruction,
+                bypass_state_injection,
+            ) = await order_agent.canonical_instruction(context)
+            assert bypass_state_injection
+            instructions.append(instruction)
+
+        assert "Name: Jane" in instructions[0]
+        assert "Purchased Courses: ['ai_marketing_platform']" in instructions[0]
+        assert "Name: Joe" in instructions[1]
+        # Variables missing from the session fall back to the initial state
+        assert "Purchased Courses: []" in instructions[1]
+
+    asyncio.run(run())
+
+
+def test_state_formatters_render_the_compacted_history() -> None:
+    """The interaction history is rendered by its compactor, not with str()."""
+    root = AgentFactory(
+        _config_manager(),
+        per_session_instructions=True,
+        state_formatters={HISTORY_STATE_KEY: default_compactor.render},
+    ).create_agent("customer_service", state_variables=INITIAL_STATE)
+    compacted = default_compactor.fold(None, {"action": "user_query", "query": "hi"})
+
+    instruction = root.instruction.render(
+        {**INITIAL_STATE, HISTORY_STATE_KEY: compacted}
+    )
+    assert default_compactor.render(compacted) in instruction
+    assert compacted["version"] not in instruction
+
+
+if __name__ == "__main__":
+    test_static_instruction_matches_full_rendering()
+    test_one_agent_tree_serves_every_session()
+    test_state_formatters_render_the_compacted_history()
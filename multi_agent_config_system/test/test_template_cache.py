@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test script for the template bytecode cache.
+This script tests that a warm cache lets a new process skip template compilation.
+"""
+
+from pathlib import Path
+
+from agent_config import AgentConfigManager, AgentFactory
+
+PROJECT_DIR: Path = Path(__file__).parent.parent
+CONFIG_DIR: str = str(PROJECT_DIR / "config" / "agents")
+TEMPLATE_DIR: str = str(PROJECT_DIR / "templates")
+
+
+def test_warm_cache_skips_compilation(tmp_path: Path) -> None:
+    """After a pre-warm, a fresh manager builds the agent tree without compiling."""
+    cache_dir: str = str(tmp_path / "jinja_cache")
+    warm = AgentConfigManager(CONFIG_DIR, TEMPLATE_DIR, bytecode_cache_dir=cache_dir)
+    template_count: int = warm.prewarm_templates()
+    assert template_count == len(list(Path(TEMPLATE_DIR).rglob("*.j2")))
+    assert warm.template_stats.compiles == template_count
+
+    cold = AgentConfigManager(CONFIG_DIR, TEMPLATE_DIR, bytecode_cache_dir=cache_dir)
+    root = AgentFactory(cold).create_agent("customer_service")
+    assert cold.template_stats.compiles == 0
+    assert cold.template_stats.renders == 1 + len(root.sub_agents)
+    assert cold.template_stats.average_render_ms > 0
+
+    uncached = AgentConfigManager(CONFIG_DIR, TEMPLATE_DIR)
+    assert AgentFactory(uncached).create_agent("customer_service").instruction == (
+        root.instruction
+    )
+    assert uncached.template_stats.compiles > 0
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_warm_cache_skips_compilation(Path(directory))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the lazy tool registry.
+This script tests that tools are imported on first use and their declarations are cached.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from google.adk.models import LlmRequest
+from google.adk.utils.variant_utils import get_google_llm_variant
+from google.genai import types
+
+from tools import registry
+
+TOOL_MODULE: str = '''
+def greet(name: str) -> dict:
+    """Greets a user by name.
+
+    Args:
+        name: Name of the user
+    """
+    return {"greeting": f"Hello, {name}!"}
+'''
+
+
+def test_tool_module_is_imported_on_first_invocation(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A bundled declaration lets the model see a tool before it is imported."""
+    (tmp_path / "lazy_greeting_tools.py").write_text(TOOL_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry.register_lazy_tool("greet", "lazy_greeting_tools:greet")
+    declaration = types.FunctionDeclaration(name="greet", description="Greets a user")
+    registry.add_declarations({"greet": declaration}, get_google_llm_variant())
+
+    async def run() -> None:
+        tool = registry.get_tool_by_id("greet")
+        llm_request = LlmRequest()
+        await tool.process_llm_request(tool_context=None, llm_request=llm_request)
+        assert llm_request.tools_dict == {"greet": tool}
+        assert llm_request.config.tools[0].function_declarations == [declaration]
+        assert "lazy_greeting_tools" not in sys.modules
+
+        result = await tool.run_async(args={"name": "Ann"}, tool_context=None)
+        assert result == {"greeting": "Hello, Ann!"}
+        assert "lazy_greeting_tools" in registry.import_times
+
+    asyncio.run(run())
+
+
+def test_declarations_are_built_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Pre-warming imports a tool and builds its declaration for every later use."""
+    (tmp_path / "prewarmed_greeting_tools.py").write_text(TOOL_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry.register_lazy_tool("prewarmed_greet", "prewarmed_greeting_tools:greet")
+
+    registry.prewarm_tools(["prewarmed_greet"])
+    assert "prewarmed_greeting_tools" in sys.modules
+    declaration = registry.get_tool_declaration("prewarmed_greet")
+    assert declaration.name == "greet"
+    assert registry.get_tool_by_id("prewarmed_greet")._get_declaration() is declaration
+
+    with pytest.raises(KeyError):
+        registry.get_tool_by_id("unknown_tool")
+    with pytest.raises(KeyError):
+        registry.get_tool_by_id("missing_tools_module.greet")
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_tool_module_is_imported_on_first_invocation,
+        test_declarations_are_built_once,
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory), pytest.MonkeyPatch())
@@ -1,5 +1,19 @@
 """Tools package for agent configuration system."""
 
-from .registry import register_tool, get_tool_by_id
+from .registry import (
+    LazyTool,
+    get_tool_by_id,
+    import_times,
+    prewarm_tools,
+    register_lazy_tool,
+    register_tool,
+)
 
-__all__ = ["register_tool", "get_tool_by_id"]
+__all__ = [
+    "LazyTool",
+    "get_tool_by_id",
+    "import_times",
+    "prewarm_tools",
+    "register_lazy_tool",
+    "register_tool",
+]
@@ -3,8 +3,9 @@
 from datetime import datetime
 from typing import Any
 
-from config.app_config_loader import load_app_config
+from config.app_config_loader import AppConfig, app_config_provider, load_app_config
 from google.adk.tools.tool_context import ToolContext
+from utils.interaction_history import record_interaction
 
 # Load configuration
 _app_config = load_app_config()
@@ -17,6 +18,22 @@ COURSE_PRICE = _course_config["price"]
 REFUND_POLICY_DAYS = _course_config["refund_policy_days"]
 
 
+def _update_course_constants(app_config: AppConfig) -> None:
+    """Pick up course settings from a reloaded app config."""
+    global COURSE_ID, COURSE_NAME, COURSE_PRICE, REFUND_POLICY_DAYS
+
+    if app_config.environment != _app_config.environment:
+        return
+    course_config = app_config.courses["ai_marketing_platform"]
+    COURSE_ID = course_config["id"]
+    COURSE_NAME = course_config["name"]
+    COURSE_PRICE = course_config["price"]
+    REFUND_POLICY_DAYS = course_config["refund_policy_days"]
+
+
+app_config_provider.add_callback(_update_course_constants)
+
+
 def get_current_time() -> str:
     """Get current timestamp."""
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -72,17 +89,16 @@ def purchase_course(tool_context: ToolContext) -> dict[str, Any]:
     tool_context.state["purchased_courses"] = updated_courses
 
     # Add purchase to interaction history
-    current_interaction_history = tool_context.state.get("interaction_history", [])
-    current_interaction_history.append(
+    record_interaction(
+        tool_context.state,
         {
             "action": "purchase_course",
             "course_id": COURSE_ID,
             "course_name": COURSE_NAME,
             "price": COURSE_PRICE,
             "timestamp": current_time,
-        }
+        },
     )
-    tool_context.state["interaction_history"] = current_interaction_history
 
     return {
         "status": "success",
@@ -152,17 +168,16 @@ def refund_course(tool_context: ToolContext) -> dict[str, Any]:
     tool_context.state["purchased_courses"] = updated_courses
 
     # Add refund to interaction history
-    current_interaction_history = tool_context.state.get("interaction_history", [])
-    current_interaction_history.append(
+    record_interaction(
+        tool_context.state,
         {
             "action": "refund_course",
             "course_id": COURSE_ID,
             "course_name": COURSE_NAME,
             "price": COURSE_PRICE,
             "timestamp": current_time,
-        }
+        },
     )
-    tool_context.state["interaction_history"] = current_interaction_history
 
     return {
         "status": "success",
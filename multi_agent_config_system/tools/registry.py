@@ -1,16 +1,69 @@
 import importlib
-from typing import Callable
+import importlib.util
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
-# Import tools
-from .purchase_tools import demo_purchase_link, purchase_course, refund_course
+from google.adk.tools import BaseTool, FunctionTool, ToolContext
+from google.adk.utils.variant_utils import get_google_llm_variant
+from google.genai import types
 
-# Registry of available tools
-_TOOL_REGISTRY = {
-    "purchase_course": purchase_course,
-    "demo_purchase_link": demo_purchase_link,
-    "refund_course": refund_course,
+# Tools by ID, as "module:function" so their modules are only imported when used
+_TOOL_SPECS: Dict[str, str] = {
+    "purchase_course": "tools.purchase_tools:purchase_course",
+    "demo_purchase_link": "tools.purchase_tools:demo_purchase_link",
+    "refund_course": "tools.purchase_tools:refund_course",
 }
 
+# Tool functions that have been imported or registered directly
+_TOOL_REGISTRY: Dict[str, Callable] = {}
+
+# Function declarations by tool ID and API variant
+_DECLARATIONS: Dict[Tuple[str, str], types.FunctionDeclaration] = {}
+
+# Seconds spent importing each tool module
+import_times: Dict[str, float] = {}
+
+_lock = threading.RLock()
+
+
+class LazyTool(BaseTool):
+    """Proxy for a registered tool that imports the tool's module on first use.
+
+    The proxy is named after the tool's function, so the function is only
+    imported when the tool is invoked, or when its function declaration is
+    needed and not cached yet.
+    """
+
+    def __init__(self, tool_id: str, name: str):
+        """Initialize the tool proxy.
+
+        Args:
+            tool_id: Identifier of the registered tool
+            name: Name of the tool's function
+        """
+        super().__init__(name=name, description="")
+        self.tool_id = tool_id
+        self._tool: Optional[FunctionTool] = None
+
+    def resolve(self) -> FunctionTool:
+        """Import the tool's function if needed and wrap it in a FunctionTool."""
+        if self._tool is None:
+            self._tool = FunctionTool(resolve_tool(self.tool_id))
+            self.description = self._tool.description
+        return self._tool
+
+    def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
+        """Get the tool's cached function declaration."""
+        return get_tool_declaration(self.tool_id)
+
+    async def run_async(
+        self, *, args: Dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        """Run the tool, importing its function on the first call."""
+        return await self.resolve().run_async(args=args, tool_context=tool_context)
+
 
 def register_tool(tool_id: str, tool_fn: Callable) -> None:
     """Register a tool function with the registry.
@@ -19,11 +72,58 @@ def register_tool(tool_id: str, tool_fn: Callable) -> None:
         tool_id: Unique identifier for the tool
         tool_fn: The tool function
     """
-    _TOOL_REGISTRY[tool_id] = tool_fn
+    with _lock:
+        name = getattr(tool_fn, "__name__", type(tool_fn).__name__)
+        _TOOL_SPECS[tool_id] = f"{tool_fn.__module__}:{name}"
+        _TOOL_REGISTRY[tool_id] = tool_fn
+        _forget_declarations(tool_id)
+
+
+def register_lazy_tool(tool_id: str, spec: str) -> None:
+    """Register a tool without importing it.
+
+    Args:
+        tool_id: Unique identifier for the tool
+        spec: Where the tool function is, as "module:function"
+    """
+    with _lock:
+        _TOOL_SPECS[tool_id] = spec
+        _TOOL_REGISTRY.pop(tool_id, None)
+        _forget_declarations(tool_id)
+
 
+def get_tool_by_id(tool_id: str) -> LazyTool:
+    """Get a tool by its identifier.
 
-def get_tool_by_id(tool_id: str) -> Callable:
-    """Get a tool function by its identifier.
+    Tool IDs that aren't registered are read as "module.function" and
+    registered, after checking that the module exists. The module is only
+    imported when the tool is first used.
+
+    Args:
+        tool_id: Identifier for the tool
+
+    Returns:
+        A proxy for the tool
+
+    Raises:
+        KeyError: If tool_id is not registered and names no module
+    """
+    with _lock:
+        if tool_id not in _TOOL_SPECS:
+            module_path, _, function_name = tool_id.rpartition(".")
+            try:
+                found = bool(module_path) and importlib.util.find_spec(module_path)
+            except ImportError:
+                found = False
+            if not found:
+                raise KeyError(f"Tool not found: {tool_id}")
+            _TOOL_SPECS[tool_id] = f"{module_path}:{function_name}"
+
+        return LazyTool(tool_id, _TOOL_SPECS[tool_id].rpartition(":")[2])
+
+
+def resolve_tool(tool_id: str) -> Callable:
+    """Get a tool's function, importing its module on first use.
 
     Args:
         tool_id: Identifier for the tool
@@ -32,17 +132,115 @@ def get_tool_by_id(tool_id: str) -> Callable:
         The tool function
 
     Raises:
-        KeyError: If tool_id is not registered
+        KeyError: If the tool is not registered or can't be imported
     """
-    if tool_id not in _TOOL_REGISTRY:
-        # Try to dynamically import the tool
-        module_path, function_name = tool_id.rsplit(".", 1)
+    with _lock:
+        if tool_id in _TOOL_REGISTRY:
+            return _TOOL_REGISTRY[tool_id]
+        if tool_id not in _TOOL_SPECS:
+            raise KeyError(f"Tool not found: {tool_id}")
+
+        module_path, _, function_name = _TOOL_SPECS[tool_id].partition(":")
         try:
+            start = time.perf_counter()
             module = importlib.import_module(module_path)
+            import_times.setdefault(module_path, time.perf_counter() - start)
             tool_fn = getattr(module, function_name)
-            register_tool(tool_id, tool_fn)
-            return tool_fn
         except (ImportError, AttributeError) as e:
             raise KeyError(f"Tool not found: {tool_id}") from e
 
-    return _TOOL_REGISTRY[tool_id]
+        _TOOL_REGISTRY[tool_id] = tool_fn
+        return tool_fn
+
+
+def get_tool_declaration(tool_id: str) -> Optional[types.FunctionDeclaration]:
+    """Get the function declaration the model sees for a tool.
+
+    Declarations are built once per tool and API variant, instead of on
+    every LLM request.
+
+    Args:
+        tool_id: Identifier for the tool
+
+    Returns:
+        The function declaration
+    """
+    key = (tool_id, get_google_llm_variant())
+    with _lock:
+        if key not in _DECLARATIONS:
+            _DECLARATIONS[key] = FunctionTool(resolve_tool(tool_id))._get_declaration()
+        return _DECLARATIONS[key]
+
+
+def get_cached_declarations(
+    variant: Optional[str] = None,
+) -> Dict[str, types.FunctionDeclaration]:
+    """Get the cached function declarations for an API variant.
+
+    Args:
+        variant: API variant, or None for the current one
+
+    Returns:
+        Function declarations by tool ID
+    """
+    variant = variant or get_google_llm_variant()
+    with _lock:
+        return {
+            tool_id: declaration
+            for (tool_id, declaration_variant), declaration in _DECLARATIONS.items()
+            if declaration_variant == variant
+        }
+
+
+def add_declarations(
+    declarations: Dict[str, types.FunctionDeclaration], variant: str
+) -> None:
+    """Add function declarations built earlier, e.g. in an agent bundle.
+
+    Args:
+        declarations: Function declarations by tool ID
+        variant: API variant the declarations were built for
+    """
+    with _lock:
+        for tool_id, declaration in declarations.items():
+            _DECLARATIONS.setdefault((tool_id, variant), declaration)
+
+
+def get_tool_source_files() -> Dict[str, Optional[Path]]:
+    """Get the source files of the registered tools' modules.
+
+    The files are found through the tool specs without importing the
+    modules, e.g. to tell when built function declarations are stale.
+
+    Returns:
+        Source file by module name, None for modules without one
+    """
+    with _lock:
+        module_paths = sorted({spec.partition(":")[0] for spec in _TOOL_SPECS.values()})
+    source_files: Dict[str, Optional[Path]] = {}
+    for module_path in module_paths:
+        try:
+            spec = importlib.util.find_spec(module_path)
+        except (ImportError, ValueError):
+            spec = None
+        source_files[module_path] = (
+            Path(spec.origin) if spec and spec.has_location else None
+        )
+    return source_files
+
+
+def prewarm_tools(tool_ids: Iterable[str]) -> None:
+    """Import latency-critical tools and build their declarations up front.
+
+    Args:
+        tool_ids: Identifiers of the tools to load
+    """
+    for tool_id in tool_ids:
+        get_tool_by_id(tool_id)
+        get_tool_declaration(tool_id)
+
+
+def _forget_declarations(tool_id: str) -> None:
+    """Drop the cached declarations of a tool."""
+    for key in [key for key in _DECLARATIONS if key[0] == tool_id]:
+        del _DECLARATIONS[key]
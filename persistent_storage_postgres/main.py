@@ -6,13 +6,24 @@ import psycopg2
 
 # import config  # Configuration
 from dotenv import load_dotenv
+from google.adk.events import Event, EventActions
 from google.adk.runners import Runner
-from google.adk.sessions import DatabaseSessionService
-from google.adk.sessions.base_session_service import ListSessionsResponse
+from google.adk.sessions import BaseSessionService, DatabaseSessionService
 from google.adk.sessions.session import Session
-from persistent_agent.agent import persistent_agent
+from persistent_agent.agent import (
+    REMINDER_COUNT_KEY,
+    persistent_agent,
+    use_reminder_store,
+)
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from utility import call_agent_async
+from utility import StateTracker, call_agent_async
+from utils.async_session_service import AsyncDatabaseSessionService
+from utils.reminder_store import ReminderStore
+from utils.session_archive import ArchivingSessionService
+from utils.session_batching import BatchingDatabaseSessionService
+from utils.session_cache import CachedSessionService
+from utils.session_queries import ensure_session_indexes, get_latest_session
+from utils.streaming import BufferedSink, StreamingRenderer
 
 # Load environment variables from .env file
 load_dotenv()
@@ -60,6 +71,9 @@ if not all([APP_NAME, USER_ID, USER_NAME]):
     print("Error: APP_NAME, USER_ID, and USER_NAME must be set in environment.")
     exit(code=1)
 
+# Show responses while they are generated unless STREAMING=false
+STREAMING: bool = os.environ.get("STREAMING", "true").lower() != "false"
+
 
 # ===== Create Database if it doesn't exist =====
 def create_database_not_exists() -> None:
@@ -97,28 +111,92 @@ create_database_not_exists()
 
 # ===== Initialize Persistent Session Service =====
 DB_URL = f"postgresql://{PG_USER}:{PG_PASSWORD}@{PG_HOST}:{PG_PORT}/{PG_DBNAME}"
-session_service = DatabaseSessionService(db_url=DB_URL)
+DB_ASYNC: bool = os.environ.get("PG_ASYNC_DRIVER", "false").lower() == "true"
+
+# Connection pool settings, passed to the SQLAlchemy engine
+DB_ENGINE_OPTIONS: dict = {
+    "pool_size": int(os.environ.get("PG_POOL_SIZE", "5")),
+    "max_overflow": int(os.environ.get("PG_MAX_OVERFLOW", "10")),
+    "pool_pre_ping": os.environ.get("PG_POOL_PRE_PING", "true").lower() == "true",
+    "pool_recycle": int(os.environ.get("PG_POOL_RECYCLE", "1800")),
+    "pool_timeout": float(os.environ.get("PG_POOL_TIMEOUT", "30")),
+}
+PG_STATEMENT_TIMEOUT_MS = int(os.environ.get("PG_STATEMENT_TIMEOUT_MS", "30000"))
+if PG_STATEMENT_TIMEOUT_MS > 0:
+    # asyncpg takes server settings, psycopg2 takes libpq options
+    DB_ENGINE_OPTIONS["connect_args"] = (
+        {"server_settings": {"statement_timeout": str(PG_STATEMENT_TIMEOUT_MS)}}
+        if DB_ASYNC
+        else {"options": f"-c statement_timeout={PG_STATEMENT_TIMEOUT_MS}"}
+    )
+
+database_service: BaseSessionService
+if DB_ASYNC:
+    # The asyncpg driver keeps session I/O off the event loop
+    database_service = AsyncDatabaseSessionService(db_url=DB_URL, **DB_ENGINE_OPTIONS)
+elif os.environ.get("WRITE_BEHIND", "false").lower() == "true":
+    # Write-behind mode commits the events of many turns in one transaction
+    database_service = BatchingDatabaseSessionService(
+        db_url=DB_URL,
+        batch_size=int(os.environ.get("WRITE_BEHIND_BATCH_SIZE", "64")),
+        flush_interval=float(os.environ.get("WRITE_BEHIND_FLUSH_INTERVAL", "0")),
+        max_pending=int(os.environ.get("WRITE_BEHIND_MAX_PENDING", "1024")),
+        **DB_ENGINE_OPTIONS,
+    )
+else:
+    database_service = DatabaseSessionService(db_url=DB_URL, **DB_ENGINE_OPTIONS)
+
+# Idle sessions move to a compressed archive table and come back on first read
+if os.environ.get("SESSION_ARCHIVE", "false").lower() == "true":
+    archive_max_idle_days = float(os.environ.get("SESSION_ARCHIVE_MAX_IDLE_DAYS", "30"))
+    database_service = ArchivingSessionService(
+        inner=database_service,
+        max_idle_seconds=archive_max_idle_days * 24 * 3600,
+        interval_seconds=float(os.environ.get("SESSION_ARCHIVE_INTERVAL", "3600")),
+        batch_size=int(os.environ.get("SESSION_ARCHIVE_BATCH_SIZE", "100")),
+    )
+
+# Hot sessions are served from memory, writes go through to the database
+session_service = CachedSessionService(
+    inner=database_service,
+    max_sessions=int(os.environ.get("SESSION_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.environ.get("SESSION_CACHE_TTL", "300")),
+)
+
+# ===== Initialize Reminder Store =====
+# Reminders are rows of their own table, next to the sessions
+reminder_store = ReminderStore(db_url=DB_URL)
+use_reminder_store(reminder_store)
 
 
 # ===== Define Initial State =====
 initial_state: dict = {
     "user_name": USER_NAME,
-    "reminders": [],
 }
 
 
 # Main entrypoint
 async def main_async() -> None:
     # ===== Session Management =====
-    # Get existing sessions for the user
-    existing_sessions: ListSessionsResponse = await session_service.list_sessions(
+    # Make sure the most recent session can be looked up through the index
+    await ensure_session_indexes(session_service)
+    if isinstance(database_service, ArchivingSessionService):
+        database_service.start()
+
+    # Get the user's most recently updated session
+    latest_session: Session | None = await get_latest_session(
+        session_service,
         app_name=APP_NAME,
         user_id=USER_ID,
     )
-    # Check existing sessions
-    if existing_sessions and len(existing_sessions.sessions) > 0:
-        # Most recent session
-        SESSION_ID: str = existing_sessions.sessions[0].id
+    if latest_session is None and isinstance(database_service, ArchivingSessionService):
+        # The latest session may have been archived; reading it restores it
+        latest_session = await database_service.get_latest_archived_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+    # Check existing session
+    if latest_session:
+        SESSION_ID: str = latest_session.id
         print(f"Continuing existing session: {SESSION_ID}")
     else:
         # Create new session with initial state
@@ -131,6 +209,40 @@ async def main_async() -> None:
         SESSION_ID: str = new_session.id
         print(f"Created new session: {SESSION_ID}")
 
+    # ===== State Tracking =====
+    # Fetch the session state once; the tracker follows it from the agent events
+    session: Session | None = await session_service.get_session(
+        app_name=APP_NAME,
+        user_id=USER_ID,
+        session_id=SESSION_ID,
+    )
+
+    # Move a reminder list kept in the state by earlier versions to the table
+    legacy_reminders: list | None = session.state.get("reminders") if session else None
+    state_delta: dict = {}
+    if session and legacy_reminders:
+        imported: int = reminder_store.import_reminders(
+            app_name=APP_NAME, user_id=USER_ID, texts=legacy_reminders
+        )
+        state_delta["reminders"] = []
+        print(f"Moved {imported} reminders to the reminders table")
+
+    # The count is shared by the user's sessions; seed it from the table
+    reminder_count: int = reminder_store.count(APP_NAME, USER_ID)
+    if session and session.state.get(REMINDER_COUNT_KEY) != reminder_count:
+        state_delta[REMINDER_COUNT_KEY] = reminder_count
+    if session and state_delta:
+        await session_service.append_event(
+            session=session,
+            event=Event(
+                invocation_id=Event.new_id(),
+                author="user",
+                actions=EventActions(state_delta=state_delta),
+            ),
+        )
+
+    state_tracker = StateTracker(state=session.state if session else initial_state)
+
     # ===== Agent Runner Setup =====
     runner = Runner(
         app_name=APP_NAME,
@@ -138,27 +250,45 @@ async def main_async() -> None:
         session_service=session_service,
     )
 
+    # Show responses as they stream in, and time them
+    renderer: StreamingRenderer | None = (
+        StreamingRenderer(sink=BufferedSink()) if STREAMING else None
+    )
+
     # ===== Interactive Conversation Loop =====
     print(f"\nWelcome to {APP_NAME} Chat!")
     print("Your reminders will be remembered across conversations.")
     print("Type 'exit' or 'quit' to end the conversation.\n")
 
     # Start conversation
-    while True:
-        user_input: str = input("You: ")
-        if user_input.lower() in ["exit", "quit"]:
-            print(
-                "Ending conversation. Your remainders has been saved to the database."
+    try:
+        while True:
+            user_input: str = input("You: ")
+            if user_input.lower() in ["exit", "quit"]:
+                print(
+                    "Ending conversation. Your remainders has been saved to the database."
+                )
+                break
+
+            # process the user query
+            await call_agent_async(
+                runner=runner,
+                user_id=USER_ID,
+                session_id=SESSION_ID,
+                query=user_input,
+                state_tracker=state_tracker,
+                renderer=renderer,
             )
-            break
+    finally:
+        if renderer:
+            print(f"Response latency: {renderer.summary()}")
+        print(f"Session cache: {session_service.stats()}")
+        if isinstance(database_service, ArchivingSessionService):
+            print(f"Session archive: {database_service.stats()}")
 
-        # process the user query
-        await call_agent_async(
-            runner=runner,
-            user_id=USER_ID,
-            session_id=SESSION_ID,
-            query=user_input,
-        )
+        # Flush events still queued for the database before exiting
+        await session_service.close()
+        reminder_store.close()
 
 
 # Run the async main function
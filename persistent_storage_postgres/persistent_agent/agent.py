@@ -1,8 +1,40 @@
-from typing import Any
+from typing import Any, Optional
 
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 
+from utils.reminder_store import Reminder, ReminderPage, ReminderStore
+
+
+# ===== Reminder Storage =====
+# Reminders live in their own table; main.py sets the store on startup
+_reminder_store: Optional[ReminderStore] = None
+
+# Reminders belong to the user, so their count is user state shared by sessions
+REMINDER_COUNT_KEY: str = "user:reminder_count"
+
+
+def use_reminder_store(store: ReminderStore) -> None:
+    """Set the store the reminder tools read and write.
+
+    Args:
+        store: The reminder store, usually on the session database
+    """
+    global _reminder_store
+    _reminder_store = store
+
+
+def _reminder_owner(tool_context: ToolContext) -> tuple[ReminderStore, str, str]:
+    """Return the reminder store and the app name and user ID of the caller.
+
+    The owner comes from the session the tool is called in, so in server mode
+    every user only sees their own reminders.
+    """
+    if _reminder_store is None:
+        raise RuntimeError("No reminder store set, call use_reminder_store() first")
+    invocation = tool_context._invocation_context
+    return _reminder_store, invocation.app_name, invocation.user_id
+
 
 def add_reminder(reminder: str, tool_context: ToolContext) -> dict:
     """Add a new reminder to the user's reminder list.
@@ -16,48 +48,68 @@ def add_reminder(reminder: str, tool_context: ToolContext) -> dict:
     """
     print(f"--- Tool: add_remainder called for '{reminder}' ---")
 
-    # Get current reminders from state
-    reminders: Any = tool_context.state.get(key="reminders", default=[])
-
-    # Add new reminder
-    reminders.append(reminder)
+    # Insert one row for the new reminder; its index follows the count in state
+    store, app_name, user_id = _reminder_owner(tool_context)
+    added: Reminder = store.add(
+        app_name, user_id, reminder, count=tool_context.state.get(REMINDER_COUNT_KEY)
+    )
 
-    # Store updated reminders in state
-    tool_context.state["reminders"] = reminders
+    # Only the count is kept in state, for the instruction
+    tool_context.state[REMINDER_COUNT_KEY] = added.index
 
     return {
         "action": "add_reminder",
         "reminder": reminder,
+        "id": added.id,
+        "index": added.index,
         "message": f"Reminder added: {reminder}",
     }
 
 
-def view_reminders(tool_context: ToolContext) -> dict:
-    """View the user's current reminders.
+def view_reminders(
+    tool_context: ToolContext, page_size: int = 20, page_token: str = ""
+) -> dict:
+    """View the user's current reminders, one page at a time.
 
     Args:
         tool_context: Context for accessing session state
+        page_size: Maximum number of reminders to return
+        page_token: The next_page_token of the previous page, empty for the first
 
     Returns:
-        A list of reminders
+        A page of numbered reminders with their IDs and the token of the next page
     """
     print("--- Tool: view_reminders called ---")
 
-    # Get current reminders from state
-    reminders: Any = tool_context.state.get(key="reminders", default=[])
+    # Read one page of reminders through the position index
+    store, app_name, user_id = _reminder_owner(tool_context)
+    try:
+        page: ReminderPage = store.list_page(
+            app_name, user_id, page_size=page_size, page_token=page_token or None
+        )
+    except ValueError as e:
+        return {"action": "view_reminders", "status": "error", "message": str(e)}
+    count: int = store.count(app_name, user_id)
+    tool_context.state[REMINDER_COUNT_KEY] = count
 
     return {
         "action": "view_reminders",
-        "reminders": reminders,
-        "count": len(reminders),
+        "reminders": [
+            {"id": reminder.id, "index": reminder.index, "text": reminder.text}
+            for reminder in page.reminders
+        ],
+        "count": count,
+        "next_page_token": page.next_page_token or "",
     }
 
 
-def update_reminder(index: int, updated_text: str, tool_context: ToolContext) -> dict:
+def update_reminder(
+    reminder_id: str, updated_text: str, tool_context: ToolContext
+) -> dict:
     """Update an existing reminder.
 
     Args:
-        index: The 1-based index of the reminder to update
+        reminder_id: The ID of the reminder to update, as listed by view_reminders
         updated_text: The new text for the reminder
         tool_context: Context for accessing and updating session state
 
@@ -65,70 +117,55 @@ def update_reminder(index: int, updated_text: str, tool_context: ToolContext) ->
         A confirmation message
     """
     print(
-        f"--- Tool: update_reminder called for index {index} with '{updated_text}' ---"
+        f"--- Tool: update_reminder called for {reminder_id} with '{updated_text}' ---"
     )
 
-    # Get current reminders from state
-    reminders: Any = tool_context.state.get(key="reminders", default=[])
-
-    # Validate reminders index
-    if not reminders or index < 1 or index > len(reminders):
+    # Update the one reminder row by its ID
+    store, app_name, user_id = _reminder_owner(tool_context)
+    if not store.update(app_name, user_id, reminder_id, updated_text):
         return {
             "action": "update_reminder",
             "status": "error",
-            "message": f"Could not find reminder at position {index}. Currently there are {len(reminders)} reminders.",
+            "message": f"Could not find reminder {reminder_id}. Use view_reminders to get the current reminder IDs.",
         }
 
-    # Update the reminder
-    old_reminder: Any = reminders[index - 1]
-    reminders[index - 1] = updated_text
-
-    # Update state with the modified list
-    tool_context.state["reminders"] = reminders
-
     return {
         "action": "update_reminder",
-        "index": index,
-        "old_text": old_reminder,
+        "id": reminder_id,
         "updated_text": updated_text,
-        "message": f"Updated reminder {index} from '{old_reminder}' to '{updated_text}'",
+        "message": f"Reminder updated: {updated_text}",
     }
 
 
-def delete_reminder(index: int, tool_context: ToolContext) -> dict:
+def delete_reminder(reminder_id: str, tool_context: ToolContext) -> dict:
     """Delete a reminder.
 
     Args:
-        index: The 1-based index of the reminder to delete
+        reminder_id: The ID of the reminder to delete, as listed by view_reminders
         tool_context: Context for accessing and updating session state
 
     Returns:
         A confirmation message
     """
-    print(f"--- Tool: delete_reminder called for index {index} ---")
+    print(f"--- Tool: delete_reminder called for {reminder_id} ---")
 
-    # Get current reminders from state
-    reminders: Any = tool_context.state.get(key="reminders", default=[])
-
-    # Validate reminders index
-    if not reminders or index < 1 or index > len(reminders):
+    # Delete the one reminder row by its ID; later reminders move up one index
+    store, app_name, user_id = _reminder_owner(tool_context)
+    if not store.delete(app_name, user_id, reminder_id):
         return {
             "action": "delete_reminder",
             "status": "error",
-            "message": f"Could not find reminder at position {index}. Currently there are {len(reminders)} reminders.",
+            "message": f"Could not find reminder {reminder_id}. Use view_reminders to get the current reminder IDs.",
         }
-
-    # Remove the reminder
-    deleted_reminder: Any = reminders.pop(index - 1)
-
-    # Update state with the modified list
-    tool_context.state["reminders"] = reminders
+    count: Optional[int] = tool_context.state.get(REMINDER_COUNT_KEY)
+    tool_context.state[REMINDER_COUNT_KEY] = (
+        store.count(app_name, user_id) if count is None else max(count - 1, 0)
+    )
 
     return {
         "action": "delete_reminder",
-        "index": index,
-        "deleted_reminder": deleted_reminder,
-        "message": f"Deleted reminder {index}: '{deleted_reminder}'",
+        "id": reminder_id,
+        "message": "Reminder deleted",
     }
 
 
@@ -168,7 +205,7 @@ persistent_agent = Agent(
     
     The user's information is stored in state:
     - User's name: {user_name}
-    - Reminders: {reminders}
+    - Number of reminders: {user:reminder_count?}
     
     You can help users manage their reminders with the following capabilities:
     1. Add new reminders
@@ -184,26 +221,29 @@ persistent_agent = Agent(
     
     When dealing with reminders, you need to be smart about finding the right reminder:
     
-    1. When the user asks to update or delete a reminder but doesn't provide an index:
+    1. Reminders are updated and deleted by their ID, never by their position:
+       - Use the view_reminders tool first and take the "id" of the matching reminder
+       - Pass that ID to update_reminder or delete_reminder
+       - Never show the IDs to the user; refer to reminders by their index and text
+    
+    2. When the user asks to update or delete a reminder by its content:
        - If they mention the content of the reminder (e.g., "delete my meeting reminder"), 
-         look through the reminders to find a match
-       - If you find an exact or close match, use that index
+         look through the listed reminders to find a match
+       - If you find an exact or close match, use that reminder's ID
        - Never clarify which reminder the user is referring to, just use the first match
        - If no match is found, list all reminders and ask the user to specify
     
-    2. When the user mentions a number or position:
-    - Use that as the index (e.g., "delete reminder 2" means index=2)
-    - Remember that indexing starts at 1 for the user
-    
-    3. For relative positions:
-       - Handle "first", "last", "second", etc. appropriately
-       - "First reminder" = index 1
+    3. When the user mentions a number or position:
+       - Find the listed reminder with that index (e.g., "delete reminder 2" means index 2)
+       - Remember that indexing starts at 1 for the user
+       - "First reminder" = index 1, "Second reminder" = index 2, and so on
        - "Last reminder" = the highest index
-       - "Second reminder" = index 2, and so on
     
     4. For viewing:
        - Always use the view_reminders tool when the user asks to see their reminders
-       - Format the response in a numbered list for clarity
+       - Format the response in a numbered list for clarity, using each reminder's index
+       - If there is a next_page_token, tell the user there are more reminders and
+         pass the token to view_reminders when they ask to see them
        - If there are no reminders, suggest adding some
     
     5. For addition:
@@ -213,7 +253,7 @@ persistent_agent = Agent(
     
     6. For updates:
        - Identify both which reminder to update and what the new text should be
-       - For example, "change my second reminder to pick up groceries" → update_reminder(2, "pick up groceries")
+       - For example, "change my second reminder to pick up groceries" → update_reminder(<ID of reminder 2>, "pick up groceries")
     
     7. For deletions:
        - Confirm deletion when complete and mention which reminder was removed
@@ -0,0 +1,273 @@
+"""
+Agent server module for ADK runners.
+Serves many concurrent sessions over HTTP and WebSocket from one shared runner
+and session service, with bounded concurrency and in-order turns per session.
+"""
+
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService
+from google.genai import types
+from pydantic import BaseModel
+
+
+class ServerBusyError(Exception):
+    """Raised when a turn arrives while too many turns are waiting."""
+
+
+@dataclass
+class ServerMetrics:
+    """Counts and timings of the turns served."""
+
+    turns: int = 0
+    failed: int = 0
+    rejected: int = 0
+    active: int = 0
+    waiting: int = 0
+    peak_active: int = 0
+    turn_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the metrics as a dictionary, with the average turn time."""
+        return {
+            "turns": self.turns,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "active": self.active,
+            "waiting": self.waiting,
+            "peak_active": self.peak_active,
+            "average_turn_ms": (
+                round(self.turn_seconds * 1000 / self.turns, 1) if self.turns else 0.0
+            ),
+        }
+
+
+def event_to_dict(event: Event) -> dict[str, Any]:
+    """Get the parts of an agent event a client shows."""
+    parts: list[types.Part] = (event.content.parts if event.content else None) or []
+    return {
+        "author": event.author,
+        "text": "".join(part.text for part in parts if part.text),
+        "function_calls": [
+            part.function_call.name for part in parts if part.function_call
+        ],
+        "final": event.is_final_response(),
+    }
+
+
+class AgentServer:
+    """Runs the turns of many sessions through one shared runner.
+
+    At most max_concurrency turns run at once; the others wait in arrival
+    order. Turns of the same session run one at a time, in the order they
+    arrived, so each turn sees the state the previous one left.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        session_service: BaseSessionService,
+        app_name: str,
+        max_concurrency: int = 16,
+        max_waiting: Optional[int] = None,
+        initial_state: Optional[dict[str, Any]] = None,
+    ):
+        """Initialize the agent server.
+
+        Args:
+            runner: The runner for every session, or anything with the same
+                run_async (e.g. a ResilientRunner wrapping it)
+            session_service: The session service the runner uses
+            app_name: App name the sessions are created under
+            max_concurrency: Most turns that run at once
+            max_waiting: Most turns that wait for a slot before new ones are
+                rejected with ServerBusyError, None for no limit
+            initial_state: State of new sessions, updated by the state a
+                client passes when creating a session
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.runner = runner
+        self.session_service = session_service
+        self.app_name = app_name
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self.initial_state = dict(initial_state or {})
+        self.metrics = ServerMetrics()
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+        # Locks of the sessions with turns in flight, by user and session ID
+        # since session IDs are only unique per user, dropped once unused
+        self._session_locks: weakref.WeakValueDictionary[
+            tuple[str, str], asyncio.Lock
+        ] = weakref.WeakValueDictionary()
+
+    # ===== Sessions =====
+    async def create_session(
+        self,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> str:
+        """Create a session with the initial state and return its ID.
+
+        A session ID is generated unless one is given.
+        """
+        session = await self.session_service.create_session(
+            app_name=self.app_name,
+            user_id=user_id,
+            state={**self.initial_state, **(state or {})},
+            session_id=session_id,
+        )
+        return session.id
+
+    async def session_exists(self, user_id: str, session_id: str) -> bool:
+        """Check whether a user has a session with the given ID."""
+        session = await self.session_service.get_session(
+            app_name=self.app_name, user_id=user_id, session_id=session_id
+        )
+        return session is not None
+
+    # ===== Turns =====
+    async def stream_turn(
+        self, user_id: str, session_id: str, text: str
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Run one turn of a session and yield its events as they arrive.
+
+        Raises:
+            ServerBusyError: If max_waiting turns are already waiting
+        """
+        if self.max_waiting is not None and self.metrics.waiting >= self.max_waiting:
+            self.metrics.rejected += 1
+            raise ServerBusyError(f"{self.metrics.waiting} turns are already waiting")
+
+        lock = self._session_locks.get((user_id, session_id))
+        if lock is None:
+            lock = self._session_locks[(user_id, session_id)] = asyncio.Lock()
+
+        self.metrics.waiting += 1
+        try:
+            await lock.acquire()
+            try:
+                await self._slots.acquire()
+            except BaseException:
+                lock.release()
+                raise
+        finally:
+            self.metrics.waiting -= 1
+
+        self.metrics.active += 1
+        self.metrics.peak_active = max(self.metrics.peak_active, self.metrics.active)
+        start = time.perf_counter()
+        try:
+            async for event in self.runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=types.Content(role="user", parts=[types.Part(text=text)]),
+            ):
+                yield event_to_dict(event)
+        except Exception:
+            self.metrics.failed += 1
+            raise
+        else:
+            self.metrics.turns += 1
+            self.metrics.turn_seconds += time.perf_counter() - start
+        finally:
+            self.metrics.active -= 1
+            self._slots.release()
+            lock.release()
+
+    async def run_turn(
+        self, user_id: str, session_id: str, text: str
+    ) -> dict[str, Any]:
+        """Run one turn of a session and return its final response and events."""
+        events = [event async for event in self.stream_turn(user_id, session_id, text)]
+        return {
+            "session_id": session_id,
+            "response": "\n".join(
+                event["text"] for event in events if event["final"] and event["text"]
+            ),
+            "events": events,
+        }
+
+
+# ===== HTTP and WebSocket API =====
+class CreateSessionRequest(BaseModel):
+    user_id: str
+    state: dict[str, Any] = {}
+
+
+class TurnRequest(BaseModel):
+    user_id: str
+    text: str
+
+
+def create_app(server: AgentServer) -> FastAPI:
+    """Create the HTTP and WebSocket API of an agent server.
+
+    Routes:
+        POST /sessions: create a session, {"user_id", "state"}
+        POST /sessions/{session_id}/turns: run a turn, {"user_id", "text"}
+        WS /sessions/{session_id}/ws?user_id=...: send texts, receive each
+            turn's events followed by {"done": true}
+        GET /metrics: the server metrics
+    """
+    app = FastAPI(title=server.app_name)
+
+    @app.post("/sessions")
+    async def create_session(request: CreateSessionRequest) -> dict[str, str]:
+        session_id = await server.create_session(request.user_id, request.state)
+        return {"session_id": session_id, "user_id": request.user_id}
+
+    @app.post("/sessions/{session_id}/turns")
+    async def run_turn(session_id: str, request: TurnRequest) -> dict[str, Any]:
+        if not await server.session_exists(request.user_id, session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+        try:
+            return await server.run_turn(request.user_id, session_id, request.text)
+        except ServerBusyError as e:
+            raise HTTPException(status_code=503, detail=str(e)) from e
+
+    @app.websocket("/sessions/{session_id}/ws")
+    async def stream_turns(websocket: WebSocket, session_id: str, user_id: str) -> None:
+        if not await server.session_exists(user_id, session_id):
+            await websocket.close(code=4404, reason="Session not found")
+            return
+        await websocket.accept()
+        try:
+            while True:
+                text = await websocket.receive_text()
+                try:
+                    async for event in server.stream_turn(user_id, session_id, text):
+                        await websocket.send_json(event)
+                    await websocket.send_json({"done": True})
+                except WebSocketDisconnect:
+                    # The client left mid-turn; there's no one to report to
+                    raise
+                except Exception as e:
+                    # Report the failed turn and keep the connection for the next one
+                    await websocket.send_json({"done": True, "error": str(e)})
+        except WebSocketDisconnect:
+            pass
+
+    @app.get("/metrics")
+    async def metrics() -> dict[str, Any]:
+        return server.metrics.as_dict()
+
+    return app
+
+
+async def serve(server: AgentServer, host: str = "127.0.0.1", port: int = 8000) -> None:
+    """Serve an agent server's API on the running event loop until stopped."""
+    config = uvicorn.Config(
+        create_app(server), host=host, port=port, log_level="warning"
+    )
+    await uvicorn.Server(config).serve()
@@ -0,0 +1,307 @@
+"""
+Async database session service module for ADK applications.
+Provides a session service on SQLAlchemy's asyncio engine, so session I/O
+with async drivers (asyncpg for PostgreSQL, aiosqlite for SQLite) doesn't
+block the event loop.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.database_session_service import (
+    Base,
+    StorageAppState,
+    StorageEvent,
+    StorageSession,
+    StorageUserState,
+)
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+# Async drivers used for the synchronous database URL schemes
+ASYNC_DRIVERS: dict[str, str] = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_db_url(db_url: str) -> str:
+    """Convert a synchronous database URL to its async driver equivalent.
+
+    Args:
+        db_url: A database URL such as postgresql://... or sqlite:///...
+
+    Returns:
+        The URL with the async driver scheme, or db_url if it already uses one
+    """
+    scheme, separator, rest = db_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+def _split_state_delta(
+    state: Optional[dict[str, Any]],
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """Split a state dictionary into app, user and session state deltas."""
+    app_delta, user_delta, session_delta = {}, {}, {}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            app_delta[key.removeprefix(State.APP_PREFIX)] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_delta[key.removeprefix(State.USER_PREFIX)] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session_delta[key] = value
+    return app_delta, user_delta, session_delta
+
+
+def _merge_state(
+    app_state: dict[str, Any], user_state: dict[str, Any], session_state: dict[str, Any]
+) -> dict[str, Any]:
+    """Merge app, user and session state into the state seen by the agent."""
+    merged: dict[str, Any] = dict(session_state)
+    merged.update({State.APP_PREFIX + k: v for k, v in app_state.items()})
+    merged.update({State.USER_PREFIX + k: v for k, v in user_state.items()})
+    return merged
+
+
+class AsyncDatabaseSessionService(BaseSessionService):
+    """A session service on an async SQLAlchemy engine.
+
+    It uses the same tables as ADK's DatabaseSessionService, so both services
+    can read each other's sessions. Tables are created on first use.
+    """
+
+    def __init__(self, db_url: str, **kwargs: Any):
+        """Initialize the async database session service.
+
+        Args:
+            db_url: The database URL, converted to its async driver if needed
+            **kwargs: Extra arguments for the SQLAlchemy engine (pool settings)
+        """
+        self.db_engine: AsyncEngine = create_async_engine(
+            async_db_url(db_url), **kwargs
+        )
+        self.database_session_factory = async_sessionmaker(
+            bind=self.db_engine, expire_on_commit=False
+        )
+        self._tables_ready = False
+        self._tables_lock = asyncio.Lock()
+
+    async def _ensure_tables(self) -> None:
+        """Create the session tables if they don't exist yet."""
+        if self._tables_ready:
+            return
+        async with self._tables_lock:
+            if not self._tables_ready:
+                async with self.db_engine.begin() as connection:
+                    await connection.run_sync(Base.metadata.create_all)
+                self._tables_ready = True
+
+    async def close(self) -> None:
+        """Close all pooled database connections."""
+        await self.db_engine.dispose()
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        await self._ensure_tables()
+        try:
+            return await self._create_session(app_name, user_id, state, session_id)
+        except IntegrityError:
+            # A concurrent first session of the app or user inserted the state
+            # row first; the retry finds that row
+            return await self._create_session(app_name, user_id, state, session_id)
+
+    async def _create_session(
+        self,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]],
+        session_id: Optional[str],
+    ) -> Session:
+        """Create a session and any missing app and user state rows."""
+        async with self.database_session_factory() as db:
+            # Fetch or create the app and user state rows
+            storage_app_state = await db.get(StorageAppState, app_name)
+            storage_user_state = await db.get(StorageUserState, (app_name, user_id))
+            if storage_app_state is None:
+                storage_app_state = StorageAppState(app_name=app_name, state={})
+                db.add(storage_app_state)
+            if storage_user_state is None:
+                storage_user_state = StorageUserState(
+                    app_name=app_name, user_id=user_id, state={}
+                )
+                db.add(storage_user_state)
+
+            # State columns are MutableDicts, so in-place updates are tracked
+            app_delta, user_delta, session_state = _split_state_delta(state)
+            if app_delta:
+                storage_app_state.state.update(app_delta)
+            if user_delta:
+                storage_user_state.state.update(user_delta)
+
+            storage_session = StorageSession(
+                app_name=app_name, user_id=user_id, id=session_id, state=session_state
+            )
+            db.add(storage_session)
+            await db.commit()
+            await db.refresh(storage_session)
+
+            return Session(
+                app_name=app_name,
+                user_id=user_id,
+                id=storage_session.id,
+                state=_merge_state(
+                    storage_app_state.state, storage_user_state.state, session_state
+                ),
+                last_update_time=storage_session.update_time.timestamp(),
+            )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self._ensure_tables()
+        async with self.database_session_factory() as db:
+            storage_session = await db.get(
+                StorageSession, (app_name, user_id, session_id)
+            )
+            if storage_session is None:
+                return None
+
+            statement = (
+                select(StorageEvent)
+                .where(StorageEvent.app_name == app_name)
+                .where(StorageEvent.user_id == user_id)
+                .where(StorageEvent.session_id == session_id)
+                .order_by(StorageEvent.timestamp.desc())
+            )
+            if config and config.after_timestamp:
+                statement = statement.where(
+                    StorageEvent.timestamp
+                    >= datetime.fromtimestamp(config.after_timestamp)
+                )
+            if config and config.num_recent_events:
+                statement = statement.limit(config.num_recent_events)
+            storage_events = (await db.execute(statement)).scalars().all()
+
+            storage_app_state = await db.get(StorageAppState, app_name)
+            storage_user_state = await db.get(StorageUserState, (app_name, user_id))
+
+            session = Session(
+                app_name=app_name,
+                user_id=user_id,
+                id=session_id,
+                state=_merge_state(
+                    storage_app_state.state if storage_app_state else {},
+                    storage_user_state.state if storage_user_state else {},
+                    storage_session.state,
+                ),
+                last_update_time=storage_session.update_time.timestamp(),
+            )
+            session.events = [e.to_event() for e in reversed(storage_events)]
+            return session
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str
+    ) -> ListSessionsResponse:
+        await self._ensure_tables()
+        async with self.database_session_factory() as db:
+            statement = (
+                select(StorageSession)
+                .where(StorageSession.app_name == app_name)
+                .where(StorageSession.user_id == user_id)
+            )
+            storage_sessions = (await db.execute(statement)).scalars().all()
+            return ListSessionsResponse(
+                sessions=[
+                    Session(
+                        app_name=app_name,
+                        user_id=user_id,
+                        id=storage_session.id,
+                        state={},
+                        last_update_time=storage_session.update_time.timestamp(),
+                    )
+                    for storage_session in storage_sessions
+                ]
+            )
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await self._ensure_tables()
+        async with self.database_session_factory() as db:
+            # SQLite doesn't enforce the events' ON DELETE CASCADE by default
+            await db.execute(
+                delete(StorageEvent)
+                .where(StorageEvent.app_name == app_name)
+                .where(StorageEvent.user_id == user_id)
+                .where(StorageEvent.session_id == session_id)
+            )
+            await db.execute(
+                delete(StorageSession).where(
+                    StorageSession.app_name == app_name,
+                    StorageSession.user_id == user_id,
+                    StorageSession.id == session_id,
+                )
+            )
+            await db.commit()
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        await self._ensure_tables()
+        async with self.database_session_factory() as db:
+            storage_session = await db.get(
+                StorageSession, (session.app_name, session.user_id, session.id)
+            )
+            if storage_session is None:
+                raise ValueError(f"Session not found: {session.id}")
+            if storage_session.update_time.timestamp() > session.last_update_time:
+                raise ValueError(
+                    f"Session {session.id} was updated after it was loaded. "
+                    "Please check if it is a stale session."
+                )
+
+            app_delta, user_delta, session_delta = _split_state_delta(
+                event.actions.state_delta if event.actions else None
+            )
+            if app_delta:
+                storage_app_state = await db.get(StorageAppState, session.app_name)
+                storage_app_state.state.update(app_delta)
+            if user_delta:
+                storage_user_state = await db.get(
+                    StorageUserState, (session.app_name, session.user_id)
+                )
+                storage_user_state.state.update(user_delta)
+            if session_delta:
+                storage_session.state.update(session_delta)
+
+            db.add(StorageEvent.from_event(session, event))
+            await db.commit()
+            await db.refresh(storage_session)
+
+            # Update timestamp with commit time
+            session.last_update_time = storage_session.update_time.timestamp()
+
+        # Also update the in-memory session
+        await super().append_event(session=session, event=event)
+        return event
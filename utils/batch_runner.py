@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Batch runner for ADK agents.
+
+Streams a JSONL file of queries through a root agent with bounded
+concurrency. Each result is appended to an output JSONL as soon as its record
+completes, and the input offset below which every record is done is
+checkpointed, so an interrupted run resumes where it stopped without running
+a record twice.
+
+Input records look like {"user_id": "u1", "session_id": "s1", "query": "..."}.
+session_id is optional: records without one get a new session, records with
+one continue that session (creating it on first use) in input order.
+
+Usage (from the repository root):
+    python -m utils.batch_runner --agent lead_qualification_agent.root_agent \
+        --agent-dir 10_sequential_agent --input leads.jsonl --output results.jsonl
+    python -m utils.batch_runner --agent email_agent.root_agent \
+        --agent-dir 4_structured_outputs --input emails.jsonl --output emails.out.jsonl \
+        [--concurrency 8] [--resume] [--db-url sqlite:///batch.db]
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from dotenv import load_dotenv
+from google.adk.agents import BaseAgent
+from google.adk.runners import Runner
+from google.adk.sessions import (
+    BaseSessionService,
+    DatabaseSessionService,
+    InMemorySessionService,
+)
+
+from utils.agent_server import AgentServer
+
+# (user ID, session ID) pairs known to exist, so a continued session isn't
+# looked up per record
+KNOWN_SESSIONS_LIMIT: int = 10_000
+
+
+@dataclass
+class BatchRecord:
+    """One line of the input file."""
+
+    offset: int
+    """Line number of the record in the input, from 0."""
+    position: int
+    """Byte position of the record's line in the input."""
+    user_id: str = ""
+    session_id: Optional[str] = None
+    query: str = ""
+    error: Optional[str] = None
+    """Why the line is not a valid record, None if it is."""
+
+
+@dataclass
+class Checkpoint:
+    """Progress of a batch run through its input file."""
+
+    input: str
+    """Resolved path of the input file."""
+    offset: int = 0
+    """Every record before this line number is done."""
+    position: int = 0
+    """Byte position of line `offset` in the input."""
+
+
+@dataclass
+class BatchStats:
+    """Counts and timing of a batch run."""
+
+    records: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    latency_seconds: float = 0.0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the stats as a dictionary, with throughput and average latency."""
+        return {
+            "records": self.records,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "seconds": round(self.seconds, 3),
+            "records_per_second": (
+                round(self.records / self.seconds, 1) if self.seconds else 0.0
+            ),
+            "average_latency_ms": (
+                round(self.latency_seconds * 1000 / self.records, 1)
+                if self.records
+                else 0.0
+            ),
+        }
+
+
+# ===== Checkpoints =====
+def read_checkpoint(path: str | Path) -> Optional[Checkpoint]:
+    """Read a checkpoint file, None if there is none."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return Checkpoint(**json.load(file))
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path: str | Path, checkpoint: Checkpoint) -> None:
+    """Write a checkpoint file atomically, so a crash never leaves half of one."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(asdict(checkpoint), file)
+    os.replace(temp_path, path)
+
+
+def completed_offsets(output_path: str | Path, start: int) -> set[int]:
+    """Get the offsets at or after `start` that already have a result.
+
+    Records finish out of order, so results past the checkpoint may already
+    be in the output. A partly written last line is truncated away.
+    """
+    offsets: set[int] = set()
+    try:
+        file = open(output_path, "rb+")
+    except FileNotFoundError:
+        return offsets
+    with file:
+        end: int = 0
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            end += len(line)
+            offset: int = json.loads(line)["offset"]
+            if offset >= start:
+                offsets.add(offset)
+        file.truncate(end)
+    return offsets
+
+
+class _Progress:
+    """Tracks which records are in flight to find the checkpoint offset."""
+
+    def __init__(self, offset: int, position: int):
+        self.read_offset = offset
+        self.read_position = position
+        self._in_flight: deque[tuple[int, int]] = deque()
+        self._finished: set[int] = set()
+
+    def start(self, record: BatchRecord) -> None:
+        """Record that a record was read and is being run."""
+        self._in_flight.append((record.offset, record.position))
+
+    def finish(self, offset: int) -> None:
+        """Record that a record is done."""
+        self._finished.add(offset)
+        while self._in_flight and self._in_flight[0][0] in self._finished:
+            self._finished.remove(self._in_flight.popleft()[0])
+
+    def checkpoint(self, input: str) -> Checkpoint:
+        """Get the checkpoint: the first record not done yet."""
+        if self._in_flight:
+            offset, position = self._in_flight[0]
+            return Checkpoint(input=input, offset=offset, position=position)
+        return Checkpoint(
+            input=input, offset=self.read_offset, position=self.read_position
+        )
+
+
+# ===== Records =====
+def parse_record(line: bytes, offset: int, position: int) -> BatchRecord:
+    """Parse an input line, recording why it isn't a valid record if it isn't."""
+    record = BatchRecord(offset=offset, position=position)
+    try:
+        data: Any = json.loads(line)
+        if not isinstance(data, dict):
+            raise ValueError("record is not a JSON object")
+        record.user_id = str(data["user_id"])
+        record.query = str(data["query"])
+        if data.get("session_id"):
+            record.session_id = str(data["session_id"])
+    except (ValueError, KeyError) as e:
+        record.error = f"Invalid record: {e!r}"
+    return record
+
+
+async def run_record(server: AgentServer, record: BatchRecord) -> dict[str, Any]:
+    """Run one record through the agent and get its result line."""
+    result: dict[str, Any] = {
+        "offset": record.offset,
+        "user_id": record.user_id,
+        "session_id": record.session_id,
+        "query": record.query,
+        "response": None,
+        "error": record.error,
+        "latency_ms": 0.0,
+    }
+    if record.error is not None:
+        return result
+
+    start = time.perf_counter()
+    try:
+        if record.session_id is None:
+            record.session_id = await server.create_session(record.user_id)
+            result["session_id"] = record.session_id
+        turn = await server.run_turn(record.user_id, record.session_id, record.query)
+        result["response"] = turn["response"]
+    except Exception as e:
+        result["error"] = repr(e)
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+# ===== Batch run =====
+async def run_batch(
+    agent: BaseAgent,
+    input_path: str | Path,
+    output_path: str | Path,
+    app_name: str = "batch",
+    concurrency: int = 8,
+    resume: bool = False,
+    session_service: Optional[BaseSessionService] = None,
+    initial_state: Optional[dict[str, Any]] = None,
+    checkpoint_path: Optional[str | Path] = None,
+    checkpoint_every: int = 100,
+) -> BatchStats:
+    """Run every record of a JSONL file through an agent.
+
+    Only the records in flight are held in memory: the input is read as
+    workers free up, and each result is written as soon as it is done.
+
+    Args:
+        agent: The root agent
+        input_path: JSONL file of records
+        output_path: JSONL file the results are written to
+        app_name: App name the sessions are created under
+        concurrency: Most records that run at once
+        resume: Continue from the checkpoint and keep the existing output,
+            instead of starting over
+        session_service: Session service for the runs, in memory by default
+        initial_state: State of new sessions
+        checkpoint_path: Checkpoint file, the output path plus ".checkpoint"
+            by default
+        checkpoint_every: Records between checkpoint writes
+
+    Returns:
+        The stats of this run
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    output_path = Path(output_path)
+    checkpoint_path = Path(
+        checkpoint_path or output_path.with_name(f"{output_path.name}.checkpoint")
+    )
+    input_name: str = str(Path(input_path).resolve())
+
+    checkpoint = Checkpoint(input=input_name)
+    done: set[int] = set()
+    if resume:
+        saved: Optional[Checkpoint] = read_checkpoint(checkpoint_path)
+        if saved is not None:
+            if saved.input != input_name:
+                raise ValueError(
+                    f"Checkpoint {checkpoint_path} is for {saved.input}, not {input_name}"
+                )
+            checkpoint = saved
+        done = completed_offsets(output_path, checkpoint.offset)
+
+    session_service = session_service or InMemorySessionService()
+    server = AgentServer(
+        Runner(app_name=app_name, agent=agent, session_service=session_service),
+        session_service,
+        app_name=app_name,
+        max_concurrency=concurrency,
+        initial_state=initial_state,
+    )
+    stats = BatchStats(skipped=len(done))
+    progress = _Progress(checkpoint.offset, checkpoint.position)
+    queue: asyncio.Queue[Optional[BatchRecord]] = asyncio.Queue(maxsize=concurrency)
+    known_sessions: OrderedDict[tuple[str, str], None] = OrderedDict()
+
+    output: IO[str] = open(output_path, "a" if resume else "w", encoding="utf-8")
+
+    def save_checkpoint() -> None:
+        output.flush()
+        write_checkpoint(checkpoint_path, progress.checkpoint(input_name))
+
+    async def ensure_session(user_id: str, session_id: str) -> None:
+        """Create a record's session on first use, in input order.
+
+        Session IDs are only unique per user, so sessions are known by both.
+        """
+        key: tuple[str, str] = (user_id, session_id)
+        if key in known_sessions:
+            known_sessions.move_to_end(key)
+            return
+        if not await server.session_exists(user_id, session_id):
+            await server.create_session(user_id, session_id=session_id)
+        known_sessions[key] = None
+        if len(known_sessions) > KNOWN_SESSIONS_LIMIT:
+            known_sessions.popitem(last=False)
+
+    async def read_records() -> None:
+        with open(input_path, "rb") as file:
+            file.seek(checkpoint.position)
+            offset: int = checkpoint.offset
+            for line in file:
+                position: int = progress.read_position
+                progress.read_offset = offset + 1
+                progress.read_position = position + len(line)
+                if line.strip() and offset not in done:
+                    record = parse_record(line, offset, position)
+                    if record.error is None and record.session_id is not None:
+                        await ensure_session(record.user_id, record.session_id)
+                    progress.start(record)
+                    await queue.put(record)
+                offset += 1
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def work() -> None:
+        while (record := await queue.get()) is not None:
+            result: dict[str, Any] = await run_record(server, record)
+            output.write(json.dumps(result) + "\n")
+            stats.records += 1
+            stats.latency_seconds += result["latency_ms"] / 1000
+            if result["error"] is None:
+                stats.succeeded += 1
+            else:
+                stats.failed += 1
+            progress.finish(record.offset)
+            if stats.records % checkpoint_every == 0:
+                save_checkpoint()
+
+    start = time.perf_counter()
+    tasks: list[asyncio.Task[None]] = [asyncio.create_task(read_records())] + [
+        asyncio.create_task(work()) for _ in range(concurrency)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        stats.seconds = time.perf_counter() - start
+        save_checkpoint()
+        output.close()
+    return stats
+
+
+def load_agent(spec: str) -> BaseAgent:
+    """Import an agent from a "package.attribute" spec, e.g. email_agent.root_agent.
+
+    Like ADK's agent loader, an attribute the package doesn't export is looked
+    up in the package's agent module.
+    """
+    module_name, _, attribute = spec.rpartition(".")
+    if not module_name:
+        raise ValueError(f"Agent spec {spec!r} is not module.attribute")
+    module = importlib.import_module(module_name)
+    if not hasattr(module, attribute):
+        module = importlib.import_module(f"{module_name}.agent")
+    agent: Any = getattr(module, attribute)
+    if not isinstance(agent, BaseAgent):
+        raise TypeError(f"{spec} is a {type(agent).__name__}, not an agent")
+    return agent
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--agent", required=True, help="Root agent, e.g. email_agent.root_agent"
+    )
+    parser.add_argument(
+        "--agent-dir", default=".", help="Directory the agent package is in"
+    )
+    parser.add_argument("--input", required=True, help="JSONL file of records")
+    parser.add_argument("--output", required=True, help="JSONL file of results")
+    parser.add_argument(
+        "--checkpoint", help="Checkpoint file (default: OUTPUT.checkpoint)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Continue from the checkpoint"
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--checkpoint-every", type=int, default=100)
+    parser.add_argument("--app-name", default="batch")
+    parser.add_argument(
+        "--db-url", help="Keep sessions in this database (default: in memory)"
+    )
+    parser.add_argument("--state", default="{}", help="Initial session state as JSON")
+    args = parser.parse_args(argv)
+
+    agent_dir = Path(args.agent_dir).resolve()
+    sys.path.insert(0, str(agent_dir))
+    load_dotenv(dotenv_path=agent_dir / args.agent.split(".")[0] / ".env")
+    load_dotenv(dotenv_path=agent_dir / ".env")
+    agent: BaseAgent = load_agent(args.agent)
+
+    session_service: Optional[BaseSessionService] = (
+        DatabaseSessionService(db_url=args.db_url) if args.db_url else None
+    )
+    try:
+        stats = asyncio.run(
+            run_batch(
+                agent,
+                args.input,
+                args.output,
+                app_name=args.app_name,
+                concurrency=args.concurrency,
+                resume=args.resume,
+                session_service=session_service,
+                initial_state=json.loads(args.state),
+                checkpoint_path=args.checkpoint,
+                checkpoint_every=args.checkpoint_every,
+            )
+        )
+    except KeyboardInterrupt:
+        print("\nInterrupted, run again with --resume to continue.")
+        return
+    print(json.dumps(stats.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
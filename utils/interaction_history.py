@@ -0,0 +1,282 @@
+"""
+Interaction history module for ADK sessions.
+Records an append-only interaction history, one event per entry, and renders
+a compacted view of it into agent instructions.
+
+Every history entry is written as one event whose state_delta carries that
+entry under LAST_INTERACTION_KEY. Recording an interaction therefore never
+copies or rewrites the entries before it, and the full history is read back by
+replaying those deltas from the session's event log.
+
+For prompt injection the history is compacted by a HistoryCompactor as it is
+written: the same state_delta carries, under HISTORY_STATE_KEY, the most recent
+entries verbatim and a digest of the older ones. Its size is bounded by the
+window, and instructions are rendered from it through the public session state.
+"""
+
+import copy
+import uuid
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from google.adk.agents.llm_agent import InstructionProvider
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.utils.instructions_utils import inject_session_state
+
+# State key holding the newest history entry in each event's state_delta
+LAST_INTERACTION_KEY = "last_interaction"
+
+# State key holding the compacted history the instructions are rendered from
+HISTORY_STATE_KEY = "interaction_history"
+
+# Placeholder in agent instructions that is filled with the interaction history
+HISTORY_PLACEHOLDER = "{interaction_history}"
+
+# Default number of recent entries injected verbatim into instructions
+DEFAULT_WINDOW_SIZE = 10
+
+# Default number of rendered histories an instruction provider keeps
+DEFAULT_RENDER_CACHE_SIZE = 256
+
+# Actions that make up the conversation itself rather than account changes
+CONVERSATION_ACTIONS: tuple[str, ...] = ("user_query", "agent_response")
+
+# Folds one entry that left the verbatim window into the digest
+DigestPolicy = Callable[[dict[str, Any], dict[str, Any]], None]
+
+
+def _stamp(entry: dict[str, Any]) -> dict[str, Any]:
+    """Add a timestamp to the entry if it doesn't have one yet."""
+    if "timestamp" not in entry:
+        entry["timestamp"] = datetime.now().strftime(format="%Y-%m-%d %H:%M:%S")
+    return entry
+
+
+def record_interaction(
+    state: State,
+    entry: dict[str, Any],
+    compactor: Optional["HistoryCompactor"] = None,
+) -> None:
+    """Record an interaction from inside a tool or callback.
+
+    The entry is written to the state delta of the event currently being built,
+    so only one entry can be recorded per tool call.
+
+    Args:
+        state: The tool or callback context state
+        entry: A dictionary containing the interaction data
+            - requires 'action' key (e.g., 'purchase_course', 'refund_course')
+        compactor: Compactor folding the entry in, defaults to default_compactor
+    """
+    compactor = compactor or default_compactor
+    state[LAST_INTERACTION_KEY] = _stamp(entry)
+    state[HISTORY_STATE_KEY] = compactor.fold(state.get(HISTORY_STATE_KEY), entry)
+
+
+async def append_interaction(
+    session_service: BaseSessionService,
+    session: Session,
+    entry: dict[str, Any],
+    author: str = "user",
+    compactor: Optional["HistoryCompactor"] = None,
+) -> Event:
+    """Append an interaction to the session history as a single event.
+
+    The session is the caller's copy, e.g. a StateTracker's, so appending
+    never fetches the session; the append updates its state and events.
+
+    Args:
+        session_service: The session service instance
+        session: The session to append to
+        entry: A dictionary containing the interaction data
+            - requires 'action' key (e.g., 'user_query', 'agent_response')
+        author: Author recorded on the history event
+        compactor: Compactor folding the entry in, defaults to default_compactor
+
+    Returns:
+        The appended history event
+    """
+    compactor = compactor or default_compactor
+    entry = _stamp(entry)
+    event = Event(
+        invocation_id=Event.new_id(),
+        author=author,
+        actions=EventActions(
+            state_delta={
+                LAST_INTERACTION_KEY: entry,
+                HISTORY_STATE_KEY: compactor.fold(
+                    session.state.get(HISTORY_STATE_KEY), entry
+                ),
+            }
+        ),
+    )
+    return await session_service.append_event(session=session, event=event)
+
+
+def get_interaction_history(session: Session) -> list[dict[str, Any]]:
+    """Replay the interaction history from the session's event log.
+
+    Args:
+        session: A session loaded with its events
+
+    Returns:
+        The history entries, oldest first
+    """
+    return _entries_from_events(session.events)
+
+
+def _entries_from_events(events: list[Event]) -> list[dict[str, Any]]:
+    """Collect the history entries carried by the given events."""
+    return [
+        event.actions.state_delta[LAST_INTERACTION_KEY]
+        for event in events
+        if event.actions and LAST_INTERACTION_KEY in event.actions.state_delta
+    ]
+
+
+def count_actions(digest: dict[str, Any], entry: dict[str, Any]) -> None:
+    """Digest policy that only counts older entries per action."""
+    counts: dict[str, int] = digest.setdefault("counts", {})
+    action: str = entry.get("action", "unknown")
+    counts[action] = counts.get(action, 0) + 1
+    digest.setdefault("since", entry.get("timestamp"))
+
+
+def summarize_actions(digest: dict[str, Any], entry: dict[str, Any]) -> None:
+    """Digest policy that counts older entries per action and keeps the latest
+    entry of every non-conversational action (e.g. purchases and refunds)."""
+    count_actions(digest, entry)
+    action: str = entry.get("action", "unknown")
+    if action not in CONVERSATION_ACTIONS:
+        digest.setdefault("latest", {})[action] = entry
+
+
+class HistoryCompactor:
+    """Keeps a bounded view of the interaction history for prompt injection.
+
+    The view is a dictionary with the last `window_size` entries verbatim
+    ("window"), a digest of the older ones ("digest"), the number of entries
+    folded into it ("folded") and an ID that changes with every fold
+    ("version"). Entries leaving the window are folded into the digest by
+    `digest_policy`, one at a time as they are recorded, so the digest is
+    never recomputed from the full history and rendering only ever reads the
+    bounded view.
+    """
+
+    def __init__(
+        self,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        digest_policy: DigestPolicy = summarize_actions,
+    ):
+        """Initialize the history compactor.
+
+        Args:
+            window_size: Number of recent entries kept verbatim
+            digest_policy: Function folding older entries into the digest
+        """
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        self.window_size = window_size
+        self.digest_policy = digest_policy
+
+    def fold(
+        self, compacted: Optional[Mapping[str, Any]], entry: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Add an entry to a compacted view.
+
+        Args:
+            compacted: The current view from the session state, if any
+            entry: The new history entry
+
+        Returns:
+            A new view; the current one is left unchanged
+        """
+        compacted = compacted or {}
+        window: list[dict[str, Any]] = [*compacted.get("window", []), entry]
+        digest: dict[str, Any] = copy.deepcopy(dict(compacted.get("digest", {})))
+        folded: int = compacted.get("folded", 0)
+        while len(window) > self.window_size:
+            self.digest_policy(digest, window.pop(0))
+            folded += 1
+        return {
+            "folded": folded,
+            "digest": digest,
+            "window": window,
+            "version": uuid.uuid4().hex,
+        }
+
+    def render(self, compacted: Optional[Mapping[str, Any]]) -> str:
+        """Render a compacted view as instruction text.
+
+        Args:
+            compacted: The view from the session state, if any
+
+        Returns:
+            The digest of older entries followed by the recent entries
+        """
+        compacted = compacted or {}
+        lines: list[str] = []
+        if compacted.get("folded"):
+            lines.append(
+                f"Summary of {compacted['folded']} earlier interactions: "
+                f"{compacted.get('digest', {})}"
+            )
+        if compacted.get("window"):
+            lines.append(f"Most recent interactions: {list(compacted['window'])}")
+        return "\n".join(lines) if lines else "[]"
+
+
+# Compactor shared by the agent instructions
+default_compactor = HistoryCompactor()
+
+
+def history_instruction(
+    template: str,
+    compactor: Optional[HistoryCompactor] = None,
+    cache_size: int = DEFAULT_RENDER_CACHE_SIZE,
+) -> InstructionProvider:
+    """Create an instruction provider that injects the interaction history.
+
+    State variables are injected exactly like a plain instruction string, while
+    HISTORY_PLACEHOLDER is filled with the compacted history in the session
+    state. The rendered history is kept by the version of the compacted view,
+    so model calls between two recorded interactions render it only once.
+
+    Args:
+        template: The instruction template
+        compactor: Compactor rendering the history, defaults to default_compactor
+        cache_size: Number of rendered histories kept, across sessions
+
+    Returns:
+        An instruction provider for an ADK agent
+    """
+    head, placeholder, tail = template.partition(HISTORY_PLACEHOLDER)
+    compactor = compactor or default_compactor
+    rendered: OrderedDict[str, str] = OrderedDict()
+
+    def render(compacted: Optional[Mapping[str, Any]]) -> str:
+        version: Optional[str] = (compacted or {}).get("version")
+        if version is None:
+            # Views written before versions were added are rendered every time
+            return compactor.render(compacted)
+        text: Optional[str] = rendered.get(version)
+        if text is None:
+            text = rendered[version] = compactor.render(compacted)
+            while len(rendered) > cache_size:
+                rendered.popitem(last=False)
+        else:
+            rendered.move_to_end(version)
+        return text
+
+    async def instruction_provider(context: ReadonlyContext) -> str:
+        instruction: str = await inject_session_state(head, context)
+        if placeholder:
+            instruction += render(context.state.get(HISTORY_STATE_KEY))
+            instruction += await inject_session_state(tail, context)
+        return instruction
+
+    return instruction_provider
@@ -0,0 +1,394 @@
+"""
+LLM response cache module for ADK agents.
+Answers repeated model requests from an exact-match cache at the model
+callback layer: an in-memory LRU, optionally backed by a SQLite file so
+cached responses outlive the process and are shared between processes.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+# Fields of GenerateContentConfig that don't change the model's answer
+_IGNORED_CONFIG_FIELDS: set[str] = {"http_options", "labels"}
+
+
+def strip_tagged_blocks(tags: Sequence[str]) -> Callable[[str], str]:
+    """Build an instruction normalizer that empties the given tagged blocks.
+
+    For instructions that render state which changes on every turn, such as
+    an interaction history inside <interaction_history> tags, so requests
+    that differ only there get the same key.
+
+    Args:
+        tags: Names of the blocks whose content is left out of the key
+    """
+    patterns: list[tuple[re.Pattern[str], str]] = [
+        (
+            re.compile(rf"<{re.escape(tag)}>.*?</{re.escape(tag)}>", re.DOTALL),
+            f"<{tag}></{tag}>",
+        )
+        for tag in tags
+    ]
+
+    def normalize(instruction: str) -> str:
+        for pattern, empty in patterns:
+            instruction = pattern.sub(empty, instruction)
+        return instruction
+
+    return normalize
+
+
+def request_cache_key(
+    llm_request: LlmRequest,
+    normalize_instruction: Optional[Callable[[str], str]] = None,
+) -> str:
+    """Hash the parts of a request that decide the model's answer.
+
+    The key covers the model, the generation config (system instruction,
+    tools, response schema, sampling settings) and the contents. The IDs ADK
+    gives function calls and responses differ on every run, so they're left
+    out; everything else must match exactly, apart from what
+    normalize_instruction removes from the system instruction.
+    """
+    config: dict[str, Any] = (
+        llm_request.config.model_dump(
+            mode="json", exclude_none=True, exclude=_IGNORED_CONFIG_FIELDS
+        )
+        if llm_request.config
+        else {}
+    )
+    if normalize_instruction and isinstance(config.get("system_instruction"), str):
+        config["system_instruction"] = normalize_instruction(
+            config["system_instruction"]
+        )
+    contents: list[dict[str, Any]] = []
+    for content in llm_request.contents:
+        data: dict[str, Any] = content.model_dump(mode="json", exclude_none=True)
+        for part in data.get("parts", []):
+            for field in ("function_call", "function_response"):
+                if field in part:
+                    part[field].pop("id", None)
+        contents.append(data)
+    normalized: str = json.dumps(
+        {"model": llm_request.model, "config": config, "contents": contents},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _CacheEntry:
+    """A cached response and the time it expires at."""
+
+    response: LlmResponse
+    expires_at: Optional[float]
+
+
+class _SqliteTier:
+    """Cached responses in a SQLite file, with wall-clock expiry times.
+
+    Calls are blocking; the cache runs them on a worker thread.
+    """
+
+    def __init__(self, db_path: str | Path):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def get(self, key: str) -> Optional[LlmResponse]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, expires_at FROM llm_response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= time.time():
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM llm_response_cache WHERE key = ?", (key,)
+                    )
+                return None
+        return LlmResponse.model_validate_json(row[0])
+
+    def put(
+        self, key: str, response: LlmResponse, ttl_seconds: Optional[float]
+    ) -> None:
+        expires_at: Optional[float] = time.time() + ttl_seconds if ttl_seconds else None
+        data: str = response.model_dump_json(exclude_none=True)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_response_cache VALUES (?, ?, ?)",
+                (key, data, expires_at),
+            )
+
+    def purge_expired(self) -> int:
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM llm_response_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM llm_response_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class LlmResponseCache:
+    """Exact-match cache of model responses for the agents that opt in.
+
+    before_model_callback hashes the request with request_cache_key and, on a
+    hit, returns the cached response so the model isn't called.
+    after_model_callback stores the complete response to a missed request.
+    Partial (streamed) and error responses are never stored.
+
+    Lookups go to the in-memory LRU first, then to the SQLite tier if there is
+    one; a SQLite hit is copied into memory. Entries expire ttl_seconds after
+    they're stored.
+
+    A missed request's key waits for its response by invocation and agent.
+    A model call that raises never reaches after_model_callback, so at most
+    max_pending keys are kept and the oldest are dropped.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = 3600.0,
+        db_path: Optional[str | Path] = None,
+        max_pending: int = 1024,
+    ):
+        """Initialize the response cache.
+
+        Args:
+            max_entries: Number of responses kept in memory
+            ttl_seconds: Seconds a response is served for, None to never expire
+            db_path: SQLite file to also keep the responses in, None for
+                memory only
+            max_pending: Number of missed requests whose responses are awaited
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_pending = max_pending
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._disk: Optional[_SqliteTier] = _SqliteTier(db_path) if db_path else None
+
+        # Keys of the requests that missed, until their responses arrive,
+        # oldest first
+        self._pending: OrderedDict[tuple[str, str], str] = OrderedDict()
+
+        # Instruction normalizers of the agents that leave blocks out of the key
+        self._normalizers: dict[str, Callable[[str], str]] = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    # ===== Opting in =====
+    def enable_for(
+        self, agent: LlmAgent, ignore_blocks: Sequence[str] = ()
+    ) -> LlmAgent:
+        """Add the cache callbacks to an agent, keeping its own callbacks.
+
+        The lookup runs after the agent's before_model callbacks, so they
+        still see every request, and the store runs before its after_model
+        callbacks, so it gets the response as the model returned it.
+
+        Args:
+            agent: The agent to cache the responses of
+            ignore_blocks: Tagged blocks of the agent's instruction left out of
+                the key, e.g. ["interaction_history"]
+
+        Returns:
+            The agent
+        """
+        if ignore_blocks:
+            self._normalizers[agent.name] = strip_tagged_blocks(ignore_blocks)
+        else:
+            self._normalizers.pop(agent.name, None)
+        agent.before_model_callback = [
+            *agent.canonical_before_model_callbacks,
+            self.before_model_callback,
+        ]
+        agent.after_model_callback = [
+            self.after_model_callback,
+            *agent.canonical_after_model_callbacks,
+        ]
+        return agent
+
+    # ===== Model callbacks =====
+    async def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Return the cached response to the request, if there is one."""
+        key: str = request_cache_key(
+            llm_request, self._normalizers.get(callback_context.agent_name)
+        )
+        response: Optional[LlmResponse] = self._lookup(key)
+        if response is None and self._disk is not None:
+            response = await asyncio.to_thread(self._disk.get, key)
+            if response is not None:
+                self.disk_hits += 1
+                self._put(key, response)
+        elif response is not None:
+            self.memory_hits += 1
+
+        pending_key: tuple[str, str] = self._pending_key(callback_context)
+        if response is None:
+            self.misses += 1
+            self._await_response(pending_key, key)
+            return None
+        # No response follows a hit, so drop a key left by a failed call
+        self._pending.pop(pending_key, None)
+        response = response.model_copy(deep=True)
+        response.custom_metadata = {
+            **(response.custom_metadata or {}),
+            "llm_cache": "hit",
+        }
+        return response
+
+    async def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Store the complete response to a request that missed."""
+        if llm_response.partial:
+            return None
+        key: Optional[str] = self._pending.pop(
+            self._pending_key(callback_context), None
+        )
+        if key is None or llm_response.error_code or llm_response.content is None:
+            return None
+        self._put(key, llm_response)
+        self.stores += 1
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.put, key, llm_response, self.ttl_seconds)
+        return None
+
+    @staticmethod
+    def _pending_key(callback_context: CallbackContext) -> tuple[str, str]:
+        """An agent's model calls within an invocation run one at a time."""
+        return callback_context.invocation_id, callback_context.agent_name
+
+    def _await_response(self, pending_key: tuple[str, str], key: str) -> None:
+        """Remember a missed request's key until its response arrives.
+
+        A key left behind by a model call that raised is replaced by the next
+        call of the same agent in the invocation, or dropped once max_pending
+        newer misses are waiting.
+        """
+        self._pending.pop(pending_key, None)
+        self._pending[pending_key] = key
+        while len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+
+    # ===== Cache bookkeeping =====
+    def _put(self, key: str, response: LlmResponse) -> None:
+        """Cache a private copy of a response."""
+        expires_at: Optional[float] = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        )
+        self._entries.pop(key, None)
+        self._entries[key] = _CacheEntry(
+            response=response.model_copy(deep=True), expires_at=expires_at
+        )
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup(self, key: str) -> Optional[LlmResponse]:
+        """Return the cached response if it's present and not expired."""
+        entry: Optional[_CacheEntry] = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.response
+
+    def stats(self) -> dict[str, Any]:
+        """Return the cache counters.
+
+        Returns:
+            The hit (by tier), miss, store and eviction counts, the hit rate
+            and the number of responses in memory
+        """
+        hits: int = self.memory_hits + self.disk_hits
+        lookups: int = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+    def purge_expired(self) -> int:
+        """Drop the expired responses from both tiers.
+
+        Returns:
+            The number of responses dropped
+        """
+        now: float = time.monotonic()
+        expired: list[str] = [
+            key
+            for key, entry in self._entries.items()
+            if entry.expires_at is not None and entry.expires_at <= now
+        ]
+        for key in expired:
+            del self._entries[key]
+        return len(expired) + (self._disk.purge_expired() if self._disk else 0)
+
+    def clear(self) -> None:
+        """Drop all cached responses from both tiers."""
+        self._entries.clear()
+        self._pending.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        """Drop the in-memory responses and close the SQLite file."""
+        self._entries.clear()
+        self._pending.clear()
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+
+def cache_hit(llm_response: LlmResponse) -> bool:
+    """Check whether a response was served from an LlmResponseCache."""
+    return (llm_response.custom_metadata or {}).get("llm_cache") == "hit"
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Load test client for the agent server.
+
+Opens many concurrent sessions against a running agent server, sends a number
+of turns in each over HTTP or WebSocket, and reports throughput and turn
+latency percentiles. With --mock it starts an in-process server whose agent
+uses MockLlm, so the server can be load tested without a model API.
+
+Usage:
+    python -m utils.load_test_client --mock [--latency-ms 50] [--sessions 100] [--turns 5]
+    python -m utils.load_test_client --url http://127.0.0.1:8000 [--websocket]
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import time
+from typing import Any, Optional
+
+import httpx
+import uvicorn
+import websockets
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from utils.agent_server import AgentServer, create_app
+from utils.mock_llm import MockLlm
+
+
+async def _http_session(
+    client: httpx.AsyncClient, user_id: str, turns: int, latencies: list[float]
+) -> None:
+    """Create a session and run its turns over HTTP."""
+    response = await client.post("/sessions", json={"user_id": user_id})
+    response.raise_for_status()
+    session_id: str = response.json()["session_id"]
+    for turn in range(turns):
+        start = time.perf_counter()
+        response = await client.post(
+            f"/sessions/{session_id}/turns",
+            json={"user_id": user_id, "text": f"turn {turn}"},
+        )
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def _websocket_session(
+    client: httpx.AsyncClient, user_id: str, turns: int, latencies: list[float]
+) -> None:
+    """Create a session over HTTP and run its turns over a WebSocket."""
+    response = await client.post("/sessions", json={"user_id": user_id})
+    response.raise_for_status()
+    session_id: str = response.json()["session_id"]
+    url = str(client.base_url.copy_with(scheme="ws"))
+    async with websockets.connect(
+        f"{url.rstrip('/')}/sessions/{session_id}/ws?user_id={user_id}"
+    ) as websocket:
+        for turn in range(turns):
+            start = time.perf_counter()
+            await websocket.send(f"turn {turn}")
+            while True:
+                message: dict[str, Any] = json.loads(await websocket.recv())
+                if message.get("done"):
+                    if "error" in message:
+                        raise RuntimeError(message["error"])
+                    break
+            latencies.append(time.perf_counter() - start)
+
+
+async def run_load_test(
+    url: str, sessions: int, turns: int, websocket: bool = False
+) -> dict[str, Any]:
+    """Run concurrent sessions against a server and measure their turns.
+
+    Args:
+        url: Base URL of the agent server
+        sessions: Number of concurrent sessions
+        turns: Turns per session
+        websocket: Send the turns over WebSockets instead of HTTP
+
+    Returns:
+        Turn counts, throughput and latency percentiles, and the server metrics
+    """
+    latencies: list[float] = []
+    run_session = _websocket_session if websocket else _http_session
+    limits = httpx.Limits(max_connections=sessions)
+    async with httpx.AsyncClient(base_url=url, timeout=60.0, limits=limits) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                run_session(client, f"load_user_{i}", turns, latencies)
+                for i in range(sessions)
+            ),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - start
+        server_metrics: dict[str, Any] = (await client.get("/metrics")).json()
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    quantiles = (
+        statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    )
+    return {
+        "sessions": sessions,
+        "turns": len(latencies),
+        "failed_sessions": len(errors),
+        "first_error": repr(errors[0]) if errors else None,
+        "seconds": round(elapsed, 3),
+        "turns_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(quantiles[49] * 1000, 1) if quantiles else None,
+        "p95_ms": round(quantiles[94] * 1000, 1) if quantiles else None,
+        "p99_ms": round(quantiles[98] * 1000, 1) if quantiles else None,
+        "server": server_metrics,
+    }
+
+
+def create_mock_server(latency: float, max_concurrency: int) -> AgentServer:
+    """Create an agent server whose agent answers through MockLlm."""
+    session_service = InMemorySessionService()
+    agent = Agent(
+        name="mock_agent",
+        model=MockLlm(latency=latency),
+        description="Echoes the user's messages",
+        instruction="Repeat what the user says.",
+    )
+    runner = Runner(app_name="load_test", agent=agent, session_service=session_service)
+    return AgentServer(
+        runner, session_service, app_name="load_test", max_concurrency=max_concurrency
+    )
+
+
+async def run_against_mock(
+    latency: float,
+    max_concurrency: int,
+    sessions: int,
+    turns: int,
+    websocket: bool = False,
+) -> dict[str, Any]:
+    """Start a mock server on a free local port and load test it."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+
+    config = uvicorn.Config(
+        create_app(create_mock_server(latency, max_concurrency)),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+    )
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if serving.done():
+                serving.result()
+            await asyncio.sleep(0.01)
+        return await run_load_test(
+            f"http://127.0.0.1:{port}", sessions, turns, websocket
+        )
+    finally:
+        server.should_exit = True
+        await serving
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running agent server")
+    target.add_argument(
+        "--mock", action="store_true", help="Start an in-process server with MockLlm"
+    )
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--websocket", action="store_true")
+    parser.add_argument(
+        "--latency-ms", type=float, default=50.0, help="MockLlm latency per call"
+    )
+    parser.add_argument(
+        "--max-concurrency", type=int, default=16, help="Mock server turn limit"
+    )
+    args = parser.parse_args(argv)
+
+    if args.mock:
+        report = asyncio.run(
+            run_against_mock(
+                args.latency_ms / 1000,
+                args.max_concurrency,
+                args.sessions,
+                args.turns,
+                args.websocket,
+            )
+        )
+    else:
+        report = asyncio.run(
+            run_load_test(args.url, args.sessions, args.turns, args.websocket)
+        )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
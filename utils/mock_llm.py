@@ -0,0 +1,361 @@
+"""
+Mock model module for ADK agents.
+Provides an LLM that answers without calling a model API, so agents, runners,
+servers and whole Sequential, Parallel and Loop pipelines can be exercised,
+benchmarked and load tested locally and deterministically.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from string import Template
+from typing import Any, AsyncGenerator, Literal, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import errors, types
+from pydantic import BaseModel, PrivateAttr
+
+LatencyDistribution = Literal["fixed", "uniform", "normal", "lognormal", "exponential"]
+
+
+class MockResponse(BaseModel):
+    """A scripted answer of a MockLlm.
+
+    text and the string values of args are string.Template templates with
+    $user_text (the latest user message), $tool_name and $tool_result (the
+    tool response being answered, as JSON) and $call (the model's call number).
+    """
+
+    text: Optional[str] = None
+    """Answer text, used when function_call is not set."""
+    function_call: Optional[str] = None
+    """Name of a tool to call instead of answering with text."""
+    args: dict[str, Any] = {}
+    """Arguments of the tool call."""
+    match: Optional[str] = None
+    """Regular expression the latest user message must contain."""
+    after_tool: Optional[str] = None
+    """Answer a response of this tool ("*" for any tool); None answers a user message."""
+    times: Optional[int] = None
+    """Most times this answer is given per conversation, None for no limit."""
+
+
+class MockLlm(BaseLlm):
+    """LLM that answers from a script after a sampled latency.
+
+    Use it as an agent's model, e.g. Agent(model=MockLlm(latency=0.05), ...),
+    or put it in place of every model of an agent tree with install_mock_llm.
+    Each call gives the first scripted response that matches the request, or
+    echoes the latest user message if none does. In streaming mode a text
+    answer arrives as one partial response per word, token_latency seconds
+    apart, followed by the complete response.
+
+    The times limits of scripted responses count uses per conversation, so
+    one model serving many concurrent sessions answers each session the same
+    way. A request continues the conversation its latest model answer was
+    given in: the uses so far are kept by a fingerprint of the contents up to
+    and including that answer, and a request without a model answer starts a
+    new conversation. Sessions with identical histories share their counts,
+    which keeps their answers identical too.
+
+    Latencies and injected errors are drawn from a random generator seeded
+    with seed, so a run can be repeated exactly. Tokens are counted as
+    whitespace-separated words and reported in usage_metadata.
+    """
+
+    model: str = "mock-llm"
+    responses: list[MockResponse] = []
+    """Scripted answers, tried in order."""
+    latency: float = 0.0
+    """Seconds each call waits before answering (the mean or median of the distribution)."""
+    latency_distribution: LatencyDistribution = "fixed"
+    """How call latencies are spread around latency."""
+    latency_spread: float = 0.0
+    """Half-width (uniform), standard deviation (normal) or sigma (lognormal)."""
+    token_latency: float = 0.0
+    """Seconds between the partial responses of a streamed answer."""
+    output_tokens: Optional[int] = None
+    """Pad or cut text answers to this many tokens, None to keep them as they are."""
+    fail_first: int = 0
+    """Number of first calls that fail with a 503 error."""
+    error_rate: float = 0.0
+    """Chance that any later call fails with a 503 error."""
+    seed: Optional[int] = 0
+    """Seed of the latency and error generator, None for a random one."""
+
+    _rng: random.Random = PrivateAttr(default_factory=random.Random)
+    # Uses of each scripted response by conversation, keyed by the fingerprint
+    # of the contents up to and including the model's latest answer
+    _uses: dict[str, dict[int, int]] = PrivateAttr(default_factory=dict)
+    _call_count: int = PrivateAttr(default=0)
+    _error_count: int = PrivateAttr(default=0)
+
+    def model_post_init(self, context: Any) -> None:
+        super().model_post_init(context)
+        self._rng = random.Random(self.seed)
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        """Model names that resolve to MockLlm, e.g. Agent(model="mock-llm")."""
+        return [r"mock-llm.*"]
+
+    @property
+    def call_count(self) -> int:
+        """Number of calls so far, failed ones included."""
+        return self._call_count
+
+    @property
+    def error_count(self) -> int:
+        """Number of calls that failed with an injected error."""
+        return self._error_count
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self._call_count += 1
+        call: int = self._call_count
+        delay: float = self._sample_latency()
+        if delay:
+            await asyncio.sleep(delay)
+        if call <= self.fail_first or (
+            self.error_rate and self._rng.random() < self.error_rate
+        ):
+            self._error_count += 1
+            raise errors.ServerError(
+                503,
+                {
+                    "error": {
+                        "code": 503,
+                        "message": "The model is overloaded. Please try again later.",
+                        "status": "UNAVAILABLE",
+                    }
+                },
+            )
+
+        part: types.Part = self._answer(llm_request, call)
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=_count_tokens(_request_text(llm_request)),
+            candidates_token_count=_count_tokens(
+                part.text if part.text is not None else str(part.function_call)
+            ),
+        )
+        usage.total_token_count = (
+            usage.prompt_token_count + usage.candidates_token_count
+        )
+
+        if stream and part.text is not None:
+            for i, word in enumerate(part.text.split(" ")):
+                if i and self.token_latency:
+                    await asyncio.sleep(self.token_latency)
+                yield LlmResponse(
+                    content=types.Content(
+                        role="model", parts=[types.Part(text=f" {word}" if i else word)]
+                    ),
+                    partial=True,
+                )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]), usage_metadata=usage
+        )
+
+    def _sample_latency(self) -> float:
+        """Draw a call's latency from the configured distribution."""
+        if self.latency_distribution == "uniform":
+            delay = self._rng.uniform(
+                self.latency - self.latency_spread, self.latency + self.latency_spread
+            )
+        elif self.latency_distribution == "normal":
+            delay = self._rng.gauss(self.latency, self.latency_spread)
+        elif self.latency_distribution == "lognormal":
+            delay = self.latency * math.exp(self._rng.gauss(0.0, self.latency_spread))
+        elif self.latency_distribution == "exponential":
+            delay = self._rng.expovariate(1 / self.latency) if self.latency else 0.0
+        else:
+            delay = self.latency
+        return max(delay, 0.0)
+
+    def _answer(self, llm_request: LlmRequest, call: int) -> types.Part:
+        """Build the answer part from the first matching scripted response."""
+        tool_response: Optional[types.FunctionResponse] = _latest_tool_response(
+            llm_request
+        )
+        user_text: str = _latest_user_text(llm_request)
+        variables: dict[str, Any] = {
+            "user_text": user_text,
+            "tool_name": tool_response.name if tool_response else "",
+            "tool_result": (
+                json.dumps(tool_response.response, default=str) if tool_response else ""
+            ),
+            "call": call,
+        }
+
+        uses: dict[int, int] = self._conversation_uses(llm_request.contents)
+        response: Optional[MockResponse] = self._match(tool_response, user_text, uses)
+        part: types.Part = self._render(response, variables, user_text)
+        # Carry the uses over to the conversation that continues with this answer
+        self._uses[
+            _fingerprint(
+                [*llm_request.contents, types.Content(role="model", parts=[part])]
+            )
+        ] = uses
+        return part
+
+    def _render(
+        self,
+        response: Optional[MockResponse],
+        variables: dict[str, Any],
+        user_text: str,
+    ) -> types.Part:
+        """Build the answer part of a scripted response, or the echo."""
+        if response is not None and response.function_call:
+            return types.Part(
+                function_call=types.FunctionCall(
+                    name=response.function_call,
+                    args={
+                        key: (
+                            Template(value).safe_substitute(variables)
+                            if isinstance(value, str)
+                            else value
+                        )
+                        for key, value in response.args.items()
+                    },
+                )
+            )
+        if response is not None and response.text is not None:
+            text: str = Template(response.text).safe_substitute(variables)
+        else:
+            text = f"echo: {user_text}"
+        if self.output_tokens is not None:
+            words: list[str] = text.split(" ")
+            words += ["lorem"] * (self.output_tokens - len(words))
+            text = " ".join(words[: self.output_tokens])
+        return types.Part(text=text)
+
+    def _conversation_uses(self, contents: list[types.Content]) -> dict[int, int]:
+        """Get a copy of the uses of the conversation a request continues."""
+        for end in range(len(contents), 0, -1):
+            if contents[end - 1].role == "model":
+                return dict(self._uses.get(_fingerprint(contents[:end]), {}))
+        return {}
+
+    def _match(
+        self,
+        tool_response: Optional[types.FunctionResponse],
+        user_text: str,
+        uses: dict[int, int],
+    ) -> Optional[MockResponse]:
+        """Get the first scripted response that applies, counting its use."""
+        for i, response in enumerate(self.responses):
+            if response.times is not None and uses.get(i, 0) >= response.times:
+                continue
+            if response.after_tool is None:
+                if tool_response is not None:
+                    continue
+            elif tool_response is None or response.after_tool not in (
+                "*",
+                tool_response.name,
+            ):
+                continue
+            if response.match and not re.search(response.match, user_text):
+                continue
+            uses[i] = uses.get(i, 0) + 1
+            return response
+        return None
+
+
+def install_mock_llm(
+    agent: BaseAgent,
+    default: Optional[BaseLlm] = None,
+    by_agent: Optional[dict[str, BaseLlm]] = None,
+) -> list[str]:
+    """Replace the models of the LLM agents in an agent tree.
+
+    Args:
+        agent: The root of the agent tree
+        default: Model for the LLM agents not in by_agent, None to keep theirs
+        by_agent: Models by agent name
+
+    Returns:
+        The names of the agents whose model was replaced
+    """
+    replaced: list[str] = []
+    model: Optional[BaseLlm] = (by_agent or {}).get(agent.name, default)
+    if isinstance(agent, LlmAgent) and model is not None:
+        agent.model = model
+        replaced.append(agent.name)
+    for sub_agent in agent.sub_agents:
+        replaced += install_mock_llm(sub_agent, default, by_agent)
+    return replaced
+
+
+def _latest_user_text(llm_request: LlmRequest) -> str:
+    """Get the text of the latest user message in a request."""
+    for content in reversed(llm_request.contents):
+        if content.role == "user" and content.parts:
+            texts: list[str] = [part.text for part in content.parts if part.text]
+            if texts:
+                return "".join(texts)
+    return ""
+
+
+def _latest_tool_response(llm_request: LlmRequest) -> Optional[types.FunctionResponse]:
+    """Get the tool response the request ends with, if it ends with one."""
+    if not llm_request.contents or not llm_request.contents[-1].parts:
+        return None
+    for part in llm_request.contents[-1].parts:
+        if part.function_response:
+            return part.function_response
+    return None
+
+
+def _fingerprint(contents: list[types.Content]) -> str:
+    """Hash the texts, tool calls and tool responses of a conversation.
+
+    Function call IDs are left out, since ADK adds them to the stored answers.
+    """
+    digest = hashlib.sha256()
+    for content in contents:
+        parts: list[Any] = [
+            [
+                part.text,
+                part.function_call.name if part.function_call else None,
+                part.function_call.args if part.function_call else None,
+                part.function_response.name if part.function_response else None,
+                part.function_response.response if part.function_response else None,
+            ]
+            for part in content.parts or []
+        ]
+        digest.update(
+            json.dumps([content.role, parts], sort_keys=True, default=str).encode()
+        )
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _request_text(llm_request: LlmRequest) -> str:
+    """Get the system instruction and contents of a request as text."""
+    texts: list[str] = []
+    if llm_request.config and isinstance(llm_request.config.system_instruction, str):
+        texts.append(llm_request.config.system_instruction)
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if part.text:
+                texts.append(part.text)
+            elif part.function_call or part.function_response:
+                texts.append(str(part.function_call or part.function_response))
+    return " ".join(texts)
+
+
+def _count_tokens(text: str) -> int:
+    """Count the tokens of a text as its whitespace-separated words."""
+    return len(text.split())
+
+
+# Resolve model names like "mock-llm" to MockLlm
+LLMRegistry.register(MockLlm)
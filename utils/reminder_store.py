@@ -0,0 +1,325 @@
+"""
+Reminder store module for the persistent agent examples.
+Provides a normalized reminders table with stable reminder IDs and a position
+index, so adding, updating or deleting a reminder writes a single row instead
+of rewriting the user's whole reminder list in the session state.
+"""
+
+import base64
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import (
+    DateTime,
+    Engine,
+    Index,
+    Integer,
+    Select,
+    String,
+    Text,
+    and_,
+    create_engine,
+    delete,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+
+
+class _Base(DeclarativeBase):
+    """Declarative base of the reminder tables, separate from ADK's tables."""
+
+
+class StorageReminder(_Base):
+    """One reminder of a user."""
+
+    __tablename__ = "reminders"
+
+    id: Mapped[str] = mapped_column(
+        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    app_name: Mapped[str] = mapped_column(String(128))
+    user_id: Mapped[str] = mapped_column(String(128))
+    # Sort key of the reminder; gaps left by deleted reminders are never closed
+    position: Mapped[int] = mapped_column(Integer)
+    text: Mapped[str] = mapped_column(Text)
+    create_time: Mapped[datetime] = mapped_column(DateTime(), default=func.now())
+    update_time: Mapped[datetime] = mapped_column(
+        DateTime(), default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        # Unique, so two concurrent adds can't both take the same position
+        Index(
+            "uq_reminders_app_user_position",
+            "app_name",
+            "user_id",
+            "position",
+            unique=True,
+        ),
+    )
+
+
+# Attempts of an add before giving up on concurrent adds taking its positions
+ADD_ATTEMPTS: int = 3
+
+
+@dataclass
+class Reminder:
+    """A reminder and its 1-based index in the user's list."""
+
+    id: str
+    index: int
+    text: str
+
+
+@dataclass
+class ReminderPage:
+    """One page of reminders and the token of the next page, if there is one."""
+
+    reminders: list[Reminder]
+    next_page_token: Optional[str] = None
+
+
+def _encode_page_token(position: int, reminder_id: str, index: int) -> str:
+    """Encode the position after a reminder as an opaque page token."""
+    token: str = f"{position}|{reminder_id}|{index}"
+    return base64.urlsafe_b64encode(token.encode()).decode()
+
+
+def _decode_page_token(page_token: str) -> tuple[int, str, int]:
+    """Decode a page token into a position, reminder ID and reminder index."""
+    try:
+        token: str = base64.urlsafe_b64decode(page_token.encode()).decode()
+        position, reminder_id, index = token.split("|", 2)
+        return int(position), reminder_id, int(index)
+    except ValueError as e:
+        raise ValueError(f"Invalid page token: {page_token}") from e
+
+
+class ReminderStore:
+    """Reminders in their own table, one row per reminder.
+
+    Reminders are ordered by position, which is only ever assigned on add, so
+    deleting a reminder doesn't renumber the others in the database. The
+    1-based index shown to the user is the reminder's rank in that order;
+    updates and deletes address the reminder by its stable ID, so they stay
+    correct when the list changed since it was read.
+    """
+
+    def __init__(self, db_url: str, **kwargs: Any):
+        """Initialize the reminder store and create its table if needed.
+
+        Args:
+            db_url: The database URL, e.g. sqlite:///./my_agent_data.db
+            **kwargs: Extra arguments for the SQLAlchemy engine (pool settings)
+        """
+        self.db_engine: Engine = create_engine(db_url, **kwargs)
+        self.database_session_factory = sessionmaker(bind=self.db_engine)
+        _Base.metadata.create_all(self.db_engine)
+
+    def close(self) -> None:
+        """Close all pooled database connections."""
+        self.db_engine.dispose()
+
+    # ===== Queries =====
+    @staticmethod
+    def _user_reminders(app_name: str, user_id: str) -> Select:
+        """Select a user's reminders in list order."""
+        return (
+            select(StorageReminder)
+            .where(StorageReminder.app_name == app_name)
+            .where(StorageReminder.user_id == user_id)
+            .order_by(StorageReminder.position, StorageReminder.id)
+        )
+
+    def count(self, app_name: str, user_id: str) -> int:
+        """Return the number of reminders the user has."""
+        statement = (
+            select(func.count())
+            .select_from(StorageReminder)
+            .where(StorageReminder.app_name == app_name)
+            .where(StorageReminder.user_id == user_id)
+        )
+        with self.database_session_factory() as db:
+            return db.scalar(statement) or 0
+
+    def list_page(
+        self,
+        app_name: str,
+        user_id: str,
+        page_size: int = 20,
+        page_token: Optional[str] = None,
+    ) -> ReminderPage:
+        """List one page of the user's reminders in list order.
+
+        Pages are read with keyset pagination on the position index, so every
+        page costs the same however many reminders come before it.
+
+        Args:
+            app_name: The application name
+            user_id: The user ID
+            page_size: Maximum number of reminders on the page
+            page_token: The next_page_token of the previous page, None for the first
+
+        Returns:
+            The page of reminders and the token of the next page, if there is one
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        statement: Select = self._user_reminders(app_name, user_id)
+        first_index: int = 1
+        if page_token:
+            after_position, after_id, first_index = _decode_page_token(page_token)
+            statement = statement.where(
+                or_(
+                    StorageReminder.position > after_position,
+                    and_(
+                        StorageReminder.position == after_position,
+                        StorageReminder.id > after_id,
+                    ),
+                )
+            )
+        # Fetch one extra row to know whether there's a next page
+        with self.database_session_factory() as db:
+            rows = db.scalars(statement.limit(page_size + 1)).all()
+
+        page = ReminderPage(
+            reminders=[
+                Reminder(id=row.id, index=first_index + offset, text=row.text)
+                for offset, row in enumerate(rows[:page_size])
+            ]
+        )
+        if len(rows) > page_size:
+            last: StorageReminder = rows[page_size - 1]
+            page.next_page_token = _encode_page_token(
+                last.position, last.id, first_index + page_size
+            )
+        return page
+
+    # ===== Writes =====
+    def add(
+        self, app_name: str, user_id: str, text: str, count: Optional[int] = None
+    ) -> Reminder:
+        """Add a reminder to the end of the user's list.
+
+        Args:
+            app_name: The application name
+            user_id: The user ID
+            text: The reminder text
+            count: The number of reminders the user has, e.g. the
+                user:reminder_count state; counted in the table when None
+
+        Returns:
+            The new reminder
+        """
+        if count is None:
+            count = self.count(app_name, user_id)
+        reminder_id: str = self._append(app_name, user_id, [text])[0]
+        return Reminder(id=reminder_id, index=count + 1, text=text)
+
+    def update(self, app_name: str, user_id: str, reminder_id: str, text: str) -> bool:
+        """Change the text of one reminder.
+
+        Args:
+            app_name: The application name
+            user_id: The user ID
+            reminder_id: The ID of the reminder
+            text: The new reminder text
+
+        Returns:
+            True if the reminder was found and updated
+        """
+        statement = (
+            update(StorageReminder)
+            .where(StorageReminder.id == reminder_id)
+            .where(StorageReminder.app_name == app_name)
+            .where(StorageReminder.user_id == user_id)
+            .values(text=text)
+        )
+        with self.database_session_factory() as db:
+            updated: int = db.execute(statement).rowcount
+            db.commit()
+            return updated > 0
+
+    def delete(self, app_name: str, user_id: str, reminder_id: str) -> bool:
+        """Delete one reminder.
+
+        Args:
+            app_name: The application name
+            user_id: The user ID
+            reminder_id: The ID of the reminder
+
+        Returns:
+            True if the reminder was found and deleted
+        """
+        statement = (
+            delete(StorageReminder)
+            .where(StorageReminder.id == reminder_id)
+            .where(StorageReminder.app_name == app_name)
+            .where(StorageReminder.user_id == user_id)
+        )
+        with self.database_session_factory() as db:
+            deleted: int = db.execute(statement).rowcount
+            db.commit()
+            return deleted > 0
+
+    def import_reminders(self, app_name: str, user_id: str, texts: list[str]) -> int:
+        """Add a list of reminders in one transaction, e.g. from session state.
+
+        Args:
+            app_name: The application name
+            user_id: The user ID
+            texts: The reminder texts in list order
+
+        Returns:
+            The number of reminders added
+        """
+        return len(self._append(app_name, user_id, [str(text) for text in texts]))
+
+    def _append(self, app_name: str, user_id: str, texts: list[str]) -> list[str]:
+        """Insert reminders after the user's last position in one transaction.
+
+        The last position is read with one seek on the unique position index.
+        When a concurrent add takes the same positions first, the unique index
+        rejects the insert and it is retried after the new last position.
+
+        Returns:
+            The IDs of the new reminders
+        """
+        last_position_query: Select = (
+            select(StorageReminder.position)
+            .where(StorageReminder.app_name == app_name)
+            .where(StorageReminder.user_id == user_id)
+            .order_by(StorageReminder.position.desc())
+            .limit(1)
+        )
+        attempt: int = 0
+        while True:
+            attempt += 1
+            reminder_ids: list[str] = [str(uuid.uuid4()) for _ in texts]
+            with self.database_session_factory() as db:
+                last_position: int = db.scalar(last_position_query) or 0
+                db.add_all(
+                    StorageReminder(
+                        id=reminder_id,
+                        app_name=app_name,
+                        user_id=user_id,
+                        position=last_position + offset,
+                        text=text,
+                    )
+                    for offset, (reminder_id, text) in enumerate(
+                        zip(reminder_ids, texts), start=1
+                    )
+                )
+                try:
+                    db.commit()
+                    return reminder_ids
+                except IntegrityError:
+                    if attempt >= ADD_ATTEMPTS:
+                        raise
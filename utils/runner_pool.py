@@ -0,0 +1,81 @@
+"""
+Runner pool module for ADK agents.
+Creates one Runner per app, agent and session service and hands out the same
+instance on every turn instead of constructing a new runner per question.
+"""
+
+from typing import Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.artifacts import BaseArtifactService
+from google.adk.memory import BaseMemoryService
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService
+
+RunnerKey = tuple[str, int, int]
+
+
+class RunnerPool:
+    """Reuses runners across turns and sessions.
+
+    A Runner holds no per-session state, so one runner per (app_name, agent,
+    session_service) serves every session of that app. Runners are keyed by
+    the identity of the agent and the session service; the pooled runner
+    keeps both alive, so the key stays valid.
+    """
+
+    def __init__(self) -> None:
+        self._runners: dict[RunnerKey, Runner] = {}
+        self.created: int = 0
+        self.reused: int = 0
+
+    def get(
+        self,
+        app_name: str,
+        agent: BaseAgent,
+        session_service: BaseSessionService,
+        artifact_service: Optional[BaseArtifactService] = None,
+        memory_service: Optional[BaseMemoryService] = None,
+    ) -> Runner:
+        """Get the runner for an app and agent, creating it on first use.
+
+        Args:
+            app_name: The application name
+            agent: The root agent
+            session_service: The session service the runner uses
+            artifact_service: Artifact service for a newly created runner
+            memory_service: Memory service for a newly created runner
+
+        Returns:
+            The pooled runner
+        """
+        key: RunnerKey = (app_name, id(agent), id(session_service))
+        runner: Optional[Runner] = self._runners.get(key)
+        if runner is not None:
+            self.reused += 1
+            return runner
+
+        runner = Runner(
+            app_name=app_name,
+            agent=agent,
+            session_service=session_service,
+            artifact_service=artifact_service,
+            memory_service=memory_service,
+        )
+        self._runners[key] = runner
+        self.created += 1
+        return runner
+
+    def __len__(self) -> int:
+        return len(self._runners)
+
+    async def close(self) -> None:
+        """Close every pooled runner and empty the pool."""
+        runners: list[Runner] = list(self._runners.values())
+        self._runners.clear()
+        for runner in runners:
+            await runner.close()
+
+
+# Pool shared by the whole process
+runner_pool = RunnerPool()
@@ -0,0 +1,515 @@
+"""
+Session archive module for ADK database session services.
+Provides a background job that moves idle sessions and their events out of
+the live tables into a compressed cold-storage table, and restores them
+transparently when they're read again.
+"""
+
+import asyncio
+import logging
+import zlib
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.database_session_service import StorageEvent, StorageSession
+from sqlalchemy import (
+    DateTime,
+    Engine,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    delete,
+    func,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    sessionmaker,
+)
+from sqlalchemy.orm import Session as DatabaseSession
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger: logging.Logger = logging.getLogger(name=__name__)
+
+SessionKey = tuple[str, str, str]
+
+# zstd when the zstandard package is installed, zlib otherwise; every archived
+# session records its codec, so archives written with either stay readable
+ARCHIVE_CODEC: str = "zstd" if zstandard else "zlib"
+
+# Index behind the search for idle sessions across all users
+SESSION_IDLE_INDEX = Index("ix_sessions_update_time", StorageSession.update_time)
+
+
+class _Base(DeclarativeBase):
+    """Declarative base of the archive table, separate from ADK's tables."""
+
+
+class StorageArchivedSession(_Base):
+    """A session and its events, compressed as one JSON document."""
+
+    __tablename__ = "archived_sessions"
+
+    app_name: Mapped[str] = mapped_column(String(128), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    create_time: Mapped[datetime] = mapped_column(DateTime())
+    update_time: Mapped[datetime] = mapped_column(DateTime())
+    archive_time: Mapped[datetime] = mapped_column(DateTime(), default=func.now())
+    event_count: Mapped[int] = mapped_column(Integer)
+    codec: Mapped[str] = mapped_column(String(16))
+    raw_bytes: Mapped[int] = mapped_column(Integer)
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+
+    __table_args__ = (
+        Index(
+            "ix_archived_sessions_app_user_update_time",
+            "app_name",
+            "user_id",
+            "update_time",
+        ),
+    )
+
+
+@dataclass
+class ArchiveReport:
+    """What one archival run moved to cold storage."""
+
+    sessions: int = 0
+    events: int = 0
+    raw_bytes: int = 0
+    compressed_bytes: int = 0
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        """Bytes of session JSON moved out of the live tables, less the archive."""
+        return self.raw_bytes - self.compressed_bytes
+
+    def add(self, other: "ArchiveReport") -> None:
+        """Add the counts of another report to this one."""
+        for field in fields(self):
+            setattr(
+                self, field.name, getattr(self, field.name) + getattr(other, field.name)
+            )
+
+
+def _compress(data: bytes) -> bytes:
+    """Compress a JSON document with the archive codec."""
+    if ARCHIVE_CODEC == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, level=9)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    """Decompress an archived JSON document written with `codec`."""
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Install zstandard to read zstd-compressed sessions")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+class ArchivingSessionService(BaseSessionService):
+    """Moves idle sessions of a database session service to cold storage.
+
+    A background job archives every session that hasn't been updated for
+    `max_idle_seconds`: the session with its events is stored as compressed
+    JSON in the archived_sessions table, and its session and event rows are
+    deleted. get_session restores an archived session into the live tables
+    before loading it, so callers never see the difference. app: and user:
+    state isn't archived, as other sessions share it.
+
+    Appends to a session this service archived (e.g. from a cached copy)
+    restore it first.
+    """
+
+    def __init__(
+        self,
+        inner: BaseSessionService,
+        max_idle_seconds: float = 30 * 24 * 3600,
+        interval_seconds: float = 3600.0,
+        batch_size: int = 100,
+    ):
+        """Initialize the archiving session service.
+
+        Args:
+            inner: A database session service (sync, async or batching)
+            max_idle_seconds: Seconds without updates before a session is archived
+            interval_seconds: Seconds between runs of the background job
+            batch_size: Maximum number of sessions archived per run
+        """
+        if not hasattr(inner, "db_engine"):
+            raise TypeError(f"{type(inner).__name__} isn't backed by a database")
+        self.inner = inner
+        self.db_engine: Engine | AsyncEngine = inner.db_engine
+        self.max_idle_seconds = max_idle_seconds
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._tables_ready = False
+        self._archived: set[SessionKey] = set()
+        # Sessions that failed to archive, skipped until they're updated
+        self._failed: set[SessionKey] = set()
+        self._job: Optional[asyncio.Task] = None
+        self.totals = ArchiveReport()
+        self.rehydrated = 0
+
+    # ===== Database access =====
+    async def _run(self, work: Callable[[DatabaseSession], Any]) -> Any:
+        """Run work on an ORM session of the sync or async engine."""
+        if isinstance(self.db_engine, AsyncEngine):
+            async with AsyncSession(self.db_engine) as db:
+                return await db.run_sync(work)
+
+        def run_sync() -> Any:
+            with sessionmaker(bind=self.db_engine)() as db:
+                return work(db)
+
+        # Archiving touches many rows, so keep it off the event loop
+        return await asyncio.to_thread(run_sync)
+
+    async def _ensure_tables(self) -> None:
+        """Create the archive table and the idle-session index if needed."""
+        if self._tables_ready:
+            return
+
+        def create(db: DatabaseSession) -> None:
+            connection = db.connection()
+            _Base.metadata.create_all(connection)
+            SESSION_IDLE_INDEX.create(bind=connection, checkfirst=True)
+            db.commit()
+
+        await self._run(create)
+        self._tables_ready = True
+
+    # ===== Archival =====
+    def _archive_session(
+        self, db: DatabaseSession, key: SessionKey, cutoff: datetime
+    ) -> ArchiveReport:
+        """Move one session and its events into the archive table, unless it
+        was updated since `cutoff`."""
+        app_name, user_id, session_id = key
+        storage_session: Optional[StorageSession] = db.get(StorageSession, key)
+        # The session may have been updated since it was found idle
+        if storage_session is None or storage_session.update_time >= cutoff:
+            return ArchiveReport()
+        storage_events: list[StorageEvent] = list(
+            db.scalars(
+                select(StorageEvent)
+                .where(StorageEvent.app_name == app_name)
+                .where(StorageEvent.user_id == user_id)
+                .where(StorageEvent.session_id == session_id)
+                .order_by(StorageEvent.timestamp)
+            )
+        )
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=dict(storage_session.state),
+            events=[storage_event.to_event() for storage_event in storage_events],
+            last_update_time=storage_session.update_time.timestamp(),
+        )
+        raw: bytes = session.model_dump_json().encode()
+        compressed: bytes = _compress(raw)
+
+        db.merge(
+            StorageArchivedSession(
+                app_name=app_name,
+                user_id=user_id,
+                id=session_id,
+                create_time=storage_session.create_time,
+                update_time=storage_session.update_time,
+                event_count=len(storage_events),
+                codec=ARCHIVE_CODEC,
+                raw_bytes=len(raw),
+                data=compressed,
+            )
+        )
+        # Delete the events explicitly, SQLite doesn't cascade without a pragma
+        db.execute(
+            delete(StorageEvent)
+            .where(StorageEvent.app_name == app_name)
+            .where(StorageEvent.user_id == user_id)
+            .where(StorageEvent.session_id == session_id)
+        )
+        db.delete(storage_session)
+        db.commit()
+        return ArchiveReport(
+            sessions=1,
+            events=len(storage_events),
+            raw_bytes=len(raw),
+            compressed_bytes=len(compressed),
+        )
+
+    async def archive_idle_sessions(self) -> ArchiveReport:
+        """Archive up to batch_size sessions idle longer than max_idle_seconds.
+
+        Returns:
+            The number of sessions and events archived and the bytes reclaimed
+        """
+        await self._ensure_tables()
+        # Flush queued writes, so their sessions don't look idle
+        flush = getattr(self.inner, "flush", None)
+        if flush is not None:
+            await flush()
+
+        def find_idle(db: DatabaseSession) -> tuple[datetime, list[SessionKey]]:
+            # Use the database clock, as update times are written with func.now()
+            now: datetime = db.scalar(select(func.now()))
+            cutoff: datetime = now - timedelta(seconds=self.max_idle_seconds)
+            rows = db.execute(
+                select(
+                    StorageSession.app_name, StorageSession.user_id, StorageSession.id
+                )
+                .where(StorageSession.update_time < cutoff)
+                .order_by(StorageSession.update_time)
+                .limit(self.batch_size + len(self._failed))
+            )
+            # Sessions that failed to archive would otherwise head every batch
+            keys = [tuple(row) for row in rows if tuple(row) not in self._failed]
+            return cutoff, keys[: self.batch_size]
+
+        cutoff, keys = await self._run(find_idle)
+        report = ArchiveReport()
+        for key in keys:
+            # One transaction per session, so a failure only skips that session
+            try:
+                archived: ArchiveReport = await self._run(
+                    lambda db: self._archive_session(db, key, cutoff)
+                )
+            except Exception as e:
+                logger.error(f"Failed to archive session {key}: {e}")
+                self._failed.add(key)
+                continue
+            report.add(archived)
+            self.totals.add(archived)
+            if archived.sessions:
+                self._archived.add(key)
+        return report
+
+    async def _restore(self, key: SessionKey, touch: bool) -> bool:
+        """Move an archived session back into the live tables.
+
+        Args:
+            key: The app name, user ID and session ID
+            touch: Set the update time to now, so the next run doesn't archive
+                the session again. Off when restoring for a caller that holds
+                the session, so its version still matches.
+
+        Returns:
+            True if the session was in the archive
+        """
+        app_name, user_id, session_id = key
+
+        def restore(db: DatabaseSession) -> bool:
+            archived: Optional[StorageArchivedSession] = db.get(
+                StorageArchivedSession, key
+            )
+            if archived is None:
+                return False
+            session: Session = Session.model_validate_json(
+                _decompress(archived.codec, archived.data)
+            )
+            # Only session state is archived; app: and user: state stays live
+            db.add(
+                StorageSession(
+                    app_name=app_name,
+                    user_id=user_id,
+                    id=session_id,
+                    state={
+                        k: v
+                        for k, v in session.state.items()
+                        if not k.startswith((State.APP_PREFIX, State.USER_PREFIX))
+                    },
+                    create_time=archived.create_time,
+                    update_time=func.now() if touch else archived.update_time,
+                )
+            )
+            db.flush()
+            db.add_all(
+                StorageEvent.from_event(session, event) for event in session.events
+            )
+            db.delete(archived)
+            db.commit()
+            return True
+
+        await self._ensure_tables()
+        restored: bool = await self._run(restore)
+        self._archived.discard(key)
+        if restored:
+            self.rehydrated += 1
+        return restored
+
+    async def _archive_loop(self) -> None:
+        """Archive idle sessions every interval_seconds."""
+        while True:
+            try:
+                report: ArchiveReport = await self.archive_idle_sessions()
+                if report.sessions:
+                    logger.info(
+                        f"Archived {report.sessions} sessions ({report.events} events),"
+                        f" reclaimed {report.reclaimed_bytes} bytes"
+                    )
+            except Exception as e:
+                logger.error(f"Failed to archive idle sessions: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Start the background archival job on the running event loop."""
+        if self._job is None or self._job.done():
+            if zstandard is None:
+                logger.warning(
+                    "zstandard isn't installed, archiving sessions with zlib; "
+                    "install the archive extra for zstd"
+                )
+            else:
+                logger.info("Archiving sessions with zstd")
+            self._job = asyncio.create_task(self._archive_loop())
+
+    def stats(self) -> dict[str, Any]:
+        """Return the archive counters.
+
+        Returns:
+            The codec new archives are written with, the sessions and events
+            archived, the raw, compressed and reclaimed bytes, and the number
+            of sessions restored
+        """
+        return {
+            "codec": ARCHIVE_CODEC,
+            "archived_sessions": self.totals.sessions,
+            "archived_events": self.totals.events,
+            "raw_bytes": self.totals.raw_bytes,
+            "compressed_bytes": self.totals.compressed_bytes,
+            "reclaimed_bytes": self.totals.reclaimed_bytes,
+            "rehydrated": self.rehydrated,
+        }
+
+    async def close(self) -> None:
+        """Stop the background job and close the wrapped service."""
+        if self._job is not None:
+            self._job.cancel()
+            try:
+                await self._job
+            except asyncio.CancelledError:
+                pass
+            self._job = None
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            await close()
+
+    async def get_latest_archived_session(
+        self, app_name: str, user_id: str
+    ) -> Optional[Session]:
+        """Find the user's most recently updated archived session.
+
+        Args:
+            app_name: The application name
+            user_id: The user ID
+
+        Returns:
+            The session without events or state, or None if none is archived
+        """
+        await self._ensure_tables()
+
+        def find_latest(db: DatabaseSession) -> Optional[tuple[str, datetime]]:
+            row = db.execute(
+                select(StorageArchivedSession.id, StorageArchivedSession.update_time)
+                .where(StorageArchivedSession.app_name == app_name)
+                .where(StorageArchivedSession.user_id == user_id)
+                .order_by(StorageArchivedSession.update_time.desc())
+                .limit(1)
+            ).first()
+            return tuple(row) if row else None
+
+        latest: Optional[tuple[str, datetime]] = await self._run(find_latest)
+        if latest is None:
+            return None
+        session_id, update_time = latest
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state={},
+            last_update_time=update_time.timestamp(),
+        )
+
+    # ===== Session service =====
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        return await self.inner.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session: Optional[Session] = await self.inner.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is None and await self._restore(
+            (app_name, user_id, session_id), touch=True
+        ):
+            session = await self.inner.get_session(
+                app_name=app_name, user_id=user_id, session_id=session_id, config=config
+            )
+        return session
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str
+    ) -> ListSessionsResponse:
+        return await self.inner.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await self.inner.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        key: SessionKey = (app_name, user_id, session_id)
+
+        def delete_archived(db: DatabaseSession) -> None:
+            archived: Optional[StorageArchivedSession] = db.get(
+                StorageArchivedSession, key
+            )
+            if archived is not None:
+                db.delete(archived)
+                db.commit()
+
+        await self._ensure_tables()
+        await self._run(delete_archived)
+        self._archived.discard(key)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        key: SessionKey = (session.app_name, session.user_id, session.id)
+        self._failed.discard(key)
+        if key in self._archived:
+            await self._restore(key, touch=False)
+        return await self.inner.append_event(session=session, event=event)
@@ -0,0 +1,385 @@
+"""
+Batched session writes module for ADK database session services.
+Provides a DatabaseSessionService that coalesces event appends from many
+concurrent sessions into one database transaction.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, DatabaseSessionService, Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.database_session_service import (
+    StorageAppState,
+    StorageEvent,
+    StorageSession,
+    StorageUserState,
+)
+from google.adk.sessions.state import State
+
+logger: logging.Logger = logging.getLogger(name=__name__)
+
+SessionKey = tuple[str, str, str]
+
+# Queue marker that makes the writer commit its current batch right away
+_FLUSH = None
+
+
+def _session_key(session: Session) -> SessionKey:
+    """Return the database key of a session."""
+    return (session.app_name, session.user_id, session.id)
+
+
+@dataclass
+class _PendingWrite:
+    """A queued event, copied on the event loop so the writer thread never
+    reads the live session or event."""
+
+    key: SessionKey
+    # The session's last_update_time when the event was appended
+    last_update_time: float
+    storage_event: StorageEvent
+    app_delta: dict[str, Any]
+    user_delta: dict[str, Any]
+    session_delta: dict[str, Any]
+    done: asyncio.Future
+
+
+def _resolve(
+    future: asyncio.Future,
+    result: Any = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    """Complete the future of a queued event unless its caller is gone."""
+    if future.done() or future.get_loop().is_closed():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class BatchingDatabaseSessionService(DatabaseSessionService):
+    """DatabaseSessionService with coalesced (group) event commits.
+
+    append_event queues the event and waits until its batch is committed. A
+    background writer commits the queued events in batches, in one
+    transaction for all the sessions involved: a batch takes every queued
+    event, up to `batch_size`, and waits at most `flush_interval` seconds
+    for more. Events queued while a batch commits go into the next one, so
+    concurrent sessions share transactions even without a flush interval. The
+    in-memory session is only updated once the event is stored.
+
+    Every event is checked on its own before the batch is written: events of a
+    session that no longer exists, or of a stale session (one updated in the
+    database since it was read, the check DatabaseSessionService.append_event
+    does), are left out of the transaction and only their append_event calls
+    raise. If the transaction itself fails, append_event raises the error for
+    every event of the batch.
+
+    The queue holds at most `max_pending` events, so producers wait when the
+    database falls behind. Reads of a session with pending events, listings and
+    deletes flush first, and close() flushes everything before returning.
+    """
+
+    def __init__(
+        self,
+        db_url: str,
+        batch_size: int = 64,
+        flush_interval: float = 0.0,
+        max_pending: int = 1024,
+        **kwargs: Any,
+    ):
+        """Initialize the batching session service.
+
+        Args:
+            db_url: The database URL
+            batch_size: Maximum number of events committed in one transaction
+            flush_interval: Most seconds a batch waits for more events, which
+                every append in it waits too
+            max_pending: Maximum number of queued events before appends wait
+            **kwargs: Extra arguments for the SQLAlchemy engine
+        """
+        super().__init__(db_url=db_url, **kwargs)
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue[Optional[_PendingWrite]]] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._pending: Counter[SessionKey] = Counter()
+        # Update times committed for sessions that still have queued events;
+        # those events were appended before the session got this update time
+        self._written: dict[SessionKey, float] = {}
+        self.batches = 0
+        self.events_written = 0
+        self.rejected_events = 0
+        self.failed_batches = 0
+
+    # ===== Batch queue =====
+    def _ensure_writer(self) -> asyncio.Queue:
+        """Start the background writer on the running event loop.
+
+        If a previous writer stopped, e.g. with the event loop it ran on, the
+        events still in its queue are moved to the new queue, not dropped.
+        """
+        if self._writer is None or self._writer.done():
+            old_queue = self._queue
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            while old_queue is not None and not old_queue.empty():
+                item = old_queue.get_nowait()
+                old_queue.task_done()
+                if item is not _FLUSH:
+                    self._queue.put_nowait(item)
+            self._writer = asyncio.create_task(self._write_loop(self._queue))
+        return self._queue
+
+    async def _write_loop(self, queue: asyncio.Queue) -> None:
+        """Collect queued events into batches and commit them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            if item is _FLUSH:
+                queue.task_done()
+                continue
+            batch: list[_PendingWrite] = [item]
+            deadline: float = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                # Take what's already queued, then wait out the flush interval
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout: float = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except TimeoutError:
+                        break
+                if item is _FLUSH:
+                    queue.task_done()
+                    break
+                batch.append(item)
+
+            try:
+                # Commit off the event loop so appends keep being queued meanwhile
+                update_times, errors = await asyncio.to_thread(
+                    self._write_batch, batch, dict(self._written)
+                )
+                self.batches += 1
+                self._written.update(update_times)
+                for write in batch:
+                    if id(write) in errors:
+                        self.rejected_events += 1
+                        _resolve(write.done, error=errors[id(write)])
+                    else:
+                        self.events_written += 1
+                        _resolve(write.done, update_times[write.key])
+            except Exception as e:
+                logger.error(f"Failed to commit {len(batch)} session events: {e}")
+                self.failed_batches += 1
+                for write in batch:
+                    _resolve(write.done, error=e)
+            finally:
+                for write in batch:
+                    self._pending[write.key] -= 1
+                    if self._pending[write.key] <= 0:
+                        del self._pending[write.key]
+                        self._written.pop(write.key, None)
+                    queue.task_done()
+
+    def _write_batch(
+        self, batch: list[_PendingWrite], written: dict[SessionKey, float]
+    ) -> tuple[dict[SessionKey, float], dict[int, Exception]]:
+        """Store a batch of events and their state deltas in one transaction.
+
+        Runs in a worker thread and only reads the copies made by append_event.
+        Events of missing or stale sessions are left out of the transaction.
+
+        Args:
+            batch: The queued events
+            written: The update times earlier batches committed for sessions
+                that still have queued events
+
+        Returns:
+            The new update time of every session written to, and the error of
+            every event left out, by the id() of its queued write
+        """
+        with (
+            self.database_session_factory() as session_factory,
+            # Loading rows mid-batch would otherwise flush the events added so far
+            session_factory.no_autoflush,
+        ):
+            storage_sessions: dict[SessionKey, Optional[StorageSession]] = {}
+            writes: list[_PendingWrite] = []
+            errors: dict[int, Exception] = {}
+            for write in batch:
+                if write.key not in storage_sessions:
+                    storage_sessions[write.key] = session_factory.get(
+                        StorageSession, write.key
+                    )
+                error: Optional[Exception] = self._check_session(
+                    write, storage_sessions[write.key], written.get(write.key)
+                )
+                if error is not None:
+                    errors[id(write)] = error
+                else:
+                    writes.append(write)
+
+            for write in writes:
+                storage_session = storage_sessions[write.key]
+                # The identity map returns the same state rows for every event
+                app_name, user_id, _ = write.key
+                if write.app_delta:
+                    storage_app_state = session_factory.get(StorageAppState, app_name)
+                    storage_app_state.state.update(write.app_delta)
+                if write.user_delta:
+                    storage_user_state = session_factory.get(
+                        StorageUserState, (app_name, user_id)
+                    )
+                    storage_user_state.state.update(write.user_delta)
+                if write.session_delta:
+                    storage_session.state.update(write.session_delta)
+
+                session_factory.add(write.storage_event)
+
+            session_factory.commit()
+
+            update_times: dict[SessionKey, float] = {}
+            for write in writes:
+                if write.key not in update_times:
+                    storage_session = storage_sessions[write.key]
+                    session_factory.refresh(storage_session)
+                    update_times[write.key] = storage_session.update_time.timestamp()
+            return update_times, errors
+
+    @staticmethod
+    def _check_session(
+        write: _PendingWrite,
+        storage_session: Optional[StorageSession],
+        written: Optional[float],
+    ) -> Optional[Exception]:
+        """Return why a queued event can't be stored, or None if it can.
+
+        The update time is read before the batch is written, and updates this
+        service committed while the event was queued don't count, so several
+        events of one session appended concurrently are all accepted.
+        """
+        if storage_session is None:
+            return ValueError(f"Session not found: {write.key[2]}")
+        last_update_time: float = max(write.last_update_time, written or 0.0)
+        if storage_session.update_time.timestamp() > last_update_time:
+            return ValueError(
+                "The last_update_time provided in the session object"
+                f" {datetime.fromtimestamp(last_update_time):'%Y-%m-%d %H:%M:%S'}"
+                " is earlier than the update_time in the storage_session"
+                f" {storage_session.update_time:'%Y-%m-%d %H:%M:%S'}. Please check"
+                " if it is a stale session."
+            )
+        return None
+
+    async def flush(self) -> None:
+        """Wait until every queued event is committed or its batch has failed.
+
+        A failed batch is raised by the append_event calls of its events.
+        """
+        if self._queue is not None and self._pending:
+            await self._ensure_writer().put(_FLUSH)
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Flush the queued events and stop the background writer."""
+        try:
+            await self.flush()
+        finally:
+            if self._writer is not None:
+                self._writer.cancel()
+                self._writer = None
+                self._queue = None
+
+    # ===== Session service =====
+    async def append_event(self, session: Session, event: Event) -> Event:
+        """Append an event once its batch is committed.
+
+        Raises:
+            Exception: The error of the transaction the event was part of
+        """
+        if event.partial:
+            return event
+        queue: asyncio.Queue = self._ensure_writer()
+        key: SessionKey = _session_key(session)
+
+        # Copy what the writer thread needs while nothing else can change it
+        snapshot: Event = event.model_copy(deep=True)
+        app_delta, user_delta, session_delta = {}, {}, {}
+        state_delta: dict[str, Any] = (
+            snapshot.actions.state_delta if snapshot.actions else {}
+        )
+        for name, value in state_delta.items():
+            if name.startswith(State.APP_PREFIX):
+                app_delta[name.removeprefix(State.APP_PREFIX)] = value
+            elif name.startswith(State.USER_PREFIX):
+                user_delta[name.removeprefix(State.USER_PREFIX)] = value
+            elif not name.startswith(State.TEMP_PREFIX):
+                session_delta[name] = value
+        write = _PendingWrite(
+            key=key,
+            last_update_time=session.last_update_time,
+            storage_event=StorageEvent.from_event(session, snapshot),
+            app_delta=app_delta,
+            user_delta=user_delta,
+            session_delta=session_delta,
+            done=asyncio.get_running_loop().create_future(),
+        )
+
+        # Waits here when the queue is full (back-pressure)
+        self._pending[key] += 1
+        try:
+            await queue.put(write)
+        except BaseException:
+            self._pending[key] -= 1
+            if self._pending[key] <= 0:
+                del self._pending[key]
+            raise
+
+        session.last_update_time = await write.done
+        # Update the in-memory session now that the database has the event
+        await BaseSessionService.append_event(self, session=session, event=event)
+        return event
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        if (app_name, user_id, session_id) in self._pending:
+            await self.flush()
+        return await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str
+    ) -> ListSessionsResponse:
+        await self.flush()
+        return await super().list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await self.flush()
+        await super().delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
@@ -0,0 +1,305 @@
+"""
+Session cache module for ADK session services.
+Provides a write-through LRU cache in front of any session service so repeat
+turns of an active conversation are served from memory instead of the database.
+"""
+
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+SessionKey = tuple[str, str, str]
+UserKey = tuple[str, str]
+
+
+@dataclass
+class _CacheEntry:
+    """A cached session and the time it expires at."""
+
+    session: Session
+    expires_at: Optional[float]
+
+
+@dataclass
+class _ListEntry:
+    """A user's listed sessions by ID and the time they expire at."""
+
+    sessions: dict[str, Session]
+    expires_at: Optional[float]
+
+
+class CachedSessionService(BaseSessionService):
+    """Write-through LRU cache in front of another session service.
+
+    Sessions are cached by (app_name, user_id, session_id) with all their
+    events. Reads are served from the cache until the entry expires, and every
+    append is written to the wrapped service first and then applied to the
+    cached copy.
+
+    The session's last_update_time is used as its version: an append is only
+    applied to the cached copy if the caller's session had the same version,
+    otherwise the entry is dropped and the next read goes to the database.
+    Writes to app: and user: state also drop the other cached sessions that
+    share that state.
+
+    Reads hand out a copy of the session's state and event list, but the
+    events themselves are shared with the cache and must not be mutated.
+
+    list_sessions results are cached per user with the same TTL. Listed
+    sessions carry no state or events, so they are kept current by adding
+    created sessions, removing deleted ones and bumping last_update_time on
+    every append.
+    """
+
+    def __init__(
+        self,
+        inner: BaseSessionService,
+        max_sessions: int = 256,
+        ttl_seconds: Optional[float] = 300.0,
+    ):
+        """Initialize the session cache.
+
+        Args:
+            inner: The session service that owns the data (e.g. DatabaseSessionService)
+            max_sessions: Number of sessions kept in the cache
+            ttl_seconds: Seconds a cached session is served for, None to never expire
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.inner = inner
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[SessionKey, _CacheEntry] = OrderedDict()
+        self._lists: OrderedDict[UserKey, _ListEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # ===== Cache bookkeeping =====
+    def _expires_at(self) -> Optional[float]:
+        """Return the expiry time of an entry cached now."""
+        return time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+
+    def _put(self, session: Session) -> None:
+        """Cache a private copy of a fully loaded session."""
+        key: SessionKey = (session.app_name, session.user_id, session.id)
+        self._sessions.pop(key, None)
+        self._sessions[key] = _CacheEntry(
+            session=session.model_copy(deep=True), expires_at=self._expires_at()
+        )
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+        self._list_put(session)
+
+    def _lookup_list(self, key: UserKey) -> Optional[dict[str, Session]]:
+        """Return a user's cached listed sessions if present and not expired."""
+        entry: Optional[_ListEntry] = self._lists.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            del self._lists[key]
+            return None
+        self._lists.move_to_end(key)
+        return entry.sessions
+
+    def _list_put(self, session: Session) -> None:
+        """Add a session to its user's cached list, or update its version."""
+        listed: Optional[dict[str, Session]] = self._lookup_list(
+            (session.app_name, session.user_id)
+        )
+        if listed is None:
+            return
+        if session.id in listed:
+            listed[session.id].last_update_time = session.last_update_time
+        else:
+            listed[session.id] = Session(
+                app_name=session.app_name,
+                user_id=session.user_id,
+                id=session.id,
+                last_update_time=session.last_update_time,
+            )
+
+    def _lookup(self, key: SessionKey) -> Optional[Session]:
+        """Return the cached session if it's present and not expired."""
+        entry: Optional[_CacheEntry] = self._sessions.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            del self._sessions[key]
+            return None
+        self._sessions.move_to_end(key)
+        return entry.session
+
+    def _invalidate(self, key: SessionKey) -> None:
+        """Drop a session from the cache."""
+        if self._sessions.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def _invalidate_shared_state(
+        self, key: SessionKey, state_delta: dict[str, Any]
+    ) -> None:
+        """Drop the other cached sessions that see the app: or user: state
+        changed by this delta."""
+        app_name, user_id, _ = key
+        app_changed: bool = any(k.startswith(State.APP_PREFIX) for k in state_delta)
+        user_changed: bool = any(k.startswith(State.USER_PREFIX) for k in state_delta)
+        if not (app_changed or user_changed):
+            return
+        for other in list(self._sessions):
+            if other == key or other[0] != app_name:
+                continue
+            if app_changed or other[1] == user_id:
+                self._invalidate(other)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the cache counters.
+
+        Returns:
+            The hit, miss, eviction and invalidation counts, the hit rate and
+            the number of cached sessions
+        """
+        lookups: int = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._sessions),
+        }
+
+    def clear(self) -> None:
+        """Drop all cached sessions and session lists."""
+        self._sessions.clear()
+        self._lists.clear()
+
+    async def close(self) -> None:
+        """Drop the cache and close the wrapped service if it supports closing."""
+        self.clear()
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            await close()
+
+    # ===== Session service =====
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session: Session = await self.inner.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._put(session)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key: SessionKey = (app_name, user_id, session_id)
+        cached: Optional[Session] = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            # Always load the full session so any later read can be served
+            cached = await self.inner.get_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+            if cached is None:
+                return None
+            self._put(cached)
+
+        events: list[Event] = cached.events
+        if config:
+            if config.num_recent_events:
+                events = events[-config.num_recent_events :]
+            if config.after_timestamp:
+                events = [
+                    event
+                    for event in events
+                    if event.timestamp >= config.after_timestamp
+                ]
+        # Callers append to the events and change the state, so they get their
+        # own list and state; copying every event would make each read O(history)
+        return cached.model_copy(
+            update={"state": copy.deepcopy(cached.state), "events": list(events)}
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str
+    ) -> ListSessionsResponse:
+        key: UserKey = (app_name, user_id)
+        listed: Optional[dict[str, Session]] = self._lookup_list(key)
+        if listed is None:
+            response: ListSessionsResponse = await self.inner.list_sessions(
+                app_name=app_name, user_id=user_id
+            )
+            listed = {session.id: session for session in response.sessions}
+            self._lists[key] = _ListEntry(
+                sessions=listed, expires_at=self._expires_at()
+            )
+            while len(self._lists) > self.max_sessions:
+                self._lists.popitem(last=False)
+        return ListSessionsResponse(
+            sessions=[session.model_copy(deep=True) for session in listed.values()]
+        )
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await self.inner.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        self._invalidate((app_name, user_id, session_id))
+        listed: Optional[dict[str, Session]] = self._lookup_list((app_name, user_id))
+        if listed is not None:
+            listed.pop(session_id, None)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        key: SessionKey = (session.app_name, session.user_id, session.id)
+        version: float = session.last_update_time
+
+        # Write through: the wrapped service stores the event first
+        try:
+            await self.inner.append_event(session=session, event=event)
+        except Exception:
+            self._invalidate(key)
+            raise
+
+        cached: Optional[Session] = self._lookup(key)
+        if cached is not None:
+            if cached.last_update_time == version:
+                # Same version as the writer, so apply the event to the cached copy
+                await super().append_event(
+                    session=cached, event=event.model_copy(deep=True)
+                )
+                cached.last_update_time = session.last_update_time
+            else:
+                self._invalidate(key)
+        self._list_put(session)
+
+        if event.actions and event.actions.state_delta:
+            self._invalidate_shared_state(key, event.actions.state_delta)
+        return event
@@ -0,0 +1,231 @@
+"""
+Session query module for ADK database session services.
+Provides an indexed lookup of a user's most recent session and paginated
+session listings, so neither has to load every session the user has.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Optional
+
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import ListSessionsResponse
+from google.adk.sessions.database_session_service import StorageSession
+from sqlalchemy import (
+    ColumnElement,
+    Engine,
+    Index,
+    Select,
+    String,
+    and_,
+    or_,
+    select,
+    type_coerce,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Index behind the latest-session lookup and the session listing order; the
+# session ID breaks ties between sessions updated at the same time
+SESSION_UPDATE_INDEX = Index(
+    "ix_sessions_app_user_update_time",
+    StorageSession.app_name,
+    StorageSession.user_id,
+    StorageSession.update_time,
+    StorageSession.id,
+)
+
+
+class SessionPage(ListSessionsResponse):
+    """One page of sessions, most recently updated first.
+
+    As with list_sessions, the events and states are not set.
+    """
+
+    next_page_token: Optional[str] = None
+
+
+def _database_engine(session_service: BaseSessionService) -> Engine | AsyncEngine:
+    """Find the database engine behind a session service and its wrappers."""
+    service: Any = session_service
+    while not hasattr(service, "db_engine"):
+        if not hasattr(service, "inner"):
+            raise TypeError(
+                f"{type(session_service).__name__} isn't backed by a database"
+            )
+        service = service.inner
+    return service.db_engine
+
+
+async def _flush(session_service: BaseSessionService) -> None:
+    """Flush queued writes so update times in the database are current."""
+    service: Any = session_service
+    while service is not None:
+        if hasattr(service, "flush"):
+            await service.flush()
+        service = getattr(service, "inner", None)
+
+
+def _update_time_column(engine: Engine | AsyncEngine) -> ColumnElement:
+    """Return the session update time as it's compared in this database.
+
+    SQLite stores DATETIME as text, and func.now() writes it without the
+    microseconds SQLAlchemy adds to bound datetimes, so there the stored text
+    is compared as-is. The index is still used as no SQL cast is emitted.
+    """
+    if engine.dialect.name == "sqlite":
+        return type_coerce(StorageSession.update_time, String)
+    return StorageSession.update_time
+
+
+def _as_datetime(update_time: datetime | str) -> datetime:
+    """Convert an update time read from the database to a datetime."""
+    if isinstance(update_time, str):
+        return datetime.fromisoformat(update_time)
+    return update_time
+
+
+async def _fetch(engine: Engine | AsyncEngine, statement: Select) -> list:
+    """Run a select on a sync or async engine."""
+    if isinstance(engine, AsyncEngine):
+        async with engine.connect() as connection:
+            return (await connection.execute(statement)).all()
+    with engine.connect() as connection:
+        return connection.execute(statement).all()
+
+
+def _encode_page_token(update_time: datetime | str, session_id: str) -> str:
+    """Encode the position after a session as an opaque page token."""
+    if isinstance(update_time, datetime):
+        update_time = update_time.isoformat()
+    position: str = f"{update_time}|{session_id}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def _decode_page_token(
+    page_token: str, engine: Engine | AsyncEngine
+) -> tuple[datetime | str, str]:
+    """Decode a page token into an update time and session ID."""
+    try:
+        position: str = base64.urlsafe_b64decode(page_token.encode()).decode()
+        update_time, session_id = position.split("|", 1)
+        parsed: datetime = datetime.fromisoformat(update_time)
+    except ValueError as e:
+        raise ValueError(f"Invalid page token: {page_token}") from e
+    return (update_time if engine.dialect.name == "sqlite" else parsed), session_id
+
+
+async def ensure_session_indexes(session_service: BaseSessionService) -> None:
+    """Create the session update-time index if the database doesn't have it.
+
+    Args:
+        session_service: A database-backed session service, optionally wrapped
+    """
+    engine: Engine | AsyncEngine = _database_engine(session_service)
+    if isinstance(engine, AsyncEngine):
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                lambda sync_connection: SESSION_UPDATE_INDEX.create(
+                    bind=sync_connection, checkfirst=True
+                )
+            )
+    else:
+        SESSION_UPDATE_INDEX.create(bind=engine, checkfirst=True)
+
+
+def _session_columns(update_time: ColumnElement, app_name: str, user_id: str) -> Select:
+    """Select a user's sessions, most recently updated first."""
+    return (
+        select(StorageSession.id, update_time)
+        .where(StorageSession.app_name == app_name)
+        .where(StorageSession.user_id == user_id)
+        .order_by(update_time.desc(), StorageSession.id.desc())
+    )
+
+
+async def get_latest_session(
+    session_service: BaseSessionService, app_name: str, user_id: str
+) -> Optional[Session]:
+    """Find the user's most recently updated session with one indexed query.
+
+    Args:
+        session_service: A database-backed session service, optionally wrapped
+        app_name: The application name
+        user_id: The user ID
+
+    Returns:
+        The session without events or state, or None if the user has none
+    """
+    await _flush(session_service)
+    engine: Engine | AsyncEngine = _database_engine(session_service)
+    statement: Select = _session_columns(
+        _update_time_column(engine), app_name, user_id
+    ).limit(1)
+    rows: list = await _fetch(engine, statement)
+    if not rows:
+        return None
+    session_id, update_time = rows[0]
+    return Session(
+        app_name=app_name,
+        user_id=user_id,
+        id=session_id,
+        state={},
+        last_update_time=_as_datetime(update_time).timestamp(),
+    )
+
+
+async def list_sessions_page(
+    session_service: BaseSessionService,
+    app_name: str,
+    user_id: str,
+    page_size: int = 20,
+    page_token: Optional[str] = None,
+) -> SessionPage:
+    """List one page of the user's sessions, most recently updated first.
+
+    Pages are read with keyset pagination on the update-time index, so every
+    page costs the same however many sessions come before it.
+
+    Args:
+        session_service: A database-backed session service, optionally wrapped
+        app_name: The application name
+        user_id: The user ID
+        page_size: Maximum number of sessions on the page
+        page_token: The next_page_token of the previous page, None for the first
+
+    Returns:
+        The page of sessions and the token of the next page, if there is one
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    await _flush(session_service)
+    engine: Engine | AsyncEngine = _database_engine(session_service)
+    update_time_column: ColumnElement = _update_time_column(engine)
+
+    statement: Select = _session_columns(update_time_column, app_name, user_id)
+    if page_token:
+        after_time, after_id = _decode_page_token(page_token, engine)
+        statement = statement.where(
+            or_(
+                update_time_column < after_time,
+                and_(update_time_column == after_time, StorageSession.id < after_id),
+            )
+        )
+    # Fetch one extra row to know whether there's a next page
+    rows: list = await _fetch(engine, statement.limit(page_size + 1))
+
+    page = SessionPage(
+        sessions=[
+            Session(
+                app_name=app_name,
+                user_id=user_id,
+                id=session_id,
+                state={},
+                last_update_time=_as_datetime(update_time).timestamp(),
+            )
+            for session_id, update_time in rows[:page_size]
+        ]
+    )
+    if len(rows) > page_size:
+        last_id, last_update_time = rows[page_size - 1]
+        page.next_page_token = _encode_page_token(last_update_time, last_id)
+    return page
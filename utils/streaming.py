@@ -0,0 +1,207 @@
+"""
+Streaming module for rendering agent responses in the terminal.
+Provides a renderer that shows SSE partial events as they arrive, writing them
+through a buffered sink, and records each turn's time to first token.
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, TextIO
+
+from google.adk.events import Event
+from google.genai import types
+
+
+# ANSI color codes of the response box
+class Colors:
+    RESET = "\033[0m"
+    BOLD = "\033[1m"
+    YELLOW = "\033[33m"
+    CYAN = "\033[36m"
+    WHITE = "\033[37m"
+    BG_BLUE = "\033[44m"
+
+
+class BufferedSink:
+    """Writes streamed response text to the terminal in batches.
+
+    Partial events carry a few words each, so instead of a write and flush
+    per event the text is buffered until max_chars accumulate or
+    flush_interval seconds have passed since the last flush. Inside an event
+    loop a timer also flushes the text if no further write comes.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        flush_interval: float = 0.05,
+        max_chars: int = 256,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            stream: Stream to write to, stdout by default
+            flush_interval: Longest time text stays buffered, in seconds
+            max_chars: Buffered characters that trigger a flush
+        """
+        self.stream: TextIO = stream or sys.stdout
+        self.flush_interval: float = flush_interval
+        self.max_chars: int = max_chars
+        self._buffer: list[str] = []
+        self._size: int = 0
+        self._last_flush: float = time.perf_counter()
+        self._timer: asyncio.TimerHandle | None = None
+
+    def write(self, text: str) -> None:
+        """Buffer text, flushing when the buffer is full or old enough."""
+        self._buffer.append(text)
+        self._size += len(text)
+        if (
+            self._size >= self.max_chars
+            or time.perf_counter() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+        elif self._timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # Without a loop the text waits for the next write or flush
+                return
+            self._timer = loop.call_later(self.flush_interval, self.flush)
+
+    def flush(self) -> None:
+        """Write the buffered text to the stream."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self._size = 0
+        self.stream.flush()
+        self._last_flush = time.perf_counter()
+
+
+@dataclass
+class TurnTiming:
+    """Perceived latency of a turn, in seconds after the query was sent."""
+
+    time_to_first_token: float | None = None
+    time_to_final: float | None = None
+
+
+class StreamingRenderer:
+    """Renders the agent's response while it streams in.
+
+    Used with RunConfig(streaming_mode=StreamingMode.SSE), the runner yields
+    partial events that each carry the text generated since the previous one.
+    Their text is written to the sink as it arrives, and the complete event
+    that follows, which repeats the whole text, only closes the response box. Each turn records when the first text arrived and when
+    the final response did.
+    """
+
+    def __init__(self, sink: BufferedSink | None = None) -> None:
+        """Initialize the renderer.
+
+        Args:
+            sink: Where the response text goes, a BufferedSink on stdout by default
+        """
+        self.sink: BufferedSink = sink or BufferedSink()
+        self.timings: list[TurnTiming] = []
+        self._start: float = 0.0
+        self._streaming: bool = False
+
+    def start_turn(self) -> None:
+        """Start timing a new turn, right before the query is sent."""
+        self._start = time.perf_counter()
+        self._streaming = False
+        self.timings.append(TurnTiming())
+
+    def render(self, event: Event) -> str | None:
+        """Render an event and return the final response text, if it has one."""
+        timing: TurnTiming = self.timings[-1]
+        parts: list[types.Part] = (event.content.parts if event.content else None) or []
+        text: str = "".join(part.text for part in parts if part.text)
+
+        if event.partial:
+            if text:
+                if timing.time_to_first_token is None:
+                    timing.time_to_first_token = time.perf_counter() - self._start
+                if not self._streaming:
+                    # Open the box and show the first words right away
+                    self._streaming = True
+                    self.sink.write(
+                        f"\n{Colors.BG_BLUE}{Colors.WHITE}{Colors.BOLD}╔══ AGENT RESPONSE ═════════════════════════════════════════{Colors.RESET}\n"
+                        f"{Colors.CYAN}{Colors.BOLD}{text}"
+                    )
+                    self.sink.flush()
+                else:
+                    self.sink.write(text)
+            return None
+
+        # The complete event repeats the streamed text, so only close the box
+        self._close_response()
+        for part in parts:
+            if part.function_call:
+                print(
+                    f"  Function Call: {part.function_call.name} with args: {part.function_call.args}"
+                )
+        if not event.is_final_response():
+            return None
+
+        final_response: str | None = text.strip() or None
+        timing.time_to_final = time.perf_counter() - self._start
+        if timing.time_to_first_token is None and final_response:
+            # The response arrived in one piece
+            timing.time_to_first_token = timing.time_to_final
+            print(
+                f"\n{Colors.BG_BLUE}{Colors.WHITE}{Colors.BOLD}╔══ AGENT RESPONSE ═════════════════════════════════════════{Colors.RESET}"
+            )
+            print(f"{Colors.CYAN}{Colors.BOLD}{final_response}{Colors.RESET}")
+            print(
+                f"{Colors.BG_BLUE}{Colors.WHITE}{Colors.BOLD}╚═════════════════════════════════════════════════════════════{Colors.RESET}\n"
+            )
+        return final_response
+
+    def end_turn(self) -> None:
+        """Close a response left open, e.g. by an error, and show the turn's timing."""
+        self._close_response()
+        timing: TurnTiming = self.timings[-1]
+        if timing.time_to_first_token is not None:
+            time_to_final: str = (
+                f"{timing.time_to_final * 1000:.0f} ms"
+                if timing.time_to_final is not None
+                else "n/a"
+            )
+            print(
+                f"{Colors.YELLOW}⏱  First token after {timing.time_to_first_token * 1000:.0f} ms, "
+                f"final response after {time_to_final}{Colors.RESET}"
+            )
+
+    def summary(self) -> dict[str, Any]:
+        """Get the median time to first token and to final response, in ms."""
+        first: list[float] = [
+            t.time_to_first_token for t in self.timings if t.time_to_first_token
+        ]
+        final: list[float] = [t.time_to_final for t in self.timings if t.time_to_final]
+        return {
+            "turns": len(self.timings),
+            "median_time_to_first_token_ms": (
+                round(statistics.median(first) * 1000) if first else None
+            ),
+            "median_time_to_final_ms": (
+                round(statistics.median(final) * 1000) if final else None
+            ),
+        }
+
+    def _close_response(self) -> None:
+        """Close the response box of streamed text."""
+        if self._streaming:
+            self._streaming = False
+            self.sink.write(
+                f"{Colors.RESET}\n{Colors.BG_BLUE}{Colors.WHITE}{Colors.BOLD}╚═════════════════════════════════════════════════════════════{Colors.RESET}\n\n"
+            )
+            self.sink.flush()
@@ -0,0 +1,11 @@
+"""
+Configuration file for pytest.
+This file is automatically loaded by pytest.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the repository root, which holds the utils package, to the path
+root_dir: Path = Path(__file__).parent.parent.parent
+sys.path.append(str(object=root_dir))
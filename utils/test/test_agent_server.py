@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test script for the agent server.
+This script tests the HTTP and WebSocket API, bounded concurrency and per-session ordering.
+"""
+
+import asyncio
+
+from fastapi import WebSocketDisconnect
+from fastapi.routing import APIWebSocketRoute
+from fastapi.testclient import TestClient
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from utils.agent_server import AgentServer, create_app
+from utils.mock_llm import MockLlm
+
+APP_NAME: str = "Customer Service"
+
+
+def _create_server(latency: float = 0.0, max_concurrency: int = 16) -> AgentServer:
+    """Create a server whose agent echoes the user through MockLlm."""
+    session_service = InMemorySessionService()
+    agent = Agent(
+        name="echo_agent",
+        model=MockLlm(latency=latency),
+        description="Echoes the user",
+        instruction="Repeat what the user says.",
+    )
+    runner = Runner(app_name=APP_NAME, agent=agent, session_service=session_service)
+    return AgentServer(
+        runner,
+        session_service,
+        app_name=APP_NAME,
+        max_concurrency=max_concurrency,
+        initial_state={"user_name": "John Doe"},
+    )
+
+
+def test_http_and_websocket_turns() -> None:
+    """Sessions are created and run over HTTP and WebSocket."""
+    client = TestClient(create_app(_create_server()))
+    session_id = client.post("/sessions", json={"user_id": "u1"}).json()["session_id"]
+
+    response = client.post(
+        f"/sessions/{session_id}/turns", json={"user_id": "u1", "text": "hello"}
+    )
+    assert response.status_code == 200
+    assert response.json()["response"] == "echo: hello"
+
+    missing = client.post("/sessions/nope/turns", json={"user_id": "u1", "text": "hi"})
+    assert missing.status_code == 404
+
+    with client.websocket_connect(f"/sessions/{session_id}/ws?user_id=u1") as ws:
+        ws.send_text("again")
+        messages = []
+        while not messages or not messages[-1].get("done"):
+            messages.append(ws.receive_json())
+    assert messages[0] == {
+        "author": "echo_agent",
+        "text": "echo: again",
+        "function_calls": [],
+        "final": True,
+    }
+    assert client.get("/metrics").json()["turns"] == 2
+
+
+def test_concurrency_is_bounded_and_sessions_stay_ordered() -> None:
+    """At most max_concurrency turns run at once, and a session's turns keep their order."""
+
+    async def run() -> None:
+        server = _create_server(latency=0.02, max_concurrency=2)
+        session_ids = [await server.create_session(f"u{i}") for i in range(4)]
+
+        turns = [
+            server.run_turn(f"u{i}", session_id, f"turn {turn}")
+            for turn in range(3)
+            for i, session_id in enumerate(session_ids)
+        ]
+        await asyncio.gather(*turns)
+        assert server.metrics.turns == 12
+        assert server.metrics.peak_active == 2
+
+        session = await server.session_service.get_session(
+            app_name=APP_NAME, user_id="u0", session_id=session_ids[0]
+        )
+        texts = [
+            event.content.parts[0].text for event in session.events if event.content
+        ]
+        assert texts == [
+            "turn 0",
+            "echo: turn 0",
+            "turn 1",
+            "echo: turn 1",
+            "turn 2",
+            "echo: turn 2",
+        ]
+        assert session.state["user_name"] == "John Doe"
+
+    asyncio.run(run())
+
+
+def test_client_leaving_mid_turn_ends_the_connection_quietly() -> None:
+    """A WebSocket dropped while events are sent isn't sent an error frame."""
+
+    class DroppedWebSocket:
+        """Sends one query, then fails every send as a closed socket does."""
+
+        def __init__(self) -> None:
+            self.sent: list[dict] = []
+
+        async def accept(self) -> None:
+            pass
+
+        async def receive_text(self) -> str:
+            if self.sent:
+                raise WebSocketDisconnect()
+            return "hello"
+
+        async def send_json(self, data: dict) -> None:
+            self.sent.append(data)
+            raise WebSocketDisconnect()
+
+    async def run() -> None:
+        server = _create_server()
+        session_id = await server.create_session("u1")
+        stream_turns = next(
+            route.endpoint
+            for route in create_app(server).routes
+            if isinstance(route, APIWebSocketRoute)
+        )
+        websocket = DroppedWebSocket()
+        await stream_turns(websocket, session_id=session_id, user_id="u1")
+        assert len(websocket.sent) == 1
+        assert "error" not in websocket.sent[0]
+
+    asyncio.run(run())
+
+
+def test_users_may_reuse_a_session_id() -> None:
+    """Sessions with the same ID for different users are separate sessions."""
+
+    async def run() -> None:
+        server = _create_server(latency=0.05, max_concurrency=2)
+        for user_id in ("u1", "u2"):
+            await server.create_session(user_id, session_id="s1")
+
+        results = await asyncio.gather(
+            server.run_turn("u1", "s1", "from u1"),
+            server.run_turn("u2", "s1", "from u2"),
+        )
+        assert [result["response"] for result in results] == [
+            "echo: from u1",
+            "echo: from u2",
+        ]
+        # Each user's session has its own lock, so the turns ran side by side
+        assert server.metrics.peak_active == 2
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_http_and_websocket_turns()
+    test_concurrency_is_bounded_and_sessions_stay_ordered()
+    test_client_leaving_mid_turn_ends_the_connection_quietly()
+    test_users_may_reuse_a_session_id()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch runner.
+This script tests streamed JSONL results, per-session ordering and checkpoint/resume.
+"""
+
+import asyncio
+import json
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+from google.adk.agents import Agent
+from google.adk.sessions import InMemorySessionService
+
+from utils.batch_runner import read_checkpoint, run_batch
+from utils.mock_llm import MockLlm
+
+
+def _create_agent(latency: float = 0.0) -> Agent:
+    """Create an agent that echoes the user through MockLlm."""
+    return Agent(
+        name="echo_agent",
+        model=MockLlm(latency=latency),
+        description="Echoes the user",
+        instruction="Repeat what the user says.",
+    )
+
+
+def _read_results(path: Path) -> list[dict]:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_batch_run_writes_every_record() -> None:
+    """Every record gets a result line and a session's records run in order."""
+
+    async def run() -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = Path(directory) / "input.jsonl"
+            output_path = Path(directory) / "output.jsonl"
+            lines = [
+                json.dumps({"user_id": "u1", "session_id": "s1", "query": "first"}),
+                json.dumps({"user_id": "u2", "query": "alone"}),
+                "",
+                "not json",
+                json.dumps({"user_id": "u1", "session_id": "s1", "query": "second"}),
+                json.dumps({"user_id": "u3"}),
+            ]
+            input_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+            session_service = InMemorySessionService()
+            stats = await run_batch(
+                _create_agent(latency=0.01),
+                input_path,
+                output_path,
+                concurrency=4,
+                session_service=session_service,
+                initial_state={"user_name": "John Doe"},
+            )
+            assert (stats.records, stats.succeeded, stats.failed) == (5, 3, 2)
+
+            results = {
+                result["offset"]: result for result in _read_results(output_path)
+            }
+            assert sorted(results) == [0, 1, 3, 4, 5]
+            assert results[0]["response"] == "echo: first"
+            assert results[1]["response"] == "echo: alone"
+            assert results[1]["session_id"]
+            assert results[3]["error"].startswith("Invalid record")
+            assert results[5]["error"].startswith("Invalid record")
+
+            session = await session_service.get_session(
+                app_name="batch", user_id="u1", session_id="s1"
+            )
+            texts = [event.content.parts[0].text for event in session.events]
+            assert texts == ["first", "echo: first", "second", "echo: second"]
+            assert session.state["user_name"] == "John Doe"
+
+            checkpoint = read_checkpoint(f"{output_path}.checkpoint")
+            assert checkpoint.offset == len(lines)
+            assert checkpoint.position == input_path.stat().st_size
+
+    asyncio.run(run())
+
+
+def test_interrupted_batch_resumes_without_repeats() -> None:
+    """A resumed run skips finished records and runs each remaining one once."""
+
+    async def run() -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = Path(directory) / "input.jsonl"
+            output_path = Path(directory) / "output.jsonl"
+            with open(input_path, "w", encoding="utf-8") as file:
+                for i in range(40):
+                    file.write(
+                        json.dumps({"user_id": f"u{i}", "query": f"q{i}"}) + "\n"
+                    )
+
+            batch = asyncio.create_task(
+                run_batch(
+                    _create_agent(latency=0.01),
+                    input_path,
+                    output_path,
+                    concurrency=4,
+                    checkpoint_every=1,
+                )
+            )
+            while not output_path.exists() or len(_read_results(output_path)) < 10:
+                await asyncio.sleep(0.005)
+            batch.cancel()
+            try:
+                await batch
+            except asyncio.CancelledError:
+                pass
+
+            finished = len(_read_results(output_path))
+            assert finished < 40
+            assert read_checkpoint(f"{output_path}.checkpoint").offset <= finished
+            with open(output_path, "a", encoding="utf-8") as file:
+                file.write('{"offset": 3')
+
+            stats = await run_batch(
+                _create_agent(),
+                input_path,
+                output_path,
+                concurrency=4,
+                resume=True,
+            )
+            assert stats.records == 40 - finished
+
+            counts = Counter(result["offset"] for result in _read_results(output_path))
+            assert sorted(counts) == list(range(40))
+            assert set(counts.values()) == {1}
+
+    asyncio.run(run())
+
+
+def test_users_may_reuse_a_session_id() -> None:
+    """Records of different users with the same session ID get their own sessions."""
+
+    async def run() -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = Path(directory) / "input.jsonl"
+            output_path = Path(directory) / "output.jsonl"
+            lines = [
+                json.dumps({"user_id": "u1", "session_id": "s1", "query": "from u1"}),
+                json.dumps({"user_id": "u2", "session_id": "s1", "query": "from u2"}),
+            ]
+            input_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+            session_service = InMemorySessionService()
+            stats = await run_batch(
+                _create_agent(),
+                input_path,
+                output_path,
+                concurrency=2,
+                session_service=session_service,
+            )
+            assert (stats.succeeded, stats.failed) == (2, 0)
+
+            for user_id in ("u1", "u2"):
+                session = await session_service.get_session(
+                    app_name="batch", user_id=user_id, session_id="s1"
+                )
+                texts = [event.content.parts[0].text for event in session.events]
+                assert texts == [f"from {user_id}", f"echo: from {user_id}"]
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_batch_run_writes_every_record()
+    test_interrupted_batch_resumes_without_repeats()
+    test_users_may_reuse_a_session_id()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Test script for the append-only interaction history.
+This script tests recording and replaying history entries without requiring API keys.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.sessions import InMemorySessionService, State
+
+from utils.interaction_history import (
+    HISTORY_STATE_KEY,
+    LAST_INTERACTION_KEY,
+    HistoryCompactor,
+    append_interaction,
+    count_actions,
+    get_interaction_history,
+    history_instruction,
+    record_interaction,
+)
+
+APP_NAME: str = "Customer Service"
+USER_ID: str = "john_doe"
+
+
+async def _create_session_with_history(
+    session_service: InMemorySessionService,
+    turns: int,
+    compactor: HistoryCompactor | None = None,
+) -> str:
+    """Create a session and append `turns` user queries to its history."""
+    session = await session_service.create_session(
+        app_name=APP_NAME, user_id=USER_ID, state={"user_name": "John Doe"}
+    )
+    for i in range(turns):
+        await append_interaction(
+            session_service=session_service,
+            session=session,
+            entry={"action": "user_query", "query": f"question {i}"},
+            compactor=compactor,
+        )
+    return session.id
+
+
+def test_append_interaction_replays_in_order() -> None:
+    """Entries are appended as events and replayed oldest first."""
+
+    async def run() -> None:
+        session_service = InMemorySessionService()
+        session_id = await _create_session_with_history(session_service, turns=3)
+        session = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+        )
+
+        history = get_interaction_history(session)
+        assert [entry["query"] for entry in history] == [
+            "question 0",
+            "question 1",
+            "question 2",
+        ]
+        assert all("timestamp" in entry for entry in history)
+
+        # Each event carries its own entry and the compacted view, never the
+        # full history
+        for i, event in enumerate(session.events):
+            delta = event.actions.state_delta
+            assert list(delta) == [LAST_INTERACTION_KEY, HISTORY_STATE_KEY]
+            assert delta[HISTORY_STATE_KEY]["window"][-1] == delta[LAST_INTERACTION_KEY]
+            assert len(delta[HISTORY_STATE_KEY]["window"]) == i + 1
+
+        # Other state is untouched
+        assert session.state["user_name"] == "John Doe"
+
+    asyncio.run(run())
+
+
+def test_append_interaction_updates_the_callers_session() -> None:
+    """Appending never fetches the session and updates the one passed in."""
+
+    async def run() -> None:
+        session_service = InMemorySessionService()
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+
+        async def get_session(**kwargs):
+            raise AssertionError("append_interaction fetched the session")
+
+        session_service.get_session = get_session
+        for i in range(3):
+            await append_interaction(
+                session_service=session_service,
+                session=session,
+                entry={"action": "user_query", "query": f"question {i}"},
+            )
+
+        assert len(session.events) == 3
+        assert session.state[LAST_INTERACTION_KEY]["query"] == "question 2"
+        assert len(session.state[HISTORY_STATE_KEY]["window"]) == 3
+
+    asyncio.run(run())
+
+
+def test_history_instruction_injects_state_and_history() -> None:
+    """The instruction provider fills state variables and the history."""
+
+    async def run() -> None:
+        session_service = InMemorySessionService()
+        session_id = await _create_session_with_history(session_service, turns=1)
+        session = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+        )
+        context = ReadonlyContext(invocation_context=SimpleNamespace(session=session))
+
+        provider = history_instruction(
+            template="Name: {user_name}\nHistory: {interaction_history}"
+        )
+        instruction: str = await provider(context)
+
+        assert instruction.startswith(
+            "Name: John Doe\nHistory: Most recent interactions: ["
+        )
+        assert "question 0" in instruction
+
+    asyncio.run(run())
+
+
+class CountingCompactor(HistoryCompactor):
+    """HistoryCompactor that counts its renders."""
+
+    renders: int = 0
+
+    def render(self, compacted):
+        self.renders += 1
+        return super().render(compacted)
+
+
+def test_history_instruction_renders_unchanged_history_once() -> None:
+    """Turns that don't record an interaction reuse the rendered history."""
+
+    async def run() -> None:
+        session_service = InMemorySessionService()
+        compactor = CountingCompactor()
+        session_id = await _create_session_with_history(
+            session_service, turns=3, compactor=compactor
+        )
+        provider = history_instruction(
+            template="History: {interaction_history}", compactor=compactor
+        )
+
+        async def instruction() -> str:
+            # Every turn reads its own copy of the session
+            session = await session_service.get_session(
+                app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+            )
+            context = ReadonlyContext(
+                invocation_context=SimpleNamespace(session=session)
+            )
+            return await provider(context)
+
+        first: str = await instruction()
+        for _ in range(3):
+            assert await instruction() == first
+        assert compactor.renders == 1
+
+        await append_interaction(
+            session_service=session_service,
+            session=await session_service.get_session(
+                app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+            ),
+            entry={"action": "user_query", "query": "question 3"},
+            compactor=compactor,
+        )
+        assert "question 3" in await instruction()
+        assert "question 3" in await instruction()
+        assert compactor.renders == 2
+
+    asyncio.run(run())
+
+
+def test_history_compactor_bounds_rendered_history() -> None:
+    """Only the window is kept verbatim; older entries go to the digest."""
+
+    async def run() -> None:
+        session_service = InMemorySessionService()
+        compactor = HistoryCompactor(window_size=5, digest_policy=count_actions)
+        session_id = await _create_session_with_history(
+            session_service, turns=50, compactor=compactor
+        )
+        session = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+        )
+
+        compacted = session.state[HISTORY_STATE_KEY]
+        assert len(compacted["window"]) == 5
+        rendered: str = compactor.render(compacted)
+        assert "Summary of 45 earlier interactions" in rendered
+        assert "'user_query': 45" in rendered
+        assert "question 44" not in rendered
+        assert all(f"question {i}" in rendered for i in range(45, 50))
+
+        # Folding builds a new view and leaves the stored one unchanged
+        folded = compactor.fold(compacted, {"action": "user_query", "query": "q"})
+        assert folded["folded"] == 46
+        assert compacted["folded"] == 45
+        assert compacted["digest"]["counts"] == {"user_query": 45}
+
+        # New entries are folded in as they are appended
+        await append_interaction(
+            session_service=session_service,
+            session=await session_service.get_session(
+                app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+            ),
+            entry={"action": "user_query", "query": "question 50"},
+            compactor=compactor,
+        )
+        session = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+        )
+        rendered = compactor.render(session.state[HISTORY_STATE_KEY])
+        assert "Summary of 46 earlier interactions" in rendered
+        assert "question 50" in rendered
+
+    asyncio.run(run())
+
+
+def test_record_interaction_writes_entry_and_compacted_view() -> None:
+    """Tools record their entry and the updated view in the state delta."""
+    state = State(
+        value={HISTORY_STATE_KEY: {"folded": 0, "digest": {}, "window": []}},
+        delta={},
+    )
+    record_interaction(state, {"action": "purchase_course", "course_id": "ai"})
+
+    assert state[LAST_INTERACTION_KEY]["course_id"] == "ai"
+    assert "timestamp" in state[LAST_INTERACTION_KEY]
+    assert state[HISTORY_STATE_KEY]["window"] == [state[LAST_INTERACTION_KEY]]
+    assert set(state._delta) == {LAST_INTERACTION_KEY, HISTORY_STATE_KEY}
+
+
+if __name__ == "__main__":
+    test_append_interaction_replays_in_order()
+    test_append_interaction_updates_the_callers_session()
+    test_history_instruction_injects_state_and_history()
+    test_history_instruction_renders_unchanged_history_once()
+    test_history_compactor_bounds_rendered_history()
+    test_record_interaction_writes_entry_and_compacted_view()
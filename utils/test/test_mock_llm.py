@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Test script for the mock model.
+This script tests scripted tool calls in parallel and loop pipelines, latency and error injection.
+"""
+
+import asyncio
+from typing import Any
+
+import pytest
+from google.adk.agents import Agent, LoopAgent, ParallelAgent, SequentialAgent
+from google.adk.models.llm_request import LlmRequest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools.tool_context import ToolContext
+from google.genai import errors, types
+
+from utils.mock_llm import MockLlm, MockResponse, install_mock_llm
+
+APP_NAME: str = "Mock Pipeline"
+USER_ID: str = "john_doe"
+
+
+def get_cpu_info() -> dict[str, Any]:
+    """Return fixed CPU information."""
+    return {"avg_cpu_usage": "12.0%"}
+
+
+def exit_loop(tool_context: ToolContext) -> dict[str, Any]:
+    """Stop the refinement loop."""
+    tool_context.actions.escalate = True
+    return {}
+
+
+def _request(text: str) -> LlmRequest:
+    return LlmRequest(
+        model="mock-llm",
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+    )
+
+
+def test_scripted_pipeline_calls_tools_and_exits_loop() -> None:
+    """Scripted answers drive tool calls in a parallel agent and end a loop."""
+
+    async def run() -> None:
+        cpu_agent = Agent(
+            name="CpuInfoAgent",
+            model="gemini-2.0-flash",
+            instruction="Report the CPU usage.",
+            tools=[get_cpu_info],
+        )
+        summary_agent = Agent(
+            name="SummaryAgent",
+            model="gemini-2.0-flash",
+            instruction="Summarize the system.",
+        )
+        reviewer = Agent(
+            name="PostReviewer",
+            model="gemini-2.0-flash",
+            instruction="Review the post.",
+            tools=[exit_loop],
+        )
+        root_agent = SequentialAgent(
+            name="Pipeline",
+            sub_agents=[
+                ParallelAgent(name="Collector", sub_agents=[cpu_agent, summary_agent]),
+                LoopAgent(name="ReviewLoop", max_iterations=5, sub_agents=[reviewer]),
+            ],
+        )
+
+        cpu_model = MockLlm(
+            responses=[
+                MockResponse(function_call="get_cpu_info"),
+                MockResponse(after_tool="get_cpu_info", text="CPU: $tool_result"),
+            ]
+        )
+        reviewer_model = MockLlm(
+            responses=[
+                MockResponse(text="Needs more detail", times=2),
+                MockResponse(function_call="exit_loop"),
+            ]
+        )
+        replaced = install_mock_llm(
+            root_agent,
+            default=MockLlm(latency=0.01),
+            by_agent={"CpuInfoAgent": cpu_model, "PostReviewer": reviewer_model},
+        )
+        assert replaced == ["CpuInfoAgent", "SummaryAgent", "PostReviewer"]
+
+        session_service = InMemorySessionService()
+        runner = Runner(
+            app_name=APP_NAME, agent=root_agent, session_service=session_service
+        )
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+        finals: dict[str, list[str]] = {}
+        async for event in runner.run_async(
+            user_id=USER_ID,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="check")]),
+        ):
+            if event.is_final_response() and event.content and event.content.parts:
+                finals.setdefault(event.author, []).append(event.content.parts[0].text)
+                assert event.usage_metadata.total_token_count > 0
+
+        assert finals["CpuInfoAgent"] == ['CPU: {"avg_cpu_usage": "12.0%"}']
+        assert finals["SummaryAgent"] == ["echo: check"]
+        # exit_loop ends the loop as soon as it runs
+        assert finals["PostReviewer"] == ["Needs more detail", "Needs more detail"]
+        assert cpu_model.call_count == 2
+        assert reviewer_model.call_count == 3
+
+    asyncio.run(run())
+
+
+def test_times_limits_count_per_session() -> None:
+    """Concurrent sessions sharing one model each get the whole scripted loop."""
+
+    async def run() -> None:
+        reviewer = Agent(
+            name="PostReviewer",
+            model=MockLlm(
+                latency=0.01,
+                responses=[
+                    MockResponse(text="Needs more detail", times=2),
+                    MockResponse(function_call="exit_loop"),
+                ],
+            ),
+            instruction="Review the post.",
+            tools=[exit_loop],
+        )
+        loop = LoopAgent(name="ReviewLoop", max_iterations=5, sub_agents=[reviewer])
+        session_service = InMemorySessionService()
+        runner = Runner(app_name=APP_NAME, agent=loop, session_service=session_service)
+
+        async def review(user_id: str) -> list[str]:
+            session = await session_service.create_session(
+                app_name=APP_NAME, user_id=user_id
+            )
+            finals: list[str] = []
+            async for event in runner.run_async(
+                user_id=user_id,
+                session_id=session.id,
+                new_message=types.Content(
+                    role="user", parts=[types.Part(text="check")]
+                ),
+            ):
+                if event.is_final_response() and event.content and event.content.parts:
+                    finals.append(event.content.parts[0].text)
+            return finals
+
+        results = await asyncio.gather(*(review(f"user_{i}") for i in range(3)))
+        assert results == [["Needs more detail", "Needs more detail"]] * 3
+
+    asyncio.run(run())
+
+
+def test_injected_errors_are_503s_and_repeatable() -> None:
+    """The first calls and a seeded share of later calls fail with a 503."""
+
+    async def outcomes(model: MockLlm) -> list[bool]:
+        results: list[bool] = []
+        for _ in range(20):
+            try:
+                async for _ in model.generate_content_async(_request("hi")):
+                    pass
+                results.append(True)
+            except errors.ServerError as e:
+                assert e.code == 503
+                results.append(False)
+        return results
+
+    first = asyncio.run(outcomes(MockLlm(fail_first=2, error_rate=0.3, seed=7)))
+    second = asyncio.run(outcomes(MockLlm(fail_first=2, error_rate=0.3, seed=7)))
+    assert first[:2] == [False, False]
+    assert first == second
+    assert True in first[2:] and False in first[2:]
+
+
+@pytest.mark.parametrize(
+    "distribution", ["uniform", "normal", "lognormal", "exponential"]
+)
+def test_latency_distributions_are_seeded(distribution: str) -> None:
+    """Latencies vary around the configured latency and repeat with the seed."""
+
+    def samples() -> list[float]:
+        model = MockLlm(
+            latency=0.05, latency_distribution=distribution, latency_spread=0.02, seed=3
+        )
+        return [model._sample_latency() for _ in range(200)]
+
+    latencies = samples()
+    assert latencies == samples()
+    assert len(set(latencies)) > 1
+    assert min(latencies) >= 0.0
+    assert 0.03 < sorted(latencies)[100] < 0.07
+
+
+def test_token_counts_and_model_name() -> None:
+    """Answers can be padded to a token count, which usage_metadata reports."""
+
+    async def run() -> None:
+        model = MockLlm(output_tokens=50)
+        responses = [
+            response
+            async for response in model.generate_content_async(
+                _request("one two three"), stream=True
+            )
+        ]
+        assert len(responses) == 51
+        final = responses[-1]
+        assert len(final.content.parts[0].text.split()) == 50
+        assert final.usage_metadata.candidates_token_count == 50
+        assert final.usage_metadata.prompt_token_count == 3
+        assert final.usage_metadata.total_token_count == 53
+
+    asyncio.run(run())
+    assert isinstance(Agent(name="a", model="mock-llm").canonical_model, MockLlm)
+
+
+if __name__ == "__main__":
+    test_scripted_pipeline_calls_tools_and_exits_loop()
+    test_times_limits_count_per_session()
+    test_injected_errors_are_503s_and_repeatable()
+    for distribution in ("uniform", "normal", "lognormal", "exponential"):
+        test_latency_distributions_are_seeded(distribution)
+    test_token_counts_and_model_name()